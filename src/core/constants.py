@@ -70,6 +70,8 @@ class GameConstants:
     PATH_UPDATE_INTERVAL = 0.5
     MIN_DISTANCE_THRESHOLD = 20
     PATHFINDING_TIMEOUT = 2.0
+    PATHFINDING_FRAME_BUDGET_MS = 2.0  # 分时寻路队列每帧的毫秒预算
+    PATHFINDING_SLICE_EXPANSIONS = 64  # 每个时间片展开的A*节点数
     ARRIVAL_DISTANCE = 15
     SIDE_MOVE_DISTANCE = 0.5
     WANDER_ATTEMPT_COUNT = 10
@@ -236,6 +238,8 @@ class GameBalance:
     starting_mana = 100
     starting_food = 50
     max_creatures = 20
-    hero_spawn_rate = 0.0008
+    hero_spawn_rate = 0.0008  # 旧的每帧刷新概率（按60FPS标定）
+    hero_wave_rate = hero_spawn_rate * 60  # 英雄随机波次的期望频率（每秒），约21秒一波
+    hero_wave_size = (1, 1)  # 随机波次的英雄数量范围 (最少, 最多)
     gold_per_second_per_treasury = 1  # 改为整数，每秒1金币
     # 魔力增长：每5秒生成1点魔力（由地牢之心直接实现）
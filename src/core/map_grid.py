@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+地图网格存储 - 结构数组(SoA)地图后端
+瓦块的热点属性（类型、挖掘标记、金矿储量、挖掘者数量、可达性、建筑id）存放在按行展开的数组中，
+game_map[y][x] 返回的 GridTile 只是指向数组下标的轻量视图，保持 Tile/GameTile 的接口不变。
+视图没有 __dict__ 且不被网格缓存，按需创建、用完即弃，整张地图被遍历后也不会常驻逐格对象。
+
+- 安装了 NumPy 时使用 NumPy 数组，并提供向量化的可通行掩码供寻路和可达性系统使用
+- 没有 NumPy 时回退到标准库 array，接口相同（掩码以嵌套列表返回）
+- 不常用的属性（room_type、建筑对象、渲染标记以及任意动态属性）稀疏存放在字典中
+"""
+
+import weakref
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .enums import TileType
+from .constants import GameConstants
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # NumPy 是可选依赖
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# 瓦块类型 <-> 数组编码
+TILE_TYPES: Tuple[TileType, ...] = tuple(TileType)
+TILE_TYPE_CODES: Dict[TileType, int] = {
+    tile_type: code for code, tile_type in enumerate(TILE_TYPES)}
+
+# 默认可通行类型（与可达性系统一致）
+DEFAULT_PASSABLE_TYPES = (TileType.GROUND, TileType.ROOM, TileType.GOLD_VEIN)
+
+# 数组字段: 名称 -> (NumPy dtype, array typecode, 默认值)
+_FIELDS = {
+    'tile_type': ('uint8', 'B', 0),
+    'is_dug': ('bool', 'B', 0),
+    'gold_amount': ('int32', 'i', 0),
+    'is_gold_vein': ('bool', 'B', 0),
+    'being_mined': ('bool', 'B', 0),
+    'miners_count': ('int16', 'h', 0),
+    'reachable': ('bool', 'B', 0),
+    'reachability_checked': ('bool', 'B', 0),
+    'last_reachability_check': ('float64', 'd', 0.0),
+    'building_id': ('int32', 'i', -1),
+}
+
+
+class MapRow:
+    """地图行视图 - 支持 game_map[y][x] 读写、len() 和迭代"""
+
+    __slots__ = ('_grid', '_y', '_offset')
+
+    def __init__(self, grid: 'MapGrid', y: int):
+        self._grid = grid
+        self._y = y
+        self._offset = y * grid.width
+
+    def __len__(self) -> int:
+        return self._grid.width
+
+    def __getitem__(self, x):
+        grid = self._grid
+        # 常见情况：非负整数下标，没有覆盖对象
+        if type(x) is int and 0 <= x < grid.width and not grid.overrides:
+            return grid._make_view(grid, self._offset + x)
+        if isinstance(x, slice):
+            return [grid.tile(i, self._y) for i in range(*x.indices(grid.width))]
+        if x < 0:
+            x += grid.width
+        if not 0 <= x < grid.width:
+            raise IndexError('地图列索引超出范围')
+        return grid.tile(x, self._y)
+
+    def __setitem__(self, x: int, tile: Any):
+        if x < 0:
+            x += self._grid.width
+        if not 0 <= x < self._grid.width:
+            raise IndexError('地图列索引超出范围')
+        self._grid.set_tile(x, self._y, tile)
+
+    def __iter__(self) -> Iterator[Any]:
+        grid = self._grid
+        if not grid.overrides:
+            make_view = grid._make_view
+            for i in range(self._offset, self._offset + grid.width):
+                yield make_view(grid, i)
+            return
+        tile = grid.tile
+        y = self._y
+        for x in range(grid.width):
+            yield tile(x, y)
+
+
+class MapGrid:
+    """地图网格存储 - 对外表现为 List[List[Tile]]"""
+
+    def __init__(self, width: int, height: int, tile_type: TileType = TileType.ROCK,
+                 tile_size: int = None):
+        """
+        初始化地图网格
+
+        Args:
+            width, height: 地图尺寸（瓦块）
+            tile_type: 初始瓦块类型
+            tile_size: 瓦块大小（像素），None 时使用游戏常量
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.tile_size = tile_size or GameConstants.TILE_SIZE
+
+        for name, (dtype, typecode, default) in _FIELDS.items():
+            if NUMPY_AVAILABLE:
+                data = np.full(self.size, default, dtype=dtype)
+            else:
+                data = array(typecode, [default]) * self.size
+            setattr(self, name, data)
+        self.fill_type(tile_type)
+
+        # 稀疏属性: 下标 -> {属性名: 值}
+        self.extras: Dict[int, Dict[str, Any]] = {}
+        # 被整体替换为独立瓦块对象的格子: 下标 -> 瓦块对象
+        self.overrides: Dict[int, Any] = {}
+        # 建筑对象表: 建筑id -> 建筑对象
+        self.building_objects: Dict[int, Any] = {}
+        self._building_ids: Dict[int, int] = {}
+        self._next_building_id = 0
+        # 建筑id -> 建筑占据的格子下标，建筑状态变化（如建成后阻挡寻路）时通知这些格子
+        self._building_cells: Dict[int, set] = {}
+
+        # 延迟导入避免循环导入
+        from ..entities.tile import GridTile, make_grid_tile
+        self._view_class = GridTile
+        self._make_view = make_grid_tile
+        self._rows = [MapRow(self, y) for y in range(height)]
+
+        # 瓦块变化监听器: callback(grid, index)，绑定方法以弱引用保存
+        self._change_listeners: List[Any] = []
+
+    @classmethod
+    def from_tiles(cls, game_map: Sequence[Sequence[Any]], tile_size: int = None) -> 'MapGrid':
+        """从 List[List[Tile]] 地图创建网格（复制瓦块状态）"""
+        height = len(game_map)
+        width = len(game_map[0]) if height else 0
+        grid = cls(width, height, tile_size=tile_size)
+        for y in range(height):
+            for x in range(width):
+                grid.copy_tile_state(x, y, game_map[y][x])
+        return grid
+
+    # ==================== List[List[Tile]] 兼容接口 ====================
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y):
+        if type(y) is int and 0 <= y < self.height:
+            return self._rows[y]
+        if isinstance(y, slice):
+            return self._rows[y]
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError('地图行索引超出范围')
+        return self._rows[y]
+
+    def __iter__(self) -> Iterator[MapRow]:
+        return iter(self._rows)
+
+    def index(self, x: int, y: int) -> int:
+        """坐标 -> 数组下标"""
+        return y * self.width + x
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """检查坐标是否在地图内"""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def tile(self, x: int, y: int) -> Any:
+        """获取瓦块视图（每次创建新的视图，同一格子的视图相等但不是同一个对象）"""
+        i = y * self.width + x
+        if self.overrides:
+            override = self.overrides.get(i)
+            if override is not None:
+                return override
+        return self._make_view(self, i)
+
+    def set_tile(self, x: int, y: int, tile: Any):
+        """
+        替换格子上的瓦块
+
+        写回本格子自己的视图时恢复为数组存储；写入其他对象时作为覆盖对象保存，
+        直到再次写回视图（用于寻路时临时阻塞瓦块等场景）
+        """
+        i = y * self.width + x
+        if type(tile) is self._view_class and tile._grid is self and tile._i == i:
+            self.overrides.pop(i, None)
+        else:
+            self.overrides[i] = tile
+        if self._change_listeners:
+            self.notify_tile_changed(i)
+
+    def copy_tile_state(self, x: int, y: int, tile: Any):
+        """把独立瓦块对象的状态复制到网格数组中"""
+        view = self.tile(x, y)
+        view.tile_type = getattr(tile, 'type', None) or getattr(
+            tile, 'tile_type', TileType.ROCK)
+        for name in ('is_dug', 'gold_amount', 'is_gold_vein', 'being_mined', 'miners_count',
+                     'room', 'room_type', 'is_incomplete', 'needs_rerender', 'just_rerendered'):
+            value = getattr(tile, name, None)
+            if value is not None:
+                setattr(view, name, value)
+
+    # ==================== 变化通知 ====================
+
+    def add_change_listener(self, callback):
+        """
+        注册瓦块变化监听器
+
+        通过瓦块视图修改类型、挖掘标记、金矿储量/状态、挖掘者数量，或替换格子上的瓦块时，
+        以 callback(grid, index) 通知。直接写数组（如批量初始化）不会触发通知。
+        """
+        if hasattr(callback, '__self__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            def ref(callback=callback):
+                return callback
+        self._change_listeners.append(ref)
+
+    def remove_change_listener(self, callback):
+        """移除瓦块变化监听器"""
+        self._change_listeners = [ref for ref in self._change_listeners
+                                  if ref() is not None and ref() != callback]
+
+    def notify_tile_changed(self, i: int):
+        """通知所有监听器某个格子发生了变化"""
+        dead = False
+        for ref in self._change_listeners:
+            callback = ref()
+            if callback is None:
+                dead = True
+            else:
+                callback(self, i)
+        if dead:
+            self._change_listeners = [
+                ref for ref in self._change_listeners if ref() is not None]
+
+    # ==================== 字段读写 ====================
+
+    def get_type(self, x: int, y: int) -> TileType:
+        """获取瓦块类型"""
+        return TILE_TYPES[self.tile_type[y * self.width + x]]
+
+    def set_type(self, x: int, y: int, tile_type: TileType):
+        """设置瓦块类型"""
+        i = y * self.width + x
+        self.tile_type[i] = TILE_TYPE_CODES[tile_type]
+        if self._change_listeners:
+            self.notify_tile_changed(i)
+
+    def fill_type(self, tile_type: TileType):
+        """把所有瓦块设置为同一类型"""
+        code = TILE_TYPE_CODES[tile_type]
+        if NUMPY_AVAILABLE:
+            self.tile_type.fill(code)
+        else:
+            self.tile_type = array('B', [code]) * self.size
+
+    def get_extra(self, i: int, name: str, default: Any = None) -> Any:
+        """读取稀疏属性"""
+        extras = self.extras.get(i)
+        if extras is None:
+            return default
+        return extras.get(name, default)
+
+    def set_extra(self, i: int, name: str, value: Any, default: Any = None):
+        """写入稀疏属性（写入默认值时不为空格子分配字典）"""
+        extras = self.extras.get(i)
+        if extras is None:
+            if value is default or value == default:
+                return
+            extras = self.extras[i] = {}
+        extras[name] = value
+
+    def get_building(self, i: int) -> Optional[Any]:
+        """获取格子上的建筑对象"""
+        building_id = self.building_id[i]
+        if building_id < 0:
+            return None
+        return self.building_objects.get(int(building_id))
+
+    def set_building(self, i: int, building: Optional[Any]):
+        """
+        设置格子上的建筑对象
+
+        建筑会影响可通行性（已完成的建筑阻挡寻路），放置、移除建筑以及之后建筑状态变化时
+        都会通知瓦块变化监听器，寻路缓存据此只刷新受影响的格子
+        """
+        old_id = int(self.building_id[i])
+        if old_id >= 0:
+            self._building_cells.get(old_id, set()).discard(i)
+
+        if building is None:
+            self.building_id[i] = -1
+        else:
+            building_id = self._building_ids.get(id(building))
+            if building_id is None:
+                building_id = self._next_building_id
+                self._next_building_id += 1
+                self._building_ids[id(building)] = building_id
+                self.building_objects[building_id] = building
+            self.building_id[i] = building_id
+            self._building_cells.setdefault(building_id, set()).add(i)
+            # 建筑状态变化时由建筑回调 notify_building_changed
+            building.tile_listener = self.notify_building_changed
+
+        if self._change_listeners:
+            self.notify_tile_changed(i)
+
+    def notify_building_changed(self, building: Any):
+        """建筑状态变化时通知其占据的所有格子"""
+        building_id = self._building_ids.get(id(building))
+        if building_id is None or not self._change_listeners:
+            return
+        for i in sorted(self._building_cells.get(building_id, ())):
+            self.notify_tile_changed(i)
+
+    # ==================== 向量化查询 ====================
+
+    def passable_mask(self, passable_types: Iterable[TileType] = DEFAULT_PASSABLE_TYPES,
+                      include_dug: bool = False):
+        """
+        获取可通行掩码
+
+        Args:
+            passable_types: 可通行的瓦块类型
+            include_dug: 已挖掘的瓦块是否一律视为可通行
+
+        Returns:
+            NumPy 可用时为 (height, width) 的 bool 数组，否则为嵌套列表
+        """
+        codes = [TILE_TYPE_CODES[t] for t in passable_types]
+        if NUMPY_AVAILABLE:
+            mask = np.isin(self.tile_type, codes)
+            if include_dug:
+                mask |= self.is_dug
+            mask = mask.reshape(self.height, self.width)
+        else:
+            code_set = set(codes)
+            flat = [code in code_set for code in self.tile_type]
+            if include_dug:
+                flat = [p or bool(d) for p, d in zip(flat, self.is_dug)]
+            mask = [flat[y * self.width:(y + 1) * self.width]
+                    for y in range(self.height)]
+
+        # 覆盖对象按其自身的类型判断
+        passable_set = set(passable_types)
+        for i, tile in self.overrides.items():
+            y, x = divmod(i, self.width)
+            tile_type = getattr(tile, 'type', None)
+            passable = tile_type in passable_set or (
+                include_dug and bool(getattr(tile, 'is_dug', False)))
+            mask[y][x] = passable
+        return mask
+
+    def passable_flat(self, passable_types: Iterable[TileType] = DEFAULT_PASSABLE_TYPES,
+                      include_dug: bool = False) -> List[bool]:
+        """获取按行展开的可通行掩码（下标与数组字段一致）"""
+        mask = self.passable_mask(passable_types, include_dug)
+        if NUMPY_AVAILABLE:
+            return mask.ravel().tolist()
+        return [passable for row in mask for passable in row]
+
+    def passable_lists(self, passable_types: Iterable[TileType] = DEFAULT_PASSABLE_TYPES,
+                       include_dug: bool = False) -> List[List[bool]]:
+        """获取可通行掩码的嵌套列表形式（适合逐格访问的纯Python算法）"""
+        mask = self.passable_mask(passable_types, include_dug)
+        return mask.tolist() if NUMPY_AVAILABLE else mask
+
+    def blocked_array(self, blocked_types: Iterable[TileType] = (TileType.ROCK,)) -> List[List[int]]:
+        """获取寻路用的 0/1 地图（1 = 不可通行）"""
+        passable_types = [t for t in TILE_TYPES if t not in set(blocked_types)]
+        mask = self.passable_lists(passable_types)
+        return [[0 if passable else 1 for passable in row] for row in mask]
+
+    def set_reachability(self, reachable_tiles: Iterable[Tuple[int, int]], check_time: float):
+        """批量更新可达性标记"""
+        width = self.width
+        indices = [y * width + x for x, y in reachable_tiles]
+        if NUMPY_AVAILABLE:
+            self.reachable.fill(False)
+            if indices:
+                self.reachable[np.asarray(indices, dtype=np.int64)] = True
+        else:
+            self.reachable = array('B', [0]) * self.size
+            for i in indices:
+                self.reachable[i] = 1
+        self.mark_reachability_checked(check_time)
+
+    def mark_reachability_checked(self, check_time: float):
+        """把所有瓦块标记为已在 check_time 检查过可达性（可达标记本身不变）"""
+        if NUMPY_AVAILABLE:
+            self.reachability_checked.fill(True)
+            self.last_reachability_check.fill(check_time)
+        else:
+            self.reachability_checked = array('B', [1]) * self.size
+            self.last_reachability_check = array('d', [check_time]) * self.size
+
+    def gold_vein_positions(self) -> List[Tuple[int, int, int]]:
+        """获取所有有储量的金矿脉 (x, y, 储量)"""
+        width = self.width
+        if NUMPY_AVAILABLE:
+            indices = np.flatnonzero(self.is_gold_vein & (self.gold_amount > 0))
+            amounts = self.gold_amount[indices]
+            return [(int(i) % width, int(i) // width, int(a)) for i, a in zip(indices, amounts)]
+        return [(i % width, i // width, self.gold_amount[i]) for i in range(self.size)
+                if self.is_gold_vein[i] and self.gold_amount[i] > 0]
+
+    def get_memory_usage(self) -> int:
+        """估算数组部分占用的内存（字节）"""
+        total = 0
+        for name in _FIELDS:
+            data = getattr(self, name)
+            total += data.nbytes if NUMPY_AVAILABLE else data.itemsize * len(data)
+        return total
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模拟时钟
+统一的游戏时间源，替代各系统中直接调用的 time.time()
+
+- 步进模式（默认）：时间只随 advance() 推进，由游戏/模拟器每帧按 delta 推进，
+  无头模拟可以远快于实时运行，且相同输入可复现相同结果
+- 实时模式：直接返回墙钟时间，用于没有游戏实例驱动的场景（向后兼容）
+
+性能测量（耗时统计）仍应使用 time.time()/time.perf_counter()，不要使用模拟时钟。
+"""
+
+import time
+from typing import Optional
+
+
+class SimClock:
+    """模拟时钟 - 由游戏/模拟器持有，各子系统通过 get_sim_clock() 读取"""
+
+    # 步进模式的起始时间（秒）
+    # 使用较大的固定值，保证 "当前时间 - 0 >= 冷却时间" 这类初始判断与墙钟时间行为一致
+    DEFAULT_EPOCH = 1_000_000.0
+
+    def __init__(self, realtime: bool = False, start_time: Optional[float] = None):
+        """
+        初始化模拟时钟
+
+        Args:
+            realtime: 是否使用墙钟时间
+            start_time: 起始时间（秒），None 时步进模式使用 DEFAULT_EPOCH
+        """
+        self.realtime = realtime
+        if start_time is None:
+            start_time = time.time() if realtime else self.DEFAULT_EPOCH
+        self.start_time = start_time
+        self._current_time = start_time
+        self.tick_count = 0
+
+    def now(self) -> float:
+        """获取当前模拟时间（秒）"""
+        if self.realtime:
+            return time.time()
+        return self._current_time
+
+    def advance(self, delta_seconds: float) -> float:
+        """
+        推进模拟时间
+
+        Args:
+            delta_seconds: 时间增量（秒），负值按0处理
+
+        Returns:
+            float: 推进后的当前时间
+        """
+        self.tick_count += 1
+        if not self.realtime and delta_seconds > 0:
+            self._current_time += delta_seconds
+        return self.now()
+
+    def elapsed(self) -> float:
+        """获取自起始时间以来经过的模拟时间（秒）"""
+        return self.now() - self.start_time
+
+    def reset(self, start_time: Optional[float] = None):
+        """重置时钟到起始时间"""
+        if start_time is not None:
+            self.start_time = start_time
+        elif self.realtime:
+            self.start_time = time.time()
+        self._current_time = self.start_time
+        self.tick_count = 0
+
+
+# 默认使用实时时钟，游戏/模拟器初始化时安装自己的步进时钟
+_default_clock = SimClock(realtime=True)
+_sim_clock = _default_clock
+
+
+def get_sim_clock() -> SimClock:
+    """获取当前生效的模拟时钟"""
+    return _sim_clock
+
+
+def set_sim_clock(clock: Optional[SimClock]) -> SimClock:
+    """
+    安装模拟时钟
+
+    Args:
+        clock: 模拟时钟实例，None 时恢复为默认实时时钟
+
+    Returns:
+        SimClock: 当前生效的模拟时钟
+    """
+    global _sim_clock
+    _sim_clock = clock if clock is not None else _default_clock
+    return _sim_clock
+
+
+def reset_sim_clock():
+    """恢复默认实时时钟（用于测试或重新开始游戏）"""
+    set_sim_clock(None)
+
+
+def sim_time() -> float:
+    """获取当前模拟时间（秒）- get_sim_clock().now() 的快捷方式"""
+    return _sim_clock.now()
@@ -10,7 +10,9 @@ from .projectile_system import ProjectileSystem, Projectile
 from .area_effect_system import AreaEffectSystem
 from .effect_renderer import EffectRenderer
 from .effect_pool import EffectPool
-from .glow_effect import GlowEffectRenderer, GlowEffectManager, GlowConfig, get_glow_manager, render_glow_effect
+from .sprite_batch import SpriteBatch, get_sprite_batch
+from .effect_lod import EffectLODGovernor, get_effect_lod
+from .glow_effect import GlowEffectRenderer, GlowEffectManager, GlowConfig, GlowSpriteCache, get_glow_manager, render_glow_effect
 
 __all__ = [
     'EffectManager',
@@ -21,9 +23,14 @@ __all__ = [
     'AreaEffectSystem',
     'EffectRenderer',
     'EffectPool',
+    'SpriteBatch',
+    'get_sprite_batch',
+    'EffectLODGovernor',
+    'get_effect_lod',
     'GlowEffectRenderer',
     'GlowEffectManager',
     'GlowConfig',
+    'GlowSpriteCache',
     'get_glow_manager',
     'render_glow_effect'
 ]
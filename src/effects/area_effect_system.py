@@ -10,6 +10,9 @@ import pygame
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 from .particle_system import ParticleSystem
+from .sprite_batch import get_sprite_batch
+from .effect_pool import EffectPool
+from src.systems.spatial_index import UNIT_LAYERS
 
 
 @dataclass
@@ -120,9 +123,9 @@ class AreaEffect:
         scaled_x = int((self.x - camera_x) * ui_scale)
         scaled_y = int((self.y - camera_y) * ui_scale)
 
-        # 创建带透明度的表面
-        effect_surface = pygame.Surface(
-            (scaled_radius * 2, scaled_radius * 2), pygame.SRCALPHA)
+        # 带透明度的合成表面（复用共享的草稿表面，不再每帧分配）
+        effect_size = scaled_radius * 2
+        effect_surface = get_sprite_batch().scratch_surface(effect_size, effect_size)
 
         if self.effect_type == "fire":
             self._render_fire_effect(effect_surface, alpha, ui_scale)
@@ -137,7 +140,7 @@ class AreaEffect:
 
         # 绘制到主屏幕
         screen.blit(effect_surface, (scaled_x - scaled_radius,
-                    scaled_y - scaled_radius))
+                    scaled_y - scaled_radius), (0, 0, effect_size, effect_size))
 
         # 渲染粒子
         if self.particles:
@@ -224,9 +227,10 @@ class AreaEffect:
 class AreaEffectSystem:
     """区域特效系统管理器"""
 
-    def __init__(self):
-        self.effects: List[AreaEffect] = []
-        self.effect_pool: List[AreaEffect] = []
+    def __init__(self, effect_pool: Optional[EffectPool] = None):
+        # 活跃区域特效即对象池中 AreaEffect 类型的活跃数组
+        self.effect_pool = effect_pool if effect_pool is not None else EffectPool()
+        self.effects: List[AreaEffect] = self.effect_pool.register(AreaEffect, 20)
 
     def create_fire_area(self, x: float, y: float, radius: float = 40,
                          duration: float = 4000, damage_per_second: int = 8) -> AreaEffect:
@@ -271,45 +275,41 @@ class AreaEffectSystem:
     def _create_area_effect(self, x: float, y: float, radius: float, duration: float,
                             effect_type: str, damage_per_second: int,
                             color: Tuple[int, int, int], opacity: float) -> AreaEffect:
-        """创建区域特效"""
-        # 尝试从对象池获取
-        if self.effect_pool:
-            effect = self.effect_pool.pop()
-            effect.x = x
-            effect.y = y
-            effect.radius = radius
-            effect.duration = duration
-            effect.effect_type = effect_type
-            effect.damage_per_second = damage_per_second
-            effect.color = color
-            effect.opacity = opacity
-            effect.current_time = 0.0
-            effect.finished = False
-            effect.damage_tick = 0.0
-            effect.particles = None
-            effect.__post_init__()
-        else:
-            effect = AreaEffect(x, y, radius, duration,
-                                effect_type, damage_per_second, color, opacity)
-
-        self.effects.append(effect)
-        return effect
+        """创建区域特效（从对象池获取）"""
+        return self.effect_pool.acquire(AreaEffect, x, y, radius, duration,
+                                        effect_type, damage_per_second, color, opacity)
 
     def update(self, delta_time: float):
         """更新所有区域特效"""
-        for effect in self.effects[:]:
+        # 倒序遍历，结束的特效交换删除并回到对象池
+        effects = self.effects
+        for index in range(len(effects) - 1, -1, -1):
+            effect = effects[index]
             effect.update(delta_time)
             if effect.finished:
-                self.effects.remove(effect)
-                # 将特效返回对象池
-                if len(self.effect_pool) < 20:  # 限制对象池大小
-                    self.effect_pool.append(effect)
-
-    def check_damage(self, targets: List) -> List[Tuple[AreaEffect, Any]]:
-        """检查区域特效对目标的伤害"""
+                self.effect_pool.release(effect)
+
+    def check_damage(self, targets: List = None, spatial_index=None,
+                     layers: Tuple[str, ...] = UNIT_LAYERS) -> List[Tuple[AreaEffect, Any]]:
+        """
+        检查区域特效对目标的伤害
+
+        Args:
+            targets: 候选目标列表，None 时按特效半径查询世界空间索引
+            spatial_index: 世界空间索引
+            layers: 查询的图层
+        """
         damage_events = []
         for effect in self.effects:
-            for target in targets:
+            if effect.damage_per_second <= 0:
+                continue
+            if targets is not None:
+                candidates = targets
+            elif spatial_index is not None:
+                candidates = spatial_index.query_radius(effect.x, effect.y, effect.radius, layers)
+            else:
+                continue
+            for target in candidates:
                 if effect.should_damage(target):
                     damage_events.append((effect, target))
         return damage_events
@@ -321,5 +321,4 @@ class AreaEffectSystem:
 
     def clear(self):
         """清空所有区域特效"""
-        self.effects.clear()
-        self.effect_pool.clear()
+        self.effect_pool.clear_pool(AreaEffect)
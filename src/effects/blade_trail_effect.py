@@ -5,10 +5,12 @@
 
 import pygame
 import math
-import time
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
+from .effect_lod import get_effect_lod
+from .effect_pool import EffectPool
 
 
 @dataclass
@@ -25,7 +27,8 @@ class BladeTrailEffect:
     """刀刃拖痕特效类"""
 
     def __init__(self, center_x: float, center_y: float, radius: float,
-                 duration: float = 0.8, rotation_speed: float = 1.5):
+                 duration: float = 0.8, rotation_speed: float = 1.5,
+                 effect_pool: Optional[EffectPool] = None):
         """
         初始化刀刃拖痕特效
 
@@ -35,6 +38,7 @@ class BladeTrailEffect:
             radius: 旋转半径
             duration: 特效持续时间（秒）
             rotation_speed: 旋转速度倍数（1.0 = 一圈，1.25 = 一圈多一点）
+            effect_pool: 拖痕段使用的对象池，None 时创建独立的对象池
         """
         self.center_x = center_x
         self.center_y = center_y
@@ -42,7 +46,9 @@ class BladeTrailEffect:
         self.duration = duration
         self.rotation_speed = rotation_speed
 
-        self.start_time = time.time()
+        self.start_time = sim_time()
+        # 拖痕段按时间顺序排列，过期的段总在队首
+        self.effect_pool = effect_pool if effect_pool is not None else EffectPool()
         self.trail_segments: List[TrailSegment] = []
         self.is_active = True
 
@@ -72,12 +78,13 @@ class BladeTrailEffect:
         if not self.is_active:
             return False
 
-        current_time = time.time()
+        current_time = sim_time()
         elapsed = current_time - self.start_time
 
         # 检查特效是否结束
         if elapsed >= self.duration:
             self.is_active = False
+            self.release_segments()
             return False
 
         # 计算当前旋转角度（一圈多一点）
@@ -88,8 +95,9 @@ class BladeTrailEffect:
         blade_x = self.center_x + math.cos(current_angle) * self.radius
         blade_y = self.center_y + math.sin(current_angle) * self.radius
 
-        # 添加新的拖痕段
-        new_segment = TrailSegment(
+        # 添加新的拖痕段（从对象池获取）
+        new_segment = self.effect_pool.acquire(
+            TrailSegment,
             x=blade_x,
             y=blade_y,
             alpha=1.0,
@@ -99,19 +107,16 @@ class BladeTrailEffect:
         self.trail_segments.append(new_segment)
 
         # 更新现有拖痕段的透明度
+        expired = 0
         for segment in self.trail_segments:
             age = current_time - segment.timestamp
             segment.alpha = max(0.0, 1.0 - (age / self.segment_lifetime))
+            if segment.alpha <= 0.0:
+                expired += 1
 
-        # 移除过期的拖痕段
-        self.trail_segments = [
-            segment for segment in self.trail_segments
-            if segment.alpha > 0.0
-        ]
-
-        # 限制拖痕段数量
-        if len(self.trail_segments) > self.max_segments:
-            self.trail_segments = self.trail_segments[-self.max_segments:]
+        # 移除过期的拖痕段，并限制拖痕段数量（上限随特效LOD缩减）
+        max_segments = get_effect_lod().scale_trail_segments(self.max_segments)
+        self._drop_oldest_segments(max(expired, len(self.trail_segments) - max_segments))
 
         return True
 
@@ -189,6 +194,18 @@ class BladeTrailEffect:
             pygame.draw.circle(screen, self.glow_color,
                                (screen_x, screen_y), highlight_radius + 2, 2)
 
+    def _drop_oldest_segments(self, count: int):
+        """移除最老的 count 个拖痕段并回收到对象池"""
+        if count <= 0:
+            return
+        for segment in self.trail_segments[:count]:
+            self.effect_pool.release(segment)
+        del self.trail_segments[:count]
+
+    def release_segments(self):
+        """回收所有拖痕段"""
+        self._drop_oldest_segments(len(self.trail_segments))
+
     def get_center_position(self) -> Tuple[float, float]:
         """获取特效中心位置"""
         return (self.center_x, self.center_y)
@@ -205,8 +222,12 @@ class BladeTrailEffect:
 class WhirlwindSlashEffect:
     """旋风斩特效管理器"""
 
-    def __init__(self):
-        self.active_effects: List[BladeTrailEffect] = []
+    def __init__(self, effect_pool: Optional[EffectPool] = None):
+        # 活跃特效即对象池中 BladeTrailEffect 类型的活跃数组
+        self.effect_pool = effect_pool if effect_pool is not None else EffectPool()
+        self.active_effects: List[BladeTrailEffect] = self.effect_pool.register(
+            BladeTrailEffect, 8)
+        self.effect_pool.register(TrailSegment, 128)
         self.max_concurrent_effects = 3  # 最大同时存在的特效数量
 
     def create_whirlwind_effect(self, center_x: float, center_y: float,
@@ -228,10 +249,11 @@ class WhirlwindSlashEffect:
             # 移除最老的特效
             oldest_effect = min(self.active_effects,
                                 key=lambda e: e.start_time)
-            self.active_effects.remove(oldest_effect)
+            self._release_effect(oldest_effect)
 
-        effect = BladeTrailEffect(center_x, center_y, radius, duration)
-        self.active_effects.append(effect)
+        effect = self.effect_pool.acquire(
+            BladeTrailEffect, center_x, center_y, radius, duration,
+            effect_pool=self.effect_pool)
 
         game_logger.info(
             f"🌪️ 旋风斩特效创建 - 位置:({center_x:.1f},{center_y:.1f}), 半径:{radius:.1f}")
@@ -239,11 +261,17 @@ class WhirlwindSlashEffect:
 
     def update_all(self, delta_time: float):
         """更新所有活跃的特效"""
-        # 更新特效并移除已结束的特效
-        self.active_effects = [
-            effect for effect in self.active_effects
-            if effect.update(delta_time)
-        ]
+        # 更新特效并移除已结束的特效（倒序遍历，交换删除）
+        effects = self.active_effects
+        for index in range(len(effects) - 1, -1, -1):
+            effect = effects[index]
+            if not effect.update(delta_time):
+                self._release_effect(effect)
+
+    def _release_effect(self, effect: BladeTrailEffect):
+        """回收特效及其拖痕段"""
+        effect.release_segments()
+        self.effect_pool.release(effect)
 
     def render_all(self, screen: pygame.Surface, ui_scale: float = 1.0,
                    camera_x: float = 0, camera_y: float = 0):
@@ -253,7 +281,9 @@ class WhirlwindSlashEffect:
 
     def clear_all(self):
         """清空所有特效"""
-        self.active_effects.clear()
+        for effect in self.active_effects:
+            effect.release_segments()
+        self.effect_pool.release_all(BladeTrailEffect)
         game_logger.info("🗡️ 刀刃拖痕特效系统已清空")
 
     def get_active_count(self) -> int:
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+特效细节层次(LOD)调节器
+根据实测的帧耗时滚动平均值连续调整特效质量系数 quality (0~1)，
+粒子生成数量、发光层数、刀光拖痕段数和可视化特效持续时间都按该系数平滑缩放，
+而不是在粒子过多时整帧跳过特效更新。
+
+- 帧耗时超出预算时按超出比例快速降级，有余量时缓慢恢复，避免来回抖动
+- 粒子数量接近上限时额外压低粒子生成数量，到达上限后不再生成新粒子
+- 当前质量系数映射为 high / medium / low / minimal 四个档位，便于显示和调试
+- 数量取整使用独立的随机数生成器：质量系数随帧耗时变化，不能让它消耗全局随机序列，
+  否则相同种子的模拟会因为机器快慢得到不同的游戏结果
+"""
+
+import random
+from collections import deque
+from typing import Any, Dict, Optional
+
+from src.core.constants import GameConstants
+from src.utils.logger import game_logger
+
+# 档位名称及其质量系数下限（从高到低）
+LOD_TIERS = (
+    ('high', 0.85),
+    ('medium', 0.6),
+    ('low', 0.35),
+    ('minimal', 0.0),
+)
+# 档位切换的回差，避免质量系数在阈值附近时档位反复跳变
+LOD_TIER_HYSTERESIS = 0.05
+# 粒子数量超过上限的该比例后开始压低生成数量
+PARTICLE_PRESSURE_START = 0.75
+
+
+class EffectLODGovernor:
+    """特效LOD调节器 - 帧耗时驱动的连续质量系数"""
+
+    def __init__(self, target_frame_ms: float = 1000.0 / 60, window: int = 30,
+                 min_quality: float = 0.2, seed: Optional[int] = None):
+        """
+        初始化LOD调节器
+
+        Args:
+            target_frame_ms: 每帧耗时预算（毫秒）
+            window: 滚动平均的帧数
+            min_quality: 质量系数下限
+            seed: 数量取整随机数生成器的种子
+        """
+        self.target_frame_ms = target_frame_ms
+        self.min_quality = min_quality
+        self.enabled = True
+        self._rng = random.Random(seed)
+
+        self.degrade_rate = 0.5     # 每超出预算100%，每帧降低的质量系数
+        self.max_degrade_step = 0.05
+        self.recover_rate = 0.005   # 有余量时每帧恢复的质量系数
+        self.headroom_ratio = 0.8   # 平均耗时低于预算的该比例时才恢复
+
+        self._frame_times = deque(maxlen=window)
+        self._frame_time_sum = 0.0
+        self.quality = 1.0
+        self.tier = LOD_TIERS[0][0]
+        self.particle_load = 0.0
+
+    # ==================== 输入 ====================
+
+    def record_frame(self, frame_ms: float):
+        """
+        记录一帧的实际耗时（不含帧率限制的等待时间）并调整质量系数
+
+        Args:
+            frame_ms: 帧耗时（毫秒），例如 pygame.time.Clock.get_rawtime()
+        """
+        if len(self._frame_times) == self._frame_times.maxlen:
+            self._frame_time_sum -= self._frame_times[0]
+        self._frame_times.append(frame_ms)
+        self._frame_time_sum += frame_ms
+
+        if not self.enabled:
+            return
+
+        ratio = self.get_average_frame_ms() / self.target_frame_ms
+        if ratio > 1.0:
+            step = min(self.max_degrade_step, self.degrade_rate * (ratio - 1.0))
+            self.quality = max(self.min_quality, self.quality - step)
+        elif ratio < self.headroom_ratio:
+            self.quality = min(1.0, self.quality + self.recover_rate)
+        self._update_tier()
+
+    def set_particle_load(self, particle_count: int, max_particles: int):
+        """更新当前粒子数量占上限的比例"""
+        self.particle_load = particle_count / max_particles if max_particles > 0 else 0.0
+
+    def set_enabled(self, enabled: bool):
+        """启用/禁用调节器，禁用时恢复满质量"""
+        self.enabled = enabled
+        if not enabled:
+            self.quality = 1.0
+            self._update_tier()
+
+    def reset(self):
+        """清空帧耗时记录并恢复满质量"""
+        self._frame_times.clear()
+        self._frame_time_sum = 0.0
+        self.quality = 1.0
+        self.particle_load = 0.0
+        self._update_tier()
+
+    def _update_tier(self):
+        """根据质量系数更新档位（带回差）"""
+        current_index = next(i for i, (name, _) in enumerate(LOD_TIERS) if name == self.tier)
+        new_index = current_index
+        # 降档：质量低于当前档位下限减去回差
+        while (new_index < len(LOD_TIERS) - 1 and
+               self.quality < LOD_TIERS[new_index][1] - LOD_TIER_HYSTERESIS):
+            new_index += 1
+        # 升档：质量高于上一档位下限加上回差
+        while new_index > 0 and self.quality >= LOD_TIERS[new_index - 1][1] + LOD_TIER_HYSTERESIS:
+            new_index -= 1
+        # 满质量时总是回到最高档
+        if self.quality >= 1.0:
+            new_index = 0
+
+        if new_index != current_index:
+            self.tier = LOD_TIERS[new_index][0]
+            game_logger.info(
+                f"🎚️ 特效LOD切换为 {self.tier} (质量 {self.quality:.2f}, 平均帧耗时 {self.get_average_frame_ms():.1f}ms)")
+
+    # ==================== 缩放查询 ====================
+
+    @property
+    def spawn_scale(self) -> float:
+        """粒子生成数量的缩放系数（质量系数 × 粒子数量压力）"""
+        scale = self.quality
+        if self.particle_load > PARTICLE_PRESSURE_START:
+            pressure = (1.0 - self.particle_load) / (1.0 - PARTICLE_PRESSURE_START)
+            scale *= max(0.0, pressure)
+        return scale
+
+    def scale_count(self, count: int) -> int:
+        """
+        缩放粒子生成数量
+
+        按缩放后的期望值随机取整，少量粒子的爆发在多次触发后平均数量仍与系数成比例。
+        """
+        if count <= 0:
+            return 0
+        scale = self.spawn_scale
+        if scale >= 1.0:
+            return count
+        expected = count * scale
+        scaled = int(expected)
+        if self._rng.random() < expected - scaled:
+            scaled += 1
+        return scaled
+
+    def scale_glow_layers(self, layers: int) -> int:
+        """缩放发光层数，至少保留一层"""
+        if layers <= 1 or self.quality >= 1.0:
+            return layers
+        return max(1, int(round(layers * (0.25 + 0.75 * self.quality))))
+
+    def scale_trail_segments(self, max_segments: int) -> int:
+        """缩放拖痕段数上限"""
+        if self.quality >= 1.0:
+            return max_segments
+        return max(6, int(max_segments * self.quality))
+
+    @property
+    def duration_scale(self) -> float:
+        """可视化特效持续时间的缩放系数"""
+        return 0.5 + 0.5 * self.quality
+
+    # ==================== 统计 ====================
+
+    def get_average_frame_ms(self) -> float:
+        """滚动平均帧耗时（毫秒）"""
+        if not self._frame_times:
+            return 0.0
+        return self._frame_time_sum / len(self._frame_times)
+
+    def get_tier(self) -> str:
+        """获取当前LOD档位"""
+        return self.tier
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            'tier': self.tier,
+            'quality': round(self.quality, 3),
+            'average_frame_ms': round(self.get_average_frame_ms(), 2),
+            'target_frame_ms': round(self.target_frame_ms, 2),
+            'spawn_scale': round(self.spawn_scale, 3),
+            'particle_load': round(self.particle_load, 3),
+            'enabled': self.enabled,
+        }
+
+
+# 全局LOD调节器实例
+_effect_lod = None
+
+
+def get_effect_lod() -> EffectLODGovernor:
+    """获取全局特效LOD调节器实例"""
+    global _effect_lod
+    if _effect_lod is None:
+        _effect_lod = EffectLODGovernor(target_frame_ms=1000.0 / GameConstants.FPS_TARGET)
+    return _effect_lod
+
+
+def reset_effect_lod():
+    """重置特效LOD调节器（用于测试或重新开始游戏）"""
+    global _effect_lod
+    _effect_lod = None
@@ -6,18 +6,20 @@
 
 import math
 import random
-import time
 import pygame
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-from .particle_system import ParticleSystem
+from .particle_system import ParticleSystem, VECTORIZED_PARTICLES
 from .projectile_system import ProjectileSystem
 from .area_effect_system import AreaEffectSystem
 from .blade_trail_effect import WhirlwindSlashEffect
 from src.utils.logger import game_logger
 from .effect_pool import EffectPool
-from .effect_renderer import EffectRenderer
+from .effect_renderer import EffectRendererManager
 from .glow_effect import get_glow_manager
+from .sprite_batch import get_sprite_batch
+from .effect_lod import get_effect_lod
+from src.core.sim_clock import sim_time
 
 
 @dataclass
@@ -40,16 +42,16 @@ class EffectManager:
     """特效管理器 - 统一管理所有攻击特效"""
 
     def __init__(self, speed_multiplier: float = 1.0):
-        # 核心系统
-        self.particle_system = ParticleSystem()
-        self.projectile_system = ProjectileSystem()
-        self.area_effect_system = AreaEffectSystem()
-        self.whirlwind_effect_manager = WhirlwindSlashEffect()
-        self.renderer_manager = EffectRenderer()
+        # 核心系统 - 所有特效对象共用同一个按类型划分的对象池
         self.effect_pool = EffectPool()
-
-        # 可视化特效系统 - 整合自VisualEffectManager
-        self.visual_effects: List[VisualEffect] = []
+        self.particle_system = ParticleSystem(effect_pool=self.effect_pool)
+        self.projectile_system = ProjectileSystem(effect_pool=self.effect_pool)
+        self.area_effect_system = AreaEffectSystem(effect_pool=self.effect_pool)
+        self.whirlwind_effect_manager = WhirlwindSlashEffect(effect_pool=self.effect_pool)
+        self.renderer_manager = EffectRendererManager()
+
+        # 可视化特效系统 - 整合自VisualEffectManager（对象池中 VisualEffect 的活跃数组）
+        self.visual_effects: List[VisualEffect] = self.effect_pool.register(VisualEffect, 100)
         self.speed_multiplier = speed_multiplier
         self.font = None
 
@@ -57,10 +59,15 @@ class EffectManager:
         self.visual_effect_configs = self._load_visual_effect_configs()
 
         # 性能设置 - 大幅降低限制以避免卡死
-        self.max_particles = 50  # 从500降低到50
+        # 粒子接近该数量时由LOD调节器压低生成数量；向量化粒子后端可以承受数千个粒子
+        self.max_particles = 2000 if VECTORIZED_PARTICLES else 50
         self.max_projectiles = 10  # 从100降低到10
         self.max_area_effects = 5  # 从50降低到5
         self.performance_mode = "low"  # 改为low模式
+        self.lod = get_effect_lod()
+
+        # 世界空间索引（由游戏接入），接入后碰撞和范围伤害不再需要完整的目标列表
+        self.spatial_index = None
 
         # 特效冷却机制
         self.effect_cooldowns = {}  # 存储特效冷却时间
@@ -143,18 +150,27 @@ class EffectManager:
 
         return True
 
+    def set_spatial_index(self, spatial_index):
+        """
+        接入世界空间索引 - 投射物碰撞、追踪和区域伤害改为按网格查询附近的单位
+
+        Args:
+            spatial_index: 游戏每帧同步的 WorldSpatialIndex，None 时回退到传入的目标列表
+        """
+        self.spatial_index = spatial_index
+        self.projectile_system.set_spatial_index(spatial_index)
+
     def update(self, delta_time: float, targets: List = None, camera_x: float = 0, camera_y: float = 0):
-        """更新所有特效系统"""
-        # 性能检查 - 如果特效数量过多，跳过某些更新
-        stats = self.get_performance_stats()
-        if stats['particles'] > self.max_particles:
-            # 如果粒子过多，降低更新频率
-            if hasattr(self, '_update_counter'):
-                self._update_counter += 1
-                if self._update_counter % 2 != 0:  # 每两帧更新一次
-                    return
-            else:
-                self._update_counter = 0
+        """
+        更新所有特效系统
+
+        Args:
+            delta_time: 时间增量（毫秒）
+            targets: 可被特效命中的单位列表；接入世界空间索引后可以不传
+        """
+        # 性能检查 - 粒子数量压力交给LOD调节器平滑压低生成数量，不再跳帧更新
+        self.lod.set_particle_load(
+            self.particle_system.get_particle_count(), self.max_particles)
 
         # 更新各系统
         self.particle_system.update(delta_time)
@@ -169,7 +185,7 @@ class EffectManager:
             self.renderer_manager.update(delta_time)
 
         # 检查碰撞
-        if targets:
+        if targets or self.spatial_index is not None:
             self._check_projectile_collisions(targets, camera_x, camera_y)
             self._check_area_damage(targets, camera_x, camera_y)
 
@@ -197,7 +213,8 @@ class EffectManager:
 
     def _check_area_damage(self, targets: List, camera_x: float = 0, camera_y: float = 0):
         """检查区域伤害"""
-        damage_events = self.area_effect_system.check_damage(targets)
+        damage_events = self.area_effect_system.check_damage(
+            targets if targets else None, self.spatial_index)
         for effect, target in damage_events:
             target._take_damage(effect.damage_per_second)
             # 伤害数字显示已移除
@@ -209,8 +226,14 @@ class EffectManager:
             return screen
 
         # 渲染各系统，传递UI放大倍数和相机参数
-        self.particle_system.render(screen, ui_scale, camera_x, camera_y)
-        self.projectile_system.render(screen, ui_scale, camera_x, camera_y)
+        # 粒子和投射物的精灵收集到同一批次，在区域特效之前一次提交
+        batch = get_sprite_batch()
+        batch.begin(screen)
+        try:
+            self.particle_system.render(screen, ui_scale, camera_x, camera_y)
+            self.projectile_system.render(screen, ui_scale, camera_x, camera_y)
+        finally:
+            batch.end(screen)
         self.area_effect_system.render(screen, ui_scale, camera_x, camera_y)
         self.whirlwind_effect_manager.render_all(
             screen, ui_scale, camera_x, camera_y)
@@ -219,7 +242,7 @@ class EffectManager:
         self.render_visual_effects(screen, ui_scale, camera_x, camera_y)
 
         # 渲染管理器处理屏幕震动和伤害数字
-        result = self.renderer_manager.render_all(screen, ui_scale)
+        result = self.renderer_manager.render_all(screen, ui_scale, camera_x, camera_y)
 
         # 确保返回有效的Surface
         if result is None:
@@ -229,6 +252,10 @@ class EffectManager:
 
         return result
 
+    def get_shake_offset(self) -> Tuple[int, int]:
+        """获取屏幕震动的相机偏移（渲染世界层时加到相机位置上）"""
+        return self.renderer_manager.get_shake_offset()
+
     def clear_all(self):
         """清空所有特效"""
         self.particle_system.clear()
@@ -240,40 +267,58 @@ class EffectManager:
     def set_performance_mode(self, mode: str):
         """设置性能模式"""
         self.performance_mode = mode
+        particle_scale = 4 if VECTORIZED_PARTICLES else 1
         if mode == "low":
-            self.max_particles = 200
+            self.max_particles = 200 * particle_scale
             self.max_projectiles = 50
             self.max_area_effects = 25
         elif mode == "medium":
-            self.max_particles = 350
+            self.max_particles = 350 * particle_scale
             self.max_projectiles = 75
             self.max_area_effects = 35
         else:  # high
-            self.max_particles = 500
+            self.max_particles = 500 * particle_scale
             self.max_projectiles = 100
             self.max_area_effects = 50
 
-    def get_performance_stats(self) -> Dict[str, int]:
-        """获取性能统计"""
+    def get_performance_stats(self) -> Dict[str, Any]:
+        """获取性能统计（pools 为各特效类型的对象池占用情况）"""
         stats = {
-            "particles": len(self.particle_system.particles),
+            "particles": self.particle_system.get_particle_count(),
             "projectiles": len(self.projectile_system.projectiles),
             "area_effects": len(self.area_effect_system.effects)
         }
 
         # 安全地获取伤害数字统计
-        if hasattr(self.renderer_manager, 'damage_renderer') and hasattr(self.renderer_manager.damage_renderer, 'damage_numbers'):
-            stats["damage_numbers"] = len(
-                self.renderer_manager.damage_renderer.damage_numbers)
+        if hasattr(self.renderer_manager, 'damage_renderer'):
+            stats["damage_numbers"] = len(self.renderer_manager.damage_renderer)
         else:
             stats["damage_numbers"] = 0
 
+        stats["pools"] = self.get_pool_status()
         return stats
 
+    def get_pool_status(self) -> Dict[str, Dict[str, int]]:
+        """获取对象池占用情况（向量化粒子以数组容量计）"""
+        status = self.effect_pool.get_pool_status()
+        if self.particle_system.vectorized:
+            # 向量化模式下粒子不使用对象，以粒子数组的占用代替
+            status.pop('RegularParticle', None)
+            status.pop('ManaParticle', None)
+            status.update(self.particle_system.get_pool_status())
+        return status
+
+    def get_lod_tier(self) -> str:
+        """获取当前生效的特效LOD档位"""
+        return self.lod.get_tier()
+
+    def get_lod_stats(self) -> Dict[str, Any]:
+        """获取特效LOD调节器的统计信息"""
+        return self.lod.get_stats()
+
     def _cleanup_effect_cooldowns(self):
         """清理过期的特效冷却记录"""
-        import time
-        current_time = time.time() * 1000
+        current_time = sim_time() * 1000
 
         # 清理5秒前的冷却记录
         expired_keys = []
@@ -311,23 +356,25 @@ class EffectManager:
         # 应用速度倍数 - 使用配置中的速度倍数
         total_speed_multiplier = self.speed_multiplier * effect_speed_multiplier
         duration = base_duration / total_speed_multiplier
+        # 特效LOD降低时缩短持续时间；射击类特效需要完整飞完，不缩短
+        if config.get('type') != 'projectile':
+            duration *= self.lod.duration_scale
 
-        # 创建特效对象
-        effect = VisualEffect(
+        # 从对象池获取特效对象
+        effect = self.effect_pool.acquire(
+            VisualEffect,
             effect_type=effect_type,
             x=x,
             y=y,
             target_x=target_x,
             target_y=target_y,
             damage=damage,
-            start_time=time.time(),
+            start_time=sim_time(),
             duration=duration,
             color=color,
             size=self._get_visual_effect_size(effect_type),
             range=kwargs.get('range', None)  # 传递范围参数
         )
-
-        self.visual_effects.append(effect)
         return effect
 
     def set_speed_multiplier(self, multiplier: float):
@@ -679,17 +726,18 @@ class EffectManager:
 
     def update_visual_effects(self, delta_time: float, targets: List = None):
         """更新可视化特效"""
-        current_time = time.time()
+        current_time = sim_time()
 
-        # 移除过期的特效
-        self.visual_effects = [
-            effect for effect in self.visual_effects
-            if current_time - effect.start_time < effect.duration
-        ]
+        # 移除过期的特效（倒序遍历，交换删除并回到对象池）
+        visual_effects = self.visual_effects
+        for index in range(len(visual_effects) - 1, -1, -1):
+            effect = visual_effects[index]
+            if current_time - effect.start_time >= effect.duration:
+                self.effect_pool.release(effect)
 
     def render_visual_effects(self, screen: pygame.Surface, ui_scale: float = 1.0, camera_x: float = 0, camera_y: float = 0):
         """渲染可视化特效"""
-        current_time = time.time()
+        current_time = sim_time()
 
         for effect in self.visual_effects:
             # 计算特效的生命周期进度 (0.0 到 1.0)
@@ -1568,8 +1616,7 @@ class EffectManager:
             camera_y: 相机Y坐标
             ui_scale: UI缩放倍数
         """
-        import time
-        current_time = time.time()
+        current_time = sim_time()
 
         # 使用世界坐标，让粒子系统自己处理坐标转换
         x, y = target_x, target_y
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 """
 特效对象池管理模块
+所有特效类型（粒子、投射物、区域特效、可视化特效、刀光拖痕、击退粒子等）
+都通过类型化的空闲链表获取和回收，避免大规模战斗中频繁分配对象引发GC停顿。
 """
 
 from typing import Dict, List, Any, TypeVar, Type
@@ -20,53 +22,118 @@ class Poolable(ABC):
 
 
 class EffectPool:
-    """特效对象池管理器"""
+    """
+    特效对象池管理器
+
+    每种特效类型一条空闲链表和一个活跃数组：
+    - acquire 从空闲链表弹出对象并就地重新初始化，不分配新对象
+    - release 把数组末尾的对象换到被释放对象的槽位（交换删除），O(1)
+    - 活跃数组的列表对象在整个生命周期内不变，特效系统可以直接持有并遍历它
+    """
+
+    # 对象在活跃数组中的槽位属性名，不在活跃数组中时为 -1
+    SLOT_ATTR = '_pool_slot'
 
     def __init__(self, pool_size: int = 50):
         self.pool_size = pool_size
-        self.pools: Dict[type, List[Poolable]] = {}
-        self.active_objects: Dict[type, List[Poolable]] = {}
-
-    def get_object(self, object_type: Type[T], *args, **kwargs) -> T:
-        """从对象池获取对象"""
-        if object_type not in self.pools:
+        self.pool_sizes: Dict[type, int] = {}
+        self.pools: Dict[type, List[Any]] = {}
+        self.active_objects: Dict[type, List[Any]] = {}
+        self.created_counts: Dict[type, int] = {}
+        self.reused_counts: Dict[type, int] = {}
+
+    def register(self, object_type: Type[T], pool_size: int = None) -> List[T]:
+        """
+        注册特效类型，返回该类型的活跃数组
+
+        Args:
+            object_type: 特效类型
+            pool_size: 空闲链表上限，None 时使用默认上限
+        """
+        if object_type not in self.active_objects:
             self.pools[object_type] = []
             self.active_objects[object_type] = []
-
+            self.created_counts[object_type] = 0
+            self.reused_counts[object_type] = 0
+        if pool_size is not None:
+            self.pool_sizes[object_type] = pool_size
+        return self.active_objects[object_type]
+
+    def active(self, object_type: Type[T]) -> List[T]:
+        """获取特效类型的活跃数组（只读遍历；增删必须通过 acquire/release）"""
+        return self.register(object_type)
+
+    def acquire(self, object_type: Type[T], *args, **kwargs) -> T:
+        """
+        获取对象，参数与 object_type 的构造函数一致
+
+        复用的对象先清空实例属性再以相同参数执行 __init__，
+        与新建对象等价，上一次使用时临时挂上的属性不会残留。
+        """
+        active = self.register(object_type)
         pool = self.pools[object_type]
-        active = self.active_objects[object_type]
 
-        # 尝试从池中获取对象
         if pool:
             obj = pool.pop()
-            obj.reset()
-            active.append(obj)
-            return obj
+            state = getattr(obj, '__dict__', None)
+            if state is not None:
+                state.clear()
+            obj.__init__(*args, **kwargs)
+            self.reused_counts[object_type] += 1
+        else:
+            obj = object_type(*args, **kwargs)
+            self.created_counts[object_type] += 1
 
-        # 创建新对象
-        obj = object_type(*args, **kwargs)
+        setattr(obj, self.SLOT_ATTR, len(active))
         active.append(obj)
         return obj
 
-    def return_object(self, obj: Poolable):
-        """将对象返回到池中"""
-        obj_type = type(obj)
+    def release(self, obj: Any) -> bool:
+        """
+        释放对象（交换删除），重复释放或不属于本池的对象会被忽略
+
+        Returns:
+            bool: 是否释放成功
+        """
+        slot = getattr(obj, self.SLOT_ATTR, -1)
+        active = self.active_objects.get(type(obj))
+        if active is None or slot < 0 or slot >= len(active) or active[slot] is not obj:
+            return False
+
+        last = active.pop()
+        if last is not obj:
+            active[slot] = last
+            setattr(last, self.SLOT_ATTR, slot)
+        setattr(obj, self.SLOT_ATTR, -1)
+
+        pool = self.pools[type(obj)]
+        if len(pool) < self.pool_sizes.get(type(obj), self.pool_size):
+            pool.append(obj)
+        return True
 
-        if obj_type not in self.pools:
+    def release_all(self, object_type: Type[T]):
+        """释放某类型的全部活跃对象（活跃数组就地清空）"""
+        active = self.active_objects.get(object_type)
+        if not active:
             return
+        pool = self.pools[object_type]
+        limit = self.pool_sizes.get(object_type, self.pool_size)
+        for obj in active:
+            setattr(obj, self.SLOT_ATTR, -1)
+            if len(pool) < limit:
+                pool.append(obj)
+        active.clear()
+
+    # 兼容旧接口
+    def get_object(self, object_type: Type[T], *args, **kwargs) -> T:
+        """从对象池获取对象（等同于 acquire）"""
+        return self.acquire(object_type, *args, **kwargs)
 
-        active = self.active_objects[obj_type]
-        pool = self.pools[obj_type]
-
-        # 从活跃列表中移除
-        if obj in active:
-            active.remove(obj)
-
-        # 检查池大小限制
-        if len(pool) < self.pool_size:
-            pool.append(obj)
+    def return_object(self, obj: Poolable):
+        """将对象返回到池中（等同于 release）"""
+        self.release(obj)
 
-    def get_pool_status(self) -> Dict[str, int]:
+    def get_pool_status(self) -> Dict[str, Dict[str, int]]:
         """获取对象池状态"""
         status = {}
         for obj_type, pool in self.pools.items():
@@ -75,29 +142,30 @@ class EffectPool:
             status[f"{obj_type.__name__}"] = {
                 "active": active_count,
                 "pooled": pool_count,
-                "total": active_count + pool_count
+                "total": active_count + pool_count,
+                "created": self.created_counts.get(obj_type, 0),
+                "reused": self.reused_counts.get(obj_type, 0)
             }
         return status
 
     def clear_pool(self, object_type: Type[T] = None):
-        """清空对象池"""
-        if object_type is None:
-            # 清空所有池
-            self.pools.clear()
-            self.active_objects.clear()
-        else:
-            # 清空特定类型的池
-            if object_type in self.pools:
-                del self.pools[object_type]
-            if object_type in self.active_objects:
-                del self.active_objects[object_type]
+        """清空对象池（活跃数组就地清空，已注册的类型保留）"""
+        types = list(self.pools) if object_type is None else [object_type]
+        for obj_type in types:
+            if obj_type not in self.pools:
+                continue
+            for obj in self.active_objects[obj_type]:
+                setattr(obj, self.SLOT_ATTR, -1)
+            self.active_objects[obj_type].clear()
+            self.pools[obj_type].clear()
 
     def cleanup_inactive_objects(self):
-        """清理非活跃对象"""
-        for obj_type, active_list in self.active_objects.items():
-            # 移除已完成的对象
-            active_list[:] = [
-                obj for obj in active_list if not getattr(obj, 'finished', False)]
+        """释放所有已完成（finished 为真）的活跃对象"""
+        for active_list in self.active_objects.values():
+            # 倒序遍历：交换删除只会把已检查过的对象换到当前位置
+            for index in range(len(active_list) - 1, -1, -1):
+                if index < len(active_list) and getattr(active_list[index], 'finished', False):
+                    self.release(active_list[index])
 
 
 class PooledParticle:
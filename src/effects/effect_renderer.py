@@ -131,31 +131,57 @@ class ScreenShake:
         self.offset_x = random.uniform(-current_intensity, current_intensity)
         self.offset_y = random.uniform(-current_intensity, current_intensity)
 
-    def apply_to_surface(self, surface: pygame.Surface) -> pygame.Surface:
-        """将震动效果应用到表面"""
-        if not self.active or surface is None:
-            return surface
+    def get_offset(self) -> Tuple[int, int]:
+        """
+        获取本帧的相机偏移
 
-        try:
-            # 创建带偏移的新表面
-            offset_surface = pygame.Surface(
-                surface.get_size(), pygame.SRCALPHA)
-            if offset_surface is None:
-                game_logger.info("❌ 创建震动Surface失败")
-                return surface
-
-            offset_surface.blit(surface, (self.offset_x, self.offset_y))
-            return offset_surface
-        except Exception as e:
-            game_logger.info(f"❌ 应用屏幕震动失败: {e}")
-            return surface
+        震动以渲染时的相机偏移实现，调用方把偏移加到相机位置上渲染世界层，
+        不再复制整帧画面。
+        """
+        if not self.active:
+            return 0, 0
+        return int(round(self.offset_x)), int(round(self.offset_y))
 
 
-class DamageNumberRenderer:
-    """伤害数字渲染器"""
+class DamageNumber:
+    """伤害数字（环形缓冲区中的槽位，循环复用）"""
+    __slots__ = ('x', 'y', 'text', 'damage_type', 'life', 'max_life', 'velocity_y', 'alpha')
 
     def __init__(self):
-        self.damage_numbers = []
+        self.x = 0.0
+        self.y = 0.0
+        self.text = ""
+        self.damage_type = "normal"
+        self.life = 0.0
+        self.max_life = 0.0
+        self.velocity_y = 0.0
+        self.alpha = 0
+
+
+class DamageNumberRenderer:
+    """
+    伤害数字渲染器
+
+    数字字形按 (字号, 伤害类型) 预先光栅化成图集，渲染时逐个字符 blit；
+    伤害数字保存在固定容量的环形缓冲区中，满了以后覆盖最旧的数字。
+    """
+
+    DAMAGE_COLORS = {
+        "critical": (255, 215, 0),  # 金色
+        "heal": (0, 255, 0),        # 绿色
+        "magic": (138, 43, 226),    # 紫色
+    }
+    DEFAULT_COLOR = (255, 255, 255)  # 白色
+    ATLAS_CHARS = "0123456789-+"
+    LIFETIME = 2000  # 2秒
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self._slots = [DamageNumber() for _ in range(capacity)]
+        self._head = 0   # 最旧数字的下标
+        self._count = 0
+        # (字号, 伤害类型) -> {字符: Surface}
+        self._atlases = {}
         self.font = None
         self.try_load_font()
 
@@ -170,78 +196,103 @@ class DamageNumberRenderer:
                 # 如果字体系统未初始化，设置为None
                 self.font = None
 
-    def add_damage_number(self, x: float, y: float, damage: int,
+    @property
+    def damage_numbers(self) -> List[DamageNumber]:
+        """当前存活的伤害数字（从旧到新）"""
+        return [self._slots[(self._head + i) % self.capacity] for i in range(self._count)]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add_damage_number(self, x: float, y: float, damage: float,
                           damage_type: str = "normal"):
-        """添加伤害数字"""
-        damage_info = {
-            "x": x,
-            "y": y,
-            "damage": damage,
-            "type": damage_type,
-            "life": 2000,  # 2秒
-            "max_life": 2000,
-            "velocity_y": -50,  # 向上飘浮
-            "alpha": 255
-        }
-        self.damage_numbers.append(damage_info)
+        """
+        添加伤害数字
+
+        Args:
+            x, y: 世界坐标（像素）
+            damage: 伤害值，取整后显示（图集只有数字和正负号）
+            damage_type: 伤害类型，决定颜色
+        """
+        if self._count == self.capacity:
+            # 缓冲区已满，覆盖最旧的数字
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+
+        number = self._slots[(self._head + self._count) % self.capacity]
+        number.x = x
+        number.y = y
+        number.text = str(int(round(damage)))
+        number.damage_type = damage_type
+        number.life = self.LIFETIME
+        number.max_life = self.LIFETIME
+        number.velocity_y = -50  # 向上飘浮
+        number.alpha = 255
+        self._count += 1
 
     def update(self, delta_time: float):
         """更新伤害数字"""
-        for damage_info in self.damage_numbers[:]:
-            damage_info["life"] -= delta_time
-            damage_info["y"] += damage_info["velocity_y"] * delta_time * 0.001
-            damage_info["velocity_y"] += 20 * delta_time * 0.001  # 重力
+        capacity = self.capacity
+        for i in range(self._count):
+            number = self._slots[(self._head + i) % capacity]
+            number.life -= delta_time
+            number.y += number.velocity_y * delta_time * 0.001
+            number.velocity_y += 20 * delta_time * 0.001  # 重力
 
             # 计算透明度
-            progress = 1 - (damage_info["life"] / damage_info["max_life"])
-            damage_info["alpha"] = int(255 * (1 - progress))
-
-            if damage_info["life"] <= 0:
-                self.damage_numbers.remove(damage_info)
-
-    def render(self, screen: pygame.Surface, ui_scale: float = 1.0):
+            number.alpha = max(0, int(255 * number.life / number.max_life))
+
+        # 所有数字寿命相同，过期的总是最旧的那些
+        while self._count and self._slots[self._head].life <= 0:
+            self._head = (self._head + 1) % capacity
+            self._count -= 1
+
+    def _get_atlas(self, font_size: int, damage_type: str) -> dict:
+        """获取 (字号, 伤害类型) 对应的数字字形图集，首次使用时光栅化"""
+        key = (font_size, damage_type)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            try:
+                font = pygame.font.Font(None, font_size)
+            except:
+                font = self.font
+            color = self.DAMAGE_COLORS.get(damage_type, self.DEFAULT_COLOR)
+            atlas = {char: font.render(char, True, color) for char in self.ATLAS_CHARS}
+            self._atlases[key] = atlas
+        return atlas
+
+    def render(self, screen: pygame.Surface, ui_scale: float = 1.0,
+               camera_x: float = 0, camera_y: float = 0):
         """渲染伤害数字"""
-        if not self.font or not pygame.font.get_init():
+        if not self.font or not pygame.font.get_init() or not self._count:
             return
 
-        for damage_info in self.damage_numbers:
-            if damage_info["alpha"] <= 0:
+        scaled_font_size = max(12, int(24 * ui_scale))
+        capacity = self.capacity
+        for i in range(self._count):
+            number = self._slots[(self._head + i) % capacity]
+            if number.alpha <= 0:
                 continue
 
-            # 根据伤害类型选择颜色
-            if damage_info["type"] == "critical":
-                color = (255, 215, 0)  # 金色
-            elif damage_info["type"] == "heal":
-                color = (0, 255, 0)    # 绿色
-            elif damage_info["type"] == "magic":
-                color = (138, 43, 226)  # 紫色
-            else:
-                color = (255, 255, 255)  # 白色
-
-            # 应用UI缩放
-            scaled_x = int(damage_info["x"] * ui_scale)
-            scaled_y = int(damage_info["y"] * ui_scale)
-            scaled_font_size = max(12, int(24 * ui_scale))
-
-            # 创建缩放后的字体
-            try:
-                scaled_font = pygame.font.Font(None, scaled_font_size)
-            except:
-                scaled_font = self.font
-
-            # 渲染文字
-            text = scaled_font.render(str(damage_info["damage"]), True, color)
+            atlas = self._get_atlas(scaled_font_size, number.damage_type)
 
-            # 应用透明度
-            if damage_info["alpha"] < 255:
-                text.set_alpha(damage_info["alpha"])
+            # 应用相机偏移和UI缩放
+            draw_x = int((number.x - camera_x) * ui_scale)
+            draw_y = int((number.y - camera_y) * ui_scale)
 
-            # 绘制到屏幕
-            screen.blit(text, (scaled_x, scaled_y))
+            # 逐字符从图集贴图，透明度设在共享字形上（每次 blit 前重新设置）
+            for char in number.text:
+                glyph = atlas.get(char)
+                if glyph is None:
+                    continue
+                glyph.set_alpha(number.alpha)
+                screen.blit(glyph, (draw_x, draw_y))
+                draw_x += glyph.get_width()
 
     def clear(self):
         """清空所有伤害数字"""
-        self.damage_numbers.clear()
+        self._head = 0
+        self._count = 0
 
 
 class EffectRendererManager:
@@ -252,7 +303,8 @@ class EffectRendererManager:
         self.screen_shake = ScreenShake()
         self.damage_renderer = DamageNumberRenderer()
 
-    def render_all(self, screen: pygame.Surface, ui_scale: float = 1.0):
+    def render_all(self, screen: pygame.Surface, ui_scale: float = 1.0,
+                   camera_x: float = 0, camera_y: float = 0):
         """渲染所有特效"""
         if screen is None:
             game_logger.info(
@@ -263,22 +315,15 @@ class EffectRendererManager:
         self.renderer.render_all(screen, ui_scale)
 
         # 渲染伤害数字
-        self.damage_renderer.render(screen, ui_scale)
-
-        # 应用屏幕震动
-        if self.screen_shake.active:
-            try:
-                screen = self.screen_shake.apply_to_surface(screen)
-                if screen is None:
-                    game_logger.info(
-                        "❌ ScreenShake.apply_to_surface() 返回 None")
-                    return screen
-            except Exception as e:
-                game_logger.info(f"❌ 屏幕震动应用失败: {e}")
-                return screen
+        self.damage_renderer.render(screen, ui_scale, camera_x, camera_y)
 
+        # 屏幕震动由调用方通过 get_shake_offset() 作为相机偏移应用
         return screen
 
+    def get_shake_offset(self) -> Tuple[int, int]:
+        """获取屏幕震动的相机偏移"""
+        return self.screen_shake.get_offset()
+
     def update(self, delta_time: float):
         """更新所有渲染效果"""
         self.screen_shake.update(delta_time)
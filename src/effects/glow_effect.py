@@ -3,13 +3,24 @@
 """
 发光效果API模块
 提供统一的发光效果渲染功能
+
+圆形/粒子/弧形发光的精灵按 (半径, 颜色, 层数, 透明度) 量化后缓存在有界LRU缓存中，
+热门的发光效果每帧只需一次 blit，不再为每一层分配新的 Surface。
 """
 
 import pygame
 import math
-from typing import Tuple, List, Optional, Union
+from collections import OrderedDict
+from typing import Tuple, List, Optional, Union, Any, Dict
 from dataclasses import dataclass
 
+from .effect_lod import get_effect_lod
+
+# 缓存键量化参数
+GLOW_ALPHA_QUANTUM = 4          # 透明度量化步长
+GLOW_RADIUS_EXACT_LIMIT = 32    # 不超过该半径时精确缓存，更大的半径按2像素量化
+GLOW_ARC_ANGLE_STEPS = 360      # 弧形角度量化（每圈步数）
+
 
 @dataclass
 class GlowConfig:
@@ -21,11 +32,130 @@ class GlowConfig:
     layers: int = 2  # 发光层数
 
 
+def _quantize_alpha(alpha: float) -> int:
+    """透明度量化并限制在 0-255"""
+    alpha = min(255, max(0, int(alpha)))
+    return min(255, (alpha + GLOW_ALPHA_QUANTUM // 2) // GLOW_ALPHA_QUANTUM * GLOW_ALPHA_QUANTUM)
+
+
+def _quantize_radius(radius: int) -> int:
+    """半径量化 - 小半径精确，大半径按2像素取整"""
+    if radius <= GLOW_RADIUS_EXACT_LIMIT:
+        return radius
+    return radius - radius % 2
+
+
+class GlowSpriteCache:
+    """发光精灵LRU缓存"""
+
+    def __init__(self, max_size: int = 512):
+        """
+        初始化缓存
+
+        Args:
+            max_size: 最多缓存的精灵数量，超过时淘汰最久未使用的精灵
+        """
+        self.max_size = max_size
+        self._sprites: "OrderedDict[Tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple) -> Optional[pygame.Surface]:
+        """查询精灵，命中时移到最近使用的位置"""
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            return None
+        self._sprites.move_to_end(key)
+        self.hits += 1
+        return sprite
+
+    def put(self, key: Tuple, sprite: pygame.Surface):
+        """存入精灵"""
+        self._sprites[key] = sprite
+        self._sprites.move_to_end(key)
+        while len(self._sprites) > self.max_size:
+            self._sprites.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """清空缓存"""
+        self._sprites.clear()
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中统计"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._sprites),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
 class GlowEffectRenderer:
     """发光效果渲染器"""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 512):
         self.default_config = GlowConfig()
+        self.sprite_cache = GlowSpriteCache(cache_size)
+        # 线条发光复用的整屏草稿表面（每层只清空线条包围盒）
+        self._scratch: Optional[pygame.Surface] = None
+
+    def _get_circle_sprite(self, color: Tuple[int, int, int],
+                           layers: Tuple[Tuple[int, int], ...]) -> Optional[pygame.Surface]:
+        """
+        获取同心多层发光圆的合成精灵
+
+        各层颜色相同且同心，因此逐层 blit 的结果等价于一张按半径分段的透明度图：
+        被多层覆盖的区域透明度为 1 - Π(1 - a_i)。
+
+        Args:
+            color: 发光颜色
+            layers: 每层的 (量化半径, 量化透明度)
+        """
+        key = ('circle', color, layers)
+        sprite = self.sprite_cache.get(key)
+        if sprite is not None:
+            return sprite
+
+        max_radius = max(radius for radius, _ in layers)
+        if max_radius <= 0:
+            return None
+        sprite = pygame.Surface((max_radius * 2, max_radius * 2), pygame.SRCALPHA)
+
+        # 从外到内绘制，每个环带的透明度由覆盖它的所有层合成
+        for radius, _ in sorted(layers, reverse=True):
+            if radius <= 0:
+                continue
+            transparency = 1.0
+            for other_radius, other_alpha in layers:
+                if other_radius >= radius:
+                    transparency *= 1.0 - other_alpha / 255.0
+            alpha = int(round(255 * (1.0 - transparency)))
+            pygame.draw.circle(sprite, (*color, alpha),
+                               (max_radius, max_radius), radius)
+
+        self.sprite_cache.put(key, sprite)
+        return sprite
+
+    def _blit_circle_glow(self, screen: pygame.Surface, screen_x: int, screen_y: int,
+                          color: Tuple[int, int, int],
+                          layers: Tuple[Tuple[int, int], ...]) -> None:
+        """量化各层参数后以一次 blit 绘制圆形发光"""
+        layers = tuple((_quantize_radius(radius), _quantize_alpha(alpha))
+                       for radius, alpha in layers)
+        sprite = self._get_circle_sprite(color, layers)
+        if sprite is None:
+            return
+        half = sprite.get_width() // 2
+        screen.blit(sprite, (screen_x - half, screen_y - half))
 
     def create_glow_color(self, base_color: Tuple[int, int, int],
                           config: Optional[GlowConfig] = None) -> Tuple[int, int, int]:
@@ -83,25 +213,16 @@ class GlowEffectRenderer:
 
         glow_color = self.create_glow_color(base_color, config)
 
-        # 渲染多层发光效果
-        for layer in range(config.layers):
+        # 计算每层的半径和透明度（层数随特效LOD缩减），合成后的精灵从缓存中取
+        layers = []
+        for layer in range(get_effect_lod().scale_glow_layers(config.layers)):
             layer_intensity = config.intensity * (1.0 - layer * 0.3)
             layer_radius = int(
                 base_radius * config.size_multiplier * (1.0 + layer * 0.3) * ui_scale)
             layer_alpha = int(config.alpha * layer_intensity)
+            layers.append((layer_radius, layer_alpha))
 
-            # 创建半透明表面
-            glow_surface = pygame.Surface(
-                (layer_radius * 2, layer_radius * 2), pygame.SRCALPHA)
-            glow_surface.set_alpha(layer_alpha)
-
-            # 绘制发光圆形
-            pygame.draw.circle(glow_surface, glow_color,
-                               (layer_radius, layer_radius), layer_radius)
-
-            # 渲染到主表面
-            screen.blit(glow_surface, (screen_x -
-                        layer_radius, screen_y - layer_radius))
+        self._blit_circle_glow(screen, screen_x, screen_y, glow_color, tuple(layers))
 
     def render_line_glow(self, screen: pygame.Surface,
                          start: Tuple[int, int],
@@ -139,23 +260,35 @@ class GlowEffectRenderer:
 
         glow_color = self.create_glow_color(base_color, config)
 
+        # 线条端点任意，不适合缓存：复用整屏草稿表面，每层只清空并贴回线条包围盒
+        scratch = self._get_scratch_surface(screen.get_size())
+        screen_rect = scratch.get_rect()
+
         # 渲染多层发光线条
-        for layer in range(config.layers):
+        for layer in range(get_effect_lod().scale_glow_layers(config.layers)):
             layer_intensity = config.intensity * (1.0 - layer * 0.2)
             layer_width = max(
                 1, int(base_width * config.size_multiplier * (1.0 + layer * 0.5) * ui_scale))
-            layer_alpha = int(config.alpha * layer_intensity)
+            layer_alpha = min(255, max(0, int(config.alpha * layer_intensity)))
+
+            bounds = pygame.Rect(min(screen_start[0], screen_end[0]),
+                                 min(screen_start[1], screen_end[1]),
+                                 abs(screen_end[0] - screen_start[0]) + 1,
+                                 abs(screen_end[1] - screen_start[1]) + 1)
+            bounds.inflate_ip(layer_width * 2, layer_width * 2)
+            bounds = bounds.clip(screen_rect)
+            if bounds.width <= 0 or bounds.height <= 0:
+                continue
 
-            # 创建半透明表面
-            glow_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            glow_surface.set_alpha(layer_alpha)
+            scratch.fill((0, 0, 0, 0), bounds)
+            scratch.set_alpha(layer_alpha)
 
             # 绘制发光线条
-            pygame.draw.line(glow_surface, glow_color,
+            pygame.draw.line(scratch, glow_color,
                              screen_start, screen_end, layer_width)
 
             # 渲染到主表面
-            screen.blit(glow_surface, (0, 0))
+            screen.blit(scratch, bounds.topleft, bounds)
 
     def render_particle_glow(self, screen: pygame.Surface,
                              position: Tuple[int, int],
@@ -193,17 +326,8 @@ class GlowEffectRenderer:
         glow_size = max(1, int(base_size * config.size_multiplier * ui_scale))
         glow_alpha = int(config.alpha * config.intensity)
 
-        # 创建半透明表面
-        glow_surface = pygame.Surface(
-            (glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-        glow_surface.set_alpha(glow_alpha)
-
-        # 绘制发光粒子
-        pygame.draw.circle(glow_surface, glow_color,
-                           (glow_size, glow_size), glow_size)
-
-        # 渲染到主表面
-        screen.blit(glow_surface, (screen_x - glow_size, screen_y - glow_size))
+        self._blit_circle_glow(screen, screen_x, screen_y, glow_color,
+                               ((glow_size, glow_alpha),))
 
     def render_arc_glow(self, screen: pygame.Surface,
                         center: Tuple[int, int],
@@ -241,25 +365,46 @@ class GlowEffectRenderer:
                          int((y - camera_y) * ui_scale))
         glow_color = self.create_glow_color(base_color, config)
 
+        # 角度量化后作为缓存键的一部分
+        angle_step = 2 * math.pi / GLOW_ARC_ANGLE_STEPS
+        start_step = int(round(start_angle / angle_step))
+        range_step = int(round((end_angle - start_angle) / angle_step))
+
         # 渲染多层发光弧形
-        for layer in range(config.layers):
+        for layer in range(get_effect_lod().scale_glow_layers(config.layers)):
             layer_intensity = config.intensity * (1.0 - layer * 0.3)
-            layer_radius = int(radius * config.size_multiplier *
-                               (1.0 + layer * 0.2) * ui_scale)
+            layer_radius = _quantize_radius(int(radius * config.size_multiplier *
+                                                (1.0 + layer * 0.2) * ui_scale))
             layer_width = max(
                 1, int(base_width * config.size_multiplier * (1.0 + layer * 0.3) * ui_scale))
-            layer_alpha = int(config.alpha * layer_intensity)
+            layer_alpha = _quantize_alpha(config.alpha * layer_intensity)
+
+            key = ('arc', glow_color, layer_radius, layer_width,
+                   start_step, range_step, layer_alpha)
+            sprite = self.sprite_cache.get(key)
+            if sprite is None:
+                # 精灵以弧心为中心，四周留出线宽的余量
+                half = layer_radius + layer_width
+                sprite = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+                sprite.set_alpha(layer_alpha)
+                self._draw_arc(sprite, glow_color, (half, half), layer_radius,
+                               start_step * angle_step,
+                               (start_step + range_step) * angle_step, layer_width)
+                self.sprite_cache.put(key, sprite)
 
-            # 创建半透明表面
-            glow_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            glow_surface.set_alpha(layer_alpha)
+            # 渲染到主表面
+            half = sprite.get_width() // 2
+            screen.blit(sprite, (screen_center[0] - half, screen_center[1] - half))
 
-            # 绘制发光弧形
-            self._draw_arc(glow_surface, glow_color, screen_center, layer_radius,
-                           start_angle, end_angle, layer_width)
+    def _get_scratch_surface(self, size: Tuple[int, int]) -> pygame.Surface:
+        """获取与屏幕同尺寸的草稿表面（尺寸变化时重建）"""
+        if self._scratch is None or self._scratch.get_size() != size:
+            self._scratch = pygame.Surface(size, pygame.SRCALPHA)
+        return self._scratch
 
-            # 渲染到主表面
-            screen.blit(glow_surface, (0, 0))
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """获取发光精灵缓存统计"""
+        return self.sprite_cache.get_stats()
 
     def _draw_arc(self, surface: pygame.Surface,
                   color: Tuple[int, int, int],
@@ -437,6 +582,12 @@ def get_glow_manager() -> GlowEffectManager:
     return _glow_manager
 
 
+def reset_glow_manager():
+    """重置发光效果管理器及其精灵缓存（用于测试或重新开始游戏）"""
+    global _glow_manager
+    _glow_manager = None
+
+
 def render_glow_effect(screen: pygame.Surface, effect_type: str,
                        position: Tuple[int, int], base_color: Tuple[int, int, int],
                        ui_scale: float = 1.0,
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+粒子数组后端 - 结构数组(SoA)粒子存储
+粒子的位置、速度、生命、颜色、大小等属性存放在连续的 NumPy 数组中，
+每帧的积分、重力、淡出和魔力粒子的环绕运动都以整批数组运算完成，
+死亡粒子通过"与末尾交换"的方式压缩，不再逐个 list.remove。
+
+- 容量不足时按倍数扩容，已分配的数组在粒子死亡后继续复用
+- NumPy 是可选依赖：不可用时 ParticleSystem 回退到逐对象的列表实现
+"""
+
+from typing import Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # NumPy 是可选依赖
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+class _ParticleArrays:
+    """粒子数组基类 - 管理字段分配、扩容和交换压缩"""
+
+    # 字段名 -> dtype，由子类定义
+    FIELDS = {}
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.count = 0
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _reserve_slot(self) -> int:
+        """分配一个槽位，容量不足时扩容一倍"""
+        if self.count == self.capacity:
+            new_capacity = self.capacity * 2
+            for name in self.FIELDS:
+                old = getattr(self, name)
+                grown = np.zeros(new_capacity, dtype=old.dtype)
+                grown[:self.capacity] = old
+                setattr(self, name, grown)
+            self.capacity = new_capacity
+        index = self.count
+        self.count += 1
+        return index
+
+    def _compact(self, dead) -> int:
+        """
+        交换压缩 - 把末尾的存活粒子搬进前面的空洞
+
+        Args:
+            dead: 长度为 count 的布尔掩码
+
+        Returns:
+            int: 移除的粒子数量
+        """
+        n = self.count
+        removed = int(dead.sum())
+        if removed == 0:
+            return 0
+        remaining = n - removed
+        if removed == n:
+            self.count = 0
+            return removed
+
+        # 前 remaining 个槽位中的空洞，由之后的存活粒子填补
+        holes = np.flatnonzero(dead[:remaining])
+        if holes.size:
+            fillers = remaining + np.flatnonzero(~dead[remaining:])
+            for name in self.FIELDS:
+                field = getattr(self, name)
+                field[holes] = field[fillers]
+        self.count = remaining
+        return removed
+
+    def clear(self):
+        """清空所有粒子（保留已分配的数组）"""
+        self.count = 0
+
+
+class RegularParticleArrays(_ParticleArrays):
+    """普通粒子数组 - 速度单位为像素/毫秒，重力单位为像素/毫秒²"""
+
+    FIELDS = {
+        'x': 'float64', 'y': 'float64',
+        'vx': 'float64', 'vy': 'float64',
+        'gravity': 'float64',
+        'life': 'float64', 'max_life': 'float64',
+        'size': 'float32',
+        'r': 'uint8', 'g': 'uint8', 'b': 'uint8',
+        'fade': 'bool',
+        'created_time': 'float64',
+    }
+
+    def add(self, x: float, y: float, vx: float, vy: float,
+            color: Tuple[int, int, int], size: float, life: float,
+            gravity: float, fade: bool, created_time: float) -> int:
+        """添加粒子，返回槽位下标（压缩后会变化，只在本帧内有效）"""
+        i = self._reserve_slot()
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.gravity[i] = gravity
+        self.life[i] = life
+        self.max_life[i] = life
+        self.size[i] = size
+        self.r[i], self.g[i], self.b[i] = color[0], color[1], color[2]
+        self.fade[i] = fade
+        self.created_time[i] = created_time
+        return i
+
+    def update(self, delta_ms: float) -> int:
+        """
+        批量积分并移除死亡粒子（与 RegularParticle.update 的积分顺序一致）
+
+        Returns:
+            int: 本帧死亡的粒子数量
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        vy = self.vy[:n]
+        self.x[:n] += self.vx[:n] * delta_ms
+        self.y[:n] += vy * delta_ms
+        vy += self.gravity[:n] * delta_ms
+        life = self.life[:n]
+        life -= delta_ms
+        return self._compact(life <= 0)
+
+    def alphas(self):
+        """当前存活粒子的透明度（淡出粒子按剩余生命计算）"""
+        n = self.count
+        ratio = np.clip(self.life[:n] / self.max_life[:n], 0.0, 1.0)
+        return np.where(self.fade[:n], (255 * ratio).astype(np.int32), 255)
+
+
+class ManaParticleArrays(_ParticleArrays):
+    """魔力粒子数组 - 围绕各自的中心旋转，角速度和半径变化速度单位为每秒"""
+
+    FIELDS = {
+        'x': 'float64', 'y': 'float64',
+        'center_x': 'float64', 'center_y': 'float64',
+        'angle': 'float64', 'radius': 'float64',
+        'angular_speed': 'float64', 'radius_speed': 'float64',
+        'fade_factor': 'float64',
+        'life': 'float64', 'max_life': 'float64',
+        'alpha': 'int32',
+        'r': 'uint8', 'g': 'uint8', 'b': 'uint8',
+        'created_time': 'float64',
+    }
+
+    def add(self, center_x: float, center_y: float, angle: float, radius: float,
+            angular_speed: float, radius_speed: float, fade_factor: float,
+            color: Tuple[int, int, int], life: float, created_time: float) -> int:
+        """添加魔力粒子，返回槽位下标"""
+        i = self._reserve_slot()
+        self.center_x[i] = center_x
+        self.center_y[i] = center_y
+        self.angle[i] = angle
+        self.radius[i] = radius
+        self.angular_speed[i] = angular_speed
+        self.radius_speed[i] = radius_speed
+        self.fade_factor[i] = fade_factor
+        self.x[i] = center_x + np.cos(angle) * radius
+        self.y[i] = center_y + np.sin(angle) * radius
+        self.life[i] = life
+        self.max_life[i] = life
+        self.alpha[i] = int(255 * fade_factor)
+        self.r[i], self.g[i], self.b[i] = color[0], color[1], color[2]
+        self.created_time[i] = created_time
+        return i
+
+    def update(self, delta_ms: float) -> int:
+        """
+        批量更新环绕运动、生命和透明度
+
+        Returns:
+            int: 本帧死亡的粒子数量
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        delta_seconds = delta_ms * 0.001
+        angle = self.angle[:n]
+        radius = self.radius[:n]
+        angle += self.angular_speed[:n] * delta_seconds
+        radius += self.radius_speed[:n] * delta_seconds
+        self.x[:n] = self.center_x[:n] + np.cos(angle) * radius
+        self.y[:n] = self.center_y[:n] + np.sin(angle) * radius
+
+        life = self.life[:n]
+        life -= delta_ms
+        self.alpha[:n] = (255 * np.maximum(life, 0) / self.max_life[:n]
+                          * self.fade_factor[:n]).astype(np.int32)
+        return self._compact(life <= 0)
@@ -2,17 +2,27 @@
 # -*- coding: utf-8 -*-
 """
 粒子系统模块
+
+安装了 NumPy 时粒子存放在 particle_arrays 的结构数组中并批量更新；
+否则使用逐对象的 RegularParticle / ManaParticle 列表实现。
+
+生成数量随特效LOD缩放，但每次生成总是按未缩放的数量抽取随机参数、只跳过多余粒子的创建：
+LOD 跟随实测帧耗时变化，全局随机序列不能因此随机器快慢而不同。
 """
 
 import math
 import random
 import pygame
-import time
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 from .glow_effect import get_glow_manager
 from .projectile_system import Projectile
+from .particle_arrays import NUMPY_AVAILABLE, RegularParticleArrays, ManaParticleArrays
+from .sprite_batch import get_sprite_batch
+from .effect_lod import get_effect_lod
+from .effect_pool import EffectPool
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
 
 
 class TimeManager:
@@ -105,7 +115,7 @@ class ManaParticle(Projectile):
         self.life -= delta_ms
         if self.life <= 0:
             # 记录魔力粒子真实消失时间
-            current_time = time.time()
+            current_time = sim_time()
             actual_lifetime = current_time - self.created_time
             expected_lifetime = self.max_life / 1000.0  # 转换为秒
             game_logger.info(
@@ -176,7 +186,7 @@ class RegularParticle:
 
         if self.life <= 0:
             # 记录粒子真实消失时间
-            current_time = time.time()
+            current_time = sim_time()
             actual_lifetime = current_time - self.created_time
             expected_lifetime = self.max_life / 1000.0  # 转换为秒
             game_logger.info(
@@ -210,14 +220,35 @@ class RegularParticle:
         self.life = self.max_life
 
 
+# 是否使用向量化的粒子数组后端
+VECTORIZED_PARTICLES = NUMPY_AVAILABLE
+
+
 class ParticleSystem:
     """统一粒子系统管理器"""
 
-    def __init__(self):
-        self.particles: List[RegularParticle] = []
-        self.particle_pool: List[RegularParticle] = []
-        self.mana_particles: List[ManaParticle] = []
-        self.mana_particle_pool: List[ManaParticle] = []
+    def __init__(self, vectorized: Optional[bool] = None, effect_pool: Optional[EffectPool] = None):
+        """
+        初始化粒子系统
+
+        Args:
+            vectorized: 是否使用NumPy数组后端，None 时在 NumPy 可用时启用
+            effect_pool: 回退模式下粒子对象使用的对象池，None 时创建独立的对象池
+        """
+        if vectorized is None:
+            vectorized = VECTORIZED_PARTICLES
+        self.vectorized = vectorized and NUMPY_AVAILABLE
+
+        # 数组后端（向量化模式）
+        self.particle_arrays = RegularParticleArrays() if self.vectorized else None
+        self.mana_arrays = ManaParticleArrays() if self.vectorized else None
+
+        # 对象列表（回退模式）- 即对象池中对应类型的活跃数组
+        self.effect_pool = effect_pool if effect_pool is not None else EffectPool()
+        self.particles: List[RegularParticle] = self.effect_pool.register(
+            RegularParticle, 100)
+        self.mana_particles: List[ManaParticle] = self.effect_pool.register(
+            ManaParticle, 100)
 
         # 获取发光效果管理器
         self.glow_manager = get_glow_manager()
@@ -241,47 +272,37 @@ class ParticleSystem:
 
     def create_particle(self, x: float, y: float, vx: float, vy: float,
                         color: Tuple[int, int, int], size: float,
-                        life: float, gravity: float = 0.0, fade: bool = True) -> RegularParticle:
-        """创建普通粒子"""
-        current_time = time.time()
-
-        # 尝试从对象池获取粒子
-        if self.particle_pool:
-            particle = self.particle_pool.pop()
-            particle.x = x
-            particle.y = y
-            particle.vx = vx
-            particle.vy = vy
-            particle.color = color
-            particle.size = size
-            particle.life = life
-            particle.max_life = life
-            particle.gravity = gravity
-            particle.fade = fade
-            particle.created_time = current_time
-            particle.reset()
-        else:
-            particle = RegularParticle(x, y, vx, vy, color, size,
-                                       life, life, gravity, fade, False, current_time)
+                        life: float, gravity: float = 0.0, fade: bool = True) -> Optional[RegularParticle]:
+        """创建普通粒子（向量化模式下粒子只存在于数组中，返回None）"""
+        current_time = sim_time()
+
+        if self.vectorized:
+            self.particle_arrays.add(x, y, vx, vy, color, size, life,
+                                     gravity, fade, current_time)
+            return None
 
-        self.particles.append(particle)
-        return particle
+        # 从对象池获取粒子
+        return self.effect_pool.acquire(RegularParticle, x, y, vx, vy, color, size,
+                                        life, life, gravity, fade, False, current_time)
 
     def create_particle_burst(self, x: float, y: float, count: int,
                               color: Tuple[int, int, int], size_range: Tuple[float, float],
                               velocity_range: Tuple[float, float], life: float,
                               gravity: float = 0.0):
-        """创建粒子爆发"""
-        for _ in range(count):
+        """创建粒子爆发（数量随特效LOD缩放）"""
+        spawn_count = get_effect_lod().scale_count(count)
+        for index in range(count):
             # 随机方向
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(velocity_range[0], velocity_range[1])
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
 
             # 随机大小
             size = random.uniform(size_range[0], size_range[1])
 
+            if index >= spawn_count:
+                continue
+            vx = math.cos(angle) * speed
+            vy = math.sin(angle) * speed
             self.create_particle(x, y, vx, vy, color, size, life, gravity)
 
     def create_spark_effect(self, x: float, y: float, count: int = 8,
@@ -293,29 +314,35 @@ class ParticleSystem:
 
     def create_fire_particles(self, x: float, y: float, count: int = 10):
         """创建火焰粒子"""
-        for _ in range(count):
+        spawn_count = get_effect_lod().scale_count(count)
+        for index in range(count):
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(100, 300)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed - 50  # 向上飘浮
 
             # 火焰颜色渐变
             colors = [(255, 0, 0), (255, 69, 0), (255, 215, 0)]
             color = random.choice(colors)
+            size = random.uniform(4, 8)
 
-            self.create_particle(x, y, vx, vy, color,
-                                 random.uniform(4, 8), 800, -0.3)
+            if index >= spawn_count:
+                continue
+            vx = math.cos(angle) * speed
+            vy = math.sin(angle) * speed - 50  # 向上飘浮
+            self.create_particle(x, y, vx, vy, color, size, 800, -0.3)
 
     def create_smoke_particles(self, x: float, y: float, count: int = 8):
         """创建烟雾粒子"""
-        for _ in range(count):
+        spawn_count = get_effect_lod().scale_count(count)
+        for index in range(count):
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(50, 150)
+            size = random.uniform(6, 12)
+
+            if index >= spawn_count:
+                continue
             vx = math.cos(angle) * speed
             vy = math.sin(angle) * speed - 30  # 向上飘浮
-
-            self.create_particle(x, y, vx, vy, (105, 105, 105),
-                                 random.uniform(6, 12), 1200, -0.2)
+            self.create_particle(x, y, vx, vy, (105, 105, 105), size, 1200, -0.2)
 
     def create_lightning_particles(self, x: float, y: float, count: int = 12):
         """创建闪电粒子"""
@@ -332,24 +359,29 @@ class ParticleSystem:
             color: 粒子颜色 (R, G, B)
             count: 粒子数量
         """
-        for _ in range(count):
+        spawn_count = get_effect_lod().scale_count(count)
+        for index in range(count):
             # 随机方向，向外溅射
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(60, 120)  # 溅射速度
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
 
             # 可配置颜色的粒子，小尺寸，短生命周期
             size = random.uniform(1, 3)
             life = random.uniform(300, 600)  # 0.3-0.6秒生命周期
 
+            if index >= spawn_count:
+                continue
+            vx = math.cos(angle) * speed
+            vy = math.sin(angle) * speed
+
             # 创建指定颜色的粒子
             self.create_particle(x, y, vx, vy, color, size,
                                  life, gravity=0.0, fade=True)
 
-    def create_mana_particle(self, center_x: float, center_y: float, max_range: float = 100.0) -> ManaParticle:
-        """创建魔力粒子"""
-        current_time = time.time()  # 记录创建时间
+    def create_mana_particle(self, center_x: float, center_y: float,
+                             max_range: float = 100.0) -> Optional[ManaParticle]:
+        """创建魔力粒子（向量化模式下返回None）"""
+        current_time = sim_time()  # 记录创建时间
         # 随机选择内层（紫色）或外层（深蓝色）
         is_inner = random.random() < 0.6  # 60%概率为内层粒子
 
@@ -381,64 +413,42 @@ class ParticleSystem:
         # 随机角度
         angle = random.uniform(0, 2 * math.pi)
 
+        if self.vectorized:
+            self.mana_arrays.add(center_x, center_y, angle, radius, angular_speed,
+                                 random.uniform(-0.5, 0.5), fade_factor, color,
+                                 life, current_time)
+            return None
+
         # 计算初始位置
         x = center_x + math.cos(angle) * radius
         y = center_y + math.sin(angle) * radius
 
-        # 尝试从对象池获取粒子
-        if self.mana_particle_pool:
-            particle = self.mana_particle_pool.pop()
-            # 设置Projectile基类属性
-            particle.x = x
-            particle.y = y
-            particle.target_x = x  # 魔力粒子不需要目标
-            particle.target_y = y
-            particle.speed = 0  # 魔力粒子不移动
-            particle.damage = 0  # 魔力粒子不造成伤害
-            particle.color = color
-            particle.size = 1.0
-            particle.projectile_type = "mana_particle"
-            particle.life = life
-            particle.max_life = life
-            particle.finished = False
-            # 设置魔力粒子特有属性
-            particle.angle = angle
-            particle.radius = radius
-            particle.alpha = int(255 * fade_factor)
-            particle.angular_speed = angular_speed
-            particle.radius_speed = random.uniform(-0.5, 0.5)
-            particle.fade_factor = fade_factor
-            particle.center_x = center_x
-            particle.center_y = center_y
-            particle.created_time = current_time
-        else:
-            particle = ManaParticle(
-                # Projectile基类属性
-                x=x,
-                y=y,
-                target_x=x,  # 魔力粒子不需要目标
-                target_y=y,
-                speed=0,  # 魔力粒子不移动
-                damage=0,  # 魔力粒子不造成伤害
-                color=color,
-                size=1.0,
-                projectile_type="mana_particle",
-                life=life,
-                max_life=life,
-                # 魔力粒子特有属性
-                angle=angle,
-                radius=radius,
-                alpha=int(255 * fade_factor),
-                angular_speed=angular_speed,
-                radius_speed=random.uniform(-0.5, 0.5),
-                fade_factor=fade_factor,
-                center_x=center_x,
-                center_y=center_y,
-                created_time=current_time
-            )
-
-        self.mana_particles.append(particle)
-        return particle
+        # 从对象池获取粒子
+        return self.effect_pool.acquire(
+            ManaParticle,
+            # Projectile基类属性
+            x=x,
+            y=y,
+            target_x=x,  # 魔力粒子不需要目标
+            target_y=y,
+            speed=0,  # 魔力粒子不移动
+            damage=0,  # 魔力粒子不造成伤害
+            color=color,
+            size=1.0,
+            projectile_type="mana_particle",
+            life=life,
+            max_life=life,
+            # 魔力粒子特有属性
+            angle=angle,
+            radius=radius,
+            alpha=int(255 * fade_factor),
+            angular_speed=angular_speed,
+            radius_speed=random.uniform(-0.5, 0.5),
+            fade_factor=fade_factor,
+            center_x=center_x,
+            center_y=center_y,
+            created_time=current_time
+        )
 
     def update(self, delta_time: float, center_x: float = 0, center_y: float = 0):
         """更新所有粒子"""
@@ -449,63 +459,149 @@ class ParticleSystem:
         self._update_counter += 1
 
         if self._update_counter % 10 == 0:  # 每10次更新输出一次
-            total_particles = len(self.particles) + len(self.mana_particles)
+            total_particles = self.get_particle_count() + self.get_mana_particle_count()
             game_logger.info(
                 f"粒子系统更新 - 当前粒子数量: {total_particles}, delta_time: {delta_time:.3f}ms")
 
-        # 更新普通粒子
-        for particle in self.particles[:]:
+        if self.vectorized:
+            # 魔力粒子围绕各自生成时的中心旋转
+            self.particle_arrays.update(delta_time)
+            self.mana_arrays.update(delta_time)
+            return
+
+        # 更新普通粒子（倒序遍历，结束的粒子交换删除并回到对象池）
+        particles = self.particles
+        for index in range(len(particles) - 1, -1, -1):
+            particle = particles[index]
             particle.update(delta_time)
             if particle.finished:
-                self.particles.remove(particle)
-                # 将粒子返回对象池
-                if len(self.particle_pool) < 100:  # 限制对象池大小
-                    self.particle_pool.append(particle)
+                self.effect_pool.release(particle)
 
         # 更新魔力粒子
-        for particle in self.mana_particles[:]:
+        mana_particles = self.mana_particles
+        for index in range(len(mana_particles) - 1, -1, -1):
+            particle = mana_particles[index]
             particle.update(delta_time, center_x, center_y)
             if particle.finished:
-                self.mana_particles.remove(particle)
-                # 将粒子返回对象池
-                if len(self.mana_particle_pool) < 100:  # 限制对象池大小
-                    self.mana_particle_pool.append(particle)
+                self.effect_pool.release(particle)
 
     def render(self, screen: pygame.Surface, ui_scale: float = 1.0, camera_x: float = 0, camera_y: float = 0):
-        """渲染所有粒子"""
-        # 渲染普通粒子
-        for particle in self.particles:
-            particle.render(screen, ui_scale, camera_x, camera_y)
-
-        # 渲染魔力粒子
-        for particle in self.mana_particles:
-            # 根据粒子颜色选择发光配置
-            if particle.color[0] > 100:  # 紫色粒子（内层）
-                glow_config = self.inner_glow_config
-            else:  # 蓝色粒子（外层）
-                glow_config = self.outer_glow_config
-
-            particle.render(screen, ui_scale, camera_x, camera_y, glow_config)
+        """渲染所有粒子（粒子本体通过精灵批次提交）"""
+        batch = get_sprite_batch()
+        batch.begin(screen)
+        try:
+            if self.vectorized:
+                self._render_arrays(screen, batch, ui_scale, camera_x, camera_y)
+                return
+
+            # 渲染普通粒子
+            for particle in self.particles:
+                if not particle.finished:
+                    batch.add_circle(int((particle.x - camera_x) * ui_scale),
+                                     int((particle.y - camera_y) * ui_scale),
+                                     max(1, int(particle.size * ui_scale)), particle.color)
+
+            # 魔力粒子直接绘制，先提交已排队的普通粒子，保持原来的绘制顺序
+            if self.mana_particles:
+                batch.flush(screen)
+
+            # 渲染魔力粒子
+            for particle in self.mana_particles:
+                # 根据粒子颜色选择发光配置
+                if particle.color[0] > 100:  # 紫色粒子（内层）
+                    glow_config = self.inner_glow_config
+                else:  # 蓝色粒子（外层）
+                    glow_config = self.outer_glow_config
+
+                particle.render(screen, ui_scale, camera_x, camera_y, glow_config)
+        finally:
+            batch.end(screen)
+
+    def _render_arrays(self, screen: pygame.Surface, batch, ui_scale: float,
+                       camera_x: float, camera_y: float):
+        """渲染数组后端中的粒子 - 屏幕坐标、大小和屏幕剔除整批计算"""
+        arrays = self.particle_arrays
+        n = arrays.count
+        if n:
+            xs = ((arrays.x[:n] - camera_x) * ui_scale).astype(int)
+            ys = ((arrays.y[:n] - camera_y) * ui_scale).astype(int)
+            sizes = (arrays.size[:n] * ui_scale).astype(int).clip(1)
+            width, height = screen.get_size()
+            visible = ((xs + sizes >= 0) & (xs - sizes < width) &
+                       (ys + sizes >= 0) & (ys - sizes < height))
+            batch.stats['culled'] += n - int(visible.sum())
+
+            colors = zip(arrays.r[:n][visible].tolist(), arrays.g[:n][visible].tolist(),
+                         arrays.b[:n][visible].tolist())
+            batch.add_visible_circles(xs[visible].tolist(), ys[visible].tolist(),
+                                      sizes[visible].tolist(), colors)
+
+        mana = self.mana_arrays
+        n = mana.count
+        if n:
+            xs = ((mana.x[:n] - camera_x) * ui_scale).astype(int).tolist()
+            ys = ((mana.y[:n] - camera_y) * ui_scale).astype(int).tolist()
+            world_xs = mana.x[:n].tolist()
+            world_ys = mana.y[:n].tolist()
+            alphas = mana.alpha[:n].tolist()
+            colors = list(zip(mana.r[:n].tolist(), mana.g[:n].tolist(), mana.b[:n].tolist()))
+            particle_size = max(1, int(1 * ui_scale))
+            glow_config = self.glow_manager.get_preset('magic')
+            render_glow = self.glow_manager.renderer.render_circle_glow
+            for i in range(n):
+                color = colors[i]
+                batch.add_circle(xs[i], ys[i], particle_size, color)
+
+                # 只在粒子足够可见时添加发光效果（与 ManaParticle.render 一致使用 magic 预设）
+                if alphas[i] > 50:
+                    # 发光直接绘制：先提交排在它前面的粒子，保持与逐个绘制相同的先后顺序
+                    batch.flush(screen)
+                    render_glow(screen, (world_xs[i], world_ys[i]), 1, color, glow_config,
+                                ui_scale, camera_x, camera_y)
+
+    def get_particle_count(self) -> int:
+        """获取当前普通粒子数量"""
+        if self.vectorized:
+            return len(self.particle_arrays)
+        return len(self.particles)
 
     def clear(self):
         """清空所有粒子"""
-        self.particles.clear()
-        self.particle_pool.clear()
-        self.mana_particles.clear()
-        self.mana_particle_pool.clear()
+        if self.vectorized:
+            self.particle_arrays.clear()
+            self.mana_arrays.clear()
+        self.effect_pool.clear_pool(RegularParticle)
+        self.effect_pool.clear_pool(ManaParticle)
 
     def clear_mana_particles(self):
         """清空魔力粒子"""
+        if self.vectorized:
+            self.mana_arrays.clear()
+            return
+
         # 将粒子回收到对象池
-        for particle in self.mana_particles:
-            if len(self.mana_particle_pool) < 100:
-                self.mana_particle_pool.append(particle)
-        self.mana_particles.clear()
+        self.effect_pool.release_all(ManaParticle)
+
+    def get_pool_status(self) -> Dict[str, Dict[str, int]]:
+        """获取粒子存储的占用情况（向量化模式下为数组容量）"""
+        if self.vectorized:
+            return {
+                type(arrays).__name__: {
+                    "active": len(arrays),
+                    "pooled": arrays.capacity - len(arrays),
+                    "total": arrays.capacity
+                }
+                for arrays in (self.particle_arrays, self.mana_arrays)
+            }
+        return {name: status for name, status in self.effect_pool.get_pool_status().items()
+                if name in (RegularParticle.__name__, ManaParticle.__name__)}
 
     def get_mana_particle_count(self) -> int:
         """获取当前魔力粒子数量"""
+        if self.vectorized:
+            return len(self.mana_arrays)
         return len(self.mana_particles)
 
     def is_mana_active(self) -> bool:
         """检查是否有活跃的魔力粒子"""
-        return len(self.mana_particles) > 0
+        return self.get_mana_particle_count() > 0
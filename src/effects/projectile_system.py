@@ -2,6 +2,10 @@
 # -*- coding: utf-8 -*-
 """
 投射物系统模块
+
+投射物碰撞使用宽相位网格：每个投射物只检查本帧扫过线段的包围盒附近格子中的目标，
+并按线段与目标的最近距离判断命中，高速箭矢不会穿过目标。追踪箭的最近目标查询结果
+会缓存一小段时间，不再每帧遍历全部单位。
 """
 
 import math
@@ -10,8 +14,20 @@ import pygame
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 from .glow_effect import get_glow_manager
+from .sprite_batch import get_sprite_batch
+from .effect_pool import EffectPool
+from src.systems.spatial_index import WorldSpatialIndex, UNIT_LAYERS
 from src.utils.logger import game_logger
 
+# 追踪箭的追踪范围（像素）
+TRACKING_RANGE = 200
+# 追踪箭重新查询最近目标的间隔（毫秒）
+TRACKING_REFRESH_MS = 100
+# 宽相位查询时假定的目标最大碰撞半径（像素）
+MAX_TARGET_RADIUS = 40
+# 未接入世界空间索引时，直接传入的目标列表所使用的图层名
+TARGETS_LAYER = 'targets'
+
 
 @dataclass
 class Projectile:
@@ -49,10 +65,21 @@ class Projectile:
     finished: bool = False
     hit_target: bool = False
 
+    # 上一帧位置（扫掠碰撞线段的起点）
+    prev_x: float = None
+    prev_y: float = None
+
+    # 追踪箭缓存的目标及剩余刷新时间（毫秒）
+    tracking_target: Any = None
+    tracking_refresh: float = 0.0
+
     def __post_init__(self):
         """初始化后处理"""
         if self.trail_points is None:
             self.trail_points = [(self.x, self.y)]
+        if self.prev_x is None:
+            self.prev_x = self.x
+            self.prev_y = self.y
         # 计算初始方向
         dx = self.target_x - self.x
         dy = self.target_y - self.y
@@ -73,11 +100,13 @@ class Projectile:
         if self.rotation_speed != 0:
             self.rotation += self.rotation_speed * delta_time
 
-        # 追踪目标
+        # 追踪目标（ProjectileSystem 通过空间网格预先转向时不传 targets）
         if self.tracking and targets:
             self._update_tracking(targets)
 
         # 更新位置
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.vx * delta_time
         self.y += self.vy * delta_time
 
@@ -118,42 +147,43 @@ class Projectile:
                 nearest_distance = distance
                 nearest_target = target
 
-        if nearest_target and nearest_distance < 200:  # 追踪范围
-            # 计算转向角度
-            dx = nearest_target.x - self.x
-            dy = nearest_target.y - self.y
-            target_angle = math.atan2(dy, dx)
+        if nearest_target and nearest_distance < TRACKING_RANGE:  # 追踪范围
+            self._steer_towards(nearest_target)
+
+    def _steer_towards(self, target):
+        """以有限的转向速度转向目标"""
+        # 计算转向角度
+        dx = target.x - self.x
+        dy = target.y - self.y
+        target_angle = math.atan2(dy, dx)
 
-            current_angle = math.atan2(self.vy, self.vx)
+        current_angle = math.atan2(self.vy, self.vx)
 
-            # 限制转向速度
-            angle_diff = target_angle - current_angle
-            while angle_diff > math.pi:
-                angle_diff -= 2 * math.pi
-            while angle_diff < -math.pi:
-                angle_diff += 2 * math.pi
+        # 限制转向速度
+        angle_diff = target_angle - current_angle
+        while angle_diff > math.pi:
+            angle_diff -= 2 * math.pi
+        while angle_diff < -math.pi:
+            angle_diff += 2 * math.pi
 
-            # 应用转向
-            turn_rate = 180 * math.pi / 180  # 度转弧度
-            max_turn = turn_rate * 0.016  # 假设60FPS
+        # 应用转向
+        turn_rate = 180 * math.pi / 180  # 度转弧度
+        max_turn = turn_rate * 0.016  # 假设60FPS
 
-            if abs(angle_diff) > max_turn:
-                angle_diff = max_turn if angle_diff > 0 else -max_turn
+        if abs(angle_diff) > max_turn:
+            angle_diff = max_turn if angle_diff > 0 else -max_turn
 
-            new_angle = current_angle + angle_diff
-            self.vx = math.cos(new_angle) * self.speed
-            self.vy = math.sin(new_angle) * self.speed
+        new_angle = current_angle + angle_diff
+        self.vx = math.cos(new_angle) * self.speed
+        self.vy = math.sin(new_angle) * self.speed
 
     def check_collision(self, target) -> bool:
-        """检查与目标的碰撞"""
+        """检查与目标的碰撞（本帧扫过的线段与目标的最近距离，高速投射物不会穿过目标）"""
         if not target or self.hit_target:
             return False
 
-        distance = math.sqrt((target.x - self.x) ** 2 +
-                             (target.y - self.y) ** 2)
         collision_distance = self.size + target.size
-
-        if distance <= collision_distance:
+        if self.sweep_hit_param(target, collision_distance) is not None:
             if not self.penetration:
                 self.hit_target = True
                 if self.bounces >= self.max_bounces:
@@ -171,6 +201,27 @@ class Projectile:
 
         return False
 
+    def sweep_hit_param(self, target, collision_distance: float) -> Optional[float]:
+        """
+        扫掠碰撞测试
+
+        Returns:
+            Optional[float]: 线段上离目标最近点的参数 t（0为上一帧位置，1为当前位置），未命中时为 None
+        """
+        seg_x = self.x - self.prev_x
+        seg_y = self.y - self.prev_y
+        rel_x = target.x - self.prev_x
+        rel_y = target.y - self.prev_y
+        length_sq = seg_x * seg_x + seg_y * seg_y
+        t = 0.0
+        if length_sq > 0:
+            t = min(1.0, max(0.0, (rel_x * seg_x + rel_y * seg_y) / length_sq))
+        dx = rel_x - seg_x * t
+        dy = rel_y - seg_y * t
+        if dx * dx + dy * dy <= collision_distance * collision_distance:
+            return t
+        return None
+
     def render(self, screen: pygame.Surface, ui_scale: float = 1.0, camera_x: float = 0, camera_y: float = 0):
         """渲染投射物"""
         if self.finished:
@@ -197,59 +248,39 @@ class Projectile:
                 pygame.draw.line(screen, self.color,
                                  start_pos, end_pos, line_width)
 
-        # 渲染投射物本体
-        if self.projectile_type == "arrow":
-            self._render_arrow(screen, ui_scale, camera_x, camera_y)
-        elif self.projectile_type == "tower_arrow":
-            self._render_tower_arrow(screen, ui_scale, camera_x, camera_y)
-        elif self.projectile_type == "fireball":
-            self._render_fireball(screen, ui_scale, camera_x, camera_y)
-        elif self.projectile_type == "lightning":
-            self._render_lightning(screen, ui_scale, camera_x, camera_y)
-        else:
-            # 默认圆形投射物 - 添加调试信息
-            game_logger.info(
-                f"🔍 投射物类型: {self.projectile_type}, 位置: ({self.x:.1f}, {self.y:.1f}), 大小: {self.size}")
-            scaled_x = int(screen_x)
-            scaled_y = int(screen_y)
-            scaled_size = max(1, int(self.size * ui_scale))
-            pygame.draw.circle(screen, self.color,
-                               (scaled_x, scaled_y), scaled_size)
+        # 渲染投射物本体（箭矢和圆形通过精灵批次提交）
+        batch = get_sprite_batch()
+        batch.begin(screen)
+        try:
+            if self.projectile_type == "arrow":
+                self._render_arrow(screen, ui_scale, camera_x, camera_y)
+            elif self.projectile_type == "tower_arrow":
+                self._render_tower_arrow(screen, ui_scale, camera_x, camera_y)
+            elif self.projectile_type == "fireball":
+                self._render_fireball(screen, ui_scale, camera_x, camera_y)
+            elif self.projectile_type == "lightning":
+                self._render_lightning(screen, ui_scale, camera_x, camera_y)
+            else:
+                # 默认圆形投射物 - 添加调试信息
+                game_logger.info(
+                    f"🔍 投射物类型: {self.projectile_type}, 位置: ({self.x:.1f}, {self.y:.1f}), 大小: {self.size}")
+                scaled_x = int(screen_x)
+                scaled_y = int(screen_y)
+                scaled_size = max(1, int(self.size * ui_scale))
+                batch.add_circle(scaled_x, scaled_y, scaled_size, self.color)
+        finally:
+            batch.end(screen)
 
     def _render_arrow(self, screen: pygame.Surface, ui_scale: float = 1.0, camera_x: float = 0, camera_y: float = 0):
-        """渲染箭矢"""
+        """渲染箭矢 - 按朝向量化的预烘焙精灵"""
         # 计算箭矢方向
         angle = math.atan2(self.vy, self.vx)
 
         # 世界坐标转屏幕坐标并应用UI缩放
-        scaled_size = self.size * ui_scale
         scaled_x = (self.x - camera_x) * ui_scale
         scaled_y = (self.y - camera_y) * ui_scale
 
-        # 箭矢顶点
-        tip_x = scaled_x + math.cos(angle) * scaled_size
-        tip_y = scaled_y + math.sin(angle) * scaled_size
-
-        # 箭矢尾部
-        tail_x = scaled_x - math.cos(angle) * scaled_size * 0.8
-        tail_y = scaled_y - math.sin(angle) * scaled_size * 0.8
-
-        # 箭矢两侧
-        side_angle1 = angle + math.pi / 2
-        side_angle2 = angle - math.pi / 2
-        side_x1 = tail_x + math.cos(side_angle1) * scaled_size * 0.3
-        side_y1 = tail_y + math.sin(side_angle1) * scaled_size * 0.3
-        side_x2 = tail_x + math.cos(side_angle2) * scaled_size * 0.3
-        side_y2 = tail_y + math.sin(side_angle2) * scaled_size * 0.3
-
-        # 绘制箭矢
-        points = [
-            (int(tip_x), int(tip_y)),
-            (int(side_x1), int(side_y1)),
-            (int(tail_x), int(tail_y)),
-            (int(side_x2), int(side_y2))
-        ]
-        pygame.draw.polygon(screen, self.color, points)
+        get_sprite_batch().add_arrow(scaled_x, scaled_y, self.size * ui_scale, angle, self.color)
 
     def _render_tower_arrow(self, screen: pygame.Surface, ui_scale: float = 1.0, camera_x: float = 0, camera_y: float = 0):
         """渲染箭塔箭矢 - 与弓箭手保持一致的直线设计"""
@@ -311,13 +342,9 @@ class Projectile:
             ]
             pygame.draw.polygon(screen, glow_color, points)
         else:
-            # 正常状态
-            points = [
-                (int(tip_x), int(tip_y)),
-                (int(side_x1), int(side_y1)),
-                (int(side_x2), int(side_y2))
-            ]
-            pygame.draw.polygon(screen, self.color, points)
+            # 正常状态 - 按朝向量化的预烘焙三角形精灵
+            get_sprite_batch().add_arrow(scaled_x, scaled_y, scaled_size, angle,
+                                         self.color, notched=False)
 
         # 如果是暴击箭矢，添加发光效果
         if hasattr(self, 'glow_effect') and self.glow_effect:
@@ -337,15 +364,14 @@ class Projectile:
         scaled_size = max(1, int(self.size * ui_scale))
 
         # 绘制火球主体
-        pygame.draw.circle(screen, self.color,
-                           (scaled_x, scaled_y), scaled_size)
+        batch = get_sprite_batch()
+        batch.add_circle(scaled_x, scaled_y, scaled_size, self.color)
 
         # 绘制火焰效果
         fire_colors = [(255, 0, 0), (255, 69, 0), (255, 215, 0)]
         for i, fire_color in enumerate(fire_colors):
             fire_size = max(1, int(scaled_size * (0.7 - i * 0.2)))
-            pygame.draw.circle(screen, fire_color,
-                               (scaled_x, scaled_y), fire_size)
+            batch.add_circle(scaled_x, scaled_y, fire_size, fire_color)
 
     def _render_lightning(self, screen: pygame.Surface, ui_scale: float = 1.0, camera_x: float = 0, camera_y: float = 0):
         """渲染闪电"""
@@ -386,9 +412,39 @@ class Projectile:
 class ProjectileSystem:
     """投射物系统管理器"""
 
-    def __init__(self):
-        self.projectiles: List[Projectile] = []
-        self.projectile_pool: List[Projectile] = []
+    def __init__(self, effect_pool: Optional[EffectPool] = None):
+        # 活跃投射物即对象池中 Projectile 类型的活跃数组
+        self.effect_pool = effect_pool if effect_pool is not None else EffectPool()
+        self.projectiles: List[Projectile] = self.effect_pool.register(Projectile, 50)
+
+        # 宽相位目标网格：优先使用游戏的世界空间索引，
+        # 否则把直接传入的目标列表增量同步到自己的网格中
+        self.spatial_index: Optional[WorldSpatialIndex] = None
+        self.target_layers = UNIT_LAYERS
+        self._local_index = WorldSpatialIndex()
+        self.stats = {'broad_phase_candidates': 0, 'tracking_queries': 0}
+
+    def set_spatial_index(self, spatial_index: Optional[WorldSpatialIndex],
+                          layers: Tuple[str, ...] = UNIT_LAYERS):
+        """
+        接入世界空间索引（由游戏每帧同步），之后 update/check_collisions 可以不传目标列表
+
+        Args:
+            spatial_index: 世界空间索引，None 时回退到直接传入的目标列表
+            layers: 作为投射物目标的图层
+        """
+        self.spatial_index = spatial_index
+        self.target_layers = layers
+
+    def _target_index(self, targets: Optional[List]) -> Tuple[Optional[WorldSpatialIndex], Tuple[str, ...]]:
+        """获取本帧用于宽相位查询的网格及图层"""
+        if targets is not None:
+            # 直接传入的目标列表优先，增量同步到本地网格
+            self._local_index.sync(TARGETS_LAYER, targets)
+            return self._local_index, (TARGETS_LAYER,)
+        if self.spatial_index is not None:
+            return self.spatial_index, self.target_layers
+        return None, ()
 
     def create_arrow(self, x: float, y: float, target_x: float, target_y: float,
                      speed: float = 400, damage: int = 20, color: tuple = (255, 255, 255)) -> Projectile:
@@ -461,66 +517,106 @@ class ProjectileSystem:
     def _get_or_create_projectile(self, x: float, y: float, target_x: float, target_y: float,
                                   speed: float, damage: int, color: Tuple[int, int, int],
                                   size: float, projectile_type: str, max_life: float) -> Projectile:
-        """获取或创建投射物"""
-        # 尝试从对象池获取
-        if self.projectile_pool:
-            projectile = self.projectile_pool.pop()
-            projectile.x = x
-            projectile.y = y
-            projectile.target_x = target_x
-            projectile.target_y = target_y
-            projectile.speed = speed
-            projectile.damage = damage
-            projectile.color = color
-            projectile.size = size
-            projectile.projectile_type = projectile_type
-            projectile.max_life = max_life
-            projectile.life = max_life
-            projectile.reset()
-
-            # 重新计算速度向量
-            dx = target_x - x
-            dy = target_y - y
-            distance = math.sqrt(dx * dx + dy * dy)
-            if distance > 0:
-                projectile.vx = (dx / distance) * speed
-                projectile.vy = (dy / distance) * speed
-            else:
-                projectile.vx = 0
-                projectile.vy = 0
-        else:
-            projectile = Projectile(x, y, target_x, target_y, speed, damage, color, size,
-                                    projectile_type, max_life, max_life)
-
-        self.projectiles.append(projectile)
-        return projectile
+        """从对象池获取投射物"""
+        return self.effect_pool.acquire(Projectile, x, y, target_x, target_y, speed, damage,
+                                        color, size, projectile_type, max_life, max_life)
 
     def update(self, delta_time: float, targets: List = None):
-        """更新所有投射物"""
-        for projectile in self.projectiles[:]:
-            projectile.update(delta_time, targets)
+        """
+        更新所有投射物
+
+        Args:
+            delta_time: 时间增量（毫秒）
+            targets: 追踪箭的候选目标，None 时使用接入的世界空间索引
+        """
+        index, layers = self._target_index(targets)
+
+        # 倒序遍历，结束的投射物交换删除并回到对象池
+        projectiles = self.projectiles
+        for slot in range(len(projectiles) - 1, -1, -1):
+            projectile = projectiles[slot]
+            if projectile.tracking and index is not None and not projectile.finished:
+                target = self._get_tracking_target(projectile, index, layers, delta_time)
+                if target is not None:
+                    projectile._steer_towards(target)
+            projectile.update(delta_time)
             if projectile.finished:
-                self.projectiles.remove(projectile)
-                # 将投射物返回对象池
-                if len(self.projectile_pool) < 50:  # 限制对象池大小
-                    self.projectile_pool.append(projectile)
+                self.effect_pool.release(projectile)
+
+    def _get_tracking_target(self, projectile: Projectile, index: WorldSpatialIndex,
+                             layers: Tuple[str, ...], delta_time: float):
+        """
+        获取追踪箭的最近目标 - 缓存上一次的查询结果，
+        到达刷新间隔、目标死亡或离开追踪范围时才重新查询网格
+        """
+        target = projectile.tracking_target
+        projectile.tracking_refresh -= delta_time
+        if target is not None and projectile.tracking_refresh > 0:
+            dx = target.x - projectile.x
+            dy = target.y - projectile.y
+            if getattr(target, 'health', 1) > 0 and dx * dx + dy * dy < TRACKING_RANGE * TRACKING_RANGE:
+                return target
+
+        target = index.nearest(projectile.x, projectile.y, TRACKING_RANGE, layers)
+        if target is not None:
+            dx = target.x - projectile.x
+            dy = target.y - projectile.y
+            if dx * dx + dy * dy >= TRACKING_RANGE * TRACKING_RANGE:
+                target = None
+        projectile.tracking_target = target
+        projectile.tracking_refresh = TRACKING_REFRESH_MS
+        self.stats['tracking_queries'] += 1
+        return target
+
+    def check_collisions(self, targets: List = None) -> List[Tuple[Projectile, Any]]:
+        """
+        检查所有投射物的碰撞
+
+        宽相位：只取本帧扫过线段的包围盒（加上碰撞半径）内的目标；
+        窄相位：按线段与目标的最近距离判断，命中多个时取沿飞行方向最先碰到的目标。
+
+        Args:
+            targets: 候选目标列表，None 时使用接入的世界空间索引
+        """
+        index, layers = self._target_index(targets)
+        if index is None:
+            return []
 
-    def check_collisions(self, targets: List) -> List[Tuple[Projectile, Any]]:
-        """检查所有投射物的碰撞"""
         collisions = []
         for projectile in self.projectiles:
-            for target in targets:
-                if projectile.check_collision(target):
-                    collisions.append((projectile, target))
-                    break  # 每个投射物只碰撞一个目标
+            if projectile.finished or projectile.hit_target:
+                continue
+            margin = projectile.size + MAX_TARGET_RADIUS
+            candidates = index.query_rect(
+                min(projectile.prev_x, projectile.x) - margin,
+                min(projectile.prev_y, projectile.y) - margin,
+                max(projectile.prev_x, projectile.x) + margin,
+                max(projectile.prev_y, projectile.y) + margin,
+                layers)
+            self.stats['broad_phase_candidates'] += len(candidates)
+
+            first_target = None
+            first_t = 2.0
+            for target in candidates:
+                t = projectile.sweep_hit_param(target, projectile.size + target.size)
+                if t is not None and t < first_t:
+                    first_target, first_t = target, t
+
+            # 每个投射物只碰撞一个目标
+            if first_target is not None and projectile.check_collision(first_target):
+                collisions.append((projectile, first_target))
         return collisions
 
     def render(self, screen: pygame.Surface, ui_scale: float = 1.0, camera_x: float = 0, camera_y: float = 0):
-        """渲染所有投射物"""
-        for projectile in self.projectiles:
-            projectile.render(screen, ui_scale, camera_x, camera_y)
+        """渲染所有投射物（所有投射物的精灵在最后一次提交）"""
+        batch = get_sprite_batch()
+        batch.begin(screen)
+        try:
+            for projectile in self.projectiles:
+                projectile.render(screen, ui_scale, camera_x, camera_y)
+        finally:
+            batch.end(screen)
 
     def clear(self):
         """清空所有投射物"""
-        self.projectiles.clear()
-        self.projectile_pool.clear()
+        self.effect_pool.clear_pool(Projectile)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+特效精灵批量渲染
+粒子、投射物等小图元不再逐个调用 pygame.draw，而是从预烘焙的精灵缓存中取出对应的精灵，
+在本帧内收集到批次里，剔除屏幕外的精灵后以一次 fblits/blits 提交。
+
+- 精灵按 (形状, 尺寸, 颜色, 量化透明度[, 量化角度]) 缓存，超过上限时淘汰最久未使用的精灵
+- 一个批次内的精灵按提交顺序绘制，与逐个绘制的遮挡关系一致
+- 独立调用的渲染函数（未处于批次中）在结束时自行提交
+"""
+
+import math
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import pygame
+
+# 透明度量化步长（透明度烘焙进精灵像素中）
+SPRITE_ALPHA_QUANTUM = 16
+# 箭矢朝向量化（每圈步数）
+ARROW_ANGLE_STEPS = 64
+
+
+def _quantize_alpha(alpha: float) -> int:
+    alpha = min(255, max(0, int(alpha)))
+    if alpha >= 255 - SPRITE_ALPHA_QUANTUM // 2:
+        return 255
+    return (alpha + SPRITE_ALPHA_QUANTUM // 2) // SPRITE_ALPHA_QUANTUM * SPRITE_ALPHA_QUANTUM
+
+
+class SpriteBatch:
+    """特效精灵批次 - 预烘焙精灵缓存 + 屏幕剔除 + 一次性提交"""
+
+    def __init__(self, max_sprites: int = 2048):
+        """
+        初始化精灵批次
+
+        Args:
+            max_sprites: 精灵缓存上限
+        """
+        self.max_sprites = max_sprites
+        self._sprites: "OrderedDict[Tuple, pygame.Surface]" = OrderedDict()
+        self._queue: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        self._depth = 0
+        self._scratch: Optional[pygame.Surface] = None
+        self.viewport_width = 0
+        self.viewport_height = 0
+
+        self.stats = {
+            'submitted': 0,
+            'culled': 0,
+            'flushes': 0,
+            'sprites_baked': 0,
+        }
+
+    # ==================== 批次生命周期 ====================
+
+    def begin(self, screen: pygame.Surface) -> bool:
+        """
+        开始一个批次（可嵌套，只有最外层的 end 才会提交）
+
+        Returns:
+            bool: 是否为最外层批次
+        """
+        if self._depth == 0:
+            self.viewport_width, self.viewport_height = screen.get_size()
+        self._depth += 1
+        return self._depth == 1
+
+    def end(self, screen: pygame.Surface) -> int:
+        """结束批次，最外层时提交所有精灵，返回提交数量"""
+        self._depth = max(0, self._depth - 1)
+        if self._depth == 0:
+            return self.flush(screen)
+        return 0
+
+    def flush(self, screen: pygame.Surface) -> int:
+        """以一次 fblits/blits 提交队列中的精灵"""
+        queue = self._queue
+        if not queue:
+            return 0
+        count = len(queue)
+        fblits = getattr(screen, 'fblits', None)
+        if fblits is not None:
+            fblits(queue)
+        else:
+            screen.blits(queue, doreturn=False)
+        self._queue = []
+        self.stats['submitted'] += count
+        self.stats['flushes'] += 1
+        return count
+
+    # ==================== 提交精灵 ====================
+
+    def add(self, sprite: pygame.Surface, x: int, y: int):
+        """按左上角坐标提交精灵，完全在屏幕外时剔除"""
+        if (x >= self.viewport_width or y >= self.viewport_height or
+                x + sprite.get_width() <= 0 or y + sprite.get_height() <= 0):
+            self.stats['culled'] += 1
+            return
+        self._queue.append((sprite, (x, y)))
+
+    def add_circle(self, center_x: int, center_y: int, radius: int,
+                   color: Tuple[int, int, int], alpha: int = 255):
+        """提交实心圆（等价于 pygame.draw.circle）"""
+        radius = max(1, int(radius))
+        if (center_x - radius >= self.viewport_width or center_y - radius >= self.viewport_height or
+                center_x + radius < 0 or center_y + radius < 0):
+            self.stats['culled'] += 1
+            return
+        sprite = self.circle_sprite(radius, color, alpha)
+        self._queue.append((sprite, (center_x - radius, center_y - radius)))
+
+    def add_visible_circles(self, centers_x: List[int], centers_y: List[int], radii: List[int],
+                            colors: List[Tuple[int, int, int]]):
+        """批量提交调用方已完成屏幕剔除的实心圆（用于数组化的粒子后端）"""
+        # 同一次提交中尺寸和颜色高度重复，本地字典避免逐个走LRU查找
+        local = {}
+        circle_sprite = self.circle_sprite
+        append = self._queue.append
+        for x, y, radius, color in zip(centers_x, centers_y, radii, colors):
+            key = (radius, color)
+            sprite = local.get(key)
+            if sprite is None:
+                sprite = local[key] = circle_sprite(radius, color)
+            append((sprite, (x - radius, y - radius)))
+
+    def add_square(self, center_x: int, center_y: int, half_size: int,
+                   color: Tuple[int, int, int], alpha: int = 255):
+        """提交实心正方形"""
+        half_size = max(1, int(half_size))
+        sprite = self.square_sprite(half_size, color, alpha)
+        self.add(sprite, center_x - half_size, center_y - half_size)
+
+    def add_arrow(self, center_x: float, center_y: float, size: float, angle: float,
+                  color: Tuple[int, int, int], notched: bool = True):
+        """提交箭矢（朝向量化后的预烘焙多边形）"""
+        sprite = self.arrow_sprite(size, angle, color, notched)
+        half = sprite.get_width() // 2
+        self.add(sprite, int(center_x) - half, int(center_y) - half)
+
+    # ==================== 精灵缓存 ====================
+
+    def _get(self, key: Tuple) -> Optional[pygame.Surface]:
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+        return sprite
+
+    def _put(self, key: Tuple, sprite: pygame.Surface) -> pygame.Surface:
+        self._sprites[key] = sprite
+        self.stats['sprites_baked'] += 1
+        while len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    @staticmethod
+    def _new_sprite(width: int, height: int, color: Tuple[int, int, int],
+                    alpha: int) -> Tuple[pygame.Surface, Tuple]:
+        """
+        创建空白精灵表面
+
+        不透明精灵使用 RLE 加速的颜色键表面，贴图只复制非透明像素的行程；
+        半透明精灵使用逐像素透明度表面，显示模式已设置时转换为显示格式以加速混合。
+
+        Returns:
+            (表面, 绘制用颜色)
+        """
+        if alpha >= 255:
+            key = (255, 0, 255) if tuple(color[:3]) != (255, 0, 255) else (0, 255, 0)
+            sprite = pygame.Surface((width, height))
+            sprite.fill(key)
+            sprite.set_colorkey(key, pygame.RLEACCEL)
+            return sprite, tuple(color[:3])
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+            sprite.fill((0, 0, 0, 0))
+        return sprite, (*color[:3], alpha)
+
+    def circle_sprite(self, radius: int, color: Tuple[int, int, int],
+                      alpha: int = 255) -> pygame.Surface:
+        """获取实心圆精灵"""
+        alpha = _quantize_alpha(alpha)
+        key = ('circle', radius, tuple(color), alpha)
+        sprite = self._get(key)
+        if sprite is None:
+            sprite, draw_color = self._new_sprite(radius * 2, radius * 2, color, alpha)
+            pygame.draw.circle(sprite, draw_color, (radius, radius), radius)
+            sprite = self._put(key, sprite)
+        return sprite
+
+    def square_sprite(self, half_size: int, color: Tuple[int, int, int],
+                      alpha: int = 255) -> pygame.Surface:
+        """获取实心正方形精灵"""
+        alpha = _quantize_alpha(alpha)
+        key = ('square', half_size, tuple(color), alpha)
+        sprite = self._get(key)
+        if sprite is None:
+            sprite, draw_color = self._new_sprite(half_size * 2, half_size * 2, color, alpha)
+            sprite.fill(draw_color)
+            sprite = self._put(key, sprite)
+        return sprite
+
+    def arrow_sprite(self, size: float, angle: float, color: Tuple[int, int, int],
+                     notched: bool = True) -> pygame.Surface:
+        """
+        获取箭矢精灵（以箭矢中心为精灵中心）
+
+        Args:
+            notched: True 为带尾部凹口的四边形（Projectile._render_arrow），
+                     False 为三角形（Projectile._render_tower_arrow）
+        """
+        step = int(round(angle / (2 * math.pi) * ARROW_ANGLE_STEPS)) % ARROW_ANGLE_STEPS
+        size_key = int(round(size * 2))
+        key = ('arrow', size_key, step, tuple(color), notched)
+        sprite = self._get(key)
+        if sprite is None:
+            size = size_key / 2.0
+            angle = step * 2 * math.pi / ARROW_ANGLE_STEPS
+            half = int(math.ceil(size)) + 1
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            tip = (half + cos_a * size, half + sin_a * size)
+            tail = (half - cos_a * size * 0.8, half - sin_a * size * 0.8)
+            side = (-sin_a * size * 0.3, cos_a * size * 0.3)
+            points = [tip, (tail[0] + side[0], tail[1] + side[1])]
+            if notched:
+                points.append(tail)
+            points.append((tail[0] - side[0], tail[1] - side[1]))
+            sprite, draw_color = self._new_sprite(half * 2, half * 2, color, 255)
+            pygame.draw.polygon(sprite, draw_color, [(int(px), int(py)) for px, py in points])
+            sprite = self._put(key, sprite)
+        return sprite
+
+    def scratch_surface(self, width: int, height: int) -> pygame.Surface:
+        """
+        获取复用的透明草稿表面，左上角 width × height 区域已清空
+
+        用于需要先合成再整体贴图、形状每帧随机变化而无法预烘焙的特效，
+        调用方以 area=(0, 0, width, height) 贴到屏幕上。
+        """
+        scratch = self._scratch
+        if scratch is None or scratch.get_width() < width or scratch.get_height() < height:
+            size = (max(width, scratch.get_width() if scratch else 0),
+                    max(height, scratch.get_height() if scratch else 0))
+            scratch = self._scratch = pygame.Surface(size, pygame.SRCALPHA)
+        scratch.fill((0, 0, 0, 0), (0, 0, width, height))
+        return scratch
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {**self.stats, 'cached_sprites': len(self._sprites)}
+
+
+# 全局精灵批次实例
+_sprite_batch = None
+
+
+def get_sprite_batch() -> SpriteBatch:
+    """获取全局精灵批次实例"""
+    global _sprite_batch
+    if _sprite_batch is None:
+        _sprite_batch = SpriteBatch()
+    return _sprite_batch
+
+
+def reset_sprite_batch():
+    """重置精灵批次及其精灵缓存（用于测试或重新开始游戏）"""
+    global _sprite_batch
+    _sprite_batch = None
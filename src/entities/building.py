@@ -5,7 +5,6 @@
 根据 BUILDING_SYSTEM.md 文档实现
 """
 
-import time
 import math
 import random
 import pygame
@@ -17,6 +16,7 @@ from src.core.constants import GameConstants
 from src.core.enums import TileType
 from .tile import GameTile
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
 
 
 class BuildingType(Enum):
@@ -81,6 +81,34 @@ class BuildingConfig:
     description: str = ""              # 描述
 
 
+class ResourceAttribute:
+    """
+    资源数值属性 - 值变化时通知建筑的 resource_listener(building, 属性名, 旧值, 新值)
+
+    用于 stored_gold / stored_mana 及其容量，经济账本据此增量维护总量。
+    未赋值前读取会抛出 AttributeError，hasattr 判断与普通属性一致。
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.storage_name = '_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.storage_name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, instance, value):
+        old_value = instance.__dict__.get(self.storage_name)
+        instance.__dict__[self.storage_name] = value
+        listener = instance.__dict__.get('resource_listener')
+        if listener is not None and old_value != value:
+            listener(instance, self.name, old_value, value)
+
+
 class Building(GameTile):
     """建筑基类 - 继承自GameTile"""
 
@@ -108,6 +136,12 @@ class Building(GameTile):
         # 基础属性
         self.name = config.name
         self.category = config.category
+        # 状态、生命值、激活状态变化时通知 change_listener(building, 属性名, 旧值, 新值)，由建筑索引设置
+        self.change_listener = None
+        # 存储的金币/魔力及其容量变化时通知 resource_listener，由经济账本设置
+        self.resource_listener = None
+        # 状态变化时通知所在地图格子 tile_listener(building)（建成的建筑阻挡寻路），由 MapGrid.set_building 设置
+        self.tile_listener = None
         self.health = config.health
         self.max_health = config.health
         self.armor = config.armor
@@ -122,7 +156,7 @@ class Building(GameTile):
         self.status = BuildingStatus.PLANNING
         self.construction_progress = 0.0  # 建造进度 (0.0 - 1.0)
         self.construction_start_time = 0.0
-        self.last_update_time = time.time()
+        self.last_update_time = sim_time()
 
         # 建造成本信息（供工程师参考）
         self.construction_cost_gold = config.cost_gold
@@ -153,7 +187,7 @@ class Building(GameTile):
 
         # 维护系统 - 取消维持费用，改为修复费用
         self.maintenance_cost = 0  # 取消维持费用
-        self.last_maintenance_time = time.time()
+        self.last_maintenance_time = sim_time()
 
         # 建筑管理器引用（用于清理缓存等操作）
         self.building_manager = None
@@ -162,6 +196,56 @@ class Building(GameTile):
         self.faction = "heroes"  # 建筑属于英雄阵营
         self.is_combat_unit = False  # 建筑不是战斗单位（除了防御塔）
 
+    # 资源存储（只有地牢之心、金库、魔法祭坛等存储建筑会赋值）
+    stored_gold = ResourceAttribute()
+    gold_storage_capacity = ResourceAttribute()
+    stored_mana = ResourceAttribute()
+    mana_storage_capacity = ResourceAttribute()
+
+    @property
+    def status(self) -> BuildingStatus:
+        """建筑状态"""
+        return self._status
+
+    @status.setter
+    def status(self, value: BuildingStatus):
+        old_status = self.__dict__.get('_status')
+        self._status = value
+        if old_status is value:
+            return
+        listener = self.__dict__.get('change_listener')
+        if listener is not None:
+            listener(self, 'status', old_status, value)
+        tile_listener = self.__dict__.get('tile_listener')
+        if tile_listener is not None:
+            tile_listener(self)
+
+    @property
+    def health(self):
+        """当前生命值"""
+        return self._health
+
+    @health.setter
+    def health(self, value):
+        old_health = self.__dict__.get('_health')
+        self._health = value
+        listener = self.__dict__.get('change_listener')
+        if listener is not None and old_health != value:
+            listener(self, 'health', old_health, value)
+
+    @property
+    def is_active(self) -> bool:
+        """是否激活"""
+        return self._is_active
+
+    @is_active.setter
+    def is_active(self, value: bool):
+        old_active = self.__dict__.get('_is_active')
+        self._is_active = value
+        listener = self.__dict__.get('change_listener')
+        if listener is not None and old_active != value:
+            listener(self, 'is_active', old_active, value)
+
     def get_tile_position(self) -> Tuple[int, int]:
         """获取瓦片坐标"""
         return (self.tile_x, self.tile_y)
@@ -190,7 +274,7 @@ class Building(GameTile):
         Returns:
             Dict: 更新结果信息
         """
-        current_time = time.time()
+        current_time = sim_time()
         delta_seconds = delta_time  # delta_time 已经是秒单位，不需要转换
 
         result = {
@@ -241,7 +325,7 @@ class Building(GameTile):
             self.assigned_engineers = engineers[:self.required_engineers]
 
         self.status = BuildingStatus.UNDER_CONSTRUCTION
-        self.construction_start_time = time.time()
+        self.construction_start_time = sim_time()
         self.construction_progress = 0.0
 
         return True
@@ -295,7 +379,7 @@ class Building(GameTile):
         # 这里应该检查资源是否足够，但需要游戏状态参数
 
         self.status = BuildingStatus.UPGRADING
-        self.construction_start_time = time.time()
+        self.construction_start_time = sim_time()
         self.construction_progress = 0.0
 
         if engineers:
@@ -568,7 +652,7 @@ class Building(GameTile):
             engineer.rejection_history.append({
                 'building_name': self.name,
                 'reason': reason,
-                'timestamp': time.time()
+                'timestamp': sim_time()
             })
 
         return result
@@ -5,7 +5,6 @@
 根据 BUILDING_SYSTEM.md 文档实现各种建筑的特殊功能
 """
 
-import time
 import math
 import random
 import pygame
@@ -18,6 +17,7 @@ from src.effects.effect_manager import EffectManager
 from src.utils.logger import game_logger
 from src.entities.monster.orc_warrior import OrcWarrior
 from src.entities.monster.imp import Imp
+from src.core.sim_clock import sim_time
 
 
 class DungeonHeart(Building):
@@ -100,7 +100,7 @@ class DungeonHeart(Building):
 
     def _update_magic_generation(self, delta_seconds: float, game_state, production: Dict[str, Any]):
         """更新魔力生成系统 - 参考MagicAltar设计风格"""
-        current_time = time.time()
+        current_time = sim_time()
 
         # 更新运行时间统计
         self.mana_generation_stats['total_operating_time'] = getattr(
@@ -697,7 +697,7 @@ class Library(Building):
         production = {}
 
         # 生成法力 - 使用ResourceManager
-        current_time = time.time()
+        current_time = sim_time()
         if current_time - self.last_production_time >= 1.0:  # 每秒生成
             mana_generated = self.mana_generation_rate * self.efficiency
 
@@ -821,7 +821,7 @@ class ArrowTower(Building):
         production = {}
 
         # 使用绝对时间检查攻击冷却，与combat_system保持一致
-        current_time = time.time()
+        current_time = sim_time()
         if hasattr(self, 'last_attack_time') and self.last_attack_time > 0:
             time_since_last_attack = current_time - self.last_attack_time
             if time_since_last_attack >= self.attack_interval:
@@ -970,7 +970,7 @@ class ArrowTower(Building):
         self.current_ammunition -= self.ammunition_per_shot
 
         # 重置攻击冷却 - 只更新last_attack_time，使用绝对时间机制
-        self.last_attack_time = time.time()
+        self.last_attack_time = sim_time()
         self.current_target = target
 
         result = {
@@ -1159,7 +1159,7 @@ class ArcaneTower(Building):
         production = {}
 
         # 使用绝对时间检查攻击冷却，与combat_system保持一致
-        current_time = time.time()
+        current_time = sim_time()
         if hasattr(self, 'last_attack_time') and self.last_attack_time > 0:
             time_since_last_attack = current_time - self.last_attack_time
             if time_since_last_attack >= self.attack_interval:
@@ -1299,7 +1299,7 @@ class ArcaneTower(Building):
                         target.health = 0
 
         # 重置攻击冷却 - 只更新last_attack_time，使用绝对时间机制
-        self.last_attack_time = time.time()
+        self.last_attack_time = sim_time()
         self.current_target = target
 
         result = {
@@ -1470,7 +1470,7 @@ class MagicAltar(Building):
     def _update_production(self, delta_seconds: float, game_state, workers: List = None) -> Dict[str, Any]:
         """更新魔法祭坛功能"""
         production = {}
-        current_time = time.time()
+        current_time = sim_time()
 
         # 调试信息已移除，减少输出噪音
 
@@ -1692,7 +1692,7 @@ class MagicAltar(Building):
 
         # 存储临时金币
         self.temp_gold += actual_gold_stored
-        current_time = time.time()
+        current_time = sim_time()
         self._record_temp_gold_storage(actual_gold_stored, current_time)
 
         # 注意：不在这里设置魔力生成状态，让 _update_production 统一处理
@@ -1880,7 +1880,7 @@ class MagicAltar(Building):
 
         # 记录效率历史
         self.efficiency_history.append({
-            'timestamp': time.time(),
+            'timestamp': sim_time(),
             'efficiency_rating': self.resource_stats['efficiency_rating'],
             'uptime_percentage': self.resource_stats['uptime_percentage'],
             'resource_efficiency': self.resource_stats['resource_efficiency']
@@ -2020,7 +2020,7 @@ class OrcLair(Building):
 
         # 检查训练是否完成
         if self.is_training:
-            current_time = time.time()
+            current_time = sim_time()
             if current_time - self.training_start_time >= self.training_duration:
                 # 训练完成，生成兽人战士
                 self._complete_training()
@@ -2072,7 +2072,7 @@ class OrcLair(Building):
         """开始训练（当苦工到达建筑时调用）"""
         if worker == self.assigned_worker and not self.is_training:
             self.is_training = True
-            self.training_start_time = time.time()
+            self.training_start_time = sim_time()
             game_logger.info(
                 f"🏹 兽人巢穴开始训练: 苦工已到达，训练时间{self.training_duration}秒")
 
@@ -2292,21 +2292,21 @@ class DemonLair(Building):
 
         # 详细状态日志：每5秒记录一次状态
         if hasattr(self, '_last_log_time'):
-            if time.time() - self._last_log_time >= 5.0:
-                self._last_log_time = time.time()
+            if sim_time() - self._last_log_time >= 5.0:
+                self._last_log_time = sim_time()
                 game_logger.info(
                     "🔮 恶魔巢穴状态: 临时金币={temp_gold}/{max_temp_gold}, 召唤中={summoning}, 锁定={locked}, 绑定怪物={bound}",
                     temp_gold=self.temp_gold, max_temp_gold=self.max_temp_gold,
                     summoning=self.is_summoning, locked=self.is_locked,
                     bound=self.bound_monster is not None)
         else:
-            self._last_log_time = time.time()
+            self._last_log_time = sim_time()
 
         # 检查是否进入召唤状态
         if not self.is_locked and not self.is_summoning and not self.is_summoning_paused and self.temp_gold >= self.max_temp_gold:
             self.is_summoning = True
             self.is_summoning_paused = False
-            self.summon_start_time = time.time()
+            self.summon_start_time = sim_time()
             self.summon_elapsed_time = 0.0
             production['summon_started'] = True
             production['building_position'] = (self.x, self.y)
@@ -2324,7 +2324,7 @@ class DemonLair(Building):
             if mana_info.available >= self.mana_consumption_rate:
                 self.is_summoning = True
                 self.is_summoning_paused = False
-                self.summon_start_time = time.time() - self.summon_elapsed_time  # 恢复之前的进度
+                self.summon_start_time = sim_time() - self.summon_elapsed_time  # 恢复之前的进度
                 production['summon_resumed'] = True
                 production['building_position'] = (self.x, self.y)
                 game_logger.info(
@@ -2333,7 +2333,7 @@ class DemonLair(Building):
 
         # 检查召唤是否完成
         if self.is_summoning:
-            current_time = time.time()
+            current_time = sim_time()
             summon_elapsed = current_time - self.summon_start_time
             summon_remaining = self.summon_duration - summon_elapsed
 
@@ -6,7 +6,6 @@
 
 import math
 import random
-import time
 from typing import List, Dict, Optional, Tuple
 from enum import Enum
 
@@ -17,6 +16,7 @@ from src.core.game_state import Tile, GameState
 from src.entities.configs import CreatureConfig
 from src.managers.movement_system import MovementSystem
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
 
 
 class CreatureStatus(Enum):
@@ -208,8 +208,7 @@ class Creature:
 
     def _update_combat_behavior(self, delta_time: float, game_map: List[List[Tile]], effect_manager=None):
         """通用怪物战斗行为 - 优化版本，使用目标追踪系统"""
-        import time
-        current_time = time.time()
+        current_time = sim_time()
 
         # 更新搜索冷却时间
         if self.target_search_cooldown > 0:
@@ -484,8 +483,7 @@ class Creature:
             self.health = 0
 
         # 设置战斗状态
-        import time
-        current_time = time.time()
+        current_time = sim_time()
         self.in_combat = True
         self.last_combat_time = current_time
 
@@ -577,7 +575,7 @@ class Creature:
             return False  # 目标已在列表中
 
         self.attack_list.append(target)
-        self.attack_list_last_update = time.time()
+        self.attack_list_last_update = sim_time()
 
         return True
 
@@ -585,7 +583,7 @@ class Creature:
         """从攻击列表中移除目标"""
         if target in self.attack_list:
             self.attack_list.remove(target)
-            self.attack_list_last_update = time.time()
+            self.attack_list_last_update = sim_time()
 
             return True
         return False
@@ -599,7 +597,7 @@ class Creature:
                 self.attack_list.remove(target)
 
         if dead_targets:
-            self.attack_list_last_update = time.time()
+            self.attack_list_last_update = sim_time()
 
         return len(dead_targets) > 0
 
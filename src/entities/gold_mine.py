@@ -5,7 +5,6 @@
 继承自GameTile，与Building类平级
 """
 
-import time
 import math
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
@@ -14,6 +13,7 @@ from enum import Enum
 from .tile import GameTile
 from ..core.enums import TileType
 from ..core.constants import GameConstants
+from ..core.sim_clock import sim_time
 
 
 class GoldMineStatus(Enum):
@@ -98,7 +98,7 @@ class GoldMine(GameTile):
             return {'success': False, 'message': '金矿已被发现'}
 
         self.status = GoldMineStatus.DISCOVERED
-        self.discovery_time = time.time()
+        self.discovery_time = sim_time()
         self.tile_type = TileType.GOLD_VEIN
         self.is_dug = True
 
@@ -142,7 +142,7 @@ class GoldMine(GameTile):
         assignment = MiningAssignment(
             miner_id=miner_id,
             miner_name=miner_name,
-            assigned_time=time.time(),
+            assigned_time=sim_time(),
             mining_efficiency=efficiency
         )
         self.mining_assignments.append(assignment)
@@ -150,7 +150,7 @@ class GoldMine(GameTile):
         # 更新状态
         if self.status == GoldMineStatus.UNDISCOVERED:
             self.status = GoldMineStatus.DISCOVERED
-            self.discovery_time = time.time()
+            self.discovery_time = sim_time()
         elif self.status == GoldMineStatus.DISCOVERED:
             self.status = GoldMineStatus.BEING_MINED
 
@@ -226,7 +226,7 @@ class GoldMine(GameTile):
         # 更新金矿储量
         self.gold_amount -= mined_amount
         self.total_mined += mined_amount
-        self.last_mining_time = time.time()
+        self.last_mining_time = sim_time()
 
         # 检查是否耗尽
         depleted = False
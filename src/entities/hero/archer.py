@@ -6,7 +6,6 @@
 
 import math
 import random
-import time
 from typing import List, Dict, Optional, Tuple
 
 # 导入需要的类型和配置
@@ -17,6 +16,7 @@ from src.entities.heros import Hero
 from src.utils.logger import game_logger
 from src.managers.movement_system import MovementSystem
 from src.ui.status_indicator import StatusIndicator
+from src.core.sim_clock import sim_time
 
 
 class Archer(Hero):
@@ -58,7 +58,7 @@ class Archer(Hero):
 
     def _regenerate_arrows(self, delta_time: float):
         """恢复箭矢"""
-        current_time = time.time()
+        current_time = sim_time()
         if current_time - self.last_arrow_regen >= 1.0:  # 每秒恢复一次
             if self.arrow_count < self.max_arrows:
                 old_count = self.arrow_count
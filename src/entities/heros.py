@@ -17,6 +17,7 @@ from src.utils.logger import game_logger
 from src.managers.movement_system import MovementSystem
 from src.entities.creature import Creature
 from src.systems.skill_system import skill_manager
+from src.core.sim_clock import sim_time
 
 
 class Hero(Creature):
@@ -106,8 +107,7 @@ class Hero(Creature):
         Args:
             delta_time: 时间增量（秒）
         """
-        import time
-        current_time = time.time()
+        current_time = sim_time()
 
         # 更新搜索冷却时间
         if self.target_search_cooldown > 0:
@@ -341,8 +341,7 @@ class Hero(Creature):
             self.health = 0
 
         # 设置战斗状态
-        import time
-        current_time = time.time()
+        current_time = sim_time()
         self.in_combat = True
         self.last_combat_time = current_time
 
@@ -465,8 +464,7 @@ class Hero(Creature):
 
     def _regenerate_mana(self, delta_time: float):
         """恢复法力值"""
-        import time
-        current_time = time.time()
+        current_time = sim_time()
         if current_time - self.last_mana_regen >= 1.0:  # 每秒恢复一次
             if self.mana < self.max_mana:
                 old_mana = self.mana
@@ -5,7 +5,6 @@
 根据 BUILDING_SYSTEM.md 文档实现基础、专业、大师工程师
 """
 
-import time
 import math
 import random
 from typing import List, Dict, Optional, Tuple, Any
@@ -16,11 +15,12 @@ from src.core.constants import GameConstants
 from src.core.enums import TileType
 from src.core.game_state import Tile
 from src.entities.monsters import Monster
-from src.entities.building import BuildingStatus
+from src.entities.building import BuildingStatus, BuildingType
 from src.managers.movement_system import MovementSystem
 from src.managers.resource_manager import get_resource_manager
 from src.utils.logger import game_logger
 from src.ui.status_indicator import StatusIndicator
+from src.core.sim_clock import sim_time
 
 
 class EngineerType(Enum):
@@ -124,9 +124,9 @@ class Engineer(Monster):
         self.dungeon_heart_pos = None      # 主基地位置缓存
 
         # 时间管理
-        self.last_update_time = time.time()
+        self.last_update_time = sim_time()
         self.work_start_time = 0.0
-        self.idle_start_time = time.time()  # 空闲状态开始时间
+        self.idle_start_time = sim_time()  # 空闲状态开始时间
         self.last_building_search_time = 0.0  # 上次查找建筑的时间
         self.waiting_start_time = 0.0  # 等待状态开始时间
         self.waiting_timeout = 5.0  # 等待超时时间（秒）
@@ -150,7 +150,7 @@ class Engineer(Monster):
         # 首先调用父类的update方法，包含状态切换器
         super().update(delta_time, creatures or [], game_map, effect_manager)
 
-        current_time = time.time()
+        current_time = sim_time()
         delta_seconds = delta_time  # 游戏系统已统一使用秒为单位
 
         # 设置游戏实例引用（从building_manager获取，仅在未设置时）
@@ -204,7 +204,7 @@ class Engineer(Monster):
 
         # 如果状态发生变化，重置空闲时间
         if result.get('status_changed', False):
-            self.idle_start_time = time.time()
+            self.idle_start_time = sim_time()
 
         # 管理空闲状态（使用全局管理器，但保留原有的1秒超时逻辑作为备用）
         self._manage_idle_state(game_instance)
@@ -251,7 +251,7 @@ class Engineer(Monster):
                 'building': building,
                 'type': 'construction',
                 'priority': priority,
-                'start_time': time.time()
+                'start_time': sim_time()
             })
             # 将工程师添加到建筑的分配列表中（避免重复添加）
             if self not in building.assigned_engineers:
@@ -575,7 +575,7 @@ class Engineer(Monster):
                                 f"🔨 {self.name} 开始建造 {self.target_building.name} (默认)")
                             self.status = EngineerStatus.CONSTRUCTING
 
-                        self.work_start_time = time.time()
+                        self.work_start_time = sim_time()
                         self.work_progress = 0.0
                         # 将工程师添加到建筑的working_engineer列表中
                         if self not in self.target_building.working_engineer:
@@ -651,7 +651,7 @@ class Engineer(Monster):
             game_logger.info(f"   ⚡ 建造速度: {self.deposit_rate} 金币/秒")
 
         # 执行金币投入 - 直接处理建造逻辑
-        current_time = time.time()
+        current_time = sim_time()
         if self.last_deposit_time == 0:
             self.last_deposit_time = current_time
 
@@ -822,7 +822,7 @@ class Engineer(Monster):
         # 执行金币投入（转换为弹药）- 使用建筑的专门装填API
         if hasattr(self.target_building, 'accept_ammunition_reload'):
             # 计算本次可以存放的金币数量
-            current_time = time.time()
+            current_time = sim_time()
             if self.last_deposit_time == 0:
                 self.last_deposit_time = current_time
 
@@ -904,11 +904,11 @@ class Engineer(Monster):
 
         # 初始化工作开始时间（如果没有的话或者为None）
         if not hasattr(self, 'gold_deposit_start_time') or self.gold_deposit_start_time is None:
-            self.gold_deposit_start_time = time.time()
+            self.gold_deposit_start_time = sim_time()
             game_logger.info(f"💰 {self.name} 开始金币存储工作，需要工作2秒钟")
 
         # 检查是否已经工作了2秒钟
-        current_time = time.time()
+        current_time = sim_time()
         work_duration = current_time - self.gold_deposit_start_time
         required_work_time = 2.0  # 需要工作2秒钟
 
@@ -1025,7 +1025,7 @@ class Engineer(Monster):
             game_logger.info(f"   💼 工程师携带: {self.carried_gold} 金币")
             game_logger.info(f"   ⚡ 修理速度: {self.deposit_rate} 金币/秒")
 
-        current_time = time.time()
+        current_time = sim_time()
         if self.last_deposit_time == 0:
             self.last_deposit_time = current_time
 
@@ -1421,40 +1421,23 @@ class Engineer(Monster):
 
     def _find_nearest_storage(self) -> Optional[Dict[str, Any]]:
         """寻找最近的存储点（仅金库或主基地）"""
-        # 寻找金库
-        nearest_treasury = None
-        min_distance = float('inf')
-
-        if hasattr(self, 'game_instance') and self.game_instance:
-            # 检查建筑管理器中的金库
-            if hasattr(self.game_instance, 'building_manager'):
-                for building in self.game_instance.building_manager.buildings:
-                    # 只选择金库（treasury）
-                    if (hasattr(building, 'building_type') and
-                        building.building_type.value == 'treasury' and
-                            building.is_active and not building.is_full()):
-
-                        # Building的x,y已经是像素坐标
-                        building_pixel_x = building.x
-                        building_pixel_y = building.y
-
-                        dx = building_pixel_x - self.x
-                        dy = building_pixel_y - self.y
-                        distance = math.sqrt(dx * dx + dy * dy)
-
-                        if distance < min_distance:
-                            min_distance = distance
-                            nearest_treasury = {
-                                'type': 'treasury',
-                                'building': building,
-                                'x': building_pixel_x,
-                                'y': building_pixel_y,
-                                'distance': distance
-                            }
-
-        # 如果找到金库且距离合理，优先选择金库
-        if nearest_treasury and min_distance < 200:  # 200像素内优先选择金库
-            return nearest_treasury
+        # 首先从建筑空间网格中查找200像素内最近的未满金库
+        building_manager = getattr(getattr(self, 'game_instance', None), 'building_manager', None)
+        if building_manager:
+            treasury = building_manager.find_nearest_building(
+                self.x, self.y, BuildingType.TREASURY, max_radius=200,
+                predicate=lambda building: building.is_active and not building.is_full())
+            if treasury:
+                # Building的x,y已经是像素坐标
+                distance = math.hypot(treasury.x - self.x, treasury.y - self.y)
+                if distance < 200:  # 200像素内优先选择金库
+                    return {
+                        'type': 'treasury',
+                        'building': treasury,
+                        'x': treasury.x,
+                        'y': treasury.y,
+                        'distance': distance
+                    }
 
         # 否则选择主基地
         dungeon_heart_positions = self._get_dungeon_heart_position()
@@ -6,7 +6,6 @@
 """
 
 import math
-import time
 from typing import List, Dict, Optional, Tuple, Any
 from enum import Enum
 
@@ -14,12 +13,14 @@ from src.core.constants import GameConstants
 from src.core.enums import TileType
 from src.core.game_state import Tile
 from src.entities.monsters import Monster
+from src.entities.building import BuildingType
 from src.utils.logger import game_logger
 from src.managers.movement_system import MovementSystem
 from src.systems.reachability_system import get_reachability_system
 from src.managers.gold_mine_manager import get_gold_mine_manager
 from src.managers.optimized_mining_system import get_optimized_mining_system, MiningEventType
 from src.ui.status_indicator import StatusIndicator
+from src.core.sim_clock import sim_time
 
 
 class WorkerStatus(Enum):
@@ -150,9 +151,9 @@ class GoblinWorker(Monster):
                 distance = math.sqrt(dx * dx + dy * dy)
 
                 if distance > 20:  # 恢复正常的交互范围
-                    # 还没到达，使用新的分离式寻路+移动系统
+                    # 还没到达，沿存储点的共享流场寻路（所有返回同一存储点的苦工共用一张流场）
                     MovementSystem.pathfind_and_move(
-                        self, target_pos, delta_time, game_map, "A_STAR", 1.0)
+                        self, target_pos, delta_time, game_map, "FLOW_FIELD", 1.0)
                 else:
                     # 到达存储点，存储金币
                     self._deposit_gold_to_storage(storage_target)
@@ -165,8 +166,7 @@ class GoblinWorker(Monster):
         # 优先级4: 挖掘金矿
         if not self.mining_target:
             # 检查目标切换冷却时间
-            import time
-            current_time = time.time()
+            current_time = sim_time()
             if current_time - self._last_target_switch_time > 0.2:  # 状态冷却优化到0.2秒，提高响应速度
                 self.mining_target = self._find_best_reachable_gold_vein(
                     game_map)
@@ -339,8 +339,7 @@ class GoblinWorker(Monster):
                             old_target = self.mining_target
 
                             # 检查目标切换冷却时间
-                            import time
-                            current_time = time.time()
+                            current_time = sim_time()
                             if current_time - self._last_target_switch_time > 0.2:  # 保持0.2秒冷却时间，避免过于频繁切换
                                 self.mining_target = self._find_best_reachable_gold_vein(
                                     game_map)
@@ -360,8 +359,7 @@ class GoblinWorker(Monster):
             self.state = WorkerStatus.WANDERING.value
 
             # 在游荡时也要检查是否有可用的金矿（高频检查，支持中断）
-            import time
-            current_time = time.time()
+            current_time = sim_time()
             if current_time - self._last_target_switch_time > 0.2:  # 游荡时寻找目标冷却优化到0.2秒，提高响应速度
                 new_target = self._find_best_reachable_gold_vein(game_map)
                 if new_target:
@@ -374,8 +372,7 @@ class GoblinWorker(Monster):
             # 定义中断检查函数
             def check_for_work_interrupt():
                 """检查是否有工作机会需要中断游荡"""
-                import time
-                interrupt_time = time.time()
+                interrupt_time = sim_time()
                 if interrupt_time - self._last_target_switch_time > 0.1:  # 更短的冷却时间，支持快速响应
                     new_target = self._find_best_reachable_gold_vein(game_map)
                     if new_target:
@@ -481,23 +478,24 @@ class GoblinWorker(Monster):
         game_logger.info(
             f"🗺️ 可达性系统统计: 可达瓦片={reachability_stats['reachable_tiles_count']}, 主基地位置={reachability_stats['base_position']}")
 
-        # 获取可达的金矿（综合优化）
-        reachable_veins = mining_system.get_reachable_gold_mines(game_map)
+        # 获取当前苦工位置
+        current_tile_x = int(self.x // GameConstants.TILE_SIZE)
+        current_tile_y = int(self.y // GameConstants.TILE_SIZE)
+        search_radius = 15  # 搜索半径
+
+        # 获取搜索半径内可达的金矿（综合优化，金矿注册表按空间查询）
+        reachable_veins = mining_system.get_reachable_gold_mines_near(
+            game_map, current_tile_x, current_tile_y, search_radius)
 
         game_logger.info(
-            f"🔍 苦工 {self.name} 寻找金矿: 找到 {len(reachable_veins)} 个可达金矿")
+            f"🔍 苦工 {self.name} 寻找金矿: 搜索半径内找到 {len(reachable_veins)} 个可达金矿")
 
         if not reachable_veins:
             game_logger.info(f"❌ 苦工 {self.name} 没有找到可达的金矿")
             return None
 
-        # 获取当前苦工位置
-        current_tile_x = int(self.x // GameConstants.TILE_SIZE)
-        current_tile_y = int(self.y // GameConstants.TILE_SIZE)
-
         # 收集候选金矿
         candidate_veins = []
-        search_radius = 15  # 搜索半径
 
         for x, y, gold_amount in reachable_veins:
             # 使用欧几里得距离计算
@@ -653,38 +651,23 @@ class GoblinWorker(Monster):
 
     def _find_nearest_storage(self, game_map: List[List[Tile]]) -> Optional[Dict[str, Any]]:
         """寻找最近的存储点（金库或主基地）"""
-        # 首先寻找金库
-        nearest_treasury = None
-        min_distance = float('inf')
-
-        if hasattr(self, 'game_instance') and self.game_instance:
-            # 检查建筑管理器中的金库
-            if hasattr(self.game_instance, 'building_manager'):
-                for building in self.game_instance.building_manager.buildings:
-                    if (hasattr(building, 'building_type') and
-                        building.building_type.value == 'treasury' and
-                            building.is_active and not building.is_full()):
-                        # Building的x,y已经是像素坐标
-                        building_pixel_x = building.x
-                        building_pixel_y = building.y
-
-                        dx = building_pixel_x - self.x
-                        dy = building_pixel_y - self.y
-                        distance = math.sqrt(dx * dx + dy * dy)
-
-                        if distance < min_distance:
-                            min_distance = distance
-                            nearest_treasury = {
-                                'type': 'treasury',
-                                'building': building,
-                                'x': building_pixel_x,
-                                'y': building_pixel_y,
-                                'distance': distance
-                            }
-
-        # 如果找到金库且距离合理，优先选择金库
-        if nearest_treasury and min_distance < 300:  # 增加到300像素内优先选择金库，提高存储效率
-            return nearest_treasury
+        # 首先从建筑空间网格中查找300像素内最近的未满金库
+        building_manager = getattr(getattr(self, 'game_instance', None), 'building_manager', None)
+        if building_manager:
+            treasury = building_manager.find_nearest_building(
+                self.x, self.y, BuildingType.TREASURY, max_radius=300,
+                predicate=lambda building: building.is_active and not building.is_full())
+            if treasury:
+                # Building的x,y已经是像素坐标
+                distance = math.hypot(treasury.x - self.x, treasury.y - self.y)
+                if distance < 300:  # 增加到300像素内优先选择金库，提高存储效率
+                    return {
+                        'type': 'treasury',
+                        'building': treasury,
+                        'x': treasury.x,
+                        'y': treasury.y,
+                        'distance': distance
+                    }
 
         # 否则选择主基地
         dungeon_heart_positions = self._get_dungeon_heart_position(game_map)
@@ -832,7 +815,7 @@ class GoblinWorker(Monster):
         self.state = WorkerStatus.MINING.value
 
         # 挖掘冷却时间检查 (每1秒挖掘一次)
-        current_time = time.time()
+        current_time = sim_time()
         if not hasattr(self, 'last_mining_time'):
             self.last_mining_time = current_time
 
@@ -1004,7 +987,8 @@ class GoblinWorker(Monster):
 
         # 更新WorkerAssigner
         result = self.worker_assigner.update(
-            workers, buildings, 0.016)  # 假设60FPS
+            workers, buildings, 0.016,  # 假设60FPS
+            getattr(game_instance, 'game_map', None))
 
         # 检查是否有新任务分配
         if result.get('tasks_assigned', 0) > 0:
@@ -6,7 +6,6 @@
 
 import math
 import random
-import time
 from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 
 # 导入需要的类型和配置
@@ -17,6 +16,7 @@ from src.entities.monsters import Monster
 from src.utils.logger import game_logger
 from src.managers.movement_system import MovementSystem
 from src.ui.status_indicator import StatusIndicator
+from src.core.sim_clock import sim_time
 
 if TYPE_CHECKING:
     from src.entities.creature import Creature
@@ -87,7 +87,7 @@ class Imp(Monster):
             self.current_target = self._find_nearest_hero(heroes, 150)
             if self.current_target:
                 self.state = 'hunting'
-                self.target_last_seen_time = time.time()
+                self.target_last_seen_time = sim_time()
 
         if self.current_target:
             # 计算到目标的距离
@@ -5,7 +5,6 @@
 参考骑士的属性设计，具有强大的近战攻击能力
 """
 
-import time
 import math
 import random
 from enum import Enum
@@ -15,6 +14,7 @@ from src.core.constants import GameConstants
 from src.core.enums import CreatureType
 from src.utils.logger import game_logger
 from src.managers.movement_system import MovementSystem
+from src.core.sim_clock import sim_time
 
 if TYPE_CHECKING:
     from src.entities.creature import Creature
@@ -97,7 +97,7 @@ class OrcWarrior(Monster):
     def _manage_idle_state(self, game_instance=None):
         """管理空闲状态 - 与IdleStateManager兼容"""
         if not hasattr(self, '_idle_start_time'):
-            self._idle_start_time = time.time()
+            self._idle_start_time = sim_time()
 
         # 检查是否处于空闲状态（没有目标且不在攻击）
         is_idle = (not self.target and
@@ -105,7 +105,7 @@ class OrcWarrior(Monster):
 
         if not is_idle:
             # 重置空闲时间
-            self._idle_start_time = time.time()
+            self._idle_start_time = sim_time()
 
     def _update_orc_behavior(self, delta_time: float, game_map: List, heroes: List, game_instance=None):
         """更新兽人战士的行为逻辑"""
@@ -389,7 +389,7 @@ class OrcWarrior(Monster):
 
     def get_attack_status(self) -> Dict[str, Any]:
         """获取攻击状态信息"""
-        current_time = time.time()
+        current_time = sim_time()
         time_since_last_attack = current_time - \
             self.last_attack if self.last_attack > 0 else 0
         cooldown_remaining = max(
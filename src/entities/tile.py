@@ -8,7 +8,9 @@ from dataclasses import dataclass
 from typing import Optional, Tuple, List, Any
 from ..core.enums import TileType
 from ..core.constants import GameConstants
+from ..core.map_grid import TILE_TYPES, TILE_TYPE_CODES
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
 # 延迟导入Building类，避免循环导入
 
 
@@ -33,123 +35,15 @@ class TileBuilding:
     just_rerendered: bool = False  # 是否刚刚重新渲染过
 
 
-class GameTile:
-    """游戏瓦块类 - 统一管理瓦块的所有属性和功能，兼容Tile类接口"""
-
-    def __init__(self, x: int = 0, y: int = 0, tile_type: TileType = None, tile_size: int = None, **kwargs):
-        """
-        初始化瓦块
+class BaseTile:
+    """
+    瓦块行为基类 - 只包含方法，不持有存储
 
-        Args:
-            x, y: 瓦块坐标（瓦块单位）
-            tile_type: 瓦块类型
-            tile_size: 瓦块大小（像素），如果为None则使用游戏常量
-            **kwargs: 其他属性，用于兼容Tile类
-        """
-        self.x = x
-        self.y = y
-        self.tile_type = tile_type or TileType.ROCK
-        self.tile_size = tile_size or GameConstants.TILE_SIZE
-
-        # 瓦块状态
-        self.is_dug = False  # 是否已挖掘
-
-        # 资源信息
-        self.resource = TileResource()
+    GameTile 把状态存放在实例属性中；GridTile 是没有 __dict__ 的 MapGrid 视图，
+    两者共用这里的接口。
+    """
 
-        # 建筑信息
-        self.building = TileBuilding()
-
-        # 可达性标记
-        self.is_reachable_from_base = False  # 是否可以从主基地到达
-        self.reachability_checked = False  # 是否已检查过可达性
-        self.last_reachability_check = 0.0  # 上次检查可达性的时间戳
-
-        # 瓦块中心像素点（相对于地图的绝对坐标）
-        self._center_pixel_x = None
-        self._center_pixel_y = None
-        self._update_center_pixel()
-
-        # 兼容Tile类的属性
-        self._init_compatibility_attributes(kwargs)
-
-    @classmethod
-    def from_tile(cls, tile_data: dict, x: int = 0, y: int = 0, tile_size: int = None):
-        """
-        从Tile类数据创建GameTile实例
-
-        Args:
-            tile_data: Tile类的数据字典
-            x, y: 瓦块坐标
-            tile_size: 瓦块大小，如果为None则使用游戏常量
-        """
-        return cls(
-            x=x, y=y,
-            tile_type=tile_data.get('type', TileType.ROCK),
-            tile_size=tile_size or GameConstants.TILE_SIZE,
-            **tile_data
-        )
-
-    def __post_init__(self):
-        """初始化后处理，保持向后兼容性"""
-        # 同步属性
-        self._sync_from_internal()
-
-    def _init_compatibility_attributes(self, kwargs):
-        """初始化兼容Tile类的属性"""
-        # 从kwargs中获取Tile类的属性
-        self.room = kwargs.get('room', None)
-        self.room_type = kwargs.get('room_type', None)
-        self.gold_amount = kwargs.get('gold_amount', 0)
-        self.is_gold_vein = kwargs.get('is_gold_vein', False)
-        self.being_mined = kwargs.get('being_mined', False)
-        self.miners_count = kwargs.get('miners_count', 0)
-        self.is_incomplete = kwargs.get('is_incomplete', False)
-        self.needs_rerender = kwargs.get('needs_rerender', False)
-        self.just_rerendered = kwargs.get('just_rerendered', False)
-
-        # 同步到内部结构
-        self.resource.gold_amount = self.gold_amount
-        self.resource.is_gold_vein = self.is_gold_vein
-        self.resource.being_mined = self.being_mined
-        self.resource.miners_count = self.miners_count
-
-        self.building.room = self.room
-        self.building.room_type = self.room_type
-        self.building.is_incomplete = self.is_incomplete
-        self.building.needs_rerender = self.needs_rerender
-        self.building.just_rerendered = self.just_rerendered
-
-    def _update_center_pixel(self):
-        """更新瓦块中心像素点坐标"""
-        self._center_pixel_x = self.x * self.tile_size + self.tile_size // 2
-        self._center_pixel_y = self.y * self.tile_size + self.tile_size // 2
-
-    def _sync_to_internal(self):
-        """将兼容性属性同步到内部结构"""
-        self.resource.gold_amount = self.gold_amount
-        self.resource.is_gold_vein = self.is_gold_vein
-        self.resource.being_mined = self.being_mined
-        self.resource.miners_count = self.miners_count
-
-        self.building.room = self.room
-        self.building.room_type = self.room_type
-        self.building.is_incomplete = self.is_incomplete
-        self.building.needs_rerender = self.needs_rerender
-        self.building.just_rerendered = self.just_rerendered
-
-    def _sync_from_internal(self):
-        """从内部结构同步到兼容性属性"""
-        self.gold_amount = self.resource.gold_amount
-        self.is_gold_vein = self.resource.is_gold_vein
-        self.being_mined = self.resource.being_mined
-        self.miners_count = self.resource.miners_count
-
-        self.room = self.building.room
-        self.room_type = self.building.room_type
-        self.is_incomplete = self.building.is_incomplete
-        self.needs_rerender = self.building.needs_rerender
-        self.just_rerendered = self.building.just_rerendered
+    __slots__ = ()
 
     @property
     def type(self) -> TileType:
@@ -369,17 +263,15 @@ class GameTile:
 
     def set_reachability(self, reachable: bool, check_time: float = None):
         """设置瓦块可达性状态"""
-        import time
         self.is_reachable_from_base = reachable
         self.reachability_checked = True
-        self.last_reachability_check = check_time or time.time()
+        self.last_reachability_check = check_time or sim_time()
 
     def needs_reachability_check(self, max_age: float = 5.0) -> bool:
         """检查是否需要重新检查可达性"""
-        import time
         if not self.reachability_checked:
             return True
-        return (time.time() - self.last_reachability_check) > max_age
+        return (sim_time() - self.last_reachability_check) > max_age
 
     def get_render_info(self) -> dict:
         """获取渲染信息"""
@@ -412,3 +304,400 @@ class GameTile:
         return (f"GameTile(x={self.x}, y={self.y}, type={self.tile_type.value}, "
                 f"center=({self._center_pixel_x},{self._center_pixel_y}), "
                 f"building={self.has_building()}, resource={self.has_resource()})")
+
+
+class GameTile(BaseTile):
+    """游戏瓦块类 - 统一管理瓦块的所有属性和功能，兼容Tile类接口"""
+
+    def __init__(self, x: int = 0, y: int = 0, tile_type: TileType = None, tile_size: int = None, **kwargs):
+        """
+        初始化瓦块
+
+        Args:
+            x, y: 瓦块坐标（瓦块单位）
+            tile_type: 瓦块类型
+            tile_size: 瓦块大小（像素），如果为None则使用游戏常量
+            **kwargs: 其他属性，用于兼容Tile类
+        """
+        self.x = x
+        self.y = y
+        self.tile_type = tile_type or TileType.ROCK
+        self.tile_size = tile_size or GameConstants.TILE_SIZE
+
+        # 瓦块状态
+        self.is_dug = False  # 是否已挖掘
+
+        # 资源信息
+        self.resource = TileResource()
+
+        # 建筑信息
+        self.building = TileBuilding()
+
+        # 可达性标记
+        self.is_reachable_from_base = False  # 是否可以从主基地到达
+        self.reachability_checked = False  # 是否已检查过可达性
+        self.last_reachability_check = 0.0  # 上次检查可达性的时间戳
+
+        # 瓦块中心像素点（相对于地图的绝对坐标）
+        self._center_pixel_x = None
+        self._center_pixel_y = None
+        self._update_center_pixel()
+
+        # 兼容Tile类的属性
+        self._init_compatibility_attributes(kwargs)
+
+    @classmethod
+    def from_tile(cls, tile_data: dict, x: int = 0, y: int = 0, tile_size: int = None):
+        """
+        从Tile类数据创建GameTile实例
+
+        Args:
+            tile_data: Tile类的数据字典
+            x, y: 瓦块坐标
+            tile_size: 瓦块大小，如果为None则使用游戏常量
+        """
+        return cls(
+            x=x, y=y,
+            tile_type=tile_data.get('type', TileType.ROCK),
+            tile_size=tile_size or GameConstants.TILE_SIZE,
+            **tile_data
+        )
+
+    def __post_init__(self):
+        """初始化后处理，保持向后兼容性"""
+        # 同步属性
+        self._sync_from_internal()
+
+    def _init_compatibility_attributes(self, kwargs):
+        """初始化兼容Tile类的属性"""
+        # 从kwargs中获取Tile类的属性
+        self.room = kwargs.get('room', None)
+        self.room_type = kwargs.get('room_type', None)
+        self.gold_amount = kwargs.get('gold_amount', 0)
+        self.is_gold_vein = kwargs.get('is_gold_vein', False)
+        self.being_mined = kwargs.get('being_mined', False)
+        self.miners_count = kwargs.get('miners_count', 0)
+        self.is_incomplete = kwargs.get('is_incomplete', False)
+        self.needs_rerender = kwargs.get('needs_rerender', False)
+        self.just_rerendered = kwargs.get('just_rerendered', False)
+
+        # 同步到内部结构
+        self.resource.gold_amount = self.gold_amount
+        self.resource.is_gold_vein = self.is_gold_vein
+        self.resource.being_mined = self.being_mined
+        self.resource.miners_count = self.miners_count
+
+        self.building.room = self.room
+        self.building.room_type = self.room_type
+        self.building.is_incomplete = self.is_incomplete
+        self.building.needs_rerender = self.needs_rerender
+        self.building.just_rerendered = self.just_rerendered
+
+    def _update_center_pixel(self):
+        """更新瓦块中心像素点坐标"""
+        self._center_pixel_x = self.x * self.tile_size + self.tile_size // 2
+        self._center_pixel_y = self.y * self.tile_size + self.tile_size // 2
+
+    def _sync_to_internal(self):
+        """将兼容性属性同步到内部结构"""
+        self.resource.gold_amount = self.gold_amount
+        self.resource.is_gold_vein = self.is_gold_vein
+        self.resource.being_mined = self.being_mined
+        self.resource.miners_count = self.miners_count
+
+        self.building.room = self.room
+        self.building.room_type = self.room_type
+        self.building.is_incomplete = self.is_incomplete
+        self.building.needs_rerender = self.needs_rerender
+        self.building.just_rerendered = self.just_rerendered
+
+    def _sync_from_internal(self):
+        """从内部结构同步到兼容性属性"""
+        self.gold_amount = self.resource.gold_amount
+        self.is_gold_vein = self.resource.is_gold_vein
+        self.being_mined = self.resource.being_mined
+        self.miners_count = self.resource.miners_count
+
+        self.room = self.building.room
+        self.room_type = self.building.room_type
+        self.is_incomplete = self.building.is_incomplete
+        self.needs_rerender = self.building.needs_rerender
+        self.just_rerendered = self.building.just_rerendered
+
+
+
+class TileResourceView:
+    """瓦块资源视图 - 与 TileResource 接口相同，数据存放在 MapGrid 数组中"""
+
+    __slots__ = ('_tile',)
+
+    def __init__(self, tile: 'GridTile'):
+        self._tile = tile
+
+    @property
+    def gold_amount(self) -> int:
+        return self._tile.gold_amount
+
+    @gold_amount.setter
+    def gold_amount(self, value: int):
+        self._tile.gold_amount = value
+
+    @property
+    def is_gold_vein(self) -> bool:
+        return self._tile.is_gold_vein
+
+    @is_gold_vein.setter
+    def is_gold_vein(self, value: bool):
+        self._tile.is_gold_vein = value
+
+    @property
+    def being_mined(self) -> bool:
+        return self._tile.being_mined
+
+    @being_mined.setter
+    def being_mined(self, value: bool):
+        self._tile.being_mined = value
+
+    @property
+    def miners_count(self) -> int:
+        return self._tile.miners_count
+
+    @miners_count.setter
+    def miners_count(self, value: int):
+        self._tile.miners_count = value
+
+    @property
+    def is_depleted(self) -> bool:
+        tile = self._tile
+        return tile._grid.get_extra(tile._i, 'is_depleted', False)
+
+    @is_depleted.setter
+    def is_depleted(self, value: bool):
+        tile = self._tile
+        tile._grid.set_extra(tile._i, 'is_depleted', value, False)
+
+
+class TileBuildingView:
+    """瓦块建筑视图 - 与 TileBuilding 接口相同，数据存放在 MapGrid 中"""
+
+    __slots__ = ('_tile',)
+
+    def __init__(self, tile: 'GridTile'):
+        self._tile = tile
+
+    @property
+    def building(self) -> Optional[Any]:
+        tile = self._tile
+        return tile._grid.get_building(tile._i)
+
+    @building.setter
+    def building(self, value: Optional[Any]):
+        tile = self._tile
+        tile._grid.set_building(tile._i, value)
+
+    @property
+    def room(self) -> Optional[str]:
+        return self._tile.room
+
+    @room.setter
+    def room(self, value: Optional[str]):
+        self._tile.room = value
+
+    @property
+    def room_type(self) -> Optional[str]:
+        return self._tile.room_type
+
+    @room_type.setter
+    def room_type(self, value: Optional[str]):
+        self._tile.room_type = value
+
+    @property
+    def is_incomplete(self) -> bool:
+        return self._tile.is_incomplete
+
+    @is_incomplete.setter
+    def is_incomplete(self, value: bool):
+        self._tile.is_incomplete = value
+
+    @property
+    def needs_rerender(self) -> bool:
+        return self._tile.needs_rerender
+
+    @needs_rerender.setter
+    def needs_rerender(self, value: bool):
+        self._tile.needs_rerender = value
+
+    @property
+    def just_rerendered(self) -> bool:
+        return self._tile.just_rerendered
+
+    @just_rerendered.setter
+    def just_rerendered(self, value: bool):
+        self._tile.just_rerendered = value
+
+
+def _extra_property(name: str, default: Any = None):
+    """创建存放在 MapGrid 稀疏字典中的属性"""
+
+    def getter(self):
+        return self._grid.get_extra(self._i, name, default)
+
+    def setter(self, value):
+        self._grid.set_extra(self._i, name, value, default)
+
+    return property(getter, setter)
+
+
+def _array_property(field: str, cast, notify: bool = False):
+    """创建存放在 MapGrid 数组中的属性（notify 为 True 时写入会通知网格的变化监听器）"""
+
+    def getter(self):
+        return cast(getattr(self._grid, field)[self._i])
+
+    if notify:
+        def setter(self, value):
+            grid = self._grid
+            getattr(grid, field)[self._i] = value
+            if grid._change_listeners:
+                grid.notify_tile_changed(self._i)
+    else:
+        def setter(self, value):
+            getattr(self._grid, field)[self._i] = value
+
+    return property(getter, setter)
+
+
+class GridTile(BaseTile):
+    """
+    网格瓦块视图 - 由 MapGrid 创建的瓦块
+
+    不持有任何状态，所有属性读写都落在 MapGrid 的数组（热点属性）或稀疏字典（其他属性）上，
+    resource / building 的兼容属性与内部结构共享同一份数据，不再需要同步。
+
+    视图没有 __dict__，由 MapGrid.tile() 按需创建、用完即弃；resource / building 子视图
+    在访问时才创建。同一格子的两个视图相等（==）且哈希相同，但不保证是同一个对象。
+    """
+
+    __slots__ = ('_grid', '_i')
+
+    def __init__(self, grid, x: int, y: int):
+        # 不调用 GameTile.__init__：状态全部存放在网格中
+        object.__setattr__(self, '_grid', grid)
+        object.__setattr__(self, '_i', y * grid.width + x)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is GridTile:
+            return self._i == other._i and self._grid is other._grid
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._grid), self._i))
+
+    @property
+    def resource(self) -> TileResourceView:
+        return TileResourceView(self)
+
+    @property
+    def building(self) -> TileBuildingView:
+        return TileBuildingView(self)
+
+    # ==================== 坐标（只读） ====================
+
+    @property
+    def x(self) -> int:
+        return self._i % self._grid.width
+
+    @property
+    def y(self) -> int:
+        return self._i // self._grid.width
+
+    @property
+    def tile_size(self) -> int:
+        return self._grid.tile_size
+
+    @property
+    def _center_pixel_x(self) -> int:
+        return self.x * self._grid.tile_size + self._grid.tile_size // 2
+
+    @property
+    def _center_pixel_y(self) -> int:
+        return self.y * self._grid.tile_size + self._grid.tile_size // 2
+
+    # ==================== 数组属性 ====================
+
+    @property
+    def tile_type(self) -> TileType:
+        return TILE_TYPES[self._grid.tile_type[self._i]]
+
+    @tile_type.setter
+    def tile_type(self, value: TileType):
+        grid = self._grid
+        grid.tile_type[self._i] = TILE_TYPE_CODES[value]
+        if grid._change_listeners:
+            grid.notify_tile_changed(self._i)
+
+    is_dug = _array_property('is_dug', bool, notify=True)
+    gold_amount = _array_property('gold_amount', int, notify=True)
+    is_gold_vein = _array_property('is_gold_vein', bool, notify=True)
+    being_mined = _array_property('being_mined', bool, notify=True)
+    miners_count = _array_property('miners_count', int, notify=True)
+    is_reachable_from_base = _array_property('reachable', bool)
+    reachability_checked = _array_property('reachability_checked', bool)
+    last_reachability_check = _array_property('last_reachability_check', float)
+
+    # ==================== 稀疏属性 ====================
+
+    room = _extra_property('room')
+    room_type = _extra_property('room_type')
+    is_incomplete = _extra_property('is_incomplete', False)
+    needs_rerender = _extra_property('needs_rerender', False)
+    just_rerendered = _extra_property('just_rerendered', False)
+
+    def __getattr__(self, name: str):
+        """读取动态属性（如 gold_mine_data）"""
+        if not name.startswith('_'):
+            extras = self._grid.extras.get(self._i)
+            if extras is not None and name in extras:
+                return extras[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name: str, value: Any):
+        """类属性（property）照常设置，其他动态属性存放到稀疏字典"""
+        if name.startswith('_') or hasattr(type(self), name):
+            object.__setattr__(self, name, value)
+        else:
+            extras = self._grid.extras.get(self._i)
+            if extras is None:
+                extras = self._grid.extras[self._i] = {}
+            extras[name] = value
+
+    def __delattr__(self, name: str):
+        extras = self._grid.extras.get(self._i)
+        if extras is None or name not in extras:
+            raise AttributeError(name)
+        del extras[name]
+
+    # 数据与兼容属性共享存储，无需同步
+    def _update_center_pixel(self):
+        pass
+
+    def _sync_to_internal(self):
+        pass
+
+    def _sync_from_internal(self):
+        pass
+
+
+# 热路径上绕过 __init__ 和自定义 __setattr__，直接写槽位创建视图
+_new_object = object.__new__
+_set_view_grid = GridTile._grid.__set__
+_set_view_index = GridTile._i.__set__
+
+
+def make_grid_tile(grid, i: int) -> GridTile:
+    """按数组下标创建网格瓦块视图（供 MapGrid 逐格访问使用）"""
+    view = _new_object(GridTile)
+    _set_view_grid(view, grid)
+    _set_view_index(view, i)
+    return view
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工程师分配策略基准测试
+在带墙体的大地图上随机放置受损的箭塔（修理任务）和工程师，分别用指定策略执行一个分配周期，
+按路径距离统计被分配工程师的总移动时间，比较贪心策略（BALANCED 等）与全局最优匹配（OPTIMAL）。
+
+使用方法:
+    python -m src.managers.assignment_benchmark --runs 10 --engineers 12 --buildings 40
+    python -m src.managers.assignment_benchmark --strategy nearest_first --strategy optimal --output report.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+def run_assignment_round(seed: int, strategies: List[str], engineers: int, buildings: int,
+                         map_width: int, map_height: int) -> Dict[str, Dict[str, float]]:
+    """
+    构建一个随机场景，并用每种策略各执行一次分配
+
+    Returns:
+        Dict: 策略名 -> {assigned, total_travel, mean_travel, max_travel, cold_ms, warm_ms}
+    """
+    from src.core.constants import GameConstants
+    from src.core.enums import TileType
+    from src.managers.auto_assigner import AssignmentStrategy, EngineerAssigner
+    from src.managers.batch_simulation_runner import reset_global_state
+    from src.managers.game_environment_simulator import GameEnvironmentSimulator
+    from src.managers.task_matching import TravelCostField
+    from src.entities.monster.goblin_engineer import EngineerStatus
+
+    reset_global_state()
+    rng = random.Random(seed)
+    tile_size = GameConstants.TILE_SIZE
+    simulator = GameEnvironmentSimulator(map_width=map_width, map_height=map_height)
+    game_map = simulator.game_map
+
+    # 每隔一段距离放一道竖墙，只留两个缺口，路径距离与直线距离明显不同
+    for wall_x in range(8, map_width - 4, 10):
+        gaps = set(rng.sample(range(1, map_height - 1), 2))
+        for y in range(map_height):
+            if y not in gaps and y - 1 not in gaps:
+                game_map.set_type(wall_x, y, TileType.ROCK)
+
+    def random_ground_tile():
+        while True:
+            x, y = rng.randrange(map_width), rng.randrange(map_height)
+            if game_map.get_type(x, y) != TileType.ROCK:
+                return x, y
+
+    towers = []
+    for _ in range(buildings):
+        tower = simulator.create_arrow_tower(*random_ground_tile())
+        # 部分建筑低于30%生命值，产生 CRITICAL 和 HIGH 两种优先级的修理任务
+        tower.health = int(tower.max_health * rng.uniform(0.1, 0.9))
+        towers.append(tower)
+
+    units = []
+    for _ in range(engineers):
+        tile_x, tile_y = random_ground_tile()
+        units.append(simulator.create_engineer(tile_x * tile_size + tile_size // 2,
+                                               tile_y * tile_size + tile_size // 2))
+    start_positions = [(unit.x, unit.y) for unit in units]
+
+    def run_assigner(name: str, travel_costs: Optional[TravelCostField]):
+        for unit, (x, y) in zip(units, start_positions):
+            unit.x, unit.y = x, y
+            unit.status = EngineerStatus.IDLE
+            unit.target_building = None
+        assigner = EngineerAssigner(AssignmentStrategy(name))
+        assigner.travel_costs = travel_costs
+        assigner.last_assignment_time = float('-inf')
+        start = time.perf_counter()
+        assigner.update(units, towers, 0.1, game_map)
+        return assigner, (time.perf_counter() - start) * 1000
+
+    # 统计用的路径代价不受计算预算限制；热启动前所有任务建筑的流场都已缓存（建筑不动时的常态）
+    measure = TravelCostField(build_budget=None)
+    for tower in towers:
+        measure.travel_distance(tower.x, tower.y, tower, game_map)
+
+    results = {}
+    for name in strategies:
+        # 冷启动：流场按预算现场计算，其余任务暂用直线距离
+        _, cold_ms = run_assigner(name, None)
+        assigner, warm_ms = run_assigner(name, measure)
+
+        travel_times = [measure.travel_time(unit, task.building, game_map)
+                        for unit, task in assigner.assigned_tasks.items()]
+        results[name] = {
+            'assigned': len(travel_times),
+            'total_travel': sum(travel_times),
+            'mean_travel': statistics.mean(travel_times) if travel_times else 0.0,
+            'max_travel': max(travel_times) if travel_times else 0.0,
+            'cold_ms': cold_ms,
+            'warm_ms': warm_ms,
+        }
+    return results
+
+
+def summarize(rounds: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    """对多轮结果按策略求平均"""
+    summary = {}
+    for name in rounds[0]:
+        metrics = [round_result[name] for round_result in rounds]
+        summary[name] = {key: statistics.mean(metric[key] for metric in metrics)
+                         for key in metrics[0]}
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    from src.managers.auto_assigner import AssignmentStrategy
+    from src.managers.batch_simulation_runner import configure_headless_environment
+    from src.utils.logger import game_logger
+
+    parser = argparse.ArgumentParser(description="工程师分配策略基准测试")
+    parser.add_argument('--strategy', action='append',
+                        choices=[strategy.value for strategy in AssignmentStrategy],
+                        help="参与比较的策略，可重复指定（默认: balanced 与 optimal）")
+    parser.add_argument('--runs', type=int, default=10, help="随机场景数量")
+    parser.add_argument('--seed', type=int, default=0, help="起始随机种子")
+    parser.add_argument('--engineers', type=int, default=12, help="工程师数量")
+    parser.add_argument('--buildings', type=int, default=40, help="受损建筑数量")
+    parser.add_argument('--map-width', type=int, default=80, help="地图宽度（瓦片）")
+    parser.add_argument('--map-height', type=int, default=50, help="地图高度（瓦片）")
+    parser.add_argument('--output', type=str, default=None, help="报告输出路径（JSON）")
+    parser.add_argument('--verbose', action='store_true', help="保留游戏日志")
+    args = parser.parse_args(argv)
+
+    configure_headless_environment()
+    if not args.verbose:
+        game_logger.disable()
+
+    strategies = args.strategy or [AssignmentStrategy.BALANCED.value, AssignmentStrategy.OPTIMAL.value]
+    rounds = []
+    for run in range(args.runs):
+        rounds.append(run_assignment_round(args.seed + run, strategies, args.engineers,
+                                           args.buildings, args.map_width, args.map_height))
+    summary = summarize(rounds)
+    # 模拟过程中的游戏日志已静默，结果照常输出
+    game_logger.enable()
+
+    baseline = summary[strategies[0]]['total_travel']
+    for name in strategies:
+        metric = summary[name]
+        change = (metric['total_travel'] / baseline - 1.0) * 100 if baseline else 0.0
+        game_logger.info(f"📊 {name}: 分配 {metric['assigned']:.1f}, 总移动时间 {metric['total_travel']:.1f}s "
+                         f"({change:+.1f}%), 平均 {metric['mean_travel']:.1f}s, 最长 {metric['max_travel']:.1f}s, "
+                         f"分配耗时 冷启动 {metric['cold_ms']:.2f}ms / 热启动 {metric['warm_ms']:.2f}ms")
+
+    if args.output:
+        report = {'config': vars(args), 'summary': summary, 'runs': rounds}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        game_logger.info(f"📝 报告已保存: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
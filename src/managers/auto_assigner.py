@@ -3,9 +3,13 @@
 """
 工程师分配器
 统一管理工程师的任务分配和状态转换
+
+工程师任务板由建筑索引的事件驱动：建筑加入、状态变化、工作原因变化（生命值、弹药、
+金币越过阈值）时才重新评估该建筑，任务按建筑去重并放入按 TaskPriority 排列的优先队列，
+每帧的工作量与发生变化的建筑数量成正比，而不是与基地规模成正比。
 """
 
-import time
+import heapq
 import math
 import random
 from typing import List, Dict, Optional, Tuple, Any
@@ -17,6 +21,9 @@ from src.entities.monster.goblin_worker import GoblinWorker, WorkerStatus
 from src.core.constants import GameConstants
 from src.entities.building import BuildingType
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
+from src.managers.building_index import BuildingIndex, EVENT_REMOVED
+from src.managers.task_matching import TravelCostField, match_units_to_tasks
 
 
 class AssignmentStrategy(Enum):
@@ -25,6 +32,7 @@ class AssignmentStrategy(Enum):
     EFFICIENCY_FIRST = "efficiency_first"  # 效率优先
     RANDOM = "random"                     # 随机分配
     BALANCED = "balanced"                 # 平衡分配
+    OPTIMAL = "optimal"                   # 全局最优匹配（按路径移动时间批量求解）
 
 
 class TaskPriority(Enum):
@@ -55,7 +63,7 @@ class WorkTask:
         self.required_gold = required_gold
         self.estimated_duration = estimated_duration
         self.worker_type = worker_type  # 指定需要的工作单位类型
-        self.created_time = time.time()
+        self.created_time = sim_time()
         self.assigned_worker = None  # 分配的工作单位（工程师或苦工）
         self.is_completed = False
 
@@ -63,15 +71,36 @@ class WorkTask:
         return f"WorkTask({self.building.name}, {self.task_type}, {self.priority.name})"
 
 
+# 创建任务时的事件描述
+TASK_CREATED_MESSAGES = {
+    'construction': '创建建造任务',
+    'repair': '创建修理任务',
+    'reload': '创建装填任务',
+    'gold_deposit': '创建金币存储任务',
+}
+
+
 class EngineerAssigner:
     """工程师分配器 - 专门管理工程师的任务分配"""
 
     def __init__(self, strategy: AssignmentStrategy = AssignmentStrategy.BALANCED):
         self.strategy = strategy
-        self.work_tasks = []  # 待分配的任务列表
         self.assigned_tasks = {}  # 已分配的任务 {engineer: WorkTask}
         self.engineer_stats = {}  # 工程师统计信息 {engineer: stats}
 
+        # 任务板：每个建筑最多一个未完成任务 {building: WorkTask}
+        self._tasks_by_building: Dict[Building, WorkTask] = {}
+        # 待分配任务的优先队列 (优先级, -创建时间, 序号, 任务)，已分配/已移除的任务出队时跳过
+        self._task_queue: List[Tuple[int, float, int, WorkTask]] = []
+        self._task_sequence = 0
+        # 需要重新评估的建筑（由建筑索引事件填充）
+        self._dirty_buildings: Dict[Building, None] = {}
+        self._building_index: Optional[BuildingIndex] = None
+        self.buildings_evaluated = 0
+
+        # OPTIMAL 策略的路径代价缓存（首次使用时创建）
+        self.travel_costs: Optional[TravelCostField] = None
+
         # 分配配置
         self.max_retry_attempts = 3
         self.assignment_cooldown = 0.1  # 分配冷却时间（秒）- 减少到0.1秒
@@ -85,11 +114,48 @@ class EngineerAssigner:
             TaskPriority.LOW: 1.0,
             TaskPriority.TRAINING: 5.0   # 训练任务优先级
         }
+        # OPTIMAL 策略中优先级每低一级折算的移动时间（秒）
+        self.optimal_priority_seconds = 10.0
 
         game_logger.info(f"工程师分配器初始化完成 - 策略: {strategy.value}")
 
+    @property
+    def work_tasks(self) -> List[WorkTask]:
+        """当前未完成的任务列表"""
+        return list(self._tasks_by_building.values())
+
+    # ==================== 建筑事件 ====================
+
+    def attach_index(self, building_index: BuildingIndex):
+        """
+        订阅建筑索引的变化事件，之后只重新评估发生变化的建筑
+
+        Args:
+            building_index: 建筑管理器的建筑索引
+        """
+        if self._building_index is not None:
+            self._building_index.remove_listener(self._on_building_event)
+        self._building_index = building_index
+        building_index.add_listener(self._on_building_event)
+        self._dirty_buildings.update(dict.fromkeys(building_index))
+
+    def _on_building_event(self, event: str, building: Building, old: Any, new: Any):
+        """建筑索引事件：移除的建筑撤销未分配的任务，其余事件标记建筑待评估"""
+        if event != EVENT_REMOVED:
+            self._dirty_buildings[building] = None
+            return
+
+        self._dirty_buildings.pop(building, None)
+        task = self._tasks_by_building.get(building)
+        if task is not None and task.assigned_worker is None:
+            del self._tasks_by_building[building]
+
+    def mark_building_dirty(self, building: Building):
+        """标记建筑需要重新评估（建筑状态在索引之外发生变化时调用）"""
+        self._dirty_buildings[building] = None
+
     def update(self, engineers: List[Engineer], buildings: List[Building],
-               delta_time: float) -> Dict[str, Any]:
+               delta_time: float, game_map: List[List] = None) -> Dict[str, Any]:
         """
         更新分配器状态
 
@@ -97,6 +163,7 @@ class EngineerAssigner:
             engineers: 工程师列表
             buildings: 建筑列表
             delta_time: 时间增量
+            game_map: 游戏地图（OPTIMAL 策略按路径距离计算代价，没有地图时使用直线距离）
 
         Returns:
             Dict: 更新结果
@@ -109,22 +176,29 @@ class EngineerAssigner:
             'events': []
         }
 
-        # 1. 扫描建筑，创建工作任务
-        self._scan_buildings_for_tasks(buildings, result)
+        # 1. 重新评估发生变化的建筑，创建工作任务
+        if self._building_index is None:
+            # 没有接入建筑索引时每帧评估所有建筑
+            self._dirty_buildings.update(dict.fromkeys(buildings))
+        self._process_dirty_buildings(result)
 
         # 2. 检查分配冷却时间
-        current_time = time.time()
+        current_time = sim_time()
         if current_time - self.last_assignment_time < self.assignment_cooldown:
             return result
 
         # 3. 处理已完成的任务
         self._process_completed_tasks(engineers, result)
 
-        # 4. 重新分配空闲工程师
-        self._reassign_idle_engineers(engineers, result)
+        if self.strategy == AssignmentStrategy.OPTIMAL:
+            # 4-5. 所有空闲工程师与待分配任务一次性匹配
+            self._assign_optimal(engineers, result, game_map)
+        else:
+            # 4. 重新分配空闲工程师
+            self._reassign_idle_engineers(engineers, result)
 
-        # 5. 分配新任务
-        self._assign_new_tasks(engineers, result)
+            # 5. 分配新任务
+            self._assign_new_tasks(engineers, result)
 
         # 6. 更新统计信息
         self._update_engineer_stats(engineers)
@@ -132,112 +206,123 @@ class EngineerAssigner:
         self.last_assignment_time = current_time
         return result
 
-    def _cleanup_invalid_tasks(self, buildings: List[Building], result: Dict[str, Any]):
-        """清理无效的任务（如地牢之心的金币存储任务）"""
-        invalid_tasks = []
-
-        for task in self.work_tasks:
-            if task.is_completed:
-                continue
-
-            # 检查地牢之心的金币存储任务
-            if (hasattr(task.building, 'building_type') and
-                task.building.building_type == BuildingType.DUNGEON_HEART and
-                    task.task_type == 'gold_deposit'):
-
-                # 检查地牢之心是否真的需要金币存储任务
-                if hasattr(task.building, 'get_engineer_task_type'):
-                    task_type = task.building.get_engineer_task_type()
-                    if task_type != 'gold_deposit':
-                        invalid_tasks.append(task)
-                        result['events'].append(
-                            f"清理无效任务: {task.building.name} ({task.task_type})")
-
-        # 移除无效任务
-        for task in invalid_tasks:
-            if task in self.work_tasks:
-                self.work_tasks.remove(task)
-            # 如果任务已分配给工作单位，取消分配
-            if task.assigned_worker:
-                task.assigned_worker.target_building = None
-                if isinstance(task.assigned_worker, Engineer):
-                    task.assigned_worker.status = EngineerStatus.IDLE
-                elif isinstance(task.assigned_worker, GoblinWorker):
-                    task.assigned_worker.state = WorkerStatus.IDLE.value
-                if task.assigned_worker in self.assigned_tasks:
-                    del self.assigned_tasks[task.assigned_worker]
-
-    def _scan_buildings_for_tasks(self, buildings: List[Building], result: Dict[str, Any]):
-        """扫描建筑，创建工作任务"""
-        # 首先清理无效的任务（如地牢之心的金币存储任务）
-        self._cleanup_invalid_tasks(buildings, result)
-
-        for building in buildings:
-            # 检查是否已有相同建筑的任务
-            existing_tasks = [task for task in self.work_tasks
-                              if task.building == building and not task.is_completed]
-            if existing_tasks:
-                continue
-
-            # 创建建造任务
-            if building.status == BuildingStatus.PLANNING:
-                required_gold = self._calculate_construction_gold(building)
-                task = WorkTask(
-                    building=building,
-                    task_type='construction',
-                    priority=TaskPriority.HIGH,
-                    required_gold=required_gold,
-                    estimated_duration=building.build_time
-                )
-                self.work_tasks.append(task)
-                result['tasks_created'] += 1
-                result['events'].append(f"创建建造任务: {building.name}")
-
-            # 创建修理任务
-            elif (building.status == BuildingStatus.COMPLETED and
-                  building.health < building.max_health):
-                required_gold = self._calculate_repair_gold(building)
-                priority = TaskPriority.CRITICAL if building.health < building.max_health * \
-                    0.3 else TaskPriority.HIGH
-                task = WorkTask(
-                    building=building,
-                    task_type='repair',
-                    priority=priority,
-                    required_gold=required_gold,
-                    estimated_duration=required_gold * 0.1  # 估算修理时间
-                )
-                self.work_tasks.append(task)
-                result['tasks_created'] += 1
-                result['events'].append(f"创建修理任务: {building.name}")
+    def _is_invalid_task(self, task: WorkTask) -> bool:
+        """检查任务是否已失效（如地牢之心的金币存储任务）"""
+        if (task.building.building_type == BuildingType.DUNGEON_HEART and
+                task.task_type == 'gold_deposit'):
+            # 检查地牢之心是否真的需要金币存储任务
+            if hasattr(task.building, 'get_engineer_task_type'):
+                return task.building.get_engineer_task_type() != 'gold_deposit'
+        return False
 
-            # 创建装填任务
-            elif self._needs_reload(building):
-                required_gold = self._calculate_reload_gold(building)
-                task = WorkTask(
-                    building=building,
-                    task_type='reload',
-                    priority=TaskPriority.NORMAL,
-                    required_gold=required_gold,
-                    estimated_duration=required_gold * 0.05
-                )
-                self.work_tasks.append(task)
+    def _remove_invalid_task(self, task: WorkTask, result: Dict[str, Any]):
+        """移除失效任务，已分配给工作单位时取消分配"""
+        if self._tasks_by_building.get(task.building) is task:
+            del self._tasks_by_building[task.building]
+        result['events'].append(f"清理无效任务: {task.building.name} ({task.task_type})")
+
+        if task.assigned_worker:
+            task.assigned_worker.target_building = None
+            if isinstance(task.assigned_worker, Engineer):
+                task.assigned_worker.status = EngineerStatus.IDLE
+            elif isinstance(task.assigned_worker, GoblinWorker):
+                task.assigned_worker.state = WorkerStatus.IDLE.value
+            if task.assigned_worker in self.assigned_tasks:
+                del self.assigned_tasks[task.assigned_worker]
+
+    def _process_dirty_buildings(self, result: Dict[str, Any]):
+        """重新评估标记过的建筑，清理失效任务并创建新任务"""
+        if not self._dirty_buildings:
+            return
+        dirty_buildings = self._dirty_buildings
+        self._dirty_buildings = {}
+
+        for building in dirty_buildings:
+            self.buildings_evaluated += 1
+
+            # 每个建筑最多一个未完成任务
+            task = self._tasks_by_building.get(building)
+            if task is not None:
+                if not self._is_invalid_task(task):
+                    continue
+                self._remove_invalid_task(task, result)
+
+            task = self._create_task_for_building(building)
+            if task is not None:
+                self._add_task(task)
                 result['tasks_created'] += 1
-                result['events'].append(f"创建装填任务: {building.name}")
-
-            # 创建金币存储任务
-            elif self._needs_gold_deposit(building):
-                required_gold = self._calculate_gold_deposit_gold(building)
-                task = WorkTask(
-                    building=building,
-                    task_type='gold_deposit',
-                    priority=TaskPriority.LOW,
-                    required_gold=required_gold,
-                    estimated_duration=required_gold * 0.02,
-                    worker_type=WorkerType.ENGINEER
-                )
-                self.work_tasks.append(task)
-                result['tasks_created'] += 1
-                result['events'].append(f"创建金币存储任务: {building.name}")
+                result['events'].append(
+                    f"{TASK_CREATED_MESSAGES[task.task_type]}: {building.name}")
+
+    def _create_task_for_building(self, building: Building) -> Optional[WorkTask]:
+        """按建筑当前状态创建工作任务，不需要工作时返回 None"""
+        # 创建建造任务
+        if building.status == BuildingStatus.PLANNING:
+            return WorkTask(
+                building=building,
+                task_type='construction',
+                priority=TaskPriority.HIGH,
+                required_gold=self._calculate_construction_gold(building),
+                estimated_duration=building.build_time
+            )
+
+        # 创建修理任务
+        if (building.status == BuildingStatus.COMPLETED and
+                building.health < building.max_health):
+            required_gold = self._calculate_repair_gold(building)
+            priority = TaskPriority.CRITICAL if building.health < building.max_health * \
+                0.3 else TaskPriority.HIGH
+            return WorkTask(
+                building=building,
+                task_type='repair',
+                priority=priority,
+                required_gold=required_gold,
+                estimated_duration=required_gold * 0.1  # 估算修理时间
+            )
+
+        # 创建装填任务
+        if self._needs_reload(building):
+            required_gold = self._calculate_reload_gold(building)
+            return WorkTask(
+                building=building,
+                task_type='reload',
+                priority=TaskPriority.NORMAL,
+                required_gold=required_gold,
+                estimated_duration=required_gold * 0.05
+            )
+
+        # 创建金币存储任务
+        if self._needs_gold_deposit(building):
+            required_gold = self._calculate_gold_deposit_gold(building)
+            return WorkTask(
+                building=building,
+                task_type='gold_deposit',
+                priority=TaskPriority.LOW,
+                required_gold=required_gold,
+                estimated_duration=required_gold * 0.02,
+                worker_type=WorkerType.ENGINEER
+            )
+
+        return None
+
+    def _add_task(self, task: WorkTask):
+        """把任务放入任务板和优先队列"""
+        self._tasks_by_building[task.building] = task
+        self._task_sequence += 1
+        heapq.heappush(self._task_queue,
+                       (task.priority.value, -task.created_time, self._task_sequence, task))
+
+        # 已分配/已移除的任务在队列中积累过多时重建队列
+        if len(self._task_queue) > 2 * len(self._tasks_by_building) + 64:
+            self._task_queue = [entry for entry in self._task_queue
+                                if self._is_task_open(entry[-1])]
+            heapq.heapify(self._task_queue)
+
+    def _is_task_open(self, task: WorkTask) -> bool:
+        """任务是否仍在任务板上等待分配"""
+        return (task.assigned_worker is None and not task.is_completed and
+                task.worker_type == WorkerType.ENGINEER and
+                self._tasks_by_building.get(task.building) is task)
 
     def _process_completed_tasks(self, engineers: List[Engineer], result: Dict[str, Any]):
         """处理已完成的任务"""
@@ -259,10 +344,11 @@ class EngineerAssigner:
                     self._cleanup_engineer_after_task(engineer)
                     del self.assigned_tasks[engineer]
 
-        # 移除已完成的任务
+        # 移除已完成的任务，建筑重新评估是否还需要工作
         for task in completed_tasks:
-            if task in self.work_tasks:
-                self.work_tasks.remove(task)
+            if self._tasks_by_building.get(task.building) is task:
+                del self._tasks_by_building[task.building]
+            self._dirty_buildings[task.building] = None
 
     def _reassign_idle_engineers(self, engineers: List[Engineer], result: Dict[str, Any]):
         """重新分配空闲工程师"""
@@ -281,27 +367,55 @@ class EngineerAssigner:
                         f"重新分配工程师: {engineer.name} - {best_task.building.name}")
 
     def _assign_new_tasks(self, engineers: List[Engineer], result: Dict[str, Any]):
-        """分配新任务"""
-        # 按优先级排序任务（只处理工程师任务）
-        available_tasks = [task for task in self.work_tasks
-                           if (not task.is_completed and task.assigned_worker is None and
-                               task.worker_type == WorkerType.ENGINEER)]
-        available_tasks.sort(key=lambda t: (t.priority.value, -t.created_time))
+        """按优先级从任务队列分配新任务，没有空闲工程师时停止"""
+        available_engineers = [eng for eng in engineers if self._is_engineer_available(eng)]
+
+        while self._task_queue and available_engineers:
+            task = heapq.heappop(self._task_queue)[-1]
+            if not self._is_task_open(task):
+                continue
 
-        for task in available_tasks:
             # 寻找最适合的工程师
-            best_engineer = self._find_best_engineer_for_task(task, engineers)
-            if best_engineer:
-                self._assign_task_to_engineer(best_engineer, task)
-                result['tasks_assigned'] += 1
-                result['events'].append(
-                    f"分配新任务: {best_engineer.name} - {task.building.name}")
+            best_engineer = self._find_best_engineer_for_task(task, available_engineers)
+            self._assign_task_to_engineer(best_engineer, task)
+            available_engineers.remove(best_engineer)
+            result['tasks_assigned'] += 1
+            result['events'].append(
+                f"分配新任务: {best_engineer.name} - {task.building.name}")
+
+    def _assign_optimal(self, engineers: List[Engineer], result: Dict[str, Any],
+                        game_map: List[List] = None):
+        """一次性求解空闲工程师与待分配任务的最小代价匹配（移动时间 + 优先级折算时间）"""
+        available_engineers = [eng for eng in engineers if self._is_engineer_available(eng)]
+        if not available_engineers:
+            return
+        available_tasks = [task for task in self._tasks_by_building.values()
+                           if self._is_task_open(task)]
+        if not available_tasks:
+            return
+
+        if self.travel_costs is None:
+            self.travel_costs = TravelCostField()
+        travel_costs = self.travel_costs
+        travel_costs.begin_round()
+
+        def travel_cost(engineer: Engineer, task: WorkTask) -> float:
+            return travel_costs.travel_time(engineer, task.building, game_map)
+
+        def priority_cost(task: WorkTask) -> float:
+            return (task.priority.value - TaskPriority.CRITICAL.value) * self.optimal_priority_seconds
+
+        for engineer, task in match_units_to_tasks(available_engineers, available_tasks,
+                                                   travel_cost, priority_cost):
+            self._assign_task_to_engineer(engineer, task)
+            result['tasks_assigned'] += 1
+            result['events'].append(
+                f"分配新任务: {engineer.name} - {task.building.name}")
 
     def _find_best_task_for_engineer(self, engineer: Engineer) -> Optional[WorkTask]:
         """为工程师寻找最适合的任务"""
-        available_tasks = [task for task in self.work_tasks
-                           if (not task.is_completed and task.assigned_worker is None and
-                               task.worker_type == WorkerType.ENGINEER)]
+        available_tasks = [task for task in self._tasks_by_building.values()
+                           if self._is_task_open(task)]
 
         if not available_tasks:
             return None
@@ -316,13 +430,15 @@ class EngineerAssigner:
         else:  # BALANCED
             return self._select_balanced_task(engineer, available_tasks)
 
-    def _find_best_engineer_for_task(self, task: WorkTask, engineers: List[Engineer]) -> Optional[Engineer]:
-        """为任务寻找最适合的工程师"""
-        available_engineers = [eng for eng in engineers
-                               if (eng.status in [EngineerStatus.IDLE, EngineerStatus.WANDERING] and
-                                   eng not in self.assigned_tasks and
-                                   len(eng.current_projects) < eng.max_concurrent_projects)]
+    def _is_engineer_available(self, engineer: Engineer) -> bool:
+        """工程师是否可以接受新任务"""
+        return (engineer.status in [EngineerStatus.IDLE, EngineerStatus.WANDERING] and
+                engineer not in self.assigned_tasks and
+                len(engineer.current_projects) < engineer.max_concurrent_projects)
 
+    def _find_best_engineer_for_task(self, task: WorkTask,
+                                     available_engineers: List[Engineer]) -> Optional[Engineer]:
+        """在空闲工程师中为任务寻找最适合的工程师"""
         if not available_engineers:
             return None
 
@@ -357,9 +473,9 @@ class EngineerAssigner:
 
         # 记录分配时间
         if not hasattr(engineer, 'last_assignment_time'):
-            engineer.last_assignment_time = time.time()
+            engineer.last_assignment_time = sim_time()
         else:
-            engineer.last_assignment_time = time.time()
+            engineer.last_assignment_time = sim_time()
 
         game_logger.info(
             f"分配任务: {engineer.name} -> {task.building.name} ({task.task_type})")
@@ -368,7 +484,7 @@ class EngineerAssigner:
         """任务完成后清理工程师状态"""
         engineer.target_building = None
         engineer.status = EngineerStatus.IDLE  # 进入空闲状态，由IdleStateManager统一管理
-        engineer.last_assignment_time = time.time()
+        engineer.last_assignment_time = sim_time()
 
     def _is_task_completed(self, engineer: Engineer, task: WorkTask) -> bool:
         """检查任务是否完成"""
@@ -596,13 +712,13 @@ class EngineerAssigner:
                     'total_tasks': 0,
                     'completed_tasks': 0,
                     'efficiency_rating': 0.0,
-                    'last_active_time': time.time()
+                    'last_active_time': sim_time()
                 }
 
             stats = self.engineer_stats[engineer]
             if engineer.status in [EngineerStatus.CONSTRUCTING, EngineerStatus.REPAIRING,
                                    EngineerStatus.UPGRADING, EngineerStatus.RELOADING]:
-                stats['last_active_time'] = time.time()
+                stats['last_active_time'] = sim_time()
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取分配器统计信息"""
@@ -612,9 +728,11 @@ class EngineerAssigner:
             engineer_stats[engineer.name] = stats.copy()
 
         return {
-            'total_tasks': len(self.work_tasks),
+            'total_tasks': len(self._tasks_by_building),
             'assigned_tasks': len(self.assigned_tasks),
-            'completed_tasks': sum(1 for task in self.work_tasks if task.is_completed),
+            'completed_tasks': sum(1 for task in self._tasks_by_building.values() if task.is_completed),
+            'queued_tasks': sum(1 for task in self._tasks_by_building.values() if self._is_task_open(task)),
+            'buildings_evaluated': self.buildings_evaluated,
             'strategy': self.strategy.value,
             'engineer_stats': engineer_stats
         }
@@ -625,9 +743,12 @@ class EngineerAssigner:
         game_logger.info(f"分配策略已更改为: {strategy.value}")
 
     def clear_all_tasks(self):
-        """清除所有任务"""
-        self.work_tasks.clear()
+        """清除所有任务（接入建筑索引时所有建筑会在下一帧重新评估）"""
+        self._tasks_by_building.clear()
+        self._task_queue.clear()
         self.assigned_tasks.clear()
+        if self._building_index is not None:
+            self._dirty_buildings.update(dict.fromkeys(self._building_index))
         game_logger.info("已清除所有任务")
 
 
@@ -650,10 +771,13 @@ class WorkerAssigner:
             TaskPriority.TRAINING: 5.0   # 训练任务优先级
         }
 
+        # OPTIMAL 策略的路径代价缓存（首次使用时创建）
+        self.travel_costs: Optional[TravelCostField] = None
+
         game_logger.info(f"苦工分配器初始化完成 - 策略: {strategy.value}")
 
     def update(self, workers: List[GoblinWorker], buildings: List[Building],
-               delta_time: float) -> Dict[str, Any]:
+               delta_time: float, game_map: List[List] = None) -> Dict[str, Any]:
         """
         更新分配器状态
 
@@ -661,6 +785,7 @@ class WorkerAssigner:
             workers: 苦工列表
             buildings: 建筑列表
             delta_time: 时间增量
+            game_map: 游戏地图（OPTIMAL 策略按路径距离计算代价，没有地图时使用直线距离）
 
         Returns:
             Dict: 更新结果
@@ -677,18 +802,22 @@ class WorkerAssigner:
         self._scan_buildings_for_worker_tasks(buildings, result)
 
         # 2. 检查分配冷却时间
-        current_time = time.time()
+        current_time = sim_time()
         if current_time - self.last_assignment_time < self.assignment_cooldown:
             return result
 
         # 3. 处理已完成的任务
         self._process_completed_tasks(workers, result)
 
-        # 4. 重新分配空闲苦工
-        self._reassign_idle_workers(workers, result)
+        if self.strategy == AssignmentStrategy.OPTIMAL:
+            # 4-5. 所有空闲苦工与待分配任务一次性匹配
+            self._assign_optimal(workers, result, game_map)
+        else:
+            # 4. 重新分配空闲苦工
+            self._reassign_idle_workers(workers, result)
 
-        # 5. 分配新任务
-        self._assign_new_tasks(workers, result)
+            # 5. 分配新任务
+            self._assign_new_tasks(workers, result)
 
         # 6. 更新统计信息
         self._update_worker_stats(workers)
@@ -796,12 +925,41 @@ class WorkerAssigner:
         else:  # BALANCED
             return self._select_balanced_task(worker, available_tasks)
 
+    def _assign_optimal(self, workers: List[GoblinWorker], result: Dict[str, Any],
+                        game_map: List[List] = None):
+        """一次性求解空闲苦工与待分配任务的最小移动时间匹配（苦工任务只有训练一种优先级）"""
+        available_workers = [worker for worker in workers if self._is_worker_available(worker)]
+        if not available_workers:
+            return
+        available_tasks = [task for task in self.work_tasks
+                           if (not task.is_completed and task.assigned_worker is None and
+                               task.worker_type == WorkerType.WORKER)]
+        if not available_tasks:
+            return
+
+        if self.travel_costs is None:
+            self.travel_costs = TravelCostField()
+        travel_costs = self.travel_costs
+        travel_costs.begin_round()
+
+        def travel_cost(worker: GoblinWorker, task: WorkTask) -> float:
+            return travel_costs.travel_time(worker, task.building, game_map)
+
+        for worker, task in match_units_to_tasks(available_workers, available_tasks, travel_cost):
+            self._assign_task_to_worker(worker, task)
+            result['tasks_assigned'] += 1
+            result['events'].append(
+                f"分配新任务: {worker.name} - {task.building.name}")
+
+    def _is_worker_available(self, worker: GoblinWorker) -> bool:
+        """苦工是否可以接受新任务"""
+        return (hasattr(worker, 'state') and worker.state == WorkerStatus.IDLE.value and
+                worker not in self.assigned_tasks and
+                not hasattr(worker, 'assigned_building') or not worker.assigned_building)
+
     def _find_best_worker_for_task(self, task: WorkTask, workers: List[GoblinWorker]) -> Optional[GoblinWorker]:
         """为任务寻找最适合的苦工"""
-        available_workers = [worker for worker in workers
-                             if (hasattr(worker, 'state') and worker.state == WorkerStatus.IDLE.value and
-                                 worker not in self.assigned_tasks and
-                                 not hasattr(worker, 'assigned_building') or not worker.assigned_building)]
+        available_workers = [worker for worker in workers if self._is_worker_available(worker)]
 
         if not available_workers:
             return None
@@ -833,9 +991,9 @@ class WorkerAssigner:
 
         # 记录分配时间
         if not hasattr(worker, 'last_assignment_time'):
-            worker.last_assignment_time = time.time()
+            worker.last_assignment_time = sim_time()
         else:
-            worker.last_assignment_time = time.time()
+            worker.last_assignment_time = sim_time()
 
         game_logger.info(
             f"分配任务: {worker.name} -> {task.building.name} ({task.task_type})")
@@ -846,7 +1004,7 @@ class WorkerAssigner:
         worker.assigned_building = None
         worker.task_type = None
         worker.state = WorkerStatus.IDLE.value  # 进入空闲状态
-        worker.last_assignment_time = time.time()
+        worker.last_assignment_time = sim_time()
 
     def _is_task_completed(self, worker: GoblinWorker, task: WorkTask) -> bool:
         """检查任务是否完成"""
@@ -1006,13 +1164,13 @@ class WorkerAssigner:
                     'total_tasks': 0,
                     'completed_tasks': 0,
                     'efficiency_rating': 0.0,
-                    'last_active_time': time.time()
+                    'last_active_time': sim_time()
                 }
 
             stats = self.worker_stats[worker]
             if (hasattr(worker, 'state') and worker.state in
                     [WorkerStatus.TRAINING.value]):
-                stats['last_active_time'] = time.time()
+                stats['last_active_time'] = sim_time()
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取分配器统计信息"""
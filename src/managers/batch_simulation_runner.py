@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量模拟运行器
+无头快进运行 GameEnvironmentSimulator 的测试场景，并使用多进程并行执行大量带种子的模拟，
+最后把每次运行的 get_statistics() 汇总成一份报告，用于经济和战斗平衡测试。
+
+使用方法:
+    python -m src.managers.batch_simulation_runner --scenario economy --runs 200 --duration 600 --workers 8
+    python -m src.managers.batch_simulation_runner --scenario combat --scenario stress --output report.json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Any, Optional
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.logger import game_logger
+
+
+# 场景名称 -> GameEnvironmentSimulator 场景方法
+SCENARIOS = {
+    'stress': 'setup_stress_test_scenario',
+    'combat': 'setup_combat_test_scenario',
+    'economy': 'setup_economy_test_scenario',
+    'repair': 'setup_repair_test_scenario',
+    'complex': 'setup_complex_test_scenario',
+    'physics': 'setup_physics_test_scenario',
+    'effects': 'setup_effects_test_scenario',
+    'comprehensive': 'setup_comprehensive_test_scenario',
+}
+
+
+@dataclass
+class BatchRunConfig:
+    """单次模拟运行配置"""
+    scenario: str
+    seed: int
+    duration: float = 60.0          # 模拟时长（模拟时间，秒）
+    delta_time: float = 100.0       # 固定步长（毫秒），与 run_simulation 无头模式一致
+    run_index: int = 0
+    map_width: Optional[int] = None
+    map_height: Optional[int] = None
+    screen_width: int = 1200
+    screen_height: int = 800
+
+
+@dataclass
+class BatchRunResult:
+    """单次模拟运行结果"""
+    run_index: int
+    scenario: str
+    seed: int
+    ticks: int = 0
+    simulated_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    statistics: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def configure_headless_environment():
+    """配置无显示环境 - 必须在pygame初始化显示之前调用"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+
+def reset_global_state():
+    """重置全局单例，避免同一进程内的多次运行互相影响"""
+    from src.core.sim_clock import reset_sim_clock
+    from src.managers.resource_manager import reset_resource_manager
+    from src.managers.gold_mine_manager import reset_gold_mine_manager
+    from src.managers.optimized_mining_system import reset_optimized_mining_system
+    from src.systems.reachability_system import reset_reachability_system
+    from src.systems.pathfinding_queue import reset_pathfinding_queue
+    from src.managers.movement_system import MovementSystem
+    from src.effects.effect_lod import reset_effect_lod
+    from src.effects.glow_effect import reset_glow_manager
+    from src.effects.sprite_batch import reset_sprite_batch
+
+    reset_sim_clock()
+    reset_resource_manager()
+    reset_gold_mine_manager()
+    reset_optimized_mining_system()
+    reset_reachability_system()
+    MovementSystem.clear_all_unit_states()
+    MovementSystem.reset_pathfinding_caches()
+    reset_pathfinding_queue()
+    reset_effect_lod()
+    reset_glow_manager()
+    reset_sprite_batch()
+
+
+def _init_worker(quiet: bool):
+    """工作进程初始化"""
+    configure_headless_environment()
+    if quiet:
+        game_logger.disable()
+
+
+def run_single_simulation(config: BatchRunConfig) -> BatchRunResult:
+    """
+    无头运行一次模拟（可在工作进程中调用）
+
+    Args:
+        config: 运行配置
+
+    Returns:
+        BatchRunResult: 运行结果，异常会被记录在 error 字段中而不是抛出
+    """
+    configure_headless_environment()
+    result = BatchRunResult(run_index=config.run_index,
+                            scenario=config.scenario, seed=config.seed)
+    wall_start = time.perf_counter()
+
+    try:
+        from src.managers.game_environment_simulator import GameEnvironmentSimulator
+
+        reset_global_state()
+        random.seed(config.seed)
+
+        # 不调用 init_pygame()：无头模式不需要字体和UI组件
+        simulator = GameEnvironmentSimulator(
+            screen_width=config.screen_width,
+            screen_height=config.screen_height,
+            map_width=config.map_width,
+            map_height=config.map_height)
+        getattr(simulator, SCENARIOS[config.scenario])()
+
+        total_ticks = max(1, int(math.ceil(
+            config.duration * 1000.0 / config.delta_time)))
+        for _ in range(total_ticks):
+            simulator.update(config.delta_time)
+            result.ticks += 1
+
+        result.simulated_seconds = simulator.sim_clock.elapsed()
+        result.statistics = simulator.get_statistics()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+
+    result.wall_seconds = time.perf_counter() - wall_start
+    return result
+
+
+def aggregate_statistics(results: List[BatchRunResult]) -> Dict[str, Any]:
+    """
+    汇总多次运行的统计信息
+
+    Args:
+        results: 运行结果列表
+
+    Returns:
+        Dict: 按场景分组的 mean/min/max/std 汇总
+    """
+    by_scenario: Dict[str, List[BatchRunResult]] = {}
+    for result in results:
+        by_scenario.setdefault(result.scenario, []).append(result)
+
+    summary = {}
+    for scenario, scenario_results in by_scenario.items():
+        succeeded = [r for r in scenario_results if r.success]
+        metrics: Dict[str, Dict[str, float]] = {}
+
+        keys = []
+        for r in succeeded:
+            for key, value in r.statistics.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool) and key not in keys:
+                    keys.append(key)
+
+        for key in keys:
+            values = [r.statistics[key] for r in succeeded if key in r.statistics]
+            mean = sum(values) / len(values)
+            variance = sum((v - mean) ** 2 for v in values) / len(values)
+            metrics[key] = {
+                'mean': mean,
+                'min': min(values),
+                'max': max(values),
+                'std': math.sqrt(variance),
+            }
+
+        total_ticks = sum(r.ticks for r in succeeded)
+        total_wall = sum(r.wall_seconds for r in succeeded)
+        total_simulated = sum(r.simulated_seconds for r in succeeded)
+        summary[scenario] = {
+            'runs': len(scenario_results),
+            'succeeded': len(succeeded),
+            'failed': len(scenario_results) - len(succeeded),
+            'metrics': metrics,
+            'ticks_per_second': total_ticks / total_wall if total_wall > 0 else 0.0,
+            'speedup': total_simulated / total_wall if total_wall > 0 else 0.0,
+        }
+
+    return summary
+
+
+class BatchSimulationRunner:
+    """批量模拟运行器 - 使用进程池并行运行大量带种子的无头模拟"""
+
+    def __init__(self, workers: Optional[int] = None, quiet: bool = True):
+        """
+        初始化批量模拟运行器
+
+        Args:
+            workers: 工作进程数量，None 时使用CPU核心数，1 时在当前进程内串行运行
+            quiet: 是否在模拟运行期间关闭游戏日志（进度和汇总仍在主进程中输出）
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.quiet = quiet
+
+    @staticmethod
+    def build_configs(scenarios: List[str], runs: int, base_seed: int = 0,
+                      duration: float = 60.0, delta_time: float = 100.0,
+                      map_width: Optional[int] = None, map_height: Optional[int] = None) -> List[BatchRunConfig]:
+        """
+        为每个场景生成 runs 个带种子的运行配置
+
+        种子按 base_seed + 运行序号 分配，相同参数总是生成相同的配置。
+        """
+        configs = []
+        run_index = 0
+        for scenario in scenarios:
+            if scenario not in SCENARIOS:
+                raise ValueError(
+                    f"未知场景: {scenario}，可用场景: {', '.join(SCENARIOS)}")
+            for i in range(runs):
+                configs.append(BatchRunConfig(
+                    scenario=scenario,
+                    seed=base_seed + i,
+                    duration=duration,
+                    delta_time=delta_time,
+                    run_index=run_index,
+                    map_width=map_width,
+                    map_height=map_height))
+                run_index += 1
+        return configs
+
+    def _run_in_process(self, config: BatchRunConfig) -> BatchRunResult:
+        """在当前进程内运行一次模拟，安静模式下只在模拟期间关闭游戏日志"""
+        enabled = game_logger.enabled
+        if self.quiet:
+            game_logger.disable()
+        try:
+            return run_single_simulation(config)
+        finally:
+            game_logger.enabled = enabled
+
+    def run(self, configs: List[BatchRunConfig], progress_callback=None) -> Dict[str, Any]:
+        """
+        运行所有配置并生成报告
+
+        Args:
+            configs: 运行配置列表
+            progress_callback: 可选回调 callback(completed, total, result)
+
+        Returns:
+            Dict: 包含汇总和每次运行结果的报告
+        """
+        wall_start = time.perf_counter()
+        results: List[BatchRunResult] = []
+
+        if self.workers <= 1:
+            configure_headless_environment()
+            for config in configs:
+                result = self._run_in_process(config)
+                results.append(result)
+                if progress_callback:
+                    progress_callback(len(results), len(configs), result)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     initializer=_init_worker,
+                                     initargs=(self.quiet,)) as executor:
+                futures = [executor.submit(run_single_simulation, config)
+                           for config in configs]
+                for future in as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+                    if progress_callback:
+                        progress_callback(len(results), len(configs), result)
+
+        results.sort(key=lambda r: r.run_index)
+        return {
+            'workers': self.workers,
+            'total_runs': len(results),
+            'wall_seconds': time.perf_counter() - wall_start,
+            'summary': aggregate_statistics(results),
+            'runs': [asdict(r) for r in results],
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="批量无头模拟运行器")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="测试场景，可重复指定（默认: economy）")
+    parser.add_argument('--runs', type=int, default=10, help="每个场景的运行次数")
+    parser.add_argument('--seed', type=int, default=0, help="起始随机种子")
+    parser.add_argument('--duration', type=float, default=60.0, help="每次运行的模拟时长（秒）")
+    parser.add_argument('--dt', type=float, default=100.0, help="固定步长（毫秒）")
+    parser.add_argument('--workers', type=int, default=None, help="工作进程数量（默认: CPU核心数）")
+    parser.add_argument('--map-width', type=int, default=None, help="地图宽度（瓦片）")
+    parser.add_argument('--map-height', type=int, default=None, help="地图高度（瓦片）")
+    parser.add_argument('--output', type=str, default=None, help="报告输出路径（JSON）")
+    parser.add_argument('--verbose', action='store_true', help="保留工作进程中的游戏日志")
+    args = parser.parse_args(argv)
+
+    configure_headless_environment()
+    configs = BatchSimulationRunner.build_configs(
+        args.scenario or ['economy'], args.runs, args.seed, args.duration, args.dt,
+        args.map_width, args.map_height)
+    runner = BatchSimulationRunner(workers=args.workers, quiet=not args.verbose)
+
+    def on_progress(completed, total, result):
+        status = "✅" if result.success else "❌"
+        game_logger.info(f"{status} [{completed}/{total}] {result.scenario} seed={result.seed} "
+                         f"ticks={result.ticks} wall={result.wall_seconds:.2f}s")
+        if not result.success:
+            game_logger.error(result.error)
+
+    report = runner.run(configs, progress_callback=on_progress)
+
+    for scenario, summary in report['summary'].items():
+        game_logger.info(f"📊 {scenario}: {summary['succeeded']}/{summary['runs']} 成功, "
+                         f"{summary['ticks_per_second']:.0f} ticks/s, 加速比 {summary['speedup']:.1f}x")
+        for key, metric in summary['metrics'].items():
+            game_logger.info(f"   {key}: mean={metric['mean']:.2f} min={metric['min']:.2f} "
+                             f"max={metric['max']:.2f} std={metric['std']:.2f}")
+    game_logger.info(f"🏁 共 {report['total_runs']} 次运行，耗时 {report['wall_seconds']:.1f}秒")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        game_logger.info(f"📝 报告已保存: {args.output}")
+
+    failed = sum(summary['failed'] for summary in report['summary'].values())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
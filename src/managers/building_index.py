@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+建筑索引
+按类型、状态、"需要工作"原因和能力把建筑分桶，并为每种建筑维护一个空间网格，
+替代各系统对 building_manager.buildings 的 hasattr + building_type.value 字符串比较的线性扫描。
+
+- 类型/能力桶在建筑加入、移除时维护；状态桶由 Building.status 的变更通知维护
+- "需要工作"原因（建造、修理、装填弹药、投入金币）在状态、生命值、激活状态变化时立即重新评估；
+  弹药、已存金币等由建筑自身逻辑改变的属性由建筑管理器在每帧更新建筑后调用 refresh 重新评估
+- 桶使用按插入顺序排列的字典，增删都是 O(1)，查询结果与加入顺序一致
+- 建筑变化（加入、移除、状态变化、激活状态变化、工作原因变化）会通知已注册的监听器
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.entities.building import Building, BuildingStatus, BuildingType
+from src.systems.spatial_index import WorldSpatialIndex
+
+# "需要工作"的原因
+WORK_CONSTRUCTION = 'construction'   # 规划中/建造中
+WORK_REPAIR = 'repair'               # 已完成但生命值不满
+WORK_AMMUNITION = 'ammunition'       # 箭塔弹药耗尽
+WORK_GOLD = 'gold'                   # 巢穴、魔法祭坛可以接收金币
+WORK_DEPOSIT = 'deposit'             # 工程师任务类型为金币存储（如未满的金库）
+WORK_REASONS = (WORK_CONSTRUCTION, WORK_REPAIR, WORK_AMMUNITION, WORK_GOLD, WORK_DEPOSIT)
+
+# 建筑能力
+CAPABILITY_DEFENSE_TOWER = 'defense_tower'   # 防御塔（参与防御塔攻击）
+CAPABILITY_GOLD_STORAGE = 'gold_storage'     # 金库（苦工/工程师存放金币）
+CAPABILITY_ACCEPTS_GOLD = 'accepts_gold'     # 接收金币投入的建筑
+CAPABILITY_AMMUNITION = 'ammunition'         # 需要装填弹药的建筑
+
+BUILDING_CAPABILITIES = {
+    CAPABILITY_DEFENSE_TOWER: frozenset({BuildingType.ARROW_TOWER, BuildingType.ARCANE_TOWER}),
+    CAPABILITY_GOLD_STORAGE: frozenset({BuildingType.TREASURY}),
+    CAPABILITY_ACCEPTS_GOLD: frozenset({BuildingType.ORC_LAIR, BuildingType.DEMON_LAIR,
+                                        BuildingType.MAGIC_ALTAR}),
+    CAPABILITY_AMMUNITION: frozenset({BuildingType.ARROW_TOWER}),
+}
+
+# 建筑变化事件
+EVENT_ADDED = 'added'
+EVENT_REMOVED = 'removed'
+EVENT_STATUS_CHANGED = 'status_changed'
+EVENT_WORK_CHANGED = 'work_changed'
+EVENT_ACTIVE_CHANGED = 'active_changed'
+
+# 监听器: listener(event, building, old, new)
+# 加入/移除/状态变化事件传入新旧状态，激活状态变化事件传入新旧 is_active，工作原因变化事件传入新旧原因元组
+BuildingListener = Callable[[str, Building, Any, Any], None]
+
+# 建筑空间网格的格子大小（像素）- 建筑稀疏且不移动，使用较大的格子
+BUILDING_GRID_CELL_SIZE = 160
+
+
+class BuildingList(list):
+    """
+    建筑列表 - 记录修改版本的 list
+
+    任何增删、替换元素的操作都会增加 version，直接修改 building_manager.buildings 的旧代码
+    （包括用一个建筑替换另一个、数量不变的情况）因此能被检测到并触发索引全量同步。
+    建筑管理器自身经由 list 的原始方法修改，同时直接维护索引，不增加版本。
+    """
+
+    __slots__ = ('version',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+    def append(self, building):
+        self.version += 1
+        super().append(building)
+
+    def extend(self, buildings):
+        self.version += 1
+        super().extend(buildings)
+
+    def insert(self, position, building):
+        self.version += 1
+        super().insert(position, building)
+
+    def remove(self, building):
+        self.version += 1
+        super().remove(building)
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def clear(self):
+        self.version += 1
+        super().clear()
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.version += 1
+        super().__delitem__(key)
+
+    def __iadd__(self, buildings):
+        self.version += 1
+        return super().__iadd__(buildings)
+
+    def __imul__(self, count):
+        self.version += 1
+        return super().__imul__(count)
+
+
+class BuildingIndex:
+    """建筑索引 - 类型/状态/工作原因/能力分桶 + 按类型的空间网格"""
+
+    def __init__(self, cell_size: int = BUILDING_GRID_CELL_SIZE):
+        """
+        初始化建筑索引
+
+        Args:
+            cell_size: 空间网格格子大小（像素）
+        """
+        self._by_type: Dict[BuildingType, Dict[Building, None]] = {}
+        self._by_status: Dict[BuildingStatus, Dict[Building, None]] = {}
+        self._by_reason: Dict[str, Dict[Building, None]] = {
+            reason: {} for reason in WORK_REASONS}
+        self._by_capability: Dict[str, Dict[Building, None]] = {
+            capability: {} for capability in BUILDING_CAPABILITIES}
+        self._by_tile: Dict[Tuple[int, int], Building] = {}
+
+        # building -> (状态, 工作原因, 瓦片坐标)
+        self._entries: Dict[Building, Tuple[BuildingStatus, Tuple[str, ...], Tuple[int, int]]] = {}
+        self.spatial = WorldSpatialIndex(cell_size, query_margin=0.0)
+        self._listeners: List[BuildingListener] = []
+
+        # 统计信息
+        self.full_syncs = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, building: Building) -> bool:
+        return building in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    # ==================== 维护 ====================
+
+    def add(self, building: Building) -> bool:
+        """
+        加入建筑（已存在时只刷新）
+
+        Returns:
+            bool: 是否为新加入的建筑
+        """
+        if building in self._entries:
+            self.refresh(building)
+            return False
+
+        building_type = building.building_type
+        self._by_type.setdefault(building_type, {})[building] = None
+        for capability, types in BUILDING_CAPABILITIES.items():
+            if building_type in types:
+                self._by_capability[capability][building] = None
+        status = building.status
+        self._by_status.setdefault(status, {})[building] = None
+
+        tile = (building.tile_x, building.tile_y)
+        self._by_tile.setdefault(tile, building)
+        self.spatial.get_layer(building_type.value).add_unit(building)
+
+        reasons = self._compute_reasons(building)
+        for reason in reasons:
+            self._by_reason[reason][building] = None
+        self._entries[building] = (status, reasons, tile)
+
+        # 状态、生命值、激活状态变化由建筑主动通知
+        building.change_listener = self._on_building_changed
+        self._notify(EVENT_ADDED, building, None, status)
+        return True
+
+    def remove(self, building: Building) -> bool:
+        """移除建筑"""
+        entry = self._entries.pop(building, None)
+        if entry is None:
+            return False
+        status, reasons, tile = entry
+
+        building_type = building.building_type
+        self._by_type.get(building_type, {}).pop(building, None)
+        for bucket in self._by_capability.values():
+            bucket.pop(building, None)
+        self._by_status.get(status, {}).pop(building, None)
+        for reason in reasons:
+            self._by_reason[reason].pop(building, None)
+        if self._by_tile.get(tile) is building:
+            del self._by_tile[tile]
+        self.spatial.get_layer(building_type.value).remove_unit(building)
+
+        if getattr(building, 'change_listener', None) == self._on_building_changed:
+            building.change_listener = None
+        self._notify(EVENT_REMOVED, building, status, None)
+        return True
+
+    def clear(self):
+        """清空索引"""
+        for building in list(self._entries):
+            self.remove(building)
+
+    def sync(self, buildings: Iterable[Building]):
+        """
+        与建筑列表全量同步 - 兼容直接修改 building_manager.buildings 的旧代码
+
+        Args:
+            buildings: 当前的完整建筑列表
+        """
+        buildings = list(buildings)
+        current = dict.fromkeys(buildings)
+        for building in [b for b in self._entries if b not in current]:
+            self.remove(building)
+        for building in buildings:
+            if building not in self._entries:
+                self.add(building)
+        self.full_syncs += 1
+
+    def refresh(self, building: Building) -> Tuple[str, ...]:
+        """
+        重新评估建筑的工作原因和位置（生命值、弹药、金币等变化之后调用）
+
+        Returns:
+            Tuple[str, ...]: 建筑当前需要工作的原因
+        """
+        entry = self._entries.get(building)
+        if entry is None:
+            return ()
+        status, old_reasons, tile = entry
+
+        reasons = self._compute_reasons(building)
+        if reasons != old_reasons:
+            for reason in old_reasons:
+                if reason not in reasons:
+                    self._by_reason[reason].pop(building, None)
+            for reason in reasons:
+                self._by_reason[reason][building] = None
+
+        new_tile = (building.tile_x, building.tile_y)
+        if new_tile != tile:
+            if self._by_tile.get(tile) is building:
+                del self._by_tile[tile]
+            self._by_tile.setdefault(new_tile, building)
+            self.spatial.get_layer(building.building_type.value).update_unit(building)
+
+        self._entries[building] = (status, reasons, new_tile)
+        if reasons != old_reasons:
+            self._notify(EVENT_WORK_CHANGED, building, old_reasons, reasons)
+        return reasons
+
+    def _on_building_changed(self, building: Building, attribute: str, old_value: Any, new_value: Any):
+        """Building.status / Building.health / Building.is_active 变更通知"""
+        entry = self._entries.get(building)
+        if entry is None:
+            return
+        if attribute == 'is_active':
+            # 激活状态影响任务是否有效，即使工作原因不变也通知监听器
+            self.refresh(building)
+            self._notify(EVENT_ACTIVE_CHANGED, building, old_value, new_value)
+            return
+        if attribute != 'status':
+            self.refresh(building)
+            return
+
+        status, reasons, tile = entry
+        self._by_status.get(status, {}).pop(building, None)
+        self._by_status.setdefault(new_value, {})[building] = None
+        self._entries[building] = (new_value, reasons, tile)
+        self.refresh(building)
+        self._notify(EVENT_STATUS_CHANGED, building, old_value, new_value)
+
+    @staticmethod
+    def _compute_reasons(building: Building) -> Tuple[str, ...]:
+        """计算建筑当前需要工作的原因"""
+        status = building.status
+        if status in (BuildingStatus.PLANNING, BuildingStatus.UNDER_CONSTRUCTION):
+            return (WORK_CONSTRUCTION,)
+        if status != BuildingStatus.COMPLETED:
+            return ()
+
+        reasons = []
+        if building.health < building.max_health:
+            reasons.append(WORK_REPAIR)
+        if building.is_active:
+            building_type = building.building_type
+            if (building_type in BUILDING_CAPABILITIES[CAPABILITY_AMMUNITION] and
+                    getattr(building, 'current_ammunition', 1) <= 0):
+                reasons.append(WORK_AMMUNITION)
+            if (building_type in BUILDING_CAPABILITIES[CAPABILITY_ACCEPTS_GOLD] and
+                    building.can_accept_gold()):
+                reasons.append(WORK_GOLD)
+        if building.get_engineer_task_type() == 'gold_deposit':
+            reasons.append(WORK_DEPOSIT)
+        return tuple(reasons)
+
+    # ==================== 监听器 ====================
+
+    def add_listener(self, listener: BuildingListener):
+        """注册建筑变化监听器"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: BuildingListener):
+        """注销建筑变化监听器"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, building: Building, old: Any, new: Any):
+        for listener in list(self._listeners):
+            listener(event, building, old, new)
+
+    # ==================== 查询 ====================
+
+    def get_by_type(self, building_type: BuildingType) -> List[Building]:
+        """按类型获取建筑"""
+        return list(self._by_type.get(building_type, ()))
+
+    def get_by_status(self, status: BuildingStatus) -> List[Building]:
+        """按状态获取建筑"""
+        return list(self._by_status.get(status, ()))
+
+    def get_by_capability(self, capability: str, active_only: bool = False) -> List[Building]:
+        """按能力获取建筑"""
+        bucket = self._by_capability.get(capability, ())
+        if active_only:
+            return [building for building in bucket if building.is_active]
+        return list(bucket)
+
+    def get_needing_work(self, reasons: Iterable[str] = WORK_REASONS) -> List[Building]:
+        """按原因顺序获取需要工作的建筑（同一建筑只出现一次）"""
+        result: Dict[Building, None] = {}
+        for reason in reasons:
+            result.update(self._by_reason[reason])
+        return list(result)
+
+    def count_by_type(self, building_type: BuildingType) -> int:
+        """某类型的建筑数量"""
+        return len(self._by_type.get(building_type, ()))
+
+    def count_by_status(self, status: BuildingStatus) -> int:
+        """某状态的建筑数量"""
+        return len(self._by_status.get(status, ()))
+
+    def get_at(self, tile_x: int, tile_y: int) -> Optional[Building]:
+        """获取以该瓦片为锚点的建筑"""
+        return self._by_tile.get((tile_x, tile_y))
+
+    def find_nearest(self, x: float, y: float,
+                     building_types: Union[BuildingType, Iterable[BuildingType]],
+                     max_radius: float = None,
+                     predicate: Optional[Callable[[Building], bool]] = None) -> Optional[Building]:
+        """
+        查找最近的指定类型建筑
+
+        Args:
+            x, y: 查询点（像素）
+            building_types: 建筑类型或类型集合
+            max_radius: 可选的最大搜索半径（像素）
+            predicate: 可选过滤函数（如未满的金库）
+
+        Returns:
+            Optional[Building]: 最近的建筑，没有时返回 None
+        """
+        if isinstance(building_types, BuildingType):
+            building_types = (building_types,)
+        layers = tuple(building_type.value for building_type in building_types)
+        return self.spatial.nearest(x, y, max_radius, layers, predicate)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            'buildings': len(self._entries),
+            'by_type': {building_type.value: len(bucket) for building_type, bucket in self._by_type.items() if bucket},
+            'by_status': {status.value: len(bucket) for status, bucket in self._by_status.items() if bucket},
+            'needs_work': {reason: len(bucket) for reason, bucket in self._by_reason.items()},
+            'full_syncs': self.full_syncs,
+        }
@@ -17,7 +17,10 @@ from src.core.enums import TileType
 from src.core.game_state import Tile
 from src.utils.logger import game_logger
 from src.managers.resource_manager import get_resource_manager
+from src.managers.movement_system import MovementSystem
 from src.managers.auto_assigner import EngineerAssigner, AssignmentStrategy
+from src.managers.building_index import (
+    BuildingIndex, BuildingList, CAPABILITY_DEFENSE_TOWER, WORK_AMMUNITION, WORK_CONSTRUCTION, WORK_GOLD, WORK_REPAIR)
 # 移除时间管理器依赖，使用绝对时间
 
 
@@ -26,7 +29,8 @@ class BuildingManager:
 
     def __init__(self):
         """初始化建筑管理器"""
-        self.buildings = []                    # 所有建筑列表
+        self.index = BuildingIndex()           # 建筑索引（类型/状态/工作原因/能力分桶）
+        self.buildings = BuildingList()        # 所有建筑列表（记录修改版本）
         self.engineers = []                    # 所有工程师列表
         self.workers = []                      # 所有工人列表
         self.construction_queue = []           # 建造队列
@@ -34,8 +38,9 @@ class BuildingManager:
         self.repair_queue = []                # 修理队列
         self.game_simulator = None            # 游戏模拟器引用（用于攻击响应）
 
-        # 工程师分配器
+        # 工程师分配器（订阅建筑索引事件，只重新评估发生变化的建筑）
         self.engineer_assigner = EngineerAssigner(AssignmentStrategy.BALANCED)
+        self.engineer_assigner.attach_index(self.index)
 
         # 统计信息
         self.total_buildings_built = 0
@@ -88,11 +93,15 @@ class BuildingManager:
             'events': []
         }
 
+        self._sync_index()
+
         # 更新所有建筑
         for building in self.buildings[:]:
             old_status = building.status
             building_result = building.update(
                 delta_seconds, game_state, self.engineers, workers)
+            # 生命值、弹药、金币等变化后重新评估建筑的工作原因
+            self.index.refresh(building)
 
             if building_result.get('production'):
                 # 处理建筑产出
@@ -100,8 +109,7 @@ class BuildingManager:
                     building, building_result['production'], game_state)
 
             # 更新魔法祭坛统计
-            if (hasattr(building, 'building_type') and
-                building.building_type.value == 'magic_altar' and
+            if (building.building_type == BuildingType.MAGIC_ALTAR and
                     hasattr(building, 'get_resource_statistics')):
                 self._update_magic_altar_stats(building, delta_seconds)
 
@@ -161,7 +169,7 @@ class BuildingManager:
 
         # 使用新的工程师分配器进行统一任务分配
         assigner_result = self.engineer_assigner.update(
-            self.engineers, self.buildings, delta_seconds)
+            self.engineers, self.buildings, delta_seconds, game_map)
 
         # 合并分配器结果
         result['tasks_created'] = assigner_result.get('tasks_created', 0)
@@ -306,7 +314,7 @@ class BuildingManager:
             building.status = BuildingStatus.PLANNING  # 设置为规划状态
 
         # 添加到建筑列表
-        self.buildings.append(building)
+        self.add_building(building)
 
         # 更新地图 - 直接设置为建筑类型，开始渲染
         if 0 <= y < len(game_map) and 0 <= x < len(game_map[0]):
@@ -508,6 +516,78 @@ class BuildingManager:
             'message': f'召唤了 {config.name}'
         }
 
+    @property
+    def buildings(self) -> BuildingList:
+        """所有建筑列表"""
+        return self._buildings
+
+    @buildings.setter
+    def buildings(self, buildings: List[Building]):
+        """整体替换建筑列表（旧代码的用法），下次查询时全量同步索引"""
+        self._buildings = buildings if isinstance(buildings, BuildingList) else BuildingList(buildings)
+        self._synced_version = None
+
+    def add_building(self, building: Building):
+        """
+        添加建筑到建筑列表和建筑索引
+
+        Args:
+            building: 建筑对象
+        """
+        self._sync_index()
+        if building in self.index:
+            return
+        # 绕过版本计数：索引在这里同步维护
+        list.append(self._buildings, building)
+        self.index.add(building)
+
+    def remove_building(self, building: Building) -> bool:
+        """
+        从建筑列表和建筑索引中移除建筑
+
+        Returns:
+            bool: 建筑是否存在并被移除
+        """
+        self._sync_index()
+        if building not in self.index:
+            return False
+        list.remove(self._buildings, building)
+        self.index.remove(building)
+        return True
+
+    def clear_buildings(self):
+        """清空所有建筑"""
+        list.clear(self._buildings)
+        self.index.clear()
+
+    def _sync_index(self):
+        """直接修改过建筑列表（版本变化）或整体替换列表后，全量同步索引"""
+        if self._synced_version != self._buildings.version:
+            self.index.sync(self._buildings)
+            self._synced_version = self._buildings.version
+
+    def get_defense_towers(self, active_only: bool = True) -> List[Building]:
+        """获取防御塔（箭塔、奥术塔）"""
+        self._sync_index()
+        return self.index.get_by_capability(CAPABILITY_DEFENSE_TOWER, active_only)
+
+    def find_nearest_building(self, x: float, y: float, building_types, max_radius: float = None,
+                              predicate=None) -> Optional[Building]:
+        """
+        查找最近的指定类型建筑（建筑空间网格查询）
+
+        Args:
+            x, y: 查询点（像素）
+            building_types: 建筑类型或类型集合
+            max_radius: 可选的最大搜索半径（像素）
+            predicate: 可选过滤函数
+
+        Returns:
+            Optional[Building]: 最近的建筑，没有时返回None
+        """
+        self._sync_index()
+        return self.index.find_nearest(x, y, building_types, max_radius, predicate)
+
     def get_building_at(self, x: int, y: int) -> Optional[Building]:
         """
         获取指定位置的建筑
@@ -518,10 +598,8 @@ class BuildingManager:
         Returns:
             Optional[Building]: 建筑对象或None
         """
-        for building in self.buildings:
-            if building.x == x and building.y == y:
-                return building
-        return None
+        self._sync_index()
+        return self.index.get_at(x, y)
 
     def get_buildings_by_type(self, building_type: BuildingType) -> List[Building]:
         """
@@ -533,8 +611,8 @@ class BuildingManager:
         Returns:
             List[Building]: 建筑列表
         """
-        return [building for building in self.buildings
-                if building.building_type == building_type]
+        self._sync_index()
+        return self.index.get_by_type(building_type)
 
     def get_buildings_by_status(self, status: BuildingStatus) -> List[Building]:
         """
@@ -546,7 +624,8 @@ class BuildingManager:
         Returns:
             List[Building]: 建筑列表
         """
-        return [building for building in self.buildings if building.status == status]
+        self._sync_index()
+        return self.index.get_by_status(status)
 
     def find_nearest_incomplete_building(self, engineer_x: float, engineer_y: float) -> Optional[Building]:
         """
@@ -559,12 +638,9 @@ class BuildingManager:
             Optional[Building]: 最近的未完成建筑，如果没有则返回None
         """
 
-        # 获取所有未完成的建筑（建造中、规划中、受损的）
-        incomplete_buildings = []
-        incomplete_buildings.extend(self.get_buildings_by_status(
-            BuildingStatus.UNDER_CONSTRUCTION))
-        incomplete_buildings.extend(
-            self.get_buildings_by_status(BuildingStatus.PLANNING))
+        # 获取所有未完成的建筑（建造中、规划中）
+        self._sync_index()
+        incomplete_buildings = self.index.get_needing_work((WORK_CONSTRUCTION,))
 
         if not incomplete_buildings:
             return None
@@ -603,49 +679,13 @@ class BuildingManager:
             Optional[Building]: 任意一个需要工作的建筑，如果没有则返回None
         """
 
-        # 获取所有需要工作的建筑
-        work_needed_buildings = []
-
-        # 1. 未完成的建筑（建造中、规划中）
-        work_needed_buildings.extend(self.get_buildings_by_status(
-            BuildingStatus.UNDER_CONSTRUCTION))
-        work_needed_buildings.extend(
-            self.get_buildings_by_status(BuildingStatus.PLANNING))
-
-        # 2. 需要修复的完成建筑（生命值不满）
-        for building in self.get_buildings_by_status(BuildingStatus.COMPLETED):
-            if building.health < building.max_health:
-                work_needed_buildings.append(building)
-
-        # 3. 空弹药的箭塔
-        for building in self.buildings:
-            if (hasattr(building, 'building_type') and
-                building.building_type.value == 'arrow_tower' and
-                building.status == BuildingStatus.COMPLETED and
-                building.is_active and
-                hasattr(building, 'current_ammunition') and
-                    building.current_ammunition <= 0):
-                work_needed_buildings.append(building)
-
-        # 4. 需要临时金币的兽人巢穴和恶魔巢穴
-        for building in self.buildings:
-            if (hasattr(building, 'building_type') and
-                building.building_type.value in ['orc_lair', 'demon_lair'] and
-                building.status == BuildingStatus.COMPLETED and
-                building.is_active and
-                hasattr(building, 'can_accept_gold') and
-                    building.can_accept_gold()):
-                work_needed_buildings.append(building)
-
-        # 5. 需要金币的魔法祭坛
-        for building in self.buildings:
-            if (hasattr(building, 'building_type') and
-                building.building_type.value == 'magic_altar' and
-                building.status == BuildingStatus.COMPLETED and
-                building.is_active and
-                hasattr(building, 'can_accept_gold') and
-                    building.can_accept_gold()):
-                work_needed_buildings.append(building)
+        # 获取所有需要工作的建筑：未完成、需要修复、空弹药箭塔、需要金币的巢穴和魔法祭坛
+        # 工作原因桶在每帧更新建筑后刷新，这里再确认一次，排除本帧内已不需要工作的建筑
+        self._sync_index()
+        work_needed_buildings = [
+            building for building in self.index.get_needing_work(
+                (WORK_CONSTRUCTION, WORK_REPAIR, WORK_AMMUNITION, WORK_GOLD))
+            if self.index.refresh(building)]
 
         # 返回第一个需要工作的建筑（允许多个工程师选择同一建筑）
         # 只有在真正开始工作时才会锁定建筑，选择阶段不锁定
@@ -809,6 +849,10 @@ class BuildingManager:
         else:
             game_logger.info(f"❌ 建筑位置超出地图范围！")
 
+        # 建成的建筑阻挡寻路：让HPA*抽象图和流场重新判断该格子的可通行性
+        # （MapGrid 上的建筑状态变化已经由瓦块变化事件通知，这里覆盖普通地图）
+        MovementSystem.update_advanced_pathfinding([(x, y)], game_map)
+
         # 注册建筑到ResourceManager
         self._register_building_to_resource_manager(building)
 
@@ -860,20 +904,18 @@ class BuildingManager:
         })
 
         # 统计各种状态的祭坛
-        for building in self.buildings:
-            if (hasattr(building, 'building_type') and
-                    building.building_type.value == 'magic_altar'):
-                stats['total_altars'] += 1
+        for building in self.get_buildings_by_type(BuildingType.MAGIC_ALTAR):
+            stats['total_altars'] += 1
 
-                if building.status == BuildingStatus.COMPLETED:
-                    stats['completed_altars'] += 1
-                elif building.status == BuildingStatus.UNDER_CONSTRUCTION:
-                    stats['under_construction_altars'] += 1
+            if building.status == BuildingStatus.COMPLETED:
+                stats['completed_altars'] += 1
+            elif building.status == BuildingStatus.UNDER_CONSTRUCTION:
+                stats['under_construction_altars'] += 1
 
-                # 添加详细统计
-                if hasattr(building, 'get_detailed_report'):
-                    altar_report = building.get_detailed_report()
-                    stats['altar_details'].append(altar_report)
+            # 添加详细统计
+            if hasattr(building, 'get_detailed_report'):
+                altar_report = building.get_detailed_report()
+                stats['altar_details'].append(altar_report)
 
         # 计算效率指标
         if stats['active_altars'] > 0:
@@ -943,17 +985,12 @@ class BuildingManager:
             }
         }
 
-        # 按类型统计
+        # 按类型、状态统计
+        self._sync_index()
         for building_type in BuildingType:
-            stats['by_type'][building_type.value] = len([
-                building for building in self.buildings if building.building_type == building_type
-            ])
-
-        # 按状态统计
+            stats['by_type'][building_type.value] = self.index.count_by_type(building_type)
         for status in BuildingStatus:
-            stats['by_status'][status.value] = len([
-                building for building in self.buildings if building.status == status
-            ])
+            stats['by_status'][status.value] = self.index.count_by_status(status)
 
         # 按分类统计
         for category in BuildingCategory:
@@ -1146,16 +1183,11 @@ class BuildingManager:
         self.magic_altar_stats['total_uptime'] += delta_seconds
 
         # 计算活跃祭坛数量
-        active_altars = 0
-        altars_with_mages = 0
-
-        for building in self.buildings:
-            if (hasattr(building, 'building_type') and
-                    building.building_type.value == 'magic_altar'):
-                if building.status == BuildingStatus.COMPLETED and building.is_active:
-                    active_altars += 1
-                    if hasattr(building, 'assigned_mage') and building.assigned_mage:
-                        altars_with_mages += 1
+        active_altar_list = [building for building in self.index.get_by_type(BuildingType.MAGIC_ALTAR)
+                             if building.status == BuildingStatus.COMPLETED and building.is_active]
+        active_altars = len(active_altar_list)
+        altars_with_mages = sum(1 for building in active_altar_list
+                                if hasattr(building, 'assigned_mage') and building.assigned_mage)
 
         self.magic_altar_stats['active_altars'] = active_altars
         self.magic_altar_stats['altars_with_mages'] = altars_with_mages
@@ -1163,13 +1195,10 @@ class BuildingManager:
         # 计算平均效率
         if active_altars > 0:
             total_efficiency = 0
-            for building in self.buildings:
-                if (hasattr(building, 'building_type') and
-                    building.building_type.value == 'magic_altar' and
-                        building.status == BuildingStatus.COMPLETED and building.is_active):
-                    if hasattr(building, 'get_resource_statistics'):
-                        stats = building.get_resource_statistics()
-                        total_efficiency += stats.get('efficiency_rating', 0)
+            for building in active_altar_list:
+                if hasattr(building, 'get_resource_statistics'):
+                    stats = building.get_resource_statistics()
+                    total_efficiency += stats.get('efficiency_rating', 0)
             self.magic_altar_stats['average_efficiency'] = total_efficiency / active_altars
 
     def destroy_building(self, building: Building) -> Dict[str, Any]:
@@ -1182,7 +1211,8 @@ class BuildingManager:
         Returns:
             Dict: 摧毁结果
         """
-        if building not in self.buildings:
+        self._sync_index()
+        if building not in self.index:
             return {
                 'destroyed': False,
                 'reason': 'building_not_found',
@@ -1193,8 +1223,14 @@ class BuildingManager:
         for engineer in building.assigned_engineers[:]:
             engineer.cancel_project(building)
 
-        # 从建筑列表中移除
-        self.buildings.remove(building)
+        # 从建筑列表和建筑索引中移除
+        self.remove_building(building)
+
+        # 从资源管理器注销，摧毁的建筑不再计入资源总量和金库收入
+        resource_manager = get_resource_manager(self.game_simulator)
+        if resource_manager:
+            resource_manager.remove_gold_building(building)
+            resource_manager.remove_mana_building(building)
 
         # 标记为摧毁状态
         building.status = BuildingStatus.DESTROYED
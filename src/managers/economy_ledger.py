@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+经济账本
+增量维护金币、魔力的总量、总容量和每个存储建筑的贡献，替代每次查询都遍历建筑列表、
+用 f-string 重新拼接来源信息的汇总方式。
+
+- 存储建筑注册（建造完成）、注销（摧毁）时更新账本
+- 建筑的 stored_gold / stored_mana 及容量是通知属性，存入、取出时账本按差值更新总量
+- 快照按资源缓存，只有数值变化后的第一次读取才重新生成来源列表，界面每帧读取几乎没有开销
+- 按建筑类型统计存储建筑数量（如金库数量），资源生成不再需要扫描地图
+"""
+
+from typing import Any, Dict, List, Optional
+
+from src.entities.building import Building, BuildingType
+
+RESOURCE_GOLD = 'gold'
+RESOURCE_MANA = 'mana'
+
+# 资源 -> (存储量属性, 容量属性)
+RESOURCE_ATTRIBUTES = {
+    RESOURCE_GOLD: ('stored_gold', 'gold_storage_capacity'),
+    RESOURCE_MANA: ('stored_mana', 'mana_storage_capacity'),
+}
+# 属性名 -> (资源, 是否为容量)
+_ATTRIBUTE_RESOURCES = {
+    attribute: (resource, index == 1)
+    for resource, attributes in RESOURCE_ATTRIBUTES.items()
+    for index, attribute in enumerate(attributes)
+}
+
+
+class LedgerSource:
+    """账本中的一个存储建筑"""
+
+    __slots__ = ('building', 'type_name', 'name', 'amount', 'capacity')
+
+    def __init__(self, building: Building, amount: Optional[int], capacity: int):
+        self.building = building
+        building_type = getattr(building, 'building_type', None)
+        self.type_name = building_type.value if building_type else 'unknown'
+        # 建筑名和位置只在注册时拼接一次
+        position = ""
+        if hasattr(building, 'tile_x') and hasattr(building, 'tile_y'):
+            position = f"({building.tile_x},{building.tile_y})"
+        self.name = f"{getattr(building, 'name', '未知建筑')}{position}"
+        self.amount = amount        # None 表示建筑没有该资源的存储属性
+        self.capacity = capacity
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'building': self.type_name,
+            'name': self.name,
+            'amount': self.amount,
+            'capacity': self.capacity,
+            'available': self.amount,
+        }
+
+
+class EconomyLedger:
+    """经济账本 - 资源总量、容量和来源的增量汇总"""
+
+    def __init__(self):
+        self._sources: Dict[str, Dict[Building, LedgerSource]] = {
+            resource: {} for resource in RESOURCE_ATTRIBUTES}
+        self._totals: Dict[str, int] = {resource: 0 for resource in RESOURCE_ATTRIBUTES}
+        self._capacities: Dict[str, int] = {resource: 0 for resource in RESOURCE_ATTRIBUTES}
+        self._type_counts: Dict[str, Dict[BuildingType, int]] = {
+            resource: {} for resource in RESOURCE_ATTRIBUTES}
+
+        # 快照缓存：数值变化时递增版本号
+        self._revisions: Dict[str, int] = {resource: 0 for resource in RESOURCE_ATTRIBUTES}
+        self._snapshots: Dict[str, tuple] = {}
+
+        # 统计信息
+        self.snapshot_builds = 0
+        self.updates = 0
+
+    # ==================== 注册 ====================
+
+    def add_source(self, resource: str, building: Building) -> bool:
+        """
+        注册存储建筑
+
+        Returns:
+            bool: 是否为新注册的建筑
+        """
+        sources = self._sources[resource]
+        if building in sources:
+            return False
+        amount_attribute, capacity_attribute = RESOURCE_ATTRIBUTES[resource]
+        source = LedgerSource(building, getattr(building, amount_attribute, None),
+                              getattr(building, capacity_attribute, 0))
+        sources[building] = source
+        if source.amount is not None:
+            self._totals[resource] += source.amount
+            self._capacities[resource] += source.capacity
+        building_type = getattr(building, 'building_type', None)
+        if building_type is not None:
+            counts = self._type_counts[resource]
+            counts[building_type] = counts.get(building_type, 0) + 1
+
+        # 存入、取出由建筑主动通知
+        building.resource_listener = self._on_resource_changed
+        self._revisions[resource] += 1
+        return True
+
+    def remove_source(self, resource: str, building: Building) -> bool:
+        """注销存储建筑"""
+        source = self._sources[resource].pop(building, None)
+        if source is None:
+            return False
+        if source.amount is not None:
+            self._totals[resource] -= source.amount
+            self._capacities[resource] -= source.capacity
+        building_type = getattr(building, 'building_type', None)
+        if building_type is not None:
+            self._type_counts[resource][building_type] -= 1
+
+        if (getattr(building, 'resource_listener', None) == self._on_resource_changed and
+                not any(building in sources for sources in self._sources.values())):
+            building.resource_listener = None
+        self._revisions[resource] += 1
+        return True
+
+    def _on_resource_changed(self, building: Building, attribute: str, old_value: Any, new_value: Any):
+        """ResourceAttribute 变更通知"""
+        resource, is_capacity = _ATTRIBUTE_RESOURCES[attribute]
+        source = self._sources[resource].get(building)
+        if source is None:
+            return
+
+        if source.amount is None:
+            if is_capacity:
+                source.capacity = new_value
+                return
+            # 建筑第一次获得存储量，连同容量一起计入总量
+            source.amount = new_value
+            self._totals[resource] += new_value
+            self._capacities[resource] += source.capacity
+        elif is_capacity:
+            self._capacities[resource] += new_value - source.capacity
+            source.capacity = new_value
+        else:
+            self._totals[resource] += new_value - source.amount
+            source.amount = new_value
+        self._revisions[resource] += 1
+        self.updates += 1
+
+    # ==================== 查询 ====================
+
+    def get_total(self, resource: str) -> int:
+        """资源总量"""
+        return self._totals[resource]
+
+    def get_capacity(self, resource: str) -> int:
+        """资源总容量"""
+        return self._capacities[resource]
+
+    def count_sources(self, resource: str, building_type: BuildingType) -> int:
+        """某类型存储建筑的数量"""
+        return self._type_counts[resource].get(building_type, 0)
+
+    def get_sources(self, resource: str) -> List[Building]:
+        """按注册顺序返回存储建筑"""
+        return list(self._sources[resource])
+
+    def get_snapshot(self, resource: str, factory):
+        """
+        获取资源快照（数值没有变化时返回缓存的快照）
+
+        Args:
+            resource: 资源名称
+            factory: 快照构造函数 factory(total, available, capacity, sources)
+
+        Returns:
+            factory 的返回值
+        """
+        revision = self._revisions[resource]
+        cached = self._snapshots.get(resource)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+
+        total = self._totals[resource]
+        sources = [source.to_dict() for source in self._sources[resource].values()
+                   if source.amount is not None]
+        snapshot = factory(total, total, self._capacities[resource], sources)
+        self._snapshots[resource] = (revision, snapshot)
+        self.snapshot_builds += 1
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            'totals': dict(self._totals),
+            'capacities': dict(self._capacities),
+            'sources': {resource: len(sources) for resource, sources in self._sources.items()},
+            'updates': self.updates,
+            'snapshot_builds': self.snapshot_builds,
+        }
@@ -5,7 +5,6 @@
 统一管理工程师的任务分配和状态转换
 """
 
-import time
 import math
 import random
 from typing import List, Dict, Optional, Tuple, Any
@@ -15,6 +14,7 @@ from src.entities.building import Building, BuildingStatus
 from src.entities.monster.goblin_engineer import Engineer, EngineerStatus
 from src.core.constants import GameConstants
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
 
 
 class AssignmentStrategy(Enum):
@@ -44,7 +44,7 @@ class WorkTask:
         self.priority = priority
         self.required_gold = required_gold
         self.estimated_duration = estimated_duration
-        self.created_time = time.time()
+        self.created_time = sim_time()
         self.assigned_engineer = None
         self.is_completed = False
 
@@ -101,7 +101,7 @@ class EngineerAssigner:
         self._scan_buildings_for_tasks(buildings, engineers, result)
 
         # 2. 检查分配冷却时间
-        current_time = time.time()
+        current_time = sim_time()
         if current_time - self.last_assignment_time < self.assignment_cooldown:
             return result
 
@@ -320,9 +320,9 @@ class EngineerAssigner:
 
         # 记录分配时间
         if not hasattr(engineer, 'last_assignment_time'):
-            engineer.last_assignment_time = time.time()
+            engineer.last_assignment_time = sim_time()
         else:
-            engineer.last_assignment_time = time.time()
+            engineer.last_assignment_time = sim_time()
 
         game_logger.info(
             f"分配任务: {engineer.name} -> {task.building.name} ({task.task_type})")
@@ -331,7 +331,7 @@ class EngineerAssigner:
         """任务完成后清理工程师状态"""
         engineer.target_building = None
         engineer.status = EngineerStatus.IDLE  # 进入空闲状态，等待新任务分配
-        engineer.last_assignment_time = time.time()
+        engineer.last_assignment_time = sim_time()
 
     def _is_task_completed(self, engineer: Engineer, task: WorkTask) -> bool:
         """检查任务是否完成"""
@@ -559,13 +559,13 @@ class EngineerAssigner:
                     'total_tasks': 0,
                     'completed_tasks': 0,
                     'efficiency_rating': 0.0,
-                    'last_active_time': time.time()
+                    'last_active_time': sim_time()
                 }
 
             stats = self.engineer_stats[engineer]
             if engineer.status in [EngineerStatus.CONSTRUCTING, EngineerStatus.REPAIRING,
                                    EngineerStatus.UPGRADING, EngineerStatus.RELOADING]:
-                stats['last_active_time'] = time.time()
+                stats['last_active_time'] = sim_time()
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取分配器统计信息"""
@@ -2,10 +2,15 @@
 # -*- coding: utf-8 -*-
 """
 统一字体管理器模块
+
+字体对象按 (类别, 字号) 缓存，safe_render 的结果按
+(文本, 字体, 颜色, 抗锯齿, 背景色, UI缩放) 缓存在有内存上限的LRU中，
+每帧重复绘制的标签不再重新检测字符范围和光栅化。
 """
 
 import pygame
 import emoji
+from collections import OrderedDict
 from src.core import emoji_constants
 from src.utils.logger import game_logger
 
@@ -24,6 +29,16 @@ class UnifiedFontManager:
         self.emoji_mapper = None
         self._fonts_initialized = False
 
+        # 字体对象缓存: (类别, 字号) -> Font
+        self._font_cache = {}
+
+        # 渲染结果LRU缓存: 键 -> Surface（返回的Surface是共享的，调用方不应修改）
+        self._text_cache = OrderedDict()
+        self.text_cache_max_entries = 2048
+        self.text_cache_max_bytes = 16 * 1024 * 1024
+        self._text_cache_bytes = 0
+        self._text_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
         game_logger.info("统一字体管理器初始化完成")
 
     def _ensure_fonts_initialized(self):
@@ -173,9 +188,18 @@ class UnifiedFontManager:
             self.emoji_font_name = 'default'
 
     def get_font(self, size=24):
-        """获取中文字体 - 增强版"""
+        """获取中文字体 - 增强版（按字号缓存）"""
         self._ensure_fonts_initialized()
 
+        font = self._font_cache.get(('chinese', size))
+        if font is None:
+            font = self._create_chinese_font(size)
+            self._font_cache[('chinese', size)] = font
+        return font
+
+    def _create_chinese_font(self, size):
+        """逐个尝试候选中文字体"""
+
         # 尝试多个字体选项
         font_candidates = []
 
@@ -209,9 +233,17 @@ class UnifiedFontManager:
             return pygame.font.SysFont('arial', size)
 
     def get_emoji_font(self, size=24):
-        """获取Emoji字体 - 改进的编码处理"""
+        """获取Emoji字体 - 改进的编码处理（按字号缓存）"""
         self._ensure_fonts_initialized()
 
+        font = self._font_cache.get(('emoji', size))
+        if font is None:
+            font = self._create_emoji_font(size)
+            self._font_cache[('emoji', size)] = font
+        return font
+
+    def _create_emoji_font(self, size):
+        """创建Emoji字体"""
         try:
             if self.emoji_font_name and self.emoji_font_name != 'default':
                 # 使用SysFont而不是Font，更好的编码支持
@@ -241,9 +273,63 @@ class UnifiedFontManager:
             ui_scale: UI缩放比例
             antialias: 是否启用抗锯齿 (默认True)
             background_color: 背景颜色，None表示透明背景
+
+        Returns:
+            pygame.Surface: 渲染结果（缓存共享，调用方不应修改）
         """
         self._ensure_fonts_initialized()
 
+        key = (text, font, tuple(color), antialias,
+               tuple(background_color) if background_color is not None else None,
+               ui_scale, use_emoji_fallback)
+        try:
+            surface = self._text_cache.get(key)
+        except TypeError:
+            # 字体对象不可哈希时直接渲染
+            return self._render_uncached(font, text, color, ui_scale, antialias, background_color)
+
+        if surface is not None:
+            self._text_cache.move_to_end(key)
+            self._text_cache_stats['hits'] += 1
+            return surface
+
+        self._text_cache_stats['misses'] += 1
+        surface = self._render_uncached(font, text, color, ui_scale, antialias, background_color)
+        self._cache_text_surface(key, surface)
+        return surface
+
+    def _cache_text_surface(self, key, surface):
+        """存入渲染结果，超过条目数或内存上限时淘汰最久未使用的条目"""
+        size = surface.get_pitch() * surface.get_height()
+        if size > self.text_cache_max_bytes:
+            return
+        self._text_cache[key] = surface
+        self._text_cache_bytes += size
+        while (len(self._text_cache) > self.text_cache_max_entries or
+               self._text_cache_bytes > self.text_cache_max_bytes):
+            _, evicted = self._text_cache.popitem(last=False)
+            self._text_cache_bytes -= evicted.get_pitch() * evicted.get_height()
+            self._text_cache_stats['evictions'] += 1
+
+    def clear_text_cache(self):
+        """清空渲染结果缓存（字体被替换时调用）"""
+        self._text_cache.clear()
+        self._text_cache_bytes = 0
+
+    def get_cache_stats(self):
+        """获取字体与文本缓存统计"""
+        lookups = self._text_cache_stats['hits'] + self._text_cache_stats['misses']
+        return {
+            **self._text_cache_stats,
+            'hit_rate': self._text_cache_stats['hits'] / lookups if lookups else 0.0,
+            'entries': len(self._text_cache),
+            'bytes': self._text_cache_bytes,
+            'max_bytes': self.text_cache_max_bytes,
+            'fonts': len(self._font_cache),
+        }
+
+    def _render_uncached(self, font, text, color, ui_scale, antialias, background_color):
+        """实际的渲染逻辑 - 按字符类型选择字体"""
         # 检查文本是否包含真正的emoji字符（而不是中文）
         has_emoji = self._contains_emoji(text)
         has_chinese = self._contains_chinese(text)
@@ -803,6 +889,15 @@ class UnifiedFontManager:
         """
         self._ensure_fonts_initialized()
 
+        font = self._font_cache.get(('bold', size))
+        if font is None:
+            font = self._create_bold_font(size)
+            self._font_cache[('bold', size)] = font
+        return font
+
+    def _create_bold_font(self, size):
+        """逐个尝试候选加粗字体"""
+
         # 尝试使用系统加粗字体
         bold_fonts = [
             'Arial Bold',
@@ -23,8 +23,10 @@ from src.entities.building import Building, BuildingType, BuildingConfig, Buildi
 from src.entities.gold_mine import GoldMine, GoldMineStatus
 from src.core.enums import TileType
 from src.core.game_state import GameState, Tile
+from src.core.map_grid import MapGrid
 from src.ui.building_ui import BuildingUI
 from src.systems.physics_system import PhysicsSystem
+from src.systems.spatial_index import WorldSpatialIndex
 from src.systems.knockback_animation import KnockbackAnimation
 from src.systems.combat_system import CombatSystem
 from src.effects.effect_manager import EffectManager
@@ -37,6 +39,8 @@ from src.ui.logistics_selection import LogisticsSelectionUI
 from src.entities.building_types import MagicAltar, ArcaneTower
 from src.entities.character_data import CharacterDatabase
 from src.systems.knockback_animation import Particle
+from src.core.sim_clock import SimClock, set_sim_clock, sim_time
+from src.managers.hero_wave_spawner import HeroWave, HeroWaveSpawner
 import sys
 import os
 import time
@@ -61,7 +65,7 @@ class IdleStateManager:
     def register_idle_unit(self, unit):
         """注册进入空闲状态的单位"""
         unit_id = id(unit)
-        current_time = time.time()
+        current_time = sim_time()
 
         # 如果单位已经在空闲列表中，更新开始时间
         if unit_id in self.idle_units:
@@ -85,7 +89,7 @@ class IdleStateManager:
 
     def update_idle_units(self, delta_seconds: float):
         """更新所有空闲状态的单位"""
-        current_time = time.time()
+        current_time = sim_time()
         units_to_remove = []
 
         for unit_id, unit_data in self.idle_units.items():
@@ -175,7 +179,7 @@ class IdleStateManager:
         for unit_id, unit_data in self.idle_units.items():
             unit = unit_data['unit']
             start_time = unit_data['start_time']
-            idle_duration = time.time() - start_time
+            idle_duration = sim_time() - start_time
 
             unit_name = getattr(unit, 'name', 'Unknown')
             unit_type = getattr(unit, 'type', 'Unknown')
@@ -205,6 +209,11 @@ class GameEnvironmentSimulator:
             map_width: 地图宽度（瓦片数量），如果为None则根据屏幕大小自动计算
             map_height: 地图高度（瓦片数量），如果为None则根据屏幕大小自动计算
         """
+        # 模拟时钟 - 必须在创建任何游戏对象之前安装，所有系统的计时都读取它
+        # 时间只随 update() 的 delta 推进，无头模式可以远快于实时运行
+        self.sim_clock = SimClock()
+        set_sim_clock(self.sim_clock)
+
         # 基础设置 - 与真实游戏保持一致
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -262,8 +271,11 @@ class GameEnvironmentSimulator:
         world_bounds = (0, 0, screen_width, screen_height)
         self.physics_system = PhysicsSystem(world_bounds, tile_size)
         self.knockback_animation = KnockbackAnimation()
+        # 世界空间索引 - 战斗、防御塔、技能和范围伤害共享
+        self.spatial_index = WorldSpatialIndex()
         # 使用EffectManager作为主要的effect_manager，与真实游戏保持一致
         self.effect_manager = EffectManager(speed_multiplier=2.0)
+        self.effect_manager.set_spatial_index(self.spatial_index)
 
         # 初始化最新的特效系统
         self.glow_manager = get_glow_manager()
@@ -320,6 +332,9 @@ class GameEnvironmentSimulator:
         # 游戏对象 - 与真实游戏保持一致，通过 building_manager 管理
         self.heroes = []     # 所有英雄
         self.monsters = []  # 所有怪物
+        self.hero_bases = []  # 英雄基地 (x, y, 方向)
+        # 英雄波次刷新器 - 调用 setup_hero_waves 后才会刷新英雄，避免干扰其他测试
+        self.hero_wave_spawner: Optional[HeroWaveSpawner] = None
         self.gold_mines = []  # 所有金矿
 
         # 特殊建筑引用
@@ -413,20 +428,8 @@ class GameEnvironmentSimulator:
 
     def _create_map(self) -> List[List[Tile]]:
         """创建游戏地图"""
-        game_map = []
-
-        for y in range(self.map_height):
-            row = []
-            for x in range(self.map_width):
-                # 创建基础地面瓦片
-                tile = self.tile_manager.create_tile(
-                    x=x, y=y,
-                    tile_type=TileType.GROUND,
-                    is_gold_vein=False,
-                    gold_amount=0
-                )
-                row.append(tile)
-            game_map.append(row)
+        # 创建基础地面瓦片（结构数组地图）
+        game_map = MapGrid(self.map_width, self.map_height, TileType.GROUND)
 
         # 使用安全的打印方法处理表情符号
         if hasattr(self, 'font_manager') and self.font_manager:
@@ -439,13 +442,16 @@ class GameEnvironmentSimulator:
 
     def get_map_as_array(self) -> List[List[int]]:
         """获取地图作为2D数组，用于路径查找"""
+        # 0 = 可通行, 1 = 不可通行
+        # 只有ROCK类型不可通行，其他都可通行
+        if isinstance(self.game_map, MapGrid):
+            return self.game_map.blocked_array((TileType.ROCK,))
+
         map_array = []
         for y in range(self.map_height):
             row = []
             for x in range(self.map_width):
                 tile = self.game_map[y][x]
-                # 0 = 可通行, 1 = 不可通行
-                # 只有ROCK类型不可通行，其他都可通行
                 if tile.tile_type == TileType.ROCK:
                     row.append(1)
                 else:
@@ -471,18 +477,7 @@ class GameEnvironmentSimulator:
         if height is None:
             height = self.map_height
 
-        game_map = []
-        for y in range(height):
-            row = []
-            for x in range(width):
-                tile = self.tile_manager.create_tile(
-                    x=x, y=y,
-                    tile_type=TileType.GROUND,
-                    is_gold_vein=False,
-                    gold_amount=0
-                )
-                row.append(tile)
-            game_map.append(row)
+        game_map = MapGrid(width, height, TileType.GROUND)
 
         game_logger.info(f"🗺️ 生成空白地图: {width}x{height}")
         return game_map
@@ -638,7 +633,7 @@ class GameEnvironmentSimulator:
             dungeon_heart.status = BuildingStatus.UNDER_CONSTRUCTION
             dungeon_heart.is_active = False
 
-        self.building_manager.buildings.append(dungeon_heart)
+        self.building_manager.add_building(dungeon_heart)
         self.dungeon_heart = dungeon_heart
 
         # 设置主基地位置（用于工程师寻找）
@@ -671,7 +666,7 @@ class GameEnvironmentSimulator:
             arrow_tower.status = BuildingStatus.UNDER_CONSTRUCTION
             arrow_tower.is_active = False
 
-        self.building_manager.buildings.append(arrow_tower)
+        self.building_manager.add_building(arrow_tower)
 
         game_logger.info(
             f"🏹 创建箭塔: 位置({x}, {y}), 弹药({arrow_tower.current_ammunition}/{arrow_tower.max_ammunition}), 状态({'已完成' if completed else '建造中'})")
@@ -695,7 +690,7 @@ class GameEnvironmentSimulator:
             arcane_tower.status = BuildingStatus.UNDER_CONSTRUCTION
             arcane_tower.is_active = False
 
-        self.building_manager.buildings.append(arcane_tower)
+        self.building_manager.add_building(arcane_tower)
 
         game_logger.info(
             f"🔮 创建奥术塔: 位置({x}, {y}), 状态({'已完成' if completed else '建造中'})")
@@ -716,7 +711,7 @@ class GameEnvironmentSimulator:
             treasury.status = BuildingStatus.UNDER_CONSTRUCTION
             treasury.is_active = False
 
-        self.building_manager.buildings.append(treasury)
+        self.building_manager.add_building(treasury)
         self.treasury = treasury
 
         # 注册金库到ResourceManager
@@ -763,7 +758,7 @@ class GameEnvironmentSimulator:
                 stored_mana, building.mana_storage_capacity)
 
         # 添加到建筑管理器
-        self.building_manager.buildings.append(building)
+        self.building_manager.add_building(building)
 
         # 注册魔法祭坛到ResourceManager
         if self.resource_manager and completed:
@@ -788,7 +783,7 @@ class GameEnvironmentSimulator:
             training_room.status = BuildingStatus.UNDER_CONSTRUCTION
             training_room.is_active = False
 
-        self.building_manager.buildings.append(training_room)
+        self.building_manager.add_building(training_room)
 
         game_logger.info(
             f"🏋️ 创建训练室: 位置({x}, {y}), 状态({'已完成' if completed else '建造中'})")
@@ -808,7 +803,7 @@ class GameEnvironmentSimulator:
             library.status = BuildingStatus.UNDER_CONSTRUCTION
             library.is_active = False
 
-        self.building_manager.buildings.append(library)
+        self.building_manager.add_building(library)
 
         game_logger.info(
             f"📚 创建图书馆: 位置({x}, {y}), 状态({'已完成' if completed else '建造中'})")
@@ -828,7 +823,7 @@ class GameEnvironmentSimulator:
             prison.status = BuildingStatus.UNDER_CONSTRUCTION
             prison.is_active = False
 
-        self.building_manager.buildings.append(prison)
+        self.building_manager.add_building(prison)
 
         game_logger.info(
             f"🔒 创建监狱: 位置({x}, {y}), 状态({'已完成' if completed else '建造中'})")
@@ -849,7 +844,7 @@ class GameEnvironmentSimulator:
             fortification.status = BuildingStatus.UNDER_CONSTRUCTION
             fortification.is_active = False
 
-        self.building_manager.buildings.append(fortification)
+        self.building_manager.add_building(fortification)
 
         game_logger.info(
             f"🛡️ 创建防御工事: 位置({x}, {y}), 状态({'已完成' if completed else '建造中'})")
@@ -938,7 +933,7 @@ class GameEnvironmentSimulator:
             building.construction_progress = 0.0
 
         # 添加到建筑列表
-        self.building_manager.buildings.append(building)
+        self.building_manager.add_building(building)
 
         # 注册到资源管理器（如果适用）
         self._register_building_to_resource_manager(
@@ -1503,44 +1498,44 @@ class GameEnvironmentSimulator:
 
     # ==================== 游戏逻辑更新 ====================
 
-    def _spawn_hero(self):
-        """生成英雄 - 在英雄基地附近刷新"""
-        if random.random() < GameBalance.hero_spawn_rate:
-            if not hasattr(self, 'hero_bases') or not self.hero_bases:
-                # 模拟器模式下不生成英雄，避免干扰测试
-                return
+    def setup_hero_waves(self, bases: List[Tuple[int, int, str]], seed: Optional[int] = None,
+                         rate: float = GameBalance.hero_wave_rate,
+                         waves: Optional[List[HeroWave]] = None,
+                         wave_size: Tuple[int, int] = GameBalance.hero_wave_size,
+                         hero_types: Optional[List[str]] = None) -> HeroWaveSpawner:
+        """
+        启用英雄波次刷新（与真实游戏相同的调度，相同种子下与步长无关）
 
-            # 随机选择一个英雄基地
-            base_x, base_y, direction = random.choice(self.hero_bases)
-
-            # 在基地附近的已挖掘区域生成英雄
-            spawn_positions = []
-            for dy in range(-2, 3):
-                for dx in range(-2, 3):
-                    x = base_x + dx
-                    y = base_y + dy
-                    if (0 <= x < self.map_width and 0 <= y < self.map_height):
-                        tile = self.game_map[y][x]
-                        if tile.type == TileType.GROUND or tile.is_dug:
-                            spawn_positions.append((x, y))
-
-            if spawn_positions:
-                # 随机选择一个生成位置
-                spawn_x, spawn_y = random.choice(spawn_positions)
-
-                # 随机选择英雄类型
-                hero_type = 'knight'
-                hero_name = '骑士'
-
-                hero = Hero(spawn_x * self.tile_size + self.tile_size // 2,
-                            spawn_y * self.tile_size + self.tile_size // 2, hero_type)
-                # 设置游戏实例引用，用于触发攻击响应
-                hero.game_instance = self
-                self.heroes.append(hero)
-                game_logger.info(
-                    f"👹 {hero_name}从基地 ({base_x}, {base_y}) 入侵！")
-            else:
-                game_logger.info("❌ 英雄基地附近没有可用的生成位置")
+        Args:
+            bases: 英雄基地列表 (x, y, 方向)
+            seed: 随机种子
+            rate: 随机波次的期望频率（每秒），0 表示只使用脚本波次
+            waves: 脚本波次列表
+            wave_size: 随机波次的英雄数量范围
+            hero_types: 英雄类型池，None 时使用所有英雄
+
+        Returns:
+            HeroWaveSpawner: 英雄波次刷新器
+        """
+        if hero_types is None:
+            hero_types = list(CharacterDatabase().get_all_heroes().keys())
+        self.hero_bases = list(bases)
+        self.hero_wave_spawner = HeroWaveSpawner(
+            hero_types, seed=seed, rate=rate, wave_size=wave_size, waves=waves)
+        self.hero_wave_spawner.set_bases(self.hero_bases, self.game_map)
+        game_logger.info(
+            f"🏰 英雄波次刷新已启用: {len(self.hero_bases)} 个基地，种子 {self.hero_wave_spawner.seed}")
+        return self.hero_wave_spawner
+
+    def _spawn_hero(self, delta_seconds: float):
+        """生成英雄 - 刷新器按模拟时间调度波次，在英雄基地附近批量刷新"""
+        if self.hero_wave_spawner is None:
+            # 模拟器默认不生成英雄，避免干扰测试
+            return
+
+        for spawn in self.hero_wave_spawner.update(delta_seconds, self.game_map):
+            self.create_hero(spawn.tile_x * self.tile_size + self.tile_size // 2,
+                             spawn.tile_y * self.tile_size + self.tile_size // 2, spawn.hero_type)
 
     def update(self, delta_time: float):
         """
@@ -1552,6 +1547,10 @@ class GameEnvironmentSimulator:
         # 将毫秒转换为秒，供需要秒为单位的子系统使用
         delta_seconds = delta_time / 1000.0
 
+        # 推进模拟时钟，本帧内所有系统读取同一时间
+        self.sim_clock.advance(delta_seconds)
+        self.simulation_time += delta_time
+
         # 更新怪物（期望秒）- 排除工程师，工程师由building_manager管理
         for creature in self.monsters[:]:
             creature.update(delta_seconds, self.game_map,
@@ -1562,10 +1561,16 @@ class GameEnvironmentSimulator:
             hero.update(delta_seconds, self.monsters,
                         self.game_map, self.effect_manager)
 
-        # 更新特效系统（期望毫秒）
+        # 同步世界空间索引 - 单位移动完成后每帧增量同步一次，供特效、战斗、防御塔查询
+        if self.spatial_index:
+            self.spatial_index.sync_game(self)
+
+        # 更新特效系统（期望毫秒）- 接入空间索引后碰撞只查询附近格子，无需拼接全部单位
         if self.effect_manager:
-            all_targets = self.monsters + self.heroes
-            self.effect_manager.update(delta_time, all_targets)
+            if self.spatial_index:
+                self.effect_manager.update(delta_time)
+            else:
+                self.effect_manager.update(delta_time, self.monsters + self.heroes)
 
         # 更新物理系统
         if self.physics_system:
@@ -1619,6 +1624,9 @@ class GameEnvironmentSimulator:
         # 清理死亡的单位
         self._cleanup_dead_units()
 
+        # 生成英雄
+        self._spawn_hero(delta_seconds)
+
     # ==================== 测试场景预设 ====================
 
     def setup_repair_test_scenario(self):
@@ -2236,13 +2244,19 @@ class GameEnvironmentSimulator:
         """重置模拟环境"""
         self.simulation_time = 0.0
         self.is_paused = False
+        self.sim_clock.reset()
+        set_sim_clock(self.sim_clock)
 
         # 清空所有对象
-        self.building_manager.buildings.clear()
+        self.building_manager.clear_buildings()
         self.building_manager.engineers.clear()
         # Workers are managed in monsters list, no need to clear separately
         self.heroes.clear()
         self.monsters.clear()
+        self.hero_bases = []
+        self.hero_wave_spawner = None
+        if self.spatial_index:
+            self.spatial_index.clear()
 
         # 重置管理器
         self.building_manager = BuildingManager()
@@ -2299,7 +2313,13 @@ class GameEnvironmentSimulator:
     # ==================== 运行循环 ====================
 
     def run_simulation(self, max_duration: float = 60.0, enable_visualization: bool = True):
-        """运行模拟"""
+        """
+        运行模拟
+
+        Args:
+            max_duration: 最大模拟时长（模拟时间，秒）。无头模式按固定100ms步长快进，不受墙钟限制
+            enable_visualization: 是否启用可视化
+        """
         if enable_visualization:
             self.init_pygame()
             game_logger.info("🎮 开始可视化模拟")
@@ -2307,9 +2327,10 @@ class GameEnvironmentSimulator:
             game_logger.info("🎮 开始无头模拟")
 
         start_time = time.time()
+        sim_start_time = self.sim_clock.now()
         running = True
 
-        while running and (time.time() - start_time) < max_duration:
+        while running and (self.sim_clock.now() - sim_start_time) < max_duration:
             if enable_visualization:
                 running = self.handle_events()
                 if not running:
@@ -2328,7 +2349,8 @@ class GameEnvironmentSimulator:
         if enable_visualization:
             pygame.quit()
 
-        game_logger.info(f"🏁 模拟结束，运行时间: {time.time() - start_time:.1f}秒")
+        game_logger.info(
+            f"🏁 模拟结束，模拟时间: {self.sim_clock.now() - sim_start_time:.1f}秒，运行时间: {time.time() - start_time:.1f}秒")
         return self.get_statistics()
 
     # ==================== 测试辅助方法 ====================
@@ -2740,7 +2762,7 @@ class GameEnvironmentSimulator:
         return {
             'knockback_effects': self.knockback_animation.get_effect_count(),
             'visual_effects': len(self.effect_manager.visual_effects) if hasattr(self.effect_manager, 'visual_effects') else 0,
-            'particle_effects': len(self.effect_manager.particle_system.particles) if hasattr(self.effect_manager, 'particle_system') else 0
+            'particle_effects': self.effect_manager.particle_system.get_particle_count() if hasattr(self.effect_manager, 'particle_system') else 0
         }
 
     def _render_building_health_bar_real_game(self, building, screen_x: int, screen_y: int):
@@ -2958,6 +2980,9 @@ class GameEnvironmentSimulator:
                 creature.bound_lair.on_bound_monster_died()
                 game_logger.info(f"🔓 通知巢穴：{creature.type} 已死亡，解除绑定")
 
+            # 清理移动状态和排队中的寻路任务
+            MovementSystem.clear_unit_state(creature)
+
             # 从monsters列表中移除
             self.monsters.remove(creature)
             game_logger.info(f"💀 {creature.type} 死亡并被移除")
@@ -2969,6 +2994,7 @@ class GameEnvironmentSimulator:
             # 清理工程师的任务分配
             if hasattr(engineer, 'target_building') and engineer.target_building:
                 engineer.target_building = None
+            MovementSystem.clear_unit_state(engineer)
 
             # 从building_manager.engineers列表中移除
             self.building_manager.engineers.remove(engineer)
@@ -2982,6 +3008,7 @@ class GameEnvironmentSimulator:
                 if hero.melee_target.melee_target == hero:
                     hero.melee_target.melee_target = None
                 hero.melee_target = None
+            MovementSystem.clear_unit_state(hero)
             self.heroes.remove(hero)
             game_logger.info(f"💀 {hero.type} 死亡并被移除")
 
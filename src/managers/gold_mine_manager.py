@@ -2,15 +2,26 @@
 # -*- coding: utf-8 -*-
 """
 金矿管理器 - 独立于可达性系统的金矿信息管理
+
+结构数组地图(MapGrid)上使用事件驱动的金矿注册表：首次接入地图时扫描一次，
+之后只在瓦块变化事件（挖掘发现矿脉、采矿、枯竭）和挖掘者分配/移除时更新对应条目，
+并按空间分桶索引金矿，支持"某位置附近最好的 k 个金矿"查询。
+普通 List[List[Tile]] 地图仍使用全图扫描。
 """
 
-import time
-from typing import List, Dict, Tuple, Set, Optional
+import heapq
+import math
+from typing import Any, Callable, List, Dict, Tuple, Set, Optional
 from collections import defaultdict
 
 from src.core.enums import TileType
 from src.core.constants import GameConstants
+from src.core.map_grid import MapGrid, TILE_TYPES
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
+
+# 每个金矿最多同时容纳的挖掘者数量
+MAX_MINERS_PER_MINE = 3
 
 
 class GoldMineManager:
@@ -34,13 +45,220 @@ class GoldMineManager:
         self.mine_count = 0
         self.available_mine_count = 0
 
+        # 事件驱动注册表
+        self._tracked_map: Optional[MapGrid] = None
+        self._pending_changes = False
+        self.bucket_size = 8  # 空间分桶大小（瓦块）
+        self._buckets: Dict[Tuple[int, int],
+                            Set[Tuple[int, int]]] = defaultdict(set)
+
     def register_gold_mine_object(self, x: int, y: int, gold_mine: 'GoldMine'):
         """注册金矿对象引用"""
         self.gold_mine_objects[(x, y)] = gold_mine
 
+    # ==================== 事件驱动注册表 ====================
+
+    def is_tracking(self, game_map: Any) -> bool:
+        """检查注册表是否正在跟踪该地图（由事件保持最新）"""
+        return game_map is not None and game_map is self._tracked_map
+
+    def attach_map(self, game_map: MapGrid):
+        """接入结构数组地图：扫描一次现有金矿，之后通过瓦块变化事件增量更新"""
+        if self._tracked_map is not None:
+            self._tracked_map.remove_change_listener(self._on_tile_changed)
+
+        self._tracked_map = game_map
+        self.gold_mines.clear()
+        self.available_mines.clear()
+        self.exhausted_mines.clear()
+        self._buckets.clear()
+        self.total_gold_amount = 0
+        self.total_available_gold = 0
+        self.mine_count = 0
+        self.available_mine_count = 0
+
+        is_gold_vein = game_map.is_gold_vein
+        for i in range(game_map.size):
+            if is_gold_vein[i]:
+                self._sync_grid_cell(game_map, i, log=False)
+
+        game_map.add_change_listener(self._on_tile_changed)
+        self._pending_changes = True
+        self.last_update = sim_time()
+        game_logger.info(
+            f"💰 金矿注册表已接入地图: {self.mine_count} 个金矿，{self.available_mine_count} 个可用，总储量: {self.total_gold_amount}")
+
+    def _on_tile_changed(self, game_map: MapGrid, i: int):
+        """瓦块变化事件（挖掘发现矿脉、采矿、枯竭、瓦块替换）"""
+        if game_map is self._tracked_map:
+            self._sync_grid_cell(game_map, i)
+
+    def _sync_grid_cell(self, game_map: MapGrid, i: int, log: bool = True):
+        """根据网格中的瓦块状态更新单个金矿条目"""
+        x, y = i % game_map.width, i // game_map.width
+        tile = game_map.overrides.get(i) if game_map.overrides else None
+        if tile is not None:
+            self._sync_mine(x, y, bool(getattr(tile, 'is_gold_vein', False)),
+                            int(getattr(tile, 'gold_amount', 0) or 0),
+                            int(getattr(tile, 'miners_count', 0) or 0),
+                            getattr(tile, 'type', None), log)
+        else:
+            self._sync_mine(x, y, bool(game_map.is_gold_vein[i]),
+                            int(game_map.gold_amount[i]),
+                            int(game_map.miners_count[i]),
+                            TILE_TYPES[game_map.tile_type[i]], log)
+
+    def _sync_mine(self, x: int, y: int, is_gold_vein: bool, gold_amount: int,
+                   miners_count: int, tile_type: Optional[TileType], log: bool = True):
+        """更新金矿条目（原地修改已有的信息字典，外部持有的引用保持有效）"""
+        pos = (x, y)
+        mine_info = self.gold_mines.get(pos)
+
+        if not is_gold_vein:
+            if mine_info is not None:
+                self._remove_contribution(pos, mine_info)
+                del self.gold_mines[pos]
+                self._buckets[self._bucket_key(x, y)].discard(pos)
+                self.mining_assignments.pop(pos, None)
+                self.mine_count -= 1
+                self._pending_changes = True
+                if log:
+                    game_logger.info(f"💔 金矿消失: {pos}")
+            return
+
+        if mine_info is None:
+            mine_info = {'gold_amount': 0, 'miners_count': 0,
+                         'is_available': False, 'tile_type': None, 'last_updated': 0.0}
+            self.gold_mines[pos] = mine_info
+            self._buckets[self._bucket_key(x, y)].add(pos)
+            self.mine_count += 1
+            self._pending_changes = True
+            if log:
+                game_logger.info(f"🆕 发现新金矿: {pos} 储量: {gold_amount}")
+        else:
+            self._remove_contribution(pos, mine_info)
+            if mine_info['gold_amount'] > 0 and gold_amount <= 0:
+                self._pending_changes = True
+                if log:
+                    game_logger.info(f"💔 金矿枯竭: {pos}")
+
+        mine_info['gold_amount'] = gold_amount
+        mine_info['miners_count'] = max(
+            miners_count, len(self.mining_assignments.get(pos, ())))
+        mine_info['tile_type'] = tile_type
+        mine_info['last_updated'] = sim_time()
+        self._add_contribution(pos, mine_info)
+
+    def _add_contribution(self, pos: Tuple[int, int], mine_info: Dict):
+        """把金矿计入可用集合和统计"""
+        mine_info['is_available'] = (mine_info['gold_amount'] > 0 and
+                                     mine_info['miners_count'] < MAX_MINERS_PER_MINE)
+        self.total_gold_amount += mine_info['gold_amount']
+        if mine_info['is_available']:
+            self.available_mines.add(pos)
+            self.total_available_gold += mine_info['gold_amount']
+            self.available_mine_count += 1
+        else:
+            self.exhausted_mines.add(pos)
+
+    def _remove_contribution(self, pos: Tuple[int, int], mine_info: Dict):
+        """从可用集合和统计中移除金矿"""
+        self.total_gold_amount -= mine_info['gold_amount']
+        if pos in self.available_mines:
+            self.available_mines.discard(pos)
+            self.total_available_gold -= mine_info['gold_amount']
+            self.available_mine_count -= 1
+        self.exhausted_mines.discard(pos)
+
+    def _bucket_key(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // self.bucket_size, y // self.bucket_size)
+
+    def get_best_veins(self, x: float, y: float, k: Optional[int] = 3,
+                       max_distance: Optional[float] = None,
+                       score: Optional[Callable[[Tuple[int, int], Dict, float], float]] = None,
+                       available_only: bool = True,
+                       predicate: Optional[Callable[[int, int], bool]] = None) -> List[Tuple[int, int, int]]:
+        """
+        查询 (x, y) 附近最好的 k 个金矿（按空间分桶由近及远搜索）
+
+        Args:
+            x, y: 查询位置（瓦块坐标）
+            k: 返回数量，None 表示返回范围内的全部金矿
+            max_distance: 最大距离（瓦块），None 表示不限
+            score: 评分函数 score(pos, mine_info, distance)，越大越好；None 时按距离由近到远
+            available_only: 是否只返回可用（有储量且未满员）的金矿
+            predicate: 额外过滤条件 predicate(x, y)，如可达性检查
+
+        Returns:
+            List[Tuple[int, int, int]]: (x, y, 储量) 列表，按评分从高到低排序
+        """
+        if not self._buckets:
+            return []
+
+        size = self.bucket_size
+        center_x, center_y = int(x // size), int(y // size)
+        if max_distance is not None:
+            max_ring = int(max_distance // size) + 1
+        else:
+            max_ring = max(max(abs(bx - center_x), abs(by - center_y))
+                           for bx, by in self._buckets)
+
+        candidates = []  # (评分, 距离, 位置, 储量)
+        for ring in range(max_ring + 1):
+            # 按距离排序时，第 ring 环的金矿距离至少为 (ring - 1) * size，不可能更近就提前结束
+            if score is None and k is not None and len(candidates) >= k:
+                kth_distance = heapq.nsmallest(
+                    k, (c[1] for c in candidates))[-1]
+                if kth_distance <= (ring - 1) * size:
+                    break
+
+            for bucket in self._iter_bucket_ring(center_x, center_y, ring):
+                for pos in self._buckets.get(bucket, ()):
+                    if available_only and pos not in self.available_mines:
+                        continue
+                    distance = math.sqrt(
+                        (pos[0] - x) ** 2 + (pos[1] - y) ** 2)
+                    if max_distance is not None and distance > max_distance:
+                        continue
+                    if predicate is not None and not predicate(pos[0], pos[1]):
+                        continue
+                    mine_info = self.gold_mines[pos]
+                    value = -distance if score is None else score(
+                        pos, mine_info, distance)
+                    candidates.append(
+                        (value, distance, pos, mine_info['gold_amount']))
+
+        if k is None:
+            best = sorted(candidates, key=lambda c: c[0], reverse=True)
+        else:
+            best = heapq.nlargest(k, candidates, key=lambda c: c[0])
+        return [(pos[0], pos[1], gold_amount) for _, _, pos, gold_amount in best]
+
+    @staticmethod
+    def _iter_bucket_ring(center_x: int, center_y: int, ring: int):
+        """遍历以 (center_x, center_y) 为中心、切比雪夫距离为 ring 的分桶"""
+        if ring == 0:
+            yield (center_x, center_y)
+            return
+        for bx in range(center_x - ring, center_x + ring + 1):
+            yield (bx, center_y - ring)
+            yield (bx, center_y + ring)
+        for by in range(center_y - ring + 1, center_y + ring):
+            yield (center_x - ring, by)
+            yield (center_x + ring, by)
+
     def update_gold_mines(self, game_map: List[List]) -> bool:
         """更新金矿信息"""
-        current_time = time.time()
+        if isinstance(game_map, MapGrid):
+            # 结构数组地图由事件保持最新，只报告自上次调用以来是否有变化
+            if not self.is_tracking(game_map):
+                self.attach_map(game_map)
+            changes_detected = self._pending_changes
+            self._pending_changes = False
+            self.last_update = sim_time()
+            return changes_detected
+
+        current_time = sim_time()
 
         # 检查是否需要更新
         if current_time - self.last_update < self.update_interval:
@@ -81,7 +299,7 @@ class GoldMineManager:
                     mine_info = {
                         'gold_amount': gold_amount,
                         'miners_count': miners_count,
-                        'is_available': gold_amount > 0 and miners_count < 3,
+                        'is_available': gold_amount > 0 and miners_count < MAX_MINERS_PER_MINE,
                         'tile_type': getattr(tile, 'type', None),
                         'last_updated': current_time
                     }
@@ -150,17 +368,14 @@ class GoldMineManager:
             return False
 
         mine_info = self.gold_mines.get((x, y))
-        if not mine_info or mine_info['miners_count'] >= 3:
+        if not mine_info or mine_info['miners_count'] >= MAX_MINERS_PER_MINE:
             return False
 
-        # 更新挖掘者计数
+        # 更新挖掘者计数，满员时从可用集合中移除
+        self._remove_contribution((x, y), mine_info)
         mine_info['miners_count'] += 1
         self.mining_assignments[(x, y)].add(miner_id)
-
-        # 检查是否仍然可用
-        if mine_info['miners_count'] >= 3:
-            self.available_mines.discard((x, y))
-            self.available_mine_count -= 1
+        self._add_contribution((x, y), mine_info)
 
         # 更新实际的金矿对象状态
         if (x, y) in self.gold_mine_objects:
@@ -173,7 +388,7 @@ class GoldMineManager:
                     f"✅ 金矿对象状态更新成功: 位置=({x}, {y}), 状态={gold_mine.status.name}, 挖掘者={len(gold_mine.mining_assignments)}")
 
         game_logger.info(
-            f"👷 挖掘者 {miner_id} 分配到金矿 ({x}, {y})，当前挖掘者: {mine_info['miners_count']}/3")
+            f"👷 挖掘者 {miner_id} 分配到金矿 ({x}, {y})，当前挖掘者: {mine_info['miners_count']}/{MAX_MINERS_PER_MINE}")
         return True
 
     def remove_miner(self, x: int, y: int, miner_id: str) -> bool:
@@ -185,14 +400,11 @@ class GoldMineManager:
         if miner_id not in self.mining_assignments[(x, y)]:
             return False
 
-        # 更新挖掘者计数
-        mine_info['miners_count'] -= 1
+        # 更新挖掘者计数，有储量且未满员时重新可用
+        self._remove_contribution((x, y), mine_info)
+        mine_info['miners_count'] = max(0, mine_info['miners_count'] - 1)
         self.mining_assignments[(x, y)].discard(miner_id)
-
-        # 检查是否重新可用
-        if mine_info['miners_count'] < 3 and mine_info['gold_amount'] > 0:
-            self.available_mines.add((x, y))
-            self.available_mine_count += 1
+        self._add_contribution((x, y), mine_info)
 
         # 更新实际的金矿对象状态
         if (x, y) in self.gold_mine_objects:
@@ -202,12 +414,13 @@ class GoldMineManager:
                 game_logger.warning(f"⚠️ 金矿对象移除挖掘者失败: {result['message']}")
 
         game_logger.info(
-            f"👷 挖掘者 {miner_id} 离开金矿 ({x}, {y})，当前挖掘者: {mine_info['miners_count']}/3")
+            f"👷 挖掘者 {miner_id} 离开金矿 ({x}, {y})，当前挖掘者: {mine_info['miners_count']}/{MAX_MINERS_PER_MINE}")
         return True
 
     def get_stats(self) -> Dict:
         """获取金矿统计信息"""
         return {
+            'event_driven': self._tracked_map is not None,
             'total_mines': self.mine_count,
             'available_mines': self.available_mine_count,
             'exhausted_mines': len(self.exhausted_mines),
@@ -233,3 +446,9 @@ def get_gold_mine_manager() -> GoldMineManager:
     if _gold_mine_manager is None:
         _gold_mine_manager = GoldMineManager()
     return _gold_mine_manager
+
+
+def reset_gold_mine_manager():
+    """重置金矿管理器（用于测试或重新开始游戏）"""
+    global _gold_mine_manager
+    _gold_mine_manager = None
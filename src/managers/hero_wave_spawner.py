@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+英雄波次刷新器
+按模拟时间调度英雄入侵，替代每帧掷一次 hero_spawn_rate 的刷新方式（入侵频率随帧率变化）。
+
+- 随机波次：泊松过程，波次间隔服从指数分布，期望频率为 GameBalance.hero_wave_rate（每秒）
+- 脚本波次：HeroWave 列表，在指定的模拟时间出现，可以指定英雄数量、类型和基地
+- 一次更新跨过多个波次时（大步长无头模拟）按时间顺序全部刷出，入侵总量与帧率无关
+- 调度和波次内容使用两个由同一种子派生的随机数生成器，相同种子下波次时间与地图状态无关，
+  30/60/144 FPS 和 10 倍速无头模拟得到相同的入侵序列
+- 每个英雄基地的可刷新格子预先计算并缓存，结构数组地图(MapGrid)上挖掘等瓦块变化事件使对应基地的缓存失效；
+  普通 List[List[Tile]] 地图每个波次重新计算
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.constants import GameBalance
+from src.core.enums import TileType
+from src.utils.logger import game_logger
+
+Cell = Tuple[int, int]
+# 英雄基地: (瓦片x, 瓦片y, 方向)
+HeroBase = Tuple[int, int, str]
+
+# 英雄在基地周围多少格内刷新（5x5 区域）
+HERO_SPAWN_RADIUS = 2
+
+
+@dataclass
+class HeroWave:
+    """脚本波次"""
+    time: float                              # 出现时间（秒，从刷新器开始计时）
+    count: int = 1                           # 英雄数量
+    hero_types: Optional[List[str]] = None   # 英雄类型（按顺序循环使用），None 时从英雄池随机
+    base: Optional[int] = None               # 英雄基地序号，None 时随机
+
+
+@dataclass
+class HeroSpawn:
+    """刷新结果 - 由游戏据此创建英雄"""
+    hero_type: str
+    tile_x: int
+    tile_y: int
+    base: HeroBase
+    wave_time: float                         # 所属波次的计划时间（秒）
+
+
+class HeroWaveSpawner:
+    """英雄波次刷新器 - 按模拟时间调度、可复现的英雄入侵"""
+
+    def __init__(self, hero_types: Sequence[str], seed: Optional[int] = None,
+                 rate: float = GameBalance.hero_wave_rate,
+                 wave_size: Tuple[int, int] = GameBalance.hero_wave_size,
+                 waves: Optional[Iterable[HeroWave]] = None,
+                 spawn_radius: int = HERO_SPAWN_RADIUS):
+        """
+        初始化英雄波次刷新器
+
+        Args:
+            hero_types: 随机波次使用的英雄类型池
+            seed: 随机种子，None 时从全局随机数生成器取一个（全局种子固定时同样可复现）
+            rate: 随机波次的期望频率（每秒），0 表示只使用脚本波次
+            wave_size: 随机波次的英雄数量范围 (最少, 最多)
+            waves: 脚本波次列表
+            spawn_radius: 英雄在基地周围多少格内刷新
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        master = random.Random(seed)
+        self._schedule_rng = random.Random(master.getrandbits(64))
+        self._wave_rng = random.Random(master.getrandbits(64))
+
+        self.hero_types = list(hero_types)
+        self.rate = rate
+        self.wave_size = wave_size
+        self.spawn_radius = spawn_radius
+
+        self.elapsed = 0.0
+        self._scripted = sorted(waves or [], key=lambda wave: wave.time)
+        self._next_scripted = 0
+        self._next_random_time = self._next_wave_time(0.0)
+
+        # 英雄基地及可刷新格子缓存（None 表示需要重新计算）
+        self.bases: List[HeroBase] = []
+        self._map = None
+        self._spawn_cells: List[Optional[List[Cell]]] = []
+        self._bases_by_index: Dict[int, List[int]] = {}
+
+        # 统计信息
+        self.stats = {
+            'waves': 0,
+            'heroes': 0,
+            'skipped_waves': 0,
+            'cell_rebuilds': 0,
+        }
+
+    # ==================== 英雄基地 ====================
+
+    def set_bases(self, bases: Sequence[HeroBase], game_map: List[List] = None):
+        """
+        设置英雄基地
+
+        Args:
+            bases: 英雄基地列表
+            game_map: 游戏地图，MapGrid 会注册瓦块变化监听
+        """
+        self.bases = list(bases)
+        self._spawn_cells = [None] * len(self.bases)
+        if game_map is not None and game_map is not self._map:
+            if self._map is not None and hasattr(self._map, 'remove_change_listener'):
+                self._map.remove_change_listener(self._on_tile_changed)
+            self._map = game_map
+            if hasattr(game_map, 'add_change_listener'):
+                game_map.add_change_listener(self._on_tile_changed)
+
+        # 基地刷新区域内的格子 -> 基地序号，瓦块变化时只让对应基地的缓存失效
+        self._bases_by_index.clear()
+        if hasattr(self._map, 'add_change_listener'):
+            width, height = self._map.width, self._map.height
+            for base_index, (base_x, base_y, _) in enumerate(self.bases):
+                for x, y in self._area(base_x, base_y, width, height):
+                    self._bases_by_index.setdefault(y * width + x, []).append(base_index)
+
+    def _on_tile_changed(self, grid, i: int):
+        """MapGrid 瓦块变化回调"""
+        if grid is self._map:
+            for base_index in self._bases_by_index.get(i, ()):
+                self._spawn_cells[base_index] = None
+
+    def invalidate_tiles(self, changed_tiles: Iterable[Cell]):
+        """标记瓦片发生了变化（用于不经过瓦块视图的修改）"""
+        radius = self.spawn_radius
+        for x, y in changed_tiles:
+            for base_index, (base_x, base_y, _) in enumerate(self.bases):
+                if abs(x - base_x) <= radius and abs(y - base_y) <= radius:
+                    self._spawn_cells[base_index] = None
+
+    def _area(self, base_x: int, base_y: int, width: int, height: int) -> List[Cell]:
+        radius = self.spawn_radius
+        return [(base_x + dx, base_y + dy)
+                for dy in range(-radius, radius + 1)
+                for dx in range(-radius, radius + 1)
+                if 0 <= base_x + dx < width and 0 <= base_y + dy < height]
+
+    def get_spawn_cells(self, base_index: int, game_map: List[List]) -> List[Cell]:
+        """获取英雄基地附近可以刷新英雄的格子（已挖掘的区域）"""
+        cacheable = game_map is self._map and hasattr(game_map, 'add_change_listener')
+        cells = self._spawn_cells[base_index] if cacheable else None
+        if cells is not None:
+            return cells
+
+        base_x, base_y, _ = self.bases[base_index]
+        height = len(game_map)
+        width = len(game_map[0]) if height else 0
+        cells = []
+        for x, y in self._area(base_x, base_y, width, height):
+            tile = game_map[y][x]
+            if tile.type == TileType.GROUND or tile.is_dug:
+                cells.append((x, y))
+        if cacheable:
+            self._spawn_cells[base_index] = cells
+        self.stats['cell_rebuilds'] += 1
+        return cells
+
+    # ==================== 调度 ====================
+
+    def _next_wave_time(self, after: float) -> float:
+        """下一个随机波次的时间（泊松过程：间隔服从指数分布）"""
+        if self.rate <= 0:
+            return math.inf
+        return after + self._schedule_rng.expovariate(self.rate)
+
+    def update(self, delta_seconds: float, game_map: List[List]) -> List[HeroSpawn]:
+        """
+        推进刷新器时间，返回本次更新到期的所有波次的英雄
+
+        Args:
+            delta_seconds: 模拟时间增量（秒）
+            game_map: 游戏地图
+
+        Returns:
+            List[HeroSpawn]: 需要创建的英雄（按波次时间排序）
+        """
+        if delta_seconds > 0:
+            self.elapsed += delta_seconds
+        if not self.bases:
+            return []
+
+        spawns = []
+        while True:
+            scripted = (self._scripted[self._next_scripted]
+                        if self._next_scripted < len(self._scripted) else None)
+            scripted_time = scripted.time if scripted else math.inf
+            wave_time = min(scripted_time, self._next_random_time)
+            if wave_time > self.elapsed:
+                break
+
+            if scripted_time <= self._next_random_time:
+                self._next_scripted += 1
+                wave = scripted
+            else:
+                low, high = self.wave_size
+                wave = HeroWave(wave_time, self._wave_rng.randint(low, high))
+                # 间隔从计划时间而不是本次更新的时间起算，不受更新步长影响
+                self._next_random_time = self._next_wave_time(wave_time)
+            spawns.extend(self._spawn_wave(wave, game_map))
+        return spawns
+
+    def _spawn_wave(self, wave: HeroWave, game_map: List[List]) -> List[HeroSpawn]:
+        """在一个英雄基地附近批量刷出一个波次"""
+        rng = self._wave_rng
+        if wave.base is not None and 0 <= wave.base < len(self.bases):
+            base_index = wave.base
+        else:
+            base_index = rng.randrange(len(self.bases))
+        base = self.bases[base_index]
+
+        if wave.hero_types:
+            hero_types = [wave.hero_types[i % len(wave.hero_types)] for i in range(wave.count)]
+        elif self.hero_types:
+            hero_types = [rng.choice(self.hero_types) for _ in range(wave.count)]
+        else:
+            hero_types = []
+
+        if not hero_types:
+            return []
+        cells = self.get_spawn_cells(base_index, game_map)
+        if not cells:
+            self.stats['skipped_waves'] += 1
+            game_logger.info(f"❌ 英雄基地 ({base[0]}, {base[1]}) 附近没有可用的生成位置")
+            return []
+
+        # 格子足够时同一波次的英雄不重叠
+        if len(cells) >= len(hero_types):
+            positions = rng.sample(cells, len(hero_types))
+        else:
+            positions = [rng.choice(cells) for _ in hero_types]
+
+        self.stats['waves'] += 1
+        self.stats['heroes'] += len(hero_types)
+        return [HeroSpawn(hero_type, x, y, base, wave.time)
+                for hero_type, (x, y) in zip(hero_types, positions)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            **self.stats,
+            'seed': self.seed,
+            'elapsed': self.elapsed,
+            'next_random_wave': self._next_random_time,
+            'scripted_remaining': len(self._scripted) - self._next_scripted,
+        }
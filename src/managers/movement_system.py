@@ -27,10 +27,13 @@ from ..core.enums import TileType
 from ..systems.advanced_pathfinding import AdvancedPathfindingSystem, PathfindingStrategy
 from ..systems.unified_pathfinding import (
     UnifiedPathfindingSystem, PathfindingStrategy as UnifiedPathfindingStrategy,
-    PathfindingResult, PathfindingConfig
+    PathfindingResult, PathfindingConfig, is_tile_walkable
 )
+from ..systems.flow_field import FlowFieldManager
+from ..systems.pathfinding_queue import get_pathfinding_queue, PRIORITY_COMBAT, PRIORITY_NORMAL
 from ..utils.tile_converter import TileConverter
 from ..systems.bstar_pathfinding import BStarPathfinding
+from ..core.sim_clock import sim_time
 
 
 class MovementMode(Enum):
@@ -179,7 +182,7 @@ class PathVisualizer:
             'unit_name': unit_name,
             'color': color,
             'style': style,
-            'created_time': time.time(),
+            'created_time': sim_time(),
             'duration': duration,
             'visible': True
         }
@@ -190,7 +193,7 @@ class PathVisualizer:
         if not self.visualization_enabled:
             return
 
-        current_time = time.time()
+        current_time = sim_time()
 
         for marker in self.path_markers[:]:
             if not marker['visible']:
@@ -322,7 +325,7 @@ class TargetVisualizer:
             'unit_name': unit_name,
             'color': color,
             'style': style,
-            'created_time': time.time(),
+            'created_time': sim_time(),
             'duration': duration,
             'visible': True
         }
@@ -455,7 +458,7 @@ class TargetVisualizer:
 
     def _cleanup_expired_lines(self):
         """清理过期连线"""
-        current_time = time.time()
+        current_time = sim_time()
         lines_to_remove = []
 
         for i, line in enumerate(self.target_lines):
@@ -725,6 +728,12 @@ class MovementSystem:
     # 统一寻路系统
     _unified_pathfinding: Optional[UnifiedPathfindingSystem] = None
 
+    # 流场管理器（同一目标的所有单位共用一张流场）
+    _flow_fields: Optional[FlowFieldManager] = None
+
+    # 分时寻路：开启后A*请求提交到寻路队列，由主循环每帧在预算内推进
+    _async_pathfinding: bool = False
+
     # 路径可视化器
     _path_visualizer: Optional[PathVisualizer] = None
 
@@ -766,6 +775,31 @@ class MovementSystem:
 
         return True
 
+    @staticmethod
+    def get_flow_field_manager() -> FlowFieldManager:
+        """获取流场管理器（首次调用时创建）"""
+        if MovementSystem._flow_fields is None:
+            MovementSystem._flow_fields = FlowFieldManager(is_tile_walkable)
+        return MovementSystem._flow_fields
+
+    @staticmethod
+    def enable_async_pathfinding(enabled: bool = True):
+        """
+        开启/关闭分时寻路（开启后需要每帧调用 process_pathfinding_queue）
+
+        只有 "A_STAR" 请求进入队列，其它算法仍然同步执行
+        """
+        MovementSystem._async_pathfinding = enabled
+        if not enabled:
+            get_pathfinding_queue().clear()
+
+    @staticmethod
+    def process_pathfinding_queue(budget_ms: float = None) -> int:
+        """在每帧预算内推进寻路队列，返回本帧完成的任务数量"""
+        if not MovementSystem._async_pathfinding:
+            return 0
+        return get_pathfinding_queue().process(budget_ms)
+
     @staticmethod
     def initialize_advanced_pathfinding(game_map: List[List], map_width: int, map_height: int) -> bool:
         """初始化高级寻路系统（向后兼容）"""
@@ -795,7 +829,7 @@ class MovementSystem:
             start_pos: 起始位置
             target_pos: 目标位置
             game_map: 游戏地图
-            algorithm: 算法选择 ("A_STAR", "B_STAR", "DFS", "NAVMESH", "HYBRID")
+            algorithm: 算法选择 ("A_STAR", "B_STAR", "DFS", "NAVMESH", "HPA_STAR", "FLOW_FIELD", "HYBRID")
 
         Returns:
             路径点列表，如果找不到路径返回None
@@ -834,6 +868,19 @@ class MovementSystem:
             else:
                 # 回退到A*
                 return MovementSystem._find_path_astar(start_tile, target_tile, game_map)
+        elif algorithm == "FLOW_FIELD":
+            # 沿目标的共享流场取路径，流场无法到达起点时回退到A*
+            path = MovementSystem._find_path_flow_field(start_tile, target_tile, game_map)
+            if path is None:
+                path = MovementSystem._find_path_astar(start_tile, target_tile, game_map)
+            return path
+        elif algorithm == "HPA_STAR":
+            # 使用统一寻路系统的分层A*
+            if MovementSystem._unified_pathfinding is None:
+                MovementSystem.initialize_unified_pathfinding()
+            result = MovementSystem._unified_pathfinding.find_path(
+                start_pos, target_pos, game_map, UnifiedPathfindingStrategy.HPA_STAR)
+            return result.path if result.success else None
         elif algorithm == "HYBRID":
             # 使用统一寻路系统的混合策略
             if MovementSystem._unified_pathfinding is not None:
@@ -871,10 +918,15 @@ class MovementSystem:
 
     @staticmethod
     def update_advanced_pathfinding(changed_tiles: List[Tuple[int, int]], game_map: List[List]):
-        """更新高级寻路系统（向后兼容）"""
+        """更新高级寻路系统（向后兼容），同时让统一寻路系统只重建被触及的区域"""
         if MovementSystem._advanced_pathfinding is not None:
             MovementSystem._advanced_pathfinding.update_map(
                 changed_tiles, game_map)
+        if MovementSystem._unified_pathfinding is not None:
+            MovementSystem._unified_pathfinding.update_map(
+                changed_tiles, game_map)
+        if MovementSystem._flow_fields is not None:
+            MovementSystem._flow_fields.invalidate_tiles(changed_tiles, game_map)
 
     # ==================== 分离的寻路+移动系统 ====================
 
@@ -902,16 +954,80 @@ class MovementSystem:
             game_logger.info(f"❌ 目标 {target} 已失败过，跳过寻路")
             return False
 
+        # 分时寻路：A*请求提交到寻路队列，结果到达前单位停留在寻路阶段
+        # （队列只实现了A*，B*等其它算法仍然同步执行，不会被悄悄换成A*）
+        if MovementSystem._async_pathfinding and algorithm == "A_STAR":
+            return MovementSystem._generate_path_async(unit, target, game_map)
+
         # 设置寻路状态
         unit_state.pathfinding_state.phase = PathfindingPhase.PATHFINDING
         unit_state.pathfinding_state.current_target = target
-        unit_state.pathfinding_state.pathfinding_start_time = time.time()
+        unit_state.pathfinding_state.pathfinding_start_time = sim_time()
         unit_state.movement_state = UnitMovementState.PATHFINDING
 
         # 执行寻路算法
         path = MovementSystem.find_path_with_algorithm_selection(
             (unit.x, unit.y), target, game_map, algorithm)
 
+        return MovementSystem._apply_generated_path(unit, target, path)
+
+    @staticmethod
+    def _generate_path_async(unit: Any, target: Tuple[float, float], game_map: List[List]) -> bool:
+        """
+        分时寻路 - 第一次调用提交任务，之后每次调用检查结果是否到达
+
+        Returns:
+            bool: 是否已生成路径（结果未到达时返回False，单位保持 PATHFINDING 阶段）
+        """
+        unit_state = MovementSystem.get_unit_state(unit)
+        queue = get_pathfinding_queue()
+        job = queue.get_job(unit)
+        target_tile = (int(target[0] // GameConstants.TILE_SIZE),
+                       int(target[1] // GameConstants.TILE_SIZE))
+
+        # 目标在同一瓦片内移动（如追击）时沿用已有任务，避免每帧重新排队
+        if job is None or job.search.goal != target_tile:
+            start_tile = (int(unit.x // GameConstants.TILE_SIZE),
+                          int(unit.y // GameConstants.TILE_SIZE))
+
+            # 起点和终点相同或无效时不需要排队，直接得出结果
+            if (start_tile == target_tile or
+                    not MovementSystem._is_valid_position(start_tile, game_map, 1) or
+                    not MovementSystem._is_valid_position(target_tile, game_map, 1)):
+                path = MovementSystem.find_path_with_algorithm_selection(
+                    (unit.x, unit.y), target, game_map, "A_STAR")
+                return MovementSystem._apply_generated_path(unit, target, path)
+
+            unit_state.pathfinding_state.phase = PathfindingPhase.PATHFINDING
+            unit_state.pathfinding_state.current_target = target
+            unit_state.pathfinding_state.pathfinding_start_time = sim_time()
+            unit_state.movement_state = UnitMovementState.PATHFINDING
+
+            priority = PRIORITY_COMBAT if getattr(
+                unit, 'in_combat', False) else PRIORITY_NORMAL
+            queue.submit(unit, start_tile, target_tile,
+                         lambda x, y: MovementSystem._is_valid_position((x, y), game_map, 1),
+                         target=target_tile, priority=priority)
+            return False
+
+        job = queue.take_result(unit)
+        if job is None:
+            # 结果还没到达
+            return False
+
+        path = None
+        if job.path:
+            path = [(x * GameConstants.TILE_SIZE + GameConstants.TILE_SIZE // 2,
+                     y * GameConstants.TILE_SIZE + GameConstants.TILE_SIZE // 2)
+                    for x, y in job.path]
+        return MovementSystem._apply_generated_path(unit, target, path)
+
+    @staticmethod
+    def _apply_generated_path(unit: Any, target: Tuple[float, float],
+                              path: Optional[List[Tuple[float, float]]]) -> bool:
+        """把寻路结果写入单位状态"""
+        unit_state = MovementSystem.get_unit_state(unit)
+
         if path:
             # 寻路成功
             unit_state.pathfinding_state.phase = PathfindingPhase.PATH_FOUND
@@ -1075,6 +1191,10 @@ class MovementSystem:
         if hasattr(unit, 'current_target'):
             unit.current_target = None
 
+        # 取消还在排队的寻路任务
+        if MovementSystem._async_pathfinding:
+            get_pathfinding_queue().cancel(unit)
+
         game_logger.info(f"🧹 单位 {getattr(unit, 'name', 'Unknown')} 路径已清除")
 
     @staticmethod
@@ -1128,7 +1248,7 @@ class MovementSystem:
         """设置单位状态"""
         unit_state = MovementSystem.get_unit_state(unit)
         unit_state.movement_state = state
-        unit_state.last_update_time = time.time()
+        unit_state.last_update_time = sim_time()
 
     @staticmethod
     def add_target_to_queue(unit: Any, target: Tuple[float, float]):
@@ -1177,7 +1297,7 @@ class MovementSystem:
         # 设置寻路状态
         unit_state.pathfinding_state.phase = PathfindingPhase.PATHFINDING
         unit_state.pathfinding_state.current_target = target
-        unit_state.pathfinding_state.pathfinding_start_time = time.time()
+        unit_state.pathfinding_state.pathfinding_start_time = sim_time()
         unit_state.movement_state = UnitMovementState.PATHFINDING
 
         # 执行寻路
@@ -1299,7 +1419,7 @@ class MovementSystem:
     def update_unit_movement(unit: Any, delta_time: float, game_map: List[List], speed_multiplier: float = 1.0) -> bool:
         """更新单位移动 - 主控制函数"""
         unit_state = MovementSystem.get_unit_state(unit)
-        current_time = time.time()
+        current_time = sim_time()
 
         # 检查寻路超时
         if (unit_state.pathfinding_state.phase == PathfindingPhase.PATHFINDING and
@@ -1617,11 +1737,20 @@ class MovementSystem:
 
     @staticmethod
     def clear_unit_state(unit: Any):
-        """清除单位状态"""
+        """清除单位状态（单位死亡或被移除时调用）"""
         if unit in MovementSystem._unit_states:
             del MovementSystem._unit_states[unit]
         if unit in MovementSystem._old_unit_states:
             del MovementSystem._old_unit_states[unit]
+        # 丢弃单位的寻路任务（包括已完成但还没被取走的结果）
+        get_pathfinding_queue().cancel(unit)
+
+    @staticmethod
+    def clear_all_unit_states():
+        """清除所有单位状态（用于重新开始游戏或批量模拟）"""
+        MovementSystem._unit_states.clear()
+        MovementSystem._old_unit_states.clear()
+        get_pathfinding_queue().clear()
 
     @staticmethod
     def render_paths_unified(screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0):
@@ -1671,11 +1800,20 @@ class MovementSystem:
             return MovementSystem._target_visualizer.get_performance_stats()
         return {}
 
+    @staticmethod
+    def reset_pathfinding_caches():
+        """丢弃路径缓存、HPA*抽象图和流场（用于重新开始游戏或批量模拟）"""
+        if MovementSystem._unified_pathfinding:
+            MovementSystem._unified_pathfinding.reset()
+        MovementSystem._flow_fields = None
+
     @staticmethod
     def clear_cache_unified():
         """清空缓存（统一系统）"""
         if MovementSystem._unified_pathfinding:
             MovementSystem._unified_pathfinding.clear_cache()
+        if MovementSystem._flow_fields:
+            MovementSystem._flow_fields.clear()
         if MovementSystem._path_visualizer:
             MovementSystem._path_visualizer.clear_markers()
 
@@ -1894,6 +2032,33 @@ class MovementSystem:
 
         return True
 
+    @staticmethod
+    def flow_field_movement(unit, target_pos, delta_time, game_map, speed_multiplier=1.0):
+        """流场移动 - 沿目标的共享流场移动，同一目标的所有单位只计算一次流场"""
+        # 检查击退状态 - 击退期间禁止移动
+        if hasattr(unit, 'knockback_state') and unit.knockback_state and unit.knockback_state.is_knocked_back:
+            return False
+
+        if not target_pos:
+            return False
+
+        waypoint = MovementSystem.get_flow_field_manager().next_waypoint(
+            unit.x, unit.y, target_pos, game_map)
+        if waypoint is None:
+            # 已在目标瓦片内或流场无法到达，直接朝目标移动
+            return MovementSystem.target_seeking_movement(
+                unit, target_pos, delta_time, game_map, speed_multiplier)
+
+        dx = waypoint[0] - unit.x
+        dy = waypoint[1] - unit.y
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance <= 0:
+            return True
+
+        move_speed = min(unit.speed * delta_time * speed_multiplier, distance)
+        return unit._safe_move(unit.x + (dx / distance) * move_speed,
+                               unit.y + (dy / distance) * move_speed, game_map)
+
     @staticmethod
     def flee_movement(unit, threat_pos, delta_time, game_map, speed_multiplier=1.2):
         """逃离移动 - 远离威胁目标"""
@@ -2110,7 +2275,7 @@ class MovementSystem:
             MovementSystem.render_paths_unified(screen, camera_x, camera_y)
 
         # 向后兼容：渲染旧系统的路径标记
-        current_time = time.time()
+        current_time = sim_time()
 
         # 移除过期的路径标记
         MovementSystem._path_markers = [
@@ -2698,6 +2863,27 @@ class MovementSystem:
         # 没有找到路径
         return None
 
+    @staticmethod
+    def _find_path_flow_field(start_tile: Tuple[int, int], target_tile: Tuple[int, int], game_map: List[List]) -> Optional[List[Tuple[float, float]]]:
+        """
+        流场寻路实现 - 同一目标的流场只计算一次，之后每次寻路只是沿流场下降
+
+        Args:
+            start_tile: 起始瓦片坐标
+            target_tile: 目标瓦片坐标
+            game_map: 游戏地图
+
+        Returns:
+            像素坐标路径，如果流场无法到达起点返回None
+        """
+        tile_path = MovementSystem.get_flow_field_manager().find_path(
+            start_tile, target_tile, game_map)
+        if tile_path is None:
+            return None
+        return [(x * GameConstants.TILE_SIZE + GameConstants.TILE_SIZE // 2,
+                 y * GameConstants.TILE_SIZE + GameConstants.TILE_SIZE // 2)
+                for x, y in tile_path]
+
     @staticmethod
     def _find_path_bstar(start_tile: Tuple[int, int], target_tile: Tuple[int, int], game_map: List[List]) -> Optional[List[Tuple[float, float]]]:
         """
@@ -11,6 +11,7 @@ from enum import Enum
 from src.systems.reachability_system import get_reachability_system
 from src.managers.gold_mine_manager import get_gold_mine_manager
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
 
 
 class MiningEventType(Enum):
@@ -53,7 +54,7 @@ class OptimizedMiningSystem:
 
     def process_events(self, game_map: List[List]) -> bool:
         """处理待处理的事件"""
-        current_time = time.time()
+        current_time = sim_time()
 
         # 检查是否需要处理事件
         if current_time - self.last_event_processing < self.event_processing_interval:
@@ -154,6 +155,22 @@ class OptimizedMiningSystem:
 
         return reachable_mines
 
+    def get_reachable_gold_mines_near(self, game_map: List[List], x: float, y: float,
+                                      radius: float) -> List[Tuple[int, int, int]]:
+        """获取 (x, y) 半径范围内可达的金矿（瓦块坐标）"""
+        self.process_events(game_map)
+
+        if self.gold_mine_manager.is_tracking(game_map):
+            # 金矿注册表按空间分桶，只检查范围内的金矿
+            veins = self.gold_mine_manager.get_best_veins(
+                x, y, k=None, max_distance=radius, available_only=False,
+                predicate=self.reachability_system.is_vein_reachable)
+            return [vein for vein in veins if vein[2] > 0]
+
+        return [(vx, vy, gold_amount)
+                for vx, vy, gold_amount in self.reachability_system.get_reachable_gold_veins(game_map)
+                if (vx - x) ** 2 + (vy - y) ** 2 <= radius ** 2]
+
     def is_mine_available(self, x: int, y: int) -> bool:
         """检查金矿是否可用"""
         return self.gold_mine_manager.is_mine_available(x, y)
@@ -197,3 +214,9 @@ def get_optimized_mining_system() -> OptimizedMiningSystem:
     if _optimized_mining_system is None:
         _optimized_mining_system = OptimizedMiningSystem()
     return _optimized_mining_system
+
+
+def reset_optimized_mining_system():
+    """重置优化挖掘系统（用于测试或重新开始游戏）"""
+    global _optimized_mining_system
+    _optimized_mining_system = None
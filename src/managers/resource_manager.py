@@ -8,6 +8,7 @@
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from src.utils.logger import game_logger
+from src.managers.economy_ledger import EconomyLedger, RESOURCE_GOLD, RESOURCE_MANA
 
 
 @dataclass
@@ -35,6 +36,9 @@ class ResourceManager:
         self.gold_buildings = []  # 存储金币的建筑列表（地牢之心、金库）
         self.mana_buildings = []  # 存储魔力的建筑列表（地牢之心、魔法祭坛）
 
+        # 经济账本：增量维护资源总量和来源，查询时不再遍历建筑
+        self.ledger = EconomyLedger()
+
     def add_gold_building(self, building):
         """
         添加存储金币的建筑到列表
@@ -44,6 +48,7 @@ class ResourceManager:
         """
         if building not in self.gold_buildings:
             self.gold_buildings.append(building)
+            self.ledger.add_source(RESOURCE_GOLD, building)
             game_logger.info(f"已添加金币建筑: {building.name}")
 
     def add_mana_building(self, building):
@@ -55,6 +60,7 @@ class ResourceManager:
         """
         if building not in self.mana_buildings:
             self.mana_buildings.append(building)
+            self.ledger.add_source(RESOURCE_MANA, building)
             game_logger.info(f"已添加魔力建筑: {building.name}")
 
     def remove_gold_building(self, building):
@@ -66,6 +72,7 @@ class ResourceManager:
         """
         if building in self.gold_buildings:
             self.gold_buildings.remove(building)
+            self.ledger.remove_source(RESOURCE_GOLD, building)
             game_logger.info(f"已移除金币建筑: {building.name}")
 
     def remove_mana_building(self, building):
@@ -77,6 +84,7 @@ class ResourceManager:
         """
         if building in self.mana_buildings:
             self.mana_buildings.remove(building)
+            self.ledger.remove_source(RESOURCE_MANA, building)
             game_logger.info(f"已移除魔力建筑: {building.name}")
 
     def register_dungeon_heart(self, dungeon_heart):
@@ -110,83 +118,21 @@ class ResourceManager:
 
     def get_total_gold(self) -> ResourceInfo:
         """
-        获取总金币数量（从金币建筑列表中汇总）
+        获取总金币数量（经济账本的缓存快照，金币变化后才重新生成）
 
         Returns:
             ResourceInfo: 包含总金币、可用金币、容量和来源信息
         """
-        sources = []
-        total_gold = 0
-        total_capacity = 0
-
-        # 从金币建筑列表中获取金币
-        for building in self.gold_buildings:
-            if hasattr(building, 'stored_gold'):
-                building_name = getattr(building, 'name', '未知建筑')
-                building_type = getattr(building, 'building_type', None)
-                building_type_name = building_type.value if building_type else 'unknown'
-
-                # 获取位置信息
-                position = ""
-                if hasattr(building, 'tile_x') and hasattr(building, 'tile_y'):
-                    position = f"({building.tile_x},{building.tile_y})"
-
-                sources.append({
-                    'building': building_type_name,
-                    'name': f'{building_name}{position}',
-                    'amount': building.stored_gold,
-                    'capacity': getattr(building, 'gold_storage_capacity', 0),
-                    'available': building.stored_gold
-                })
-                total_gold += building.stored_gold
-                total_capacity += getattr(building, 'gold_storage_capacity', 0)
-
-        return ResourceInfo(
-            total=total_gold,
-            available=total_gold,  # 所有存储的金币都是可用的
-            capacity=total_capacity,
-            sources=sources
-        )
+        return self.ledger.get_snapshot(RESOURCE_GOLD, ResourceInfo)
 
     def get_total_mana(self) -> ResourceInfo:
         """
-        获取总魔力数量（从魔力建筑列表中汇总）
+        获取总魔力数量（经济账本的缓存快照，魔力变化后才重新生成）
 
         Returns:
             ResourceInfo: 包含总魔力、可用魔力、容量和来源信息
         """
-        sources = []
-        total_mana = 0
-        total_capacity = 0
-
-        # 从魔力建筑列表中获取魔力
-        for building in self.mana_buildings:
-            if hasattr(building, 'stored_mana'):
-                building_name = getattr(building, 'name', '未知建筑')
-                building_type = getattr(building, 'building_type', None)
-                building_type_name = building_type.value if building_type else 'unknown'
-
-                # 获取位置信息
-                position = ""
-                if hasattr(building, 'tile_x') and hasattr(building, 'tile_y'):
-                    position = f"({building.tile_x},{building.tile_y})"
-
-                sources.append({
-                    'building': building_type_name,
-                    'name': f'{building_name}{position}',
-                    'amount': building.stored_mana,
-                    'capacity': getattr(building, 'mana_storage_capacity', 0),
-                    'available': building.stored_mana
-                })
-                total_mana += building.stored_mana
-                total_capacity += getattr(building, 'mana_storage_capacity', 0)
-
-        return ResourceInfo(
-            total=total_mana,
-            available=total_mana,  # 所有存储的魔力都是可用的
-            capacity=total_capacity,
-            sources=sources
-        )
+        return self.ledger.get_snapshot(RESOURCE_MANA, ResourceInfo)
 
     def can_afford(self, gold_cost: int = 0, mana_cost: int = 0) -> bool:
         """
@@ -199,10 +145,9 @@ class ResourceManager:
         Returns:
             bool: 是否有足够资源
         """
-        gold_info = self.get_total_gold()
-        mana_info = self.get_total_mana()
-
-        return gold_info.available >= gold_cost and mana_info.available >= mana_cost
+        # 所有存储的资源都是可用的，直接比较账本总量
+        return (self.ledger.get_total(RESOURCE_GOLD) >= gold_cost and
+                self.ledger.get_total(RESOURCE_MANA) >= mana_cost)
 
     def consume_gold(self, amount: int, priority_sources: List[str] = None) -> Dict[str, Any]:
         """
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+任务批量匹配
+分配器的 OPTIMAL 策略在每个分配周期把"空闲单位 × 待分配任务"的代价矩阵一次性求解，
+得到总移动时间最小的一一匹配，而不是逐个单位贪心地挑选任务。
+
+- solve_assignment: 矩形代价矩阵的最小代价匹配（最短增广路形式的匈牙利算法，
+  NumPy 可用时每一步对所有列向量化计算，否则使用纯Python实现）
+- TravelCostField: 以任务建筑为目标缓存流场，代价为沿地图的路径距离而不是直线距离
+- match_units_to_tasks: 代价 = 移动时间 + 任务优先级折算的时间，任务多于单位时优先级高的任务先得到单位
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.core.constants import GameConstants
+from src.systems.flow_field import FlowFieldManager
+from src.systems.hpa_pathfinding import NEIGHBOR_STEPS
+from src.systems.unified_pathfinding import is_tile_walkable
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # NumPy 是可选依赖
+    np = None
+    NUMPY_AVAILABLE = False
+
+_INF = float('inf')
+
+# 路径代价缓存的流场数量（每个任务建筑一张）
+TRAVEL_FIELD_CACHE_SIZE = 64
+# 每个分配周期最多新计算的流场数量，超出时暂用直线距离（路径距离的下界）
+TRAVEL_FIELD_BUILD_BUDGET = 4
+
+
+# ==================== 匹配求解 ====================
+
+def solve_assignment(cost_matrix: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """
+    求解最小代价匹配
+
+    行数与列数可以不同，较少的一侧全部参与匹配；代价为 inf 的组合视为不可行，不会出现在结果中。
+
+    Args:
+        cost_matrix: 代价矩阵 cost_matrix[行][列]
+
+    Returns:
+        List[Tuple[int, int]]: 匹配的 (行, 列) 列表，按行排序
+    """
+    rows = len(cost_matrix)
+    cols = len(cost_matrix[0]) if rows else 0
+    if rows == 0 or cols == 0:
+        return []
+
+    if NUMPY_AVAILABLE:
+        cost = np.asarray(cost_matrix, dtype=float)
+        transposed = rows > cols
+        if transposed:
+            cost = cost.T
+        finite = np.isfinite(cost)
+        if not finite.any():
+            return []
+        # 不可行组合替换为比任何可行匹配总代价都大的值，求解后再剔除
+        big = (np.abs(cost[finite]).max() + 1.0) * (min(rows, cols) + 1)
+        col_for_row = _solve_numpy(np.where(finite, cost, big))
+        pairs = [(row, col) for row, col in enumerate(col_for_row.tolist()) if finite[row, col]]
+    else:
+        cost = [list(row) for row in cost_matrix]
+        transposed = rows > cols
+        if transposed:
+            cost = [list(column) for column in zip(*cost)]
+        finite_values = [abs(value) for row in cost for value in row if value < _INF]
+        if not finite_values:
+            return []
+        big = (max(finite_values) + 1.0) * (min(rows, cols) + 1)
+        cost = [[value if value < _INF else big for value in row] for row in cost]
+        col_for_row = _solve_python(cost)
+        pairs = [(row, col) for row, col in enumerate(col_for_row) if cost[row][col] < big]
+
+    if transposed:
+        pairs = sorted((col, row) for row, col in pairs)
+    return pairs
+
+
+def _solve_numpy(cost) -> Any:
+    """最短增广路匈牙利算法（行数 <= 列数，代价全部有限），每步对所有列向量化"""
+    rows, cols = cost.shape
+    u = np.zeros(rows)
+    v = np.zeros(cols)
+    col_for_row = np.full(rows, -1, dtype=int)
+    row_for_col = np.full(cols, -1, dtype=int)
+
+    for current_row in range(rows):
+        shortest = np.full(cols, _INF)
+        path = np.full(cols, -1, dtype=int)
+        remaining = np.ones(cols, dtype=bool)
+        scanned_rows = []
+        row = current_row
+        min_value = 0.0
+        sink = -1
+
+        while sink < 0:
+            scanned_rows.append(row)
+            reduced = min_value + cost[row] - u[row] - v
+            improved = remaining & (reduced < shortest)
+            shortest[improved] = reduced[improved]
+            path[improved] = row
+
+            candidates = np.where(remaining, shortest, _INF)
+            min_value = candidates.min()
+            # 最小值相同时优先选择尚未匹配的列，尽早结束增广
+            ties = np.flatnonzero(candidates == min_value)
+            free = ties[row_for_col[ties] < 0]
+            col = int(free[0]) if len(free) else int(ties[0])
+
+            remaining[col] = False
+            if row_for_col[col] < 0:
+                sink = col
+            else:
+                row = int(row_for_col[col])
+
+        # 更新对偶变量
+        u[current_row] += min_value
+        for row in scanned_rows[1:]:
+            u[row] += min_value - shortest[col_for_row[row]]
+        scanned = ~remaining
+        v[scanned] -= min_value - shortest[scanned]
+
+        # 沿增广路翻转匹配
+        col = sink
+        while True:
+            row = int(path[col])
+            row_for_col[col] = row
+            col_for_row[row], col = col, int(col_for_row[row])
+            if row == current_row:
+                break
+
+    return col_for_row
+
+
+def _solve_python(cost: List[List[float]]) -> List[int]:
+    """最短增广路匈牙利算法的纯Python实现（行数 <= 列数，代价全部有限）"""
+    rows, cols = len(cost), len(cost[0])
+    u = [0.0] * rows
+    v = [0.0] * cols
+    col_for_row = [-1] * rows
+    row_for_col = [-1] * cols
+
+    for current_row in range(rows):
+        shortest = [_INF] * cols
+        path = [-1] * cols
+        remaining = [True] * cols
+        scanned_rows = []
+        row = current_row
+        min_value = 0.0
+        sink = -1
+
+        while sink < 0:
+            scanned_rows.append(row)
+            row_cost, row_u = cost[row], u[row]
+            best, best_col = _INF, -1
+            for col in range(cols):
+                if not remaining[col]:
+                    continue
+                reduced = min_value + row_cost[col] - row_u - v[col]
+                if reduced < shortest[col]:
+                    shortest[col] = reduced
+                    path[col] = row
+                value = shortest[col]
+                if value < best or (value == best and row_for_col[col] < 0 <= row_for_col[best_col]):
+                    best, best_col = value, col
+            min_value = best
+            col = best_col
+
+            remaining[col] = False
+            if row_for_col[col] < 0:
+                sink = col
+            else:
+                row = row_for_col[col]
+
+        u[current_row] += min_value
+        for row in scanned_rows[1:]:
+            u[row] += min_value - shortest[col_for_row[row]]
+        for col in range(cols):
+            if not remaining[col]:
+                v[col] -= min_value - shortest[col]
+
+        col = sink
+        while True:
+            row = path[col]
+            row_for_col[col] = row
+            col_for_row[row], col = col, col_for_row[row]
+            if row == current_row:
+                break
+
+    return col_for_row
+
+
+# ==================== 路径代价 ====================
+
+class TravelCostField:
+    """路径移动代价 - 以任务建筑所在瓦片为目标的流场缓存"""
+
+    def __init__(self, max_fields: int = TRAVEL_FIELD_CACHE_SIZE,
+                 build_budget: Optional[int] = TRAVEL_FIELD_BUILD_BUDGET):
+        """
+        初始化路径代价缓存
+
+        Args:
+            max_fields: 最多缓存的流场数量
+            build_budget: 每个分配周期最多新计算的流场数量，None 表示不限制
+        """
+        # 使用独立的流场管理器，避免大量任务目标挤掉移动系统缓存的热门流场
+        self.flow_fields = FlowFieldManager(is_tile_walkable, max_fields)
+        self.build_budget = build_budget
+        self._builds_left = build_budget
+        self.estimated_costs = 0
+
+    def begin_round(self):
+        """每个分配周期开始时调用，重置流场计算预算"""
+        self._builds_left = self.build_budget
+
+    def travel_distance(self, x: float, y: float, building: Any, game_map: List[List] = None) -> float:
+        """
+        从像素位置沿地图走到建筑的距离（像素）
+
+        没有地图时退回直线距离；无法到达时返回 inf。
+        """
+        if game_map is None:
+            return math.hypot(building.x - x, building.y - y)
+
+        goal = (building.tile_x, building.tile_y)
+        field = self.flow_fields.peek_field(goal, game_map)
+        if field is None:
+            if self._builds_left is not None and self._builds_left <= 0:
+                # 本周期的计算预算已用完，流场在之后的周期补齐
+                self.estimated_costs += 1
+                return math.hypot(building.x - x, building.y - y)
+            if self._builds_left is not None:
+                self._builds_left -= 1
+            field = self.flow_fields.get_field(goal, game_map)
+            if field is None:
+                return _INF
+        tile_size = GameConstants.TILE_SIZE
+        tile_x, tile_y = int(x // tile_size), int(y // tile_size)
+        cost = field.get_cost(tile_x, tile_y)
+        if cost == _INF:
+            # 单位站在不可通行的格子上（如建筑内），从相邻格子出发
+            for dx, dy, step in NEIGHBOR_STEPS:
+                cost = min(cost, field.get_cost(tile_x + dx, tile_y + dy) + step)
+        return cost * tile_size
+
+    def travel_time(self, unit: Any, building: Any, game_map: List[List] = None) -> float:
+        """单位走到建筑所需的时间（秒）"""
+        distance = self.travel_distance(unit.x, unit.y, building, game_map)
+        return distance / max(getattr(unit, 'speed', 1.0) or 1.0, 1.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {**self.flow_fields.get_stats(), 'estimated_costs': self.estimated_costs}
+
+
+# ==================== 批量匹配 ====================
+
+def match_units_to_tasks(units: List[Any], tasks: List[Any],
+                         travel_cost: Callable[[Any, Any], float],
+                         task_cost: Optional[Callable[[Any], float]] = None) -> List[Tuple[Any, Any]]:
+    """
+    一次性求解单位与任务的最小总代价匹配
+
+    Args:
+        units: 空闲单位列表
+        tasks: 待分配任务列表
+        travel_cost: 移动代价 travel_cost(unit, task)，inf 表示无法到达
+        task_cost: 可选的任务附加代价 task_cost(task)，例如按优先级折算的等待时间
+
+    Returns:
+        List[Tuple[Any, Any]]: (单位, 任务) 匹配列表
+    """
+    if not units or not tasks:
+        return []
+    extra = [task_cost(task) for task in tasks] if task_cost else [0.0] * len(tasks)
+    cost_matrix = [[travel_cost(unit, task) + extra[col] for col, task in enumerate(tasks)]
+                   for unit in units]
+    return [(units[row], tasks[col]) for row, col in solve_assignment(cost_matrix)]
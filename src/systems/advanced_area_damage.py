@@ -10,6 +10,7 @@ from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 from src.utils.logger import game_logger
+from src.systems.spatial_index import get_spatial_index, ALL_LAYERS
 
 
 class AreaAttackType(Enum):
@@ -210,7 +211,8 @@ class AdvancedAreaDamageSystem:
         targets = []
 
         # 获取所有可能的目标
-        all_units = self._get_all_units()
+        all_units = self._get_candidate_units_in_radius(
+            center_x, center_y, radius)
 
         for unit in all_units:
             if not unit or unit.health <= 0:
@@ -234,8 +236,9 @@ class AdvancedAreaDamageSystem:
         """获取扇形区域内的目标"""
         targets = []
 
-        # 获取所有可能的目标
-        all_units = self._get_all_units()
+        # 获取所有可能的目标（扇形位于同半径的圆内）
+        all_units = self._get_candidate_units_in_radius(
+            center_x, center_y, radius)
 
         # 将角度转换为弧度
         direction_rad = math.radians(direction)
@@ -272,9 +275,6 @@ class AdvancedAreaDamageSystem:
         """获取长方形区域内的目标"""
         targets = []
 
-        # 获取所有可能的目标
-        all_units = self._get_all_units()
-
         # 将方向转换为弧度
         direction_rad = math.radians(direction)
         cos_dir = math.cos(direction_rad)
@@ -296,6 +296,14 @@ class AdvancedAreaDamageSystem:
              start_y - half_width * sin_dir + half_height * cos_dir)
         ]
 
+        # 获取所有可能的目标（有空间索引时只取旋转长方形包围盒内的单位）
+        spatial_index = get_spatial_index(self.game_instance)
+        if spatial_index:
+            all_units = spatial_index.query_polygon_bounds(
+                corners, layers=ALL_LAYERS)
+        else:
+            all_units = self._get_all_units()
+
         for unit in all_units:
             if not unit or unit.health <= 0:
                 continue
@@ -328,6 +336,14 @@ class AdvancedAreaDamageSystem:
 
         return inside
 
+    def _get_candidate_units_in_radius(self, center_x: float, center_y: float,
+                                       radius: float) -> List[Any]:
+        """获取圆形范围内的候选单位 - 有空间索引时使用索引查询，否则返回所有单位"""
+        spatial_index = get_spatial_index(self.game_instance)
+        if spatial_index:
+            return spatial_index.query_radius(center_x, center_y, radius, layers=ALL_LAYERS)
+        return self._get_all_units()
+
     def _get_all_units(self) -> List[Any]:
         """获取所有可能的单位"""
         all_units = []
@@ -17,6 +17,7 @@ import time
 from typing import List, Tuple, Optional, Set, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
+from src.core.sim_clock import sim_time
 
 
 class BStarNodeType(Enum):
@@ -100,7 +101,7 @@ class BStarPathfinding:
         cache_key = (start, goal, int(dynamic_adjustments))
         if cache_key in self.path_cache:
             cached_path, cache_time = self.path_cache[cache_key]
-            if time.time() - cache_time < self.cache_timeout:
+            if sim_time() - cache_time < self.cache_timeout:
                 self.cache_hits += 1
                 return cached_path
 
@@ -122,7 +123,7 @@ class BStarPathfinding:
 
         # 缓存结果
         if path:
-            self.path_cache[cache_key] = (path, time.time())
+            self.path_cache[cache_key] = (path, sim_time())
 
         # 清理过期缓存
         self._cleanup_cache()
@@ -140,13 +141,13 @@ class BStarPathfinding:
         start_node = BStarNode(start[0], start[1])
         start_node.h = heuristic_func(start, goal)
         start_node.f = start_node.g + start_node.h
-        start_node.last_updated = time.time()
+        start_node.last_updated = sim_time()
 
         heapq.heappush(open_set, start_node)
 
         # 环境变化检测
         environment_changes = 0.0
-        last_environment_check = time.time()
+        last_environment_check = sim_time()
 
         iterations = 0
         while open_set and iterations < self.max_iterations:
@@ -167,7 +168,7 @@ class BStarPathfinding:
 
             # 动态调整检测
             if dynamic_adjustments:
-                current_time = time.time()
+                current_time = sim_time()
                 if current_time - last_environment_check > 0.1:  # 每0.1秒检查一次
                     environment_changes = self._detect_environment_changes(
                         (current.x, current.y), game_map)
@@ -203,12 +204,12 @@ class BStarPathfinding:
                 neighbor_node.h = heuristic_func(neighbor_pos, goal)
                 neighbor_node.f = neighbor_node.g + neighbor_node.h
                 neighbor_node.parent = current
-                neighbor_node.last_updated = time.time()
+                neighbor_node.last_updated = sim_time()
 
                 # 动态调整
                 if dynamic_adjustments and environment_changes > self.dynamic_threshold:
                     neighbor_node.update_dynamic_cost(
-                        time.time(), environment_changes)
+                        sim_time(), environment_changes)
 
                 # 添加到开放集
                 heapq.heappush(open_set, neighbor_node)
@@ -308,7 +309,7 @@ class BStarPathfinding:
 
     def _cleanup_cache(self):
         """清理过期缓存"""
-        current_time = time.time()
+        current_time = sim_time()
         expired_keys = []
 
         for key, (_, cache_time) in self.path_cache.items():
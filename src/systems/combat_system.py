@@ -17,6 +17,8 @@ from src.managers.movement_system import MovementSystem
 from src.entities.building import BuildingStatus
 from src.systems.advanced_area_damage import get_advanced_area_damage_system
 from src.systems.skill_system import skill_manager
+from src.systems.spatial_index import get_spatial_index, ALL_LAYERS, LAYER_HEROES, LAYER_MONSTERS, LAYER_BUILDINGS
+from src.core.sim_clock import sim_time
 
 
 class CombatSystem:
@@ -139,7 +141,7 @@ class CombatSystem:
 
         # 设置当前目标为攻击者
         target.current_target = attacker
-        target.target_last_seen_time = time.time()
+        target.target_last_seen_time = sim_time()
 
         # 对于战斗单位，应该移动到攻击者附近进行反击
         if hasattr(attacker, 'x') and hasattr(attacker, 'y'):
@@ -248,7 +250,7 @@ class CombatSystem:
         if not self._validate_inputs(delta_time, creatures, heroes):
             return
 
-        current_time = time.time()
+        current_time = sim_time()
 
         try:
             # 性能统计（可选）
@@ -353,8 +355,8 @@ class CombatSystem:
         for hero in heroes[:]:
             if not hero.in_combat:
                 if hero.state == 'exploring' and hasattr(hero, 'known_dungeon_heart') and hero.known_dungeon_heart:
-                    # 探索地牢之心
-                    MovementSystem.target_seeking_movement(
+                    # 探索地牢之心 - 同一目标的英雄共用一张流场
+                    MovementSystem.flow_field_movement(
                         hero, hero.known_dungeon_heart, delta_time, self.game_instance.game_map)
                 elif hero.state == 'patrolling':
                     # 随机探索
@@ -367,11 +369,20 @@ class CombatSystem:
                 if creature.state == 'fleeing' and creature.health <= creature.max_health * GameConstants.FLEE_HEALTH_THRESHOLD:
                     # 血量过低时撤退
                     # 寻找最近的英雄并逃离
-                    for hero in self.game_instance.heroes:
-                        if hero.health > 0:
+                    spatial_index = get_spatial_index(self.game_instance)
+                    if spatial_index:
+                        nearest_hero = spatial_index.nearest(
+                            creature.x, creature.y, layers=(LAYER_HEROES,),
+                            predicate=lambda hero: hero.health > 0)
+                        if nearest_hero:
                             MovementSystem.flee_movement(
-                                creature, (hero.x, hero.y), delta_time, self.game_instance.game_map)
-                            break
+                                creature, (nearest_hero.x, nearest_hero.y), delta_time, self.game_instance.game_map)
+                    else:
+                        for hero in self.game_instance.heroes:
+                            if hero.health > 0:
+                                MovementSystem.flee_movement(
+                                    creature, (hero.x, hero.y), delta_time, self.game_instance.game_map)
+                                break
                 elif creature.state == 'wandering':
                     # 游荡巡逻
                     wander_speed = creature._get_wander_speed_multiplier() if hasattr(
@@ -462,6 +473,12 @@ class CombatSystem:
 
     def _detect_creature_vs_hero_combat(self, creatures: List, heroes: List, current_time: float):
         """检测怪物攻击英雄"""
+        spatial_index = get_spatial_index(self.game_instance)
+        if spatial_index:
+            self._detect_creature_vs_hero_combat_indexed(
+                spatial_index, creatures, heroes, current_time)
+            return
+
         for creature in creatures[:]:
             if not self._is_combat_unit(creature):
                 continue
@@ -487,8 +504,49 @@ class CombatSystem:
                 elif creature.in_combat and hero in creature.attack_list:
                     self._set_combat_state(hero, creature, current_time)
 
+    def _detect_creature_vs_hero_combat_indexed(self, spatial_index, creatures: List, heroes: List, current_time: float):
+        """检测怪物攻击英雄 - 空间索引版本，只检查检测范围内的英雄和攻击列表中的反击目标"""
+        hero_ids = {id(hero) for hero in heroes}
+        # 正在攻击各个怪物的英雄（反击范围无限大，不受空间查询限制）
+        hero_attackers = self._build_attackers_map(heroes)
+
+        for creature in creatures[:]:
+            if not self._is_combat_unit(creature):
+                continue
+
+            # 检测范围内的英雄，添加到攻击列表
+            creature_detection_range = self._get_creature_detection_range(
+                creature)
+            in_range = spatial_index.query_radius(
+                creature.x, creature.y, creature_detection_range, layers=(LAYER_HEROES,),
+                predicate=lambda hero: hero.health > 0 and id(hero) in hero_ids)
+            handled = set()
+            for hero in in_range:
+                self._set_combat_state(creature, hero, current_time)
+                handled.add(id(hero))
+
+            # 如果英雄已经在攻击这个怪物，怪物应该反击
+            for hero in hero_attackers.get(id(creature), ()):
+                if id(hero) in handled or hero.health <= 0:
+                    continue
+                if hero.in_combat:
+                    self._set_combat_state(creature, hero, current_time)
+                    handled.add(id(hero))
+
+            # 如果生物已经在攻击这个英雄，英雄应该反击
+            if creature.in_combat:
+                for hero in creature.attack_list[:]:
+                    if id(hero) in hero_ids and id(hero) not in handled and hero.health > 0:
+                        self._set_combat_state(hero, creature, current_time)
+
     def _detect_hero_vs_creature_combat(self, creatures: List, heroes: List, current_time: float):
         """检测英雄攻击怪物"""
+        spatial_index = get_spatial_index(self.game_instance)
+        if spatial_index:
+            self._detect_hero_vs_creature_combat_indexed(
+                spatial_index, creatures, heroes, current_time)
+            return
+
         for hero in heroes[:]:
             for creature in creatures[:]:
                 if creature.health <= 0:
@@ -498,13 +556,7 @@ class CombatSystem:
                 distance = self._calculate_distance(hero, creature)
 
                 # 获取英雄追击范围（近战单位：攻击范围 × 2.5，远程单位：攻击范围 × 1.0）
-                attack_range = getattr(
-                    hero, 'attack_range', GameConstants.DEFAULT_ATTACK_RANGE)
-                if hasattr(hero, '_is_melee_attack') and hero._is_melee_attack():
-                    pursuit_range = attack_range * GameConstants.MELEE_PURSUIT_MULTIPLIER  # 近战：攻击范围 × 2.5
-                else:
-                    pursuit_range = attack_range * \
-                        GameConstants.RANGED_PURSUIT_MULTIPLIER  # 远程：攻击范围 × 1.0
+                pursuit_range = self._get_hero_pursuit_range(hero)
 
                 # 如果在追击范围内，添加到攻击列表
                 if distance <= pursuit_range:
@@ -513,28 +565,72 @@ class CombatSystem:
                 elif creature.in_combat and hero in creature.attack_list:
                     self._set_combat_state(hero, creature, current_time)
 
+    def _detect_hero_vs_creature_combat_indexed(self, spatial_index, creatures: List, heroes: List, current_time: float):
+        """检测英雄攻击怪物 - 空间索引版本"""
+        creature_ids = {id(creature) for creature in creatures}
+        # 正在攻击各个英雄的怪物（反击范围无限大，不受空间查询限制）
+        creature_attackers = self._build_attackers_map(creatures)
+
+        for hero in heroes[:]:
+            # 追击范围内的怪物，添加到攻击列表
+            pursuit_range = self._get_hero_pursuit_range(hero)
+            in_range = spatial_index.query_radius(
+                hero.x, hero.y, pursuit_range, layers=(LAYER_MONSTERS,),
+                predicate=lambda creature: creature.health > 0 and id(creature) in creature_ids)
+            handled = set()
+            for creature in in_range:
+                self._set_combat_state(hero, creature, current_time)
+                handled.add(id(creature))
+
+            # 如果怪物已经在攻击这个英雄，英雄应该反击
+            for creature in creature_attackers.get(id(hero), ()):
+                if id(creature) in handled or creature.health <= 0:
+                    continue
+                if creature.in_combat:
+                    self._set_combat_state(hero, creature, current_time)
+                    handled.add(id(creature))
+
+    def _build_attackers_map(self, attackers: List) -> Dict[int, List]:
+        """构建 目标id -> 攻击列表中包含该目标的单位 的反向映射"""
+        attackers_map = {}
+        for attacker in attackers:
+            for target in getattr(attacker, 'attack_list', None) or ():
+                attackers_map.setdefault(id(target), []).append(attacker)
+        return attackers_map
+
+    def _get_hero_pursuit_range(self, hero) -> float:
+        """获取英雄追击范围（近战单位：攻击范围 × 2.5，远程单位：攻击范围 × 1.0）"""
+        attack_range = getattr(
+            hero, 'attack_range', GameConstants.DEFAULT_ATTACK_RANGE)
+        if hasattr(hero, '_is_melee_attack') and hero._is_melee_attack():
+            return attack_range * GameConstants.MELEE_PURSUIT_MULTIPLIER  # 近战：攻击范围 × 2.5
+        return attack_range * GameConstants.RANGED_PURSUIT_MULTIPLIER  # 远程：攻击范围 × 1.0
+
     def _detect_hero_vs_building_combat(self, heroes: List, building_manager, current_time: float):
         """检测英雄攻击建筑"""
         if not building_manager or not building_manager.buildings:
             return
 
+        spatial_index = get_spatial_index(self.game_instance)
+
         for hero in heroes[:]:
-            for building in building_manager.buildings:
+            # 获取英雄追击范围（近战单位：攻击范围 × 2.5，远程单位：攻击范围 × 1.0）
+            pursuit_range = self._get_hero_pursuit_range(hero)
+
+            if spatial_index:
+                # 空间索引只返回追击范围内的建筑
+                buildings = spatial_index.query_radius(
+                    hero.x, hero.y, pursuit_range, layers=(LAYER_BUILDINGS,))
+            else:
+                buildings = building_manager.buildings
+
+            for building in buildings:
                 if not building.is_active or building.health <= 0:
                     continue
 
                 # 计算距离
                 distance = self._calculate_distance(hero, building)
 
-                # 获取英雄追击范围（近战单位：攻击范围 × 2.5，远程单位：攻击范围 × 1.0）
-                attack_range = getattr(
-                    hero, 'attack_range', GameConstants.DEFAULT_ATTACK_RANGE)
-                if hasattr(hero, '_is_melee_attack') and hero._is_melee_attack():
-                    pursuit_range = attack_range * GameConstants.MELEE_PURSUIT_MULTIPLIER  # 近战：攻击范围 × 2.5
-                else:
-                    pursuit_range = attack_range * \
-                        GameConstants.RANGED_PURSUIT_MULTIPLIER  # 远程：攻击范围 × 1.0
-
                 # 如果在追击范围内，添加到攻击列表
                 if distance <= pursuit_range:
                     self._set_combat_state(hero, building, current_time)
@@ -544,11 +640,24 @@ class CombatSystem:
         if not building_manager or not building_manager.buildings:
             return
 
+        spatial_index = get_spatial_index(self.game_instance)
+
         for creature in creatures[:]:
             if not self._is_combat_unit(creature):
                 continue
 
-            for building in building_manager.buildings:
+            # 获取生物检测范围
+            creature_detection_range = getattr(
+                creature, 'detection_range', GameConstants.DEFAULT_CREATURE_DETECTION_RANGE)
+
+            if spatial_index:
+                # 空间索引只返回检测范围内的建筑
+                buildings = spatial_index.query_radius(
+                    creature.x, creature.y, creature_detection_range, layers=(LAYER_BUILDINGS,))
+            else:
+                buildings = building_manager.buildings
+
+            for building in buildings:
                 if not building.is_active or building.health <= 0:
                     continue
 
@@ -559,10 +668,6 @@ class CombatSystem:
                 # 计算距离
                 distance = self._calculate_distance(creature, building)
 
-                # 获取生物检测范围
-                creature_detection_range = getattr(
-                    creature, 'detection_range', GameConstants.DEFAULT_CREATURE_DETECTION_RANGE)
-
                 # 如果在检测范围内，添加到攻击列表
                 if distance <= creature_detection_range:
                     self._set_combat_state(creature, building, current_time)
@@ -904,21 +1009,27 @@ class CombatSystem:
             return targets
 
         # 获取所有可能的目标
-        all_units = []
+        spatial_index = get_spatial_index(self.game_instance)
+        if spatial_index:
+            # 空间索引只返回范围内的候选单位（生物、英雄、建筑）
+            all_units = spatial_index.query_radius(
+                center_x, center_y, radius, layers=ALL_LAYERS)
+        else:
+            all_units = []
 
-        # 添加生物
-        if hasattr(self.game_instance, 'monsters'):
-            all_units.extend(self.game_instance.monsters)
+            # 添加生物
+            if hasattr(self.game_instance, 'monsters'):
+                all_units.extend(self.game_instance.monsters)
 
-        # 添加英雄
-        if hasattr(self.game_instance, 'heroes'):
-            all_units.extend(self.game_instance.heroes)
+            # 添加英雄
+            if hasattr(self.game_instance, 'heroes'):
+                all_units.extend(self.game_instance.heroes)
 
-        # 添加建筑（如果攻击者是英雄或怪物）
-        if hasattr(self.game_instance, 'building_manager') and self.game_instance.building_manager:
-            buildings = self.game_instance.building_manager.buildings
-            if buildings:
-                all_units.extend(buildings)
+            # 添加建筑（如果攻击者是英雄或怪物）
+            if hasattr(self.game_instance, 'building_manager') and self.game_instance.building_manager:
+                buildings = self.game_instance.building_manager.buildings
+                if buildings:
+                    all_units.extend(buildings)
 
         # 筛选目标
         for unit in all_units:
@@ -1262,25 +1373,28 @@ class CombatSystem:
         if not building_manager:
             return
 
-        # 获取所有防御塔（包括箭塔、奥术塔等）
-        defense_towers = [building for building in building_manager.buildings
-                          if hasattr(building, 'building_type') and
-                          building.building_type.value in ['arrow_tower', 'arcane_tower', 'magic_tower', 'cannon_tower'] and
-                          building.is_active]
+        # 获取所有激活的防御塔（包括箭塔、奥术塔等）- 来自建筑索引的能力分桶
+        defense_towers = building_manager.get_defense_towers()
 
         if not defense_towers or not heroes:
             return
 
-        # 使用与handle_combat相同的时间机制：使用time.time()获取当前时间
-        current_time = time.time()
+        # 使用与handle_combat相同的时间机制：读取模拟时钟 sim_time()
+        current_time = sim_time()
+        spatial_index = get_spatial_index(self.game_instance)
 
         # 为每个防御塔处理攻击
         for tower in defense_towers:
             # 使用绝对时间检查攻击冷却，而不是依赖delta_time
             # 这与handle_combat中的_execute_attack_sequence方法保持一致
 
-            # 寻找最佳目标
-            best_target = tower.find_best_target(heroes)
+            # 寻找最佳目标 - 有空间索引时只把射程内的英雄交给防御塔评估
+            if spatial_index:
+                candidates = spatial_index.query_radius(
+                    tower.x, tower.y, tower.attack_range, layers=(LAYER_HEROES,))
+                best_target = tower.find_best_target(candidates)
+            else:
+                best_target = tower.find_best_target(heroes)
 
             if best_target:
                 # 更新当前目标
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流场寻路
+为热门目标（地牢之心、金库、英雄基地等）从目标点做一次Dijkstra积分，得到每个格子到目标的代价，
+所有前往同一目标的单位共用这张流场：取路径只需沿代价下降的方向走，每帧读取移动方向是O(1)操作。
+
+- 流场按目标瓦片缓存，超过 max_fields 时淘汰最久未使用的流场
+- 地图变化只使受影响的流场失效：被堵住的格子在流场已到达的区域内，或新打通的格子与已到达区域相邻
+- 使用 MapGrid 时订阅瓦块变化通知，挖掘等操作会自动使对应的流场失效
+- 邻居规则与 A*、HPA* 相同（八方向，斜向移动只要求目标格子可通行），三者的可达性一致
+"""
+
+import heapq
+import math
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..core.constants import GameConstants
+from .hpa_pathfinding import NEIGHBOR_STEPS, build_walkable_table
+
+Cell = Tuple[int, int]
+
+_INF = float('inf')
+
+
+class FlowField:
+    """单目标流场 - 各格子到目标的积分代价 + 按需计算的下一步"""
+
+    def __init__(self, goal: Cell, width: int, height: int, walkable: List[bool]):
+        """
+        计算流场
+
+        Args:
+            goal: 目标瓦片坐标（目标本身可以不可通行，例如建筑所在的格子）
+            width, height: 地图尺寸（瓦片）
+            walkable: 按行展开的可通行表
+        """
+        self.goal = goal
+        self.width = width
+        self.height = height
+        self.cost: List[float] = [_INF] * (width * height)
+        # 下一步的格子下标：-2 = 未计算，-1 = 没有下一步（目标或不可达）
+        self._next: List[int] = [-2] * (width * height)
+        self.reached_cells = self._integrate(walkable)
+
+    def _integrate(self, walkable: List[bool]) -> int:
+        """从目标出发的Dijkstra积分（与A*相同的八方向邻居）"""
+        width, height = self.width, self.height
+        cost = self.cost
+        goal_index = self.goal[1] * width + self.goal[0]
+        cost[goal_index] = 0.0
+        heap = [(0.0, goal_index)]
+        reached = 0
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > cost[i]:
+                continue
+            reached += 1
+            y, x = divmod(i, width)
+            for dx, dy, step in NEIGHBOR_STEPS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                j = ny * width + nx
+                if not walkable[j]:
+                    continue
+                nd = d + step
+                if nd < cost[j]:
+                    cost[j] = nd
+                    heapq.heappush(heap, (nd, j))
+        return reached
+
+    def get_cost(self, x: int, y: int) -> float:
+        """格子到目标的代价（不可达时为 inf）"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cost[y * self.width + x]
+        return _INF
+
+    def is_reachable(self, x: int, y: int) -> bool:
+        """格子能否到达目标"""
+        return self.get_cost(x, y) < _INF
+
+    def next_tile(self, x: int, y: int) -> Optional[Cell]:
+        """
+        从格子出发的下一步（代价下降最快的相邻格子）
+
+        Returns:
+            Optional[Cell]: 下一步格子，已在目标或不可达时返回None
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        width = self.width
+        i = y * width + x
+        j = self._next[i]
+        if j == -2:
+            j = self._descend(i, x, y)
+            self._next[i] = j
+        if j < 0:
+            return None
+        return j % width, j // width
+
+    def _descend(self, i: int, x: int, y: int) -> int:
+        cost, width, height = self.cost, self.width, self.height
+        own_cost = cost[i]
+        if own_cost == _INF or own_cost == 0.0:
+            return -1
+        best, best_total = -1, _INF
+        for dx, dy, step in NEIGHBOR_STEPS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            neighbor_cost = cost[ny * width + nx]
+            if neighbor_cost < own_cost and neighbor_cost + step < best_total:
+                best, best_total = ny * width + nx, neighbor_cost + step
+        return best
+
+    def get_direction(self, x: int, y: int) -> Tuple[float, float]:
+        """格子处的单位移动方向，已在目标或不可达时为 (0, 0)"""
+        next_tile = self.next_tile(x, y)
+        if next_tile is None:
+            return 0.0, 0.0
+        dx, dy = next_tile[0] - x, next_tile[1] - y
+        length = math.sqrt(dx * dx + dy * dy)
+        return dx / length, dy / length
+
+    def extract_path(self, start: Cell) -> Optional[List[Cell]]:
+        """
+        沿流场取出从起点到目标的瓦片路径
+
+        Returns:
+            Optional[List[Cell]]: 包含起点和目标的路径，起点不可达时返回None
+        """
+        if not self.is_reachable(*start):
+            return None
+        path = [start]
+        current = start
+        while current != self.goal:
+            current = self.next_tile(*current)
+            if current is None or len(path) > len(self.cost):
+                return None
+            path.append(current)
+        return path
+
+    def affected_by(self, i: int, walkable: bool) -> bool:
+        """格子 i 的可通行性变为 walkable 后流场是否需要重算"""
+        if not walkable:
+            # 被堵住的格子在已到达的区域内
+            return self.cost[i] < _INF
+        # 新打通的格子与已到达的区域相邻（包括斜向相邻）
+        width = self.width
+        y, x = divmod(i, width)
+        for dx, dy, _ in NEIGHBOR_STEPS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < self.height and self.cost[ny * width + nx] < _INF:
+                return True
+        return False
+
+
+class FlowFieldManager:
+    """流场管理器 - 按目标缓存流场并在地图变化时按需失效"""
+
+    def __init__(self, is_walkable: Callable[[Any], bool], max_fields: int = 16):
+        """
+        初始化流场管理器
+
+        Args:
+            is_walkable: 瓦块可通行判断函数 is_walkable(tile)
+            max_fields: 最多缓存的流场数量
+        """
+        self.is_walkable = is_walkable
+        self.max_fields = max_fields
+
+        self._map = None
+        self.width = 0
+        self.height = 0
+        self._walkable: List[bool] = []
+        self._fields: "OrderedDict[Cell, FlowField]" = OrderedDict()
+        self._dirty_cells: Set[int] = set()
+
+        self.stats = {
+            'fields_built': 0,
+            'field_hits': 0,
+            'fields_invalidated': 0,
+            'paths_extracted': 0,
+        }
+
+    # ==================== 地图同步 ====================
+
+    def prepare(self, game_map: List[List]):
+        """同步地图状态：地图对象或尺寸变化时丢弃全部流场，否则只处理变化的格子"""
+        height = len(game_map)
+        width = len(game_map[0]) if height else 0
+        if game_map is not self._map or width != self.width or height != self.height:
+            self._attach(game_map, width, height)
+        elif self._dirty_cells:
+            self._refresh_dirty_cells()
+
+    def invalidate_tiles(self, changed_tiles: Iterable[Cell], game_map: List[List] = None):
+        """标记瓦片发生了变化（用于普通地图和不经过瓦块视图的修改）"""
+        if self._map is None or (game_map is not None and game_map is not self._map):
+            return
+        width = self.width
+        for x, y in changed_tiles:
+            if 0 <= x < width and 0 <= y < self.height:
+                self._dirty_cells.add(y * width + x)
+
+    def clear(self):
+        """丢弃所有流场"""
+        self._fields.clear()
+
+    def _on_tile_changed(self, grid, i: int):
+        """MapGrid 瓦块变化回调"""
+        if grid is self._map:
+            self._dirty_cells.add(i)
+
+    def _attach(self, game_map: List[List], width: int, height: int):
+        if self._map is not None and hasattr(self._map, 'remove_change_listener'):
+            self._map.remove_change_listener(self._on_tile_changed)
+        self._map = game_map
+        self.width = width
+        self.height = height
+        self._walkable = build_walkable_table(game_map, self.is_walkable)
+        self._fields.clear()
+        self._dirty_cells.clear()
+        if hasattr(game_map, 'add_change_listener'):
+            game_map.add_change_listener(self._on_tile_changed)
+
+    def _refresh_dirty_cells(self):
+        """重新判断变化格子的可通行性，只丢弃受影响的流场"""
+        width = self.width
+        for i in self._dirty_cells:
+            y, x = divmod(i, width)
+            walkable = self.is_walkable(self._map[y][x])
+            if walkable == self._walkable[i]:
+                continue
+            self._walkable[i] = walkable
+            for goal in [goal for goal, field in self._fields.items()
+                         if field.affected_by(i, walkable)]:
+                del self._fields[goal]
+                self.stats['fields_invalidated'] += 1
+        self._dirty_cells.clear()
+
+    # ==================== 查询 ====================
+
+    def get_field(self, goal: Cell, game_map: List[List]) -> Optional[FlowField]:
+        """
+        获取目标瓦片的流场（没有缓存时计算）
+
+        Returns:
+            Optional[FlowField]: 目标超出地图时返回None
+        """
+        self.prepare(game_map)
+        if not (0 <= goal[0] < self.width and 0 <= goal[1] < self.height):
+            return None
+
+        field = self._fields.get(goal)
+        if field is not None:
+            self._fields.move_to_end(goal)
+            self.stats['field_hits'] += 1
+            return field
+
+        field = FlowField(goal, self.width, self.height, self._walkable)
+        self._fields[goal] = field
+        self.stats['fields_built'] += 1
+        while len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return field
+
+    def peek_field(self, goal: Cell, game_map: List[List]) -> Optional[FlowField]:
+        """获取已缓存的流场，没有缓存时返回None而不计算"""
+        self.prepare(game_map)
+        field = self._fields.get(goal)
+        if field is not None:
+            self._fields.move_to_end(goal)
+            self.stats['field_hits'] += 1
+        return field
+
+    def get_field_for_position(self, target_pos: Tuple[float, float],
+                               game_map: List[List]) -> Optional[FlowField]:
+        """按像素坐标获取目标所在瓦片的流场"""
+        tile_size = GameConstants.TILE_SIZE
+        return self.get_field((int(target_pos[0] // tile_size), int(target_pos[1] // tile_size)),
+                              game_map)
+
+    def find_path(self, start: Cell, goal: Cell, game_map: List[List]) -> Optional[List[Cell]]:
+        """沿目标流场取出瓦片路径"""
+        field = self.get_field(goal, game_map)
+        if field is None:
+            return None
+        self.stats['paths_extracted'] += 1
+        return field.extract_path(start)
+
+    def next_waypoint(self, unit_x: float, unit_y: float, target_pos: Tuple[float, float],
+                      game_map: List[List]) -> Optional[Tuple[float, float]]:
+        """
+        单位所在瓦片的下一步瓦片中心（像素坐标）
+
+        Returns:
+            Optional: 已在目标瓦片或不可达时返回None
+        """
+        field = self.get_field_for_position(target_pos, game_map)
+        if field is None:
+            return None
+        tile_size = GameConstants.TILE_SIZE
+        next_tile = field.next_tile(int(unit_x // tile_size), int(unit_y // tile_size))
+        if next_tile is None:
+            return None
+        return (next_tile[0] * tile_size + tile_size // 2,
+                next_tile[1] * tile_size + tile_size // 2)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            **self.stats,
+            'cached_fields': len(self._fields),
+            'pending_dirty_cells': len(self._dirty_cells),
+        }
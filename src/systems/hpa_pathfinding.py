@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HPA*分层寻路
+把地图划分为 cluster_size × cluster_size 的簇，在相邻簇的公共边界上寻找入口，
+入口两侧的格子作为抽象图的节点。查询时先在抽象图上做A*，再把缓存的簇内路径拼接成完整路径，
+长距离寻路只需展开少量抽象节点，而不是逐格搜索整张地图。
+
+核心特性:
+1. 簇内路径按需计算并缓存 - 簇第一次被抽象搜索展开时，从簇内每个入口节点做一次受限Dijkstra
+2. 局部失效 - 地图变化只重建被触及的簇及其边界，相邻簇只有在边界入口改变时才丢弃缓存
+3. 自动同步 - 使用 MapGrid 时订阅瓦块变化通知，挖掘等操作会自动使对应的簇失效
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+ClusterKey = Tuple[int, int]
+BorderKey = Tuple[str, int, int]
+
+# 与 A* 实现一致的八方向移动代价
+DIAGONAL_COST = 1.414
+NEIGHBOR_STEPS = ((0, 1, 1.0), (0, -1, 1.0), (1, 0, 1.0), (-1, 0, 1.0),
+              (1, 1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST),
+              (1, -1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST))
+
+# 抽象边类型（用于把抽象路径还原为瓦片路径）
+_EDGE_START = 0
+_EDGE_INTRA = 1
+_EDGE_INTER = 2
+_EDGE_GOAL = 3
+
+
+def octile_distance(a: Cell, b: Cell) -> float:
+    """八方向距离（A*启发函数）"""
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return max(dx, dy) + (DIAGONAL_COST - 1) * min(dx, dy)
+
+
+def build_walkable_table(game_map: List[List], is_walkable: Callable[[Any], bool]) -> List[bool]:
+    """
+    计算按行展开的可通行表（下标 = y * 宽度 + x）
+
+    MapGrid 使用向量化的可通行掩码，只有覆盖对象和放置了建筑对象的格子逐个按瓦块判断
+    """
+    height = len(game_map)
+    width = len(game_map[0]) if height else 0
+    if hasattr(game_map, 'passable_flat'):
+        walkable = game_map.passable_flat(include_dug=True)
+        special = set(game_map.overrides)
+        special.update(i for i, building_id in enumerate(game_map.building_id.tolist())
+                       if building_id >= 0)
+        for i in special:
+            y, x = divmod(i, width)
+            walkable[i] = is_walkable(game_map[y][x])
+        return walkable
+
+    return [is_walkable(game_map[y][x]) for y in range(height) for x in range(width)]
+
+
+class HierarchicalPathfinder:
+    """HPA*分层寻路器 - 簇/入口抽象图 + 簇内路径缓存"""
+
+    def __init__(self, is_walkable: Callable[[Any], bool], cluster_size: int = 10,
+                 entrance_split_length: int = 6):
+        """
+        初始化分层寻路器
+
+        Args:
+            is_walkable: 瓦块可通行判断函数 is_walkable(tile)
+            cluster_size: 簇的边长（瓦片）
+            entrance_split_length: 入口长度达到该值时在两端各放一个节点，否则只在中点放一个
+        """
+        self.is_walkable = is_walkable
+        self.cluster_size = cluster_size
+        self.entrance_split_length = entrance_split_length
+
+        self._map = None
+        self.width = 0
+        self.height = 0
+        self.clusters_x = 0
+        self.clusters_y = 0
+        self._walkable: List[bool] = []
+
+        # 边界入口: ('h', cx, cy) 为簇(cx, cy)与(cx+1, cy)之间的竖直边界，
+        # ('v', cx, cy) 为簇(cx, cy)与(cx, cy+1)之间的水平边界；值为跨边界的格子对列表
+        self._borders: Dict[BorderKey, List[Tuple[Cell, Cell]]] = {}
+        # 簇 -> {入口节点: [(边界另一侧的节点, 代价)]}（由边界入口按需生成）
+        self._links: Dict[ClusterKey, Dict[Cell, List[Tuple[Cell, float]]]] = {}
+        # 簇 -> {入口节点: {同簇入口节点: 代价}}
+        self._intra: Dict[ClusterKey, Dict[Cell, Dict[Cell, float]]] = {}
+        # 簇 -> {入口节点: 簇内Dijkstra前驱表}
+        self._intra_came_from: Dict[ClusterKey, Dict[Cell, Dict[Cell, Cell]]] = {}
+        # 簇 -> {(入口节点, 入口节点): 瓦片路径}
+        self._intra_paths: Dict[ClusterKey, Dict[Tuple[Cell, Cell], List[Cell]]] = {}
+
+        self._dirty_cells: Set[int] = set()
+        # 地图结构版本号，簇被重建时递增（供上层路径缓存判断是否过期）
+        self.version = 0
+
+        self.stats = {
+            'queries': 0,
+            'abstract_expansions': 0,
+            'intra_searches': 0,
+            'clusters_rebuilt': 0,
+            'full_rebuilds': 0,
+        }
+
+    # ==================== 地图同步 ====================
+
+    def prepare(self, game_map: List[List]):
+        """
+        同步地图状态（寻路前调用）
+
+        地图对象或尺寸变化时整体重建，否则只处理自上次以来被标记为变化的格子
+        """
+        height = len(game_map)
+        width = len(game_map[0]) if height else 0
+        if game_map is not self._map or width != self.width or height != self.height:
+            self._attach(game_map, width, height)
+        elif self._dirty_cells:
+            self._refresh_dirty_cells()
+
+    def invalidate_tiles(self, changed_tiles: Iterable[Cell], game_map: List[List] = None):
+        """
+        标记瓦片发生了变化（下次寻路时只重建被触及的簇）
+
+        MapGrid 上的挖掘等修改会自动通知，这里用于普通地图和建筑状态变化等不经过瓦块视图的修改
+        """
+        if self._map is None or (game_map is not None and game_map is not self._map):
+            return
+        width = self.width
+        for x, y in changed_tiles:
+            if 0 <= x < width and 0 <= y < self.height:
+                self._dirty_cells.add(y * width + x)
+
+    def _on_tile_changed(self, grid, i: int):
+        """MapGrid 瓦块变化回调"""
+        if grid is self._map:
+            self._dirty_cells.add(i)
+
+    def _attach(self, game_map: List[List], width: int, height: int):
+        """绑定新地图并重建整个抽象图"""
+        if self._map is not None and hasattr(self._map, 'remove_change_listener'):
+            self._map.remove_change_listener(self._on_tile_changed)
+
+        self._map = game_map
+        self.width = width
+        self.height = height
+        size = self.cluster_size
+        self.clusters_x = (width + size - 1) // size
+        self.clusters_y = (height + size - 1) // size
+        self._walkable = build_walkable_table(game_map, self.is_walkable)
+        self._dirty_cells.clear()
+        self._links.clear()
+        self._intra.clear()
+        self._intra_came_from.clear()
+        self._intra_paths.clear()
+
+        self._borders = {}
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    self._borders[('h', cx, cy)] = self._build_border(('h', cx, cy))
+                if cy + 1 < self.clusters_y:
+                    self._borders[('v', cx, cy)] = self._build_border(('v', cx, cy))
+
+        if hasattr(game_map, 'add_change_listener'):
+            game_map.add_change_listener(self._on_tile_changed)
+
+        self.version += 1
+        self.stats['full_rebuilds'] += 1
+
+    def _refresh_dirty_cells(self):
+        """重新判断变化格子的可通行性，只重建可通行性真正改变的簇"""
+        width, size = self.width, self.cluster_size
+        dirty_clusters = set()
+        for i in self._dirty_cells:
+            y, x = divmod(i, width)
+            walkable = self.is_walkable(self._map[y][x])
+            if walkable != self._walkable[i]:
+                self._walkable[i] = walkable
+                dirty_clusters.add((x // size, y // size))
+        self._dirty_cells.clear()
+
+        for cluster in dirty_clusters:
+            self._drop_cluster_cache(cluster)
+            for key in self._cluster_borders(cluster):
+                transitions = self._build_border(key)
+                if transitions != self._borders.get(key):
+                    # 边界入口改变，两侧簇的节点集合都要重新生成
+                    self._borders[key] = transitions
+                    for neighbor in self._border_clusters(key):
+                        self._links.pop(neighbor, None)
+                        self._drop_cluster_cache(neighbor)
+            self._links.pop(cluster, None)
+
+        if dirty_clusters:
+            self.version += 1
+            self.stats['clusters_rebuilt'] += len(dirty_clusters)
+
+    def _drop_cluster_cache(self, cluster: ClusterKey):
+        self._intra.pop(cluster, None)
+        self._intra_came_from.pop(cluster, None)
+        self._intra_paths.pop(cluster, None)
+
+    # ==================== 簇与入口 ====================
+
+    def _cluster_rect(self, cluster: ClusterKey) -> Tuple[int, int, int, int]:
+        """簇的瓦片范围 (x0, y0, x1, y1)，x1/y1 不包含"""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return x0, y0, min(self.width, x0 + size), min(self.height, y0 + size)
+
+    def _cluster_borders(self, cluster: ClusterKey) -> List[BorderKey]:
+        """簇的四条边界"""
+        cx, cy = cluster
+        borders = []
+        if cx + 1 < self.clusters_x:
+            borders.append(('h', cx, cy))
+        if cx > 0:
+            borders.append(('h', cx - 1, cy))
+        if cy + 1 < self.clusters_y:
+            borders.append(('v', cx, cy))
+        if cy > 0:
+            borders.append(('v', cx, cy - 1))
+        return borders
+
+    @staticmethod
+    def _border_clusters(key: BorderKey) -> Tuple[ClusterKey, ClusterKey]:
+        """边界两侧的簇"""
+        kind, cx, cy = key
+        if kind == 'h':
+            return (cx, cy), (cx + 1, cy)
+        return (cx, cy), (cx, cy + 1)
+
+    def _build_border(self, key: BorderKey) -> List[Tuple[Cell, Cell]]:
+        """
+        查找边界上的入口
+
+        两侧格子都可通行的连续区段构成一个入口，短入口在中点放一对节点，
+        长入口在两端各放一对节点；只能斜向穿过边界的位置单独放一对斜向节点
+        """
+        kind, cx, cy = key
+        size = self.cluster_size
+        if kind == 'h':
+            xa = (cx + 1) * size - 1
+            pairs = [((xa, y), (xa + 1, y))
+                     for y in range(cy * size, min(self.height, (cy + 1) * size))]
+        else:
+            ya = (cy + 1) * size - 1
+            pairs = [((x, ya), (x, ya + 1))
+                     for x in range(cx * size, min(self.width, (cx + 1) * size))]
+
+        walkable, width = self._walkable, self.width
+        side_a = [walkable[ay * width + ax] for (ax, ay), _ in pairs]
+        side_b = [walkable[by * width + bx] for _, (bx, by) in pairs]
+        straight = [a and b for a, b in zip(side_a, side_b)]
+
+        transitions = []
+        run = []
+        for i, pair in enumerate(pairs + [None]):
+            if pair is not None and straight[i]:
+                run.append(pair)
+                continue
+            if run:
+                if len(run) >= self.entrance_split_length:
+                    transitions.append(run[0])
+                    transitions.append(run[-1])
+                else:
+                    transitions.append(run[len(run) // 2])
+                run = []
+
+        # 相邻两个位置都没有正对的通路时，斜向通路是两簇之间唯一的连接
+        for i in range(len(pairs) - 1):
+            if straight[i] or straight[i + 1]:
+                continue
+            if side_a[i] and side_b[i + 1]:
+                transitions.append((pairs[i][0], pairs[i + 1][1]))
+            if side_a[i + 1] and side_b[i]:
+                transitions.append((pairs[i + 1][0], pairs[i][1]))
+        return transitions
+
+    def _get_links(self, cluster: ClusterKey) -> Dict[Cell, List[Tuple[Cell, float]]]:
+        """簇的入口节点及其跨边界连接"""
+        links = self._links.get(cluster)
+        if links is None:
+            links = {}
+            for key in self._cluster_borders(cluster):
+                first, _ = self._border_clusters(key)
+                for a, b in self._borders.get(key, ()):
+                    node, other = (a, b) if first == cluster else (b, a)
+                    cost = DIAGONAL_COST if a[0] != b[0] and a[1] != b[1] else 1.0
+                    links.setdefault(node, []).append((other, cost))
+            self._links[cluster] = links
+        return links
+
+    def _get_intra(self, cluster: ClusterKey) -> Dict[Cell, Dict[Cell, float]]:
+        """簇内入口节点之间的代价（首次访问时计算并缓存）"""
+        intra = self._intra.get(cluster)
+        if intra is None:
+            nodes = list(self._get_links(cluster))
+            rect = self._cluster_rect(cluster)
+            intra = {}
+            came_from_by_node = {}
+            for node in nodes:
+                dist, came_from = self._local_search(node, rect, nodes)
+                intra[node] = {other: dist[other] for other in nodes
+                               if other != node and other in dist}
+                came_from_by_node[node] = came_from
+            self._intra[cluster] = intra
+            self._intra_came_from[cluster] = came_from_by_node
+            self._intra_paths[cluster] = {}
+        return intra
+
+    def _local_search(self, source: Cell, rect: Tuple[int, int, int, int],
+                      targets: Iterable[Cell]) -> Tuple[Dict[Cell, float], Dict[Cell, Cell]]:
+        """在簇范围内做Dijkstra，所有目标都确定最短距离后提前结束"""
+        self.stats['intra_searches'] += 1
+        x0, y0, x1, y1 = rect
+        walkable, width = self._walkable, self.width
+        remaining = set(targets)
+        remaining.discard(source)
+        dist = {source: 0.0}
+        came_from: Dict[Cell, Cell] = {}
+        heap = [(0.0, source)]
+        while heap and remaining:
+            d, current = heapq.heappop(heap)
+            if d > dist[current]:
+                continue
+            remaining.discard(current)
+            x, y = current
+            for dx, dy, cost in NEIGHBOR_STEPS:
+                nx, ny = x + dx, y + dy
+                if x0 <= nx < x1 and y0 <= ny < y1 and walkable[ny * width + nx]:
+                    neighbor = (nx, ny)
+                    nd = d + cost
+                    if nd < dist.get(neighbor, float('inf')):
+                        dist[neighbor] = nd
+                        came_from[neighbor] = current
+                        heapq.heappush(heap, (nd, neighbor))
+        return dist, came_from
+
+    @staticmethod
+    def _trace(came_from: Dict[Cell, Cell], source: Cell, target: Cell) -> List[Cell]:
+        """从前驱表还原 source -> target 的路径"""
+        path = [target]
+        while path[-1] != source:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return path
+
+    def _intra_path(self, cluster: ClusterKey, a: Cell, b: Cell) -> List[Cell]:
+        """簇内两个入口节点之间的瓦片路径（缓存）"""
+        paths = self._intra_paths[cluster]
+        path = paths.get((a, b))
+        if path is None:
+            path = self._trace(self._intra_came_from[cluster][a], a, b)
+            paths[(a, b)] = path
+        return path
+
+    # ==================== 寻路 ====================
+
+    def cluster_of(self, cell: Cell) -> ClusterKey:
+        """格子所在的簇"""
+        return cell[0] // self.cluster_size, cell[1] // self.cluster_size
+
+    def is_walkable_cell(self, x: int, y: int) -> bool:
+        """按缓存的可通行表判断格子是否可通行"""
+        return 0 <= x < self.width and 0 <= y < self.height and self._walkable[y * self.width + x]
+
+    def find_path(self, start: Cell, goal: Cell, game_map: List[List]) -> Optional[List[Cell]]:
+        """
+        分层寻路
+
+        Args:
+            start: 起点瓦片坐标（与A*一致，起点本身不要求可通行）
+            goal: 终点瓦片坐标
+            game_map: 游戏地图
+
+        Returns:
+            Optional[List]: 包含起点和终点的瓦片路径，找不到时返回None
+        """
+        self.prepare(game_map)
+        self.stats['queries'] += 1
+
+        if not (0 <= start[0] < self.width and 0 <= start[1] < self.height):
+            return None
+        if not self.is_walkable_cell(*goal):
+            return None
+        if start == goal:
+            return [start]
+
+        # 把起点和终点临时接入抽象图
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        start_targets = list(self._get_links(start_cluster))
+        if goal_cluster == start_cluster:
+            start_targets.append(goal)
+        start_dist, start_came_from = self._local_search(
+            start, self._cluster_rect(start_cluster), start_targets)
+        start_edges = {node: start_dist[node] for node in start_targets
+                       if node != start and node in start_dist}
+
+        goal_nodes = list(self._get_links(goal_cluster))
+        goal_dist, goal_came_from = self._local_search(
+            goal, self._cluster_rect(goal_cluster), goal_nodes)
+        goal_edges = {node: goal_dist[node] for node in goal_nodes
+                      if node != goal and node in goal_dist}
+
+        # 抽象图A*
+        g_score = {start: 0.0}
+        parent: Dict[Cell, Tuple[Cell, int]] = {}
+        closed = set()
+        open_set = [(octile_distance(start, goal), start)]
+        while open_set:
+            _, node = heapq.heappop(open_set)
+            if node == goal:
+                return self._refine(start, goal, parent, start_came_from, goal_came_from)
+            if node in closed:
+                continue
+            closed.add(node)
+            self.stats['abstract_expansions'] += 1
+
+            g = g_score[node]
+            for neighbor, cost, kind in self._abstract_edges(node, start, goal,
+                                                             start_edges, goal_edges):
+                if neighbor in closed:
+                    continue
+                tentative = g + cost
+                if tentative < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = tentative
+                    parent[neighbor] = (node, kind)
+                    heapq.heappush(open_set, (tentative + octile_distance(neighbor, goal), neighbor))
+
+        return None
+
+    def _abstract_edges(self, node: Cell, start: Cell, goal: Cell,
+                        start_edges: Dict[Cell, float], goal_edges: Dict[Cell, float]):
+        """抽象图上某个节点的出边 (邻居, 代价, 边类型)"""
+        cluster = self.cluster_of(node)
+        if node == start:
+            for other, cost in start_edges.items():
+                yield other, cost, _EDGE_START
+        else:
+            for other, cost in self._get_intra(cluster).get(node, {}).items():
+                yield other, cost, _EDGE_INTRA
+            cost = goal_edges.get(node)
+            if cost is not None:
+                yield goal, cost, _EDGE_GOAL
+        for other, cost in self._get_links(cluster).get(node, ()):
+            yield other, cost, _EDGE_INTER
+
+    def _refine(self, start: Cell, goal: Cell, parent: Dict[Cell, Tuple[Cell, int]],
+                start_came_from: Dict[Cell, Cell], goal_came_from: Dict[Cell, Cell]) -> List[Cell]:
+        """把抽象路径还原为瓦片路径"""
+        edges = []
+        node = goal
+        while node != start:
+            previous, kind = parent[node]
+            edges.append((previous, node, kind))
+            node = previous
+        edges.reverse()
+
+        path = [start]
+        for a, b, kind in edges:
+            if kind == _EDGE_INTER:
+                segment = [a, b]
+            elif kind == _EDGE_INTRA:
+                segment = self._intra_path(self.cluster_of(a), a, b)
+            elif kind == _EDGE_START:
+                segment = self._trace(start_came_from, start, b)
+            else:
+                segment = self._trace(goal_came_from, goal, a)[::-1]
+            path.extend(segment[1:])
+        return path
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            **self.stats,
+            'version': self.version,
+            'clusters': self.clusters_x * self.clusters_y,
+            'cached_clusters': len(self._intra),
+            'entrances': sum(len(transitions) for transitions in self._borders.values()),
+            'pending_dirty_cells': len(self._dirty_cells),
+        }
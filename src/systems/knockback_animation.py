@@ -10,6 +10,8 @@ import pygame
 from typing import List, Tuple, Optional, Any
 from dataclasses import dataclass
 from src.utils.logger import game_logger
+from src.effects.sprite_batch import get_sprite_batch
+from src.effects.effect_pool import EffectPool
 
 
 @dataclass
@@ -60,6 +62,7 @@ class FlashEffect:
     elapsed_time: float = 0.0
     color: Tuple[int, int, int] = (255, 255, 255)
     intensity: float = 1.0
+    unit: Any = None  # 闪烁的单位
 
     def update(self, delta_time: float) -> bool:
         """
@@ -142,9 +145,10 @@ class KnockbackAnimation:
     """击退动画系统"""
 
     def __init__(self):
-        self.particle_effects: List[Particle] = []
-        # (unit, effect)
-        self.flash_effects: List[Tuple[Any, FlashEffect]] = []
+        # 粒子和闪烁效果从对象池获取，列表即对象池中对应类型的活跃数组
+        self.effect_pool = EffectPool()
+        self.particle_effects: List[Particle] = self.effect_pool.register(Particle, 200)
+        self.flash_effects: List[FlashEffect] = self.effect_pool.register(FlashEffect, 50)
         self.screen_shake = ScreenShakeManager()
 
         # 音效管理器（可选）
@@ -178,8 +182,8 @@ class KnockbackAnimation:
             self.screen_shake.shake(shake_intensity, 0.2)
 
             # 3. 单位闪烁效果
-            flash_effect = FlashEffect(duration=0.3, color=(255, 255, 255))
-            self.flash_effects.append((unit, flash_effect))
+            self.effect_pool.acquire(
+                FlashEffect, duration=0.3, color=(255, 255, 255), unit=unit)
 
             # 4. 播放音效
             if self.sound_manager:
@@ -209,8 +213,8 @@ class KnockbackAnimation:
 
         # 3. 撞墙闪烁效果（红色）
         flash_color = self._get_collision_flash_color(collision_type)
-        flash_effect = FlashEffect(duration=0.5, color=flash_color)
-        self.flash_effects.append((unit, flash_effect))
+        self.effect_pool.acquire(
+            FlashEffect, duration=0.5, color=flash_color, unit=unit)
 
         # 4. 播放撞墙音效
         if self.sound_manager:
@@ -229,7 +233,8 @@ class KnockbackAnimation:
             speed = random.uniform(40, 80)  # 撞墙粒子速度更快
             life_time = random.uniform(0.5, 1.2)  # 撞墙粒子持续更久
 
-            particle = Particle(
+            self.effect_pool.acquire(
+                Particle,
                 x=x + random.uniform(-8, 8),  # 更大的起始位置偏移
                 y=y + random.uniform(-8, 8),
                 velocity_x=math.cos(angle) * speed,
@@ -240,8 +245,6 @@ class KnockbackAnimation:
                 size=random.uniform(2.0, 4.0)  # 撞墙粒子更大
             )
 
-            self.particle_effects.append(particle)
-
     def _get_collision_flash_color(self, collision_type: str) -> Tuple[int, int, int]:
         """获取碰撞闪烁颜色"""
         colors = {
@@ -314,7 +317,8 @@ class KnockbackAnimation:
             else:
                 color = (255, 255, 200)  # 轻微击退：黄色
 
-            particle = Particle(
+            self.effect_pool.acquire(
+                Particle,
                 x=x + random.uniform(-5, 5),  # 起始位置随机偏移
                 y=y + random.uniform(-5, 5),
                 velocity_x=math.cos(angle) * speed,
@@ -325,8 +329,6 @@ class KnockbackAnimation:
                 size=random.uniform(1.5, 3.0)
             )
 
-            self.particle_effects.append(particle)
-
     def play_knockback_sound(self, unit: Any, distance: float):
         """
         播放击退音效
@@ -364,16 +366,19 @@ class KnockbackAnimation:
 
     def update(self, delta_time: float):
         """更新所有动画效果"""
-        # 更新粒子效果
-        self.particle_effects = [
-            p for p in self.particle_effects if p.update(delta_time)]
+        # 更新粒子效果（倒序遍历，结束的粒子交换删除并回到对象池）
+        particles = self.particle_effects
+        for index in range(len(particles) - 1, -1, -1):
+            particle = particles[index]
+            if not particle.update(delta_time):
+                self.effect_pool.release(particle)
 
         # 更新闪烁效果
-        active_flash_effects = []
-        for unit, effect in self.flash_effects:
-            if effect.update(delta_time):
-                active_flash_effects.append((unit, effect))
-        self.flash_effects = active_flash_effects
+        flash_effects = self.flash_effects
+        for index in range(len(flash_effects) - 1, -1, -1):
+            effect = flash_effects[index]
+            if not effect.update(delta_time):
+                self.effect_pool.release(effect)
 
         # 更新屏幕震动
         self.screen_shake.update(delta_time)
@@ -388,29 +393,22 @@ class KnockbackAnimation:
             camera_y: 相机Y偏移
             ui_scale: UI缩放倍数
         """
-        for particle in self.particle_effects:
-            # 应用UI缩放和相机偏移
-            screen_x = int((particle.x - camera_x) * ui_scale)
-            screen_y = int((particle.y - camera_y) * ui_scale)
-
-            # 只渲染屏幕内的粒子
-            if (0 <= screen_x <= screen.get_width() and
-                    0 <= screen_y <= screen.get_height()):
-
-                # 创建带透明度的颜色
+        # 粒子方块从预烘焙的精灵中取出，由精灵批次剔除屏幕外的粒子并一次提交
+        batch = get_sprite_batch()
+        batch.begin(screen)
+        try:
+            for particle in self.particle_effects:
                 alpha = particle.get_alpha()
                 if alpha > 0:
-                    # 应用UI缩放到粒子大小
+                    # 应用UI缩放和相机偏移
+                    screen_x = int((particle.x - camera_x) * ui_scale)
+                    screen_y = int((particle.y - camera_y) * ui_scale)
                     scaled_size = int(particle.size * ui_scale)
-                    # 创建临时表面用于透明度渲染
-                    temp_surface = pygame.Surface(
-                        (scaled_size * 2, scaled_size * 2))
-                    temp_surface.set_alpha(alpha)
-                    temp_surface.fill(particle.color)
-
-                    # 绘制粒子
-                    screen.blit(temp_surface,
-                                (screen_x - scaled_size, screen_y - scaled_size))
+                    if scaled_size > 0:
+                        batch.add_square(screen_x, screen_y, scaled_size,
+                                         particle.color, alpha)
+        finally:
+            batch.end(screen)
 
     def render_flash_effects(self, screen: pygame.Surface, camera_x: float = 0, camera_y: float = 0, ui_scale: float = 1.0):
         """
@@ -422,7 +420,8 @@ class KnockbackAnimation:
             camera_y: 相机Y偏移
             ui_scale: UI缩放倍数
         """
-        for unit, effect in self.flash_effects:
+        for effect in self.flash_effects:
+            unit = effect.unit
             if not hasattr(unit, 'x') or not hasattr(unit, 'y'):
                 continue
 
@@ -448,16 +447,11 @@ class KnockbackAnimation:
                     # 创建圆形闪烁效果
                     flash_radius = int(scaled_unit_size * 0.75)  # 圆形半径，比单位稍大
 
-                    # 创建带透明度的圆形闪烁效果
-                    # 使用临时表面来实现透明度
-                    temp_surface = pygame.Surface(
-                        (flash_radius * 2, flash_radius * 2), pygame.SRCALPHA)
-                    pygame.draw.circle(
-                        temp_surface, (*effect.color, alpha), (flash_radius, flash_radius), flash_radius)
-
-                    # 绘制圆形闪烁效果
-                    screen.blit(temp_surface, (screen_x -
-                                flash_radius, screen_y - flash_radius))
+                    # 绘制带透明度的圆形闪烁效果（预烘焙精灵）
+                    if flash_radius > 0:
+                        screen.blit(get_sprite_batch().circle_sprite(
+                            flash_radius, effect.color, alpha),
+                            (screen_x - flash_radius, screen_y - flash_radius))
 
     def render(self, screen: pygame.Surface, camera_x: float = 0, camera_y: float = 0, ui_scale: float = 1.0):
         """
@@ -484,8 +478,8 @@ class KnockbackAnimation:
 
     def clear_all_effects(self):
         """清除所有动画效果"""
-        self.particle_effects.clear()
-        self.flash_effects.clear()
+        self.effect_pool.release_all(Particle)
+        self.effect_pool.release_all(FlashEffect)
         self.screen_shake.shake_intensity = 0.0
         self.screen_shake.shake_duration = 0.0
 
@@ -18,6 +18,8 @@ from src.utils.logger import game_logger
 from enum import Enum
 import heapq
 from .bstar_pathfinding import BStarPathfinding
+from ..core.enums import TileType
+from ..core.map_grid import MapGrid
 
 
 class NavMeshNodeType(Enum):
@@ -154,25 +156,38 @@ class NavMeshSystem:
         """识别可行走区域"""
         regions = []
         visited = set()
+        walkable = self._get_walkable_mask(game_map)
 
         for y in range(map_height):
             for x in range(map_width):
-                if (x, y) not in visited and self._is_walkable_tile(x, y, game_map):
-                    region = self._flood_fill_region(x, y, game_map, visited)
+                if (x, y) not in visited and self._is_walkable_tile(x, y, game_map, walkable):
+                    region = self._flood_fill_region(
+                        x, y, game_map, visited, walkable)
                     if len(region) > 1:  # 只保留足够大的区域
                         regions.append(region)
 
         return regions
 
-    def _is_walkable_tile(self, x: int, y: int, game_map: List[List]) -> bool:
+    def _get_walkable_mask(self, game_map: List[List]) -> Optional[List[List[bool]]]:
+        """结构数组地图一次性生成可行走掩码，普通地图返回None（逐瓦片检查）"""
+        if isinstance(game_map, MapGrid):
+            return game_map.passable_lists((TileType.GROUND, TileType.ROOM), include_dug=True)
+        return None
+
+    def _is_walkable_tile(self, x: int, y: int, game_map: List[List],
+                          walkable: Optional[List[List[bool]]] = None) -> bool:
         """检查瓦片是否可行走"""
         if not (0 <= x < len(game_map[0]) and 0 <= y < len(game_map)):
             return False
 
+        if walkable is not None:
+            return walkable[y][x]
+
         tile = game_map[y][x]
         return tile.type.name in ['GROUND', 'ROOM'] or tile.is_dug
 
-    def _flood_fill_region(self, start_x: int, start_y: int, game_map: List[List], visited: Set[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    def _flood_fill_region(self, start_x: int, start_y: int, game_map: List[List], visited: Set[Tuple[int, int]],
+                           walkable: Optional[List[List[bool]]] = None) -> List[Tuple[int, int]]:
         """使用洪水填充算法识别连通区域"""
         region = []
         stack = [(start_x, start_y)]
@@ -182,7 +197,7 @@ class NavMeshSystem:
             if (x, y) in visited:
                 continue
 
-            if not self._is_walkable_tile(x, y, game_map):
+            if not self._is_walkable_tile(x, y, game_map, walkable):
                 continue
 
             visited.add((x, y))
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分时寻路任务队列
+单位的寻路请求不再在 creature.update 中同步执行，而是提交到队列里，
+由游戏主循环每帧在固定的毫秒预算内推进：A*的搜索状态保存在任务对象中，预算用完就暂停，下一帧继续。
+大量单位同时重新寻路时，寻路开销被摊到多帧里，避免单帧卡顿。
+
+- 任务按优先级处理（数值越小越优先），同优先级先提交先处理
+- 每个单位同时只有一个任务：目标改变时取消旧任务
+- 每帧至少推进一个时间片，保证队列在预算很小时也不会饿死
+"""
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.constants import GameConstants
+
+Cell = Tuple[int, int]
+
+# 任务优先级
+PRIORITY_COMBAT = 0    # 战斗中的单位
+PRIORITY_NORMAL = 1    # 普通移动
+PRIORITY_IDLE = 2      # 空闲/游荡
+
+_DIRECTIONS = ((-1, -1, 1.414), (-1, 0, 1.0), (-1, 1, 1.414), (0, -1, 1.0),
+               (0, 1, 1.0), (1, -1, 1.414), (1, 0, 1.0), (1, 1, 1.414))
+
+
+def _heuristic(a: Cell, b: Cell) -> float:
+    """对角线距离（与移动系统的A*一致）"""
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return max(dx, dy) + (1.414 - 1) * min(dx, dy)
+
+
+class IncrementalAStar:
+    """可中断的A*搜索 - 搜索状态保存在对象中，每次 step() 只展开有限个节点"""
+
+    def __init__(self, start: Cell, goal: Cell, is_walkable: Callable[[int, int], bool],
+                 max_expansions: int = 20000):
+        """
+        初始化搜索
+
+        Args:
+            start: 起点瓦片坐标
+            goal: 终点瓦片坐标
+            is_walkable: 格子可通行判断 is_walkable(x, y)，需要自行处理越界
+            max_expansions: 最多展开的节点数，超过后判定为不可达
+        """
+        self.start = start
+        self.goal = goal
+        self.is_walkable = is_walkable
+        self.max_expansions = max_expansions
+
+        self.g_score: Dict[Cell, float] = {start: 0.0}
+        self.came_from: Dict[Cell, Cell] = {}
+        self.closed = set()
+        self._counter = itertools.count()
+        self.open_set: List[Tuple[float, int, Cell]] = [
+            (_heuristic(start, goal), next(self._counter), start)]
+
+        self.expansions = 0
+        self.done = False
+        self.path: Optional[List[Cell]] = None
+
+    def step(self, max_steps: int) -> bool:
+        """
+        继续搜索
+
+        Args:
+            max_steps: 本次最多展开的节点数
+
+        Returns:
+            bool: 搜索是否已结束（找到路径或判定不可达）
+        """
+        if self.done:
+            return True
+
+        goal = self.goal
+        open_set, closed = self.open_set, self.closed
+        g_score, came_from = self.g_score, self.came_from
+        is_walkable = self.is_walkable
+        for _ in range(max_steps):
+            if not open_set or self.expansions >= self.max_expansions:
+                self.done = True
+                return True
+
+            _, _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            if current == goal:
+                self.path = self._reconstruct(current)
+                self.done = True
+                return True
+
+            closed.add(current)
+            self.expansions += 1
+            g = g_score[current]
+            x, y = current
+            for dx, dy, cost in _DIRECTIONS:
+                neighbor = (x + dx, y + dy)
+                if neighbor in closed or not is_walkable(neighbor[0], neighbor[1]):
+                    continue
+                tentative = g + cost
+                if tentative < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = tentative
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (tentative + _heuristic(neighbor, goal),
+                                              next(self._counter), neighbor))
+        return False
+
+    def _reconstruct(self, current: Cell) -> List[Cell]:
+        path = [current]
+        while current != self.start:
+            current = self.came_from[current]
+            path.append(current)
+        path.reverse()
+        return path
+
+
+@dataclass
+class PathfindingJob:
+    """寻路任务"""
+    owner: Any
+    target: Any                      # 调用方的目标标识（通常是目标像素坐标）
+    search: IncrementalAStar
+    priority: int = PRIORITY_NORMAL
+    submitted_frame: int = 0
+    finished_frame: int = -1
+    cancelled: bool = False
+    sequence: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.search.done
+
+    @property
+    def path(self) -> Optional[List[Cell]]:
+        """瓦片路径，找不到路径时为None"""
+        return self.search.path
+
+    @property
+    def wait_frames(self) -> int:
+        """从提交到完成经过的帧数"""
+        return self.finished_frame - self.submitted_frame if self.finished_frame >= 0 else -1
+
+
+class PathfindingQueue:
+    """分时寻路任务队列"""
+
+    def __init__(self, frame_budget_ms: float = None, slice_expansions: int = None):
+        """
+        初始化任务队列
+
+        Args:
+            frame_budget_ms: 每帧寻路的毫秒预算
+            slice_expansions: 每个时间片展开的节点数（每个时间片结束时检查一次预算）
+        """
+        self.frame_budget_ms = frame_budget_ms or GameConstants.PATHFINDING_FRAME_BUDGET_MS
+        self.slice_expansions = slice_expansions or GameConstants.PATHFINDING_SLICE_EXPANSIONS
+
+        self._heap: List[Tuple[int, int, PathfindingJob]] = []
+        self._jobs: Dict[Any, PathfindingJob] = {}
+        self._sequence = itertools.count()
+        self.frame = 0
+
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'cancelled': 0,
+            'expansions': 0,
+            'frames_processed': 0,
+            'max_frame_ms': 0.0,
+            'max_wait_frames': 0,
+        }
+
+    # ==================== 提交与查询 ====================
+
+    def submit(self, owner: Any, start: Cell, goal: Cell, is_walkable: Callable[[int, int], bool],
+               target: Any = None, priority: int = PRIORITY_NORMAL,
+               max_expansions: int = 20000) -> PathfindingJob:
+        """
+        提交寻路任务
+
+        同一单位对同一目标的未完成任务会被复用（优先级取较高者），目标不同时取消旧任务。
+
+        Returns:
+            PathfindingJob: 寻路任务
+        """
+        target = goal if target is None else target
+        job = self._jobs.get(owner)
+        if job is not None and not job.cancelled and job.target == target:
+            if priority < job.priority and not job.done:
+                job.priority = priority
+                heapq.heappush(self._heap, (priority, job.sequence, job))
+            return job
+        if job is not None:
+            self.cancel(owner)
+
+        job = PathfindingJob(owner=owner, target=target,
+                             search=IncrementalAStar(start, goal, is_walkable, max_expansions),
+                             priority=priority, submitted_frame=self.frame,
+                             sequence=next(self._sequence))
+        self._jobs[owner] = job
+        heapq.heappush(self._heap, (priority, job.sequence, job))
+        self.stats['submitted'] += 1
+        return job
+
+    def get_job(self, owner: Any) -> Optional[PathfindingJob]:
+        """获取单位当前的任务"""
+        return self._jobs.get(owner)
+
+    def take_result(self, owner: Any) -> Optional[PathfindingJob]:
+        """取走单位已完成的任务，未完成时返回None"""
+        job = self._jobs.get(owner)
+        if job is None or not job.done:
+            return None
+        del self._jobs[owner]
+        return job
+
+    def cancel(self, owner: Any):
+        """取消单位的任务"""
+        job = self._jobs.pop(owner, None)
+        if job is not None and not job.done:
+            job.cancelled = True
+            self.stats['cancelled'] += 1
+
+    def clear(self):
+        """清空所有任务"""
+        for job in self._jobs.values():
+            job.cancelled = True
+        self._jobs.clear()
+        self._heap.clear()
+
+    def pending_count(self) -> int:
+        """未完成的任务数量"""
+        return sum(1 for job in self._jobs.values() if not job.done)
+
+    # ==================== 每帧处理 ====================
+
+    def process(self, budget_ms: float = None) -> int:
+        """
+        在预算内推进队列中的任务（每帧调用一次）
+
+        Args:
+            budget_ms: 本帧预算，None 时使用 frame_budget_ms
+
+        Returns:
+            int: 本帧完成的任务数量
+        """
+        budget = (self.frame_budget_ms if budget_ms is None else budget_ms) / 1000.0
+        frame_start = time.perf_counter()
+        completed = 0
+
+        while self._heap:
+            priority, _, job = self._heap[0]
+            if job.cancelled or job.done or priority != job.priority:
+                # 已取消、已完成或优先级被提升后的旧条目
+                heapq.heappop(self._heap)
+                continue
+
+            before = job.search.expansions
+            finished = job.search.step(self.slice_expansions)
+            self.stats['expansions'] += job.search.expansions - before
+            if finished:
+                heapq.heappop(self._heap)
+                job.finished_frame = self.frame
+                completed += 1
+                self.stats['completed'] += 1
+                self.stats['max_wait_frames'] = max(
+                    self.stats['max_wait_frames'], job.wait_frames)
+
+            if time.perf_counter() - frame_start >= budget:
+                break
+
+        elapsed_ms = (time.perf_counter() - frame_start) * 1000
+        self.stats['max_frame_ms'] = max(self.stats['max_frame_ms'], elapsed_ms)
+        self.stats['frames_processed'] += 1
+        self.frame += 1
+        return completed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            **self.stats,
+            'pending': self.pending_count(),
+            'frame_budget_ms': self.frame_budget_ms,
+        }
+
+
+# 全局寻路队列实例
+_pathfinding_queue = None
+
+
+def get_pathfinding_queue() -> PathfindingQueue:
+    """获取全局寻路队列实例"""
+    global _pathfinding_queue
+    if _pathfinding_queue is None:
+        _pathfinding_queue = PathfindingQueue()
+    return _pathfinding_queue
+
+
+def reset_pathfinding_queue():
+    """重置寻路队列（用于测试或重新开始游戏）"""
+    global _pathfinding_queue
+    _pathfinding_queue = None
@@ -6,12 +6,15 @@
 
 import time
 import math
-from typing import List, Tuple, Set, Optional
+from array import array
+from typing import Dict, List, Tuple, Set, Optional
 from collections import deque
 
 from ..core.enums import TileType
 from ..core.constants import GameConstants
+from ..core.map_grid import MapGrid, DEFAULT_PASSABLE_TYPES
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
 
 
 class ReachabilitySystem:
@@ -29,10 +32,34 @@ class ReachabilitySystem:
         self.last_force_update_time = 0.0  # 上次强制更新时间
         self.force_update_cooldown = 0.5  # 强制更新冷却时间（秒）
 
+        # 增量连通分量（仅结构数组地图）
+        # 每个可通行瓦块记录所属连通分量id，-1 表示不可通行
+        self._labeled_map = None
+        self._width = 0
+        self._height = 0
+        self._passable: Optional[List[bool]] = None
+        self._component: Optional[array] = None
+        self._component_sizes: Dict[int, int] = {}
+        self._next_component_id = 0
+        self._base_component = -1
+        self.local_check_radius = 8  # 瓦块被阻挡时局部重检的半径（瓦块）
+
+        self.stats = {
+            'full_relabels': 0,
+            'incremental_updates': 0,
+            'local_checks': 0,
+            'component_splits': 0,
+        }
+
     def set_base_position(self, base_x: int, base_y: int):
         """设置主基地位置"""
+        if self.base_position == (base_x, base_y):
+            return
         self.base_position = (base_x, base_y)
         self.reachable_tiles.clear()  # 清除缓存
+        # 起点变化，下次更新重新标记连通分量
+        self._labeled_map = None
+        self._component = None
 
     def register_force_update_event(self, event_type: str, x: int, y: int):
         """注册需要强制更新的事件"""
@@ -49,7 +76,7 @@ class ReachabilitySystem:
 
     def should_force_update(self) -> bool:
         """检查是否应该强制更新"""
-        current_time = time.time()
+        current_time = sim_time()
 
         # 检查冷却时间
         if current_time - self.last_force_update_time < self.force_update_cooldown:
@@ -60,7 +87,7 @@ class ReachabilitySystem:
 
     def update_reachability(self, game_map: List[List], force_update: bool = False) -> bool:
         """更新所有瓦块的可达性"""
-        current_time = time.time()
+        current_time = sim_time()
 
         # 检查是否需要更新
         if not force_update and (current_time - self.last_update_time) < self.update_interval:
@@ -77,11 +104,16 @@ class ReachabilitySystem:
 
         start_time = time.time()
 
-        # 使用BFS算法计算可达性
-        self._calculate_reachability_bfs(game_map)
+        if isinstance(game_map, MapGrid):
+            # 结构数组地图：只处理通行性发生变化的瓦块
+            changed = self._update_components(game_map)
+        else:
+            # 使用BFS算法计算可达性
+            self._calculate_reachability_bfs(game_map)
 
-        # 更新瓦块的可达性标记
-        self._update_tile_reachability(game_map)
+            # 更新瓦块的可达性标记
+            self._update_tile_reachability(game_map)
+            changed = True
 
         self.last_update_time = current_time
         elapsed = time.time() - start_time
@@ -91,6 +123,9 @@ class ReachabilitySystem:
             self.last_force_update_time = current_time
             self.clear_force_update_events()
 
+        if not changed:
+            return True
+
         # 统计金矿脉数量
         gold_veins = self.get_reachable_gold_veins(game_map)
         update_type = "强制更新" if force_update else "常规更新"
@@ -114,9 +149,15 @@ class ReachabilitySystem:
             game_logger.info(f"❌ 主基地位置无效: ({base_x}, {base_y})")
             return
 
+        # 结构数组地图一次性取出可通行掩码，避免逐瓦块访问属性
+        passable = None
+        if isinstance(game_map, MapGrid):
+            passable = game_map.passable_lists(DEFAULT_PASSABLE_TYPES)
+
         # 检查主基地瓦块是否可通行
         base_tile = game_map[base_y][base_x]
-        if not self._is_tile_passable(base_tile):
+        if not (passable[base_y][base_x] if passable is not None
+                else self._is_tile_passable(base_tile)):
             game_logger.info(f"❌ 主基地瓦块不可通行: {base_tile}")
             return
 
@@ -145,6 +186,12 @@ class ReachabilitySystem:
                     continue
 
                 # 检查瓦块是否可通行
+                if passable is not None:
+                    if passable[ny][nx]:
+                        visited.add((nx, ny))
+                        queue.append((nx, ny))
+                    continue
+
                 tile = game_map[ny][nx]
                 if self._is_tile_passable(tile):
                     visited.add((nx, ny))
@@ -167,7 +214,12 @@ class ReachabilitySystem:
 
     def _update_tile_reachability(self, game_map: List[List]):
         """更新瓦块的可达性标记"""
-        current_time = time.time()
+        current_time = sim_time()
+
+        if isinstance(game_map, MapGrid):
+            game_map.set_reachability(self.reachable_tiles, current_time)
+            self._update_override_reachability(game_map, current_time)
+            return
 
         for y in range(len(game_map)):
             for x in range(len(game_map[0])):
@@ -182,6 +234,262 @@ class ReachabilitySystem:
                 elif hasattr(tile, 'set_reachability'):
                     tile.set_reachability(is_reachable, current_time)
 
+    def _update_override_reachability(self, game_map: MapGrid, current_time: float):
+        """被临时替换的瓦块对象不在数组中，单独更新"""
+        for i, tile in game_map.overrides.items():
+            y, x = divmod(i, game_map.width)
+            if hasattr(tile, 'set_reachability'):
+                tile.set_reachability(
+                    (x, y) in self.reachable_tiles, current_time)
+
+    # ==================== 增量连通分量 ====================
+
+    def _update_components(self, game_map: MapGrid) -> bool:
+        """
+        增量更新连通分量
+
+        比较本次与上次的可通行掩码，只处理发生变化的瓦块：
+        新变为可通行的瓦块并入相邻分量，变为不可通行的瓦块先做局部重检，
+        只有确实把分量切断时才重新标记被切开的部分。
+
+        Returns:
+            bool: 可达性是否可能发生了变化
+        """
+        current_time = sim_time()
+        passable = game_map.passable_flat(DEFAULT_PASSABLE_TYPES)
+
+        if (self._labeled_map is not game_map or self._passable is None or
+                len(passable) != len(self._passable)):
+            self._label_components(game_map, passable)
+            game_map.set_reachability(self.reachable_tiles, current_time)
+            self._update_override_reachability(game_map, current_time)
+            return True
+
+        if passable == self._passable:
+            changed_cells = []
+        else:
+            changed_cells = [i for i, (new, old) in enumerate(zip(passable, self._passable))
+                             if new != old]
+        self._passable = passable
+
+        # 先处理阻挡再处理开通，保证每一步时分量标记都与已处理的瓦块一致
+        for i in changed_cells:
+            if not passable[i]:
+                self._on_tile_blocked(game_map, i)
+        for i in changed_cells:
+            if passable[i]:
+                self._on_tile_opened(game_map, i)
+
+        game_map.mark_reachability_checked(current_time)
+        self._update_override_reachability(game_map, current_time)
+        if changed_cells:
+            self.stats['incremental_updates'] += 1
+        return bool(changed_cells)
+
+    def _label_components(self, game_map: MapGrid, passable: List[bool]):
+        """全量标记所有连通分量"""
+        self._labeled_map = game_map
+        self._passable = passable
+        self._width = game_map.width
+        self._height = game_map.height
+        # -2 = 可通行但未标记，-1 = 不可通行
+        self._component = array('i', [-2 if p else -1 for p in passable])
+        self._component_sizes = {}
+        self._next_component_id = 0
+
+        component = self._component
+        for start in range(len(component)):
+            if component[start] == -2:
+                component_id = self._new_component_id()
+                self._component_sizes[component_id] = len(
+                    self._flood(start, -2, component_id))
+
+        self._base_component = self._get_base_component()
+        self._rebuild_reachable_tiles()
+        self.stats['full_relabels'] += 1
+
+    def _new_component_id(self) -> int:
+        component_id = self._next_component_id
+        self._next_component_id += 1
+        return component_id
+
+    def _get_base_component(self) -> int:
+        """主基地所在的分量id，主基地不可通行或不在地图内时为-1"""
+        if not self.base_position:
+            return -1
+        base_x, base_y = self.base_position
+        if not (0 <= base_x < self._width and 0 <= base_y < self._height):
+            return -1
+        return self._component[base_y * self._width + base_x]
+
+    def _rebuild_reachable_tiles(self):
+        """根据分量标记重建可达瓦块集合"""
+        width = self._width
+        base = self._base_component
+        self.reachable_tiles = set()
+        if base < 0:
+            return
+        self.reachable_tiles.update((i % width, i // width)
+                                    for i, component_id in enumerate(self._component)
+                                    if component_id == base)
+
+    def _neighbors(self, i: int) -> List[int]:
+        """4方向相邻瓦块的下标"""
+        width = self._width
+        x = i % width
+        neighbors = []
+        if x > 0:
+            neighbors.append(i - 1)
+        if x < width - 1:
+            neighbors.append(i + 1)
+        if i >= width:
+            neighbors.append(i - width)
+        if i + width < len(self._component):
+            neighbors.append(i + width)
+        return neighbors
+
+    def _flood(self, start: int, old_id: int, new_id: int) -> List[int]:
+        """把与 start 连通且标记为 old_id 的瓦块全部改标为 new_id，返回被改标的下标"""
+        component = self._component
+        component[start] = new_id
+        stack = [start]
+        cells = [start]
+        while stack:
+            for j in self._neighbors(stack.pop()):
+                if component[j] == old_id:
+                    component[j] = new_id
+                    stack.append(j)
+                    cells.append(j)
+        return cells
+
+    def _set_cells_reachable(self, game_map: MapGrid, cells: List[int], reachable: bool):
+        """同步可达瓦块集合与地图数组中的可达标记"""
+        width = self._width
+        for i in cells:
+            position = (i % width, i // width)
+            if reachable:
+                self.reachable_tiles.add(position)
+            else:
+                self.reachable_tiles.discard(position)
+            game_map.reachable[i] = reachable
+
+    def _on_tile_opened(self, game_map: MapGrid, i: int):
+        """瓦块变为可通行：并入相邻分量，连接多个分量时合并它们"""
+        component = self._component
+        sizes = self._component_sizes
+        neighbor_ids = {component[j]
+                        for j in self._neighbors(i) if component[j] >= 0}
+        base = self._base_component
+
+        if not neighbor_ids:
+            target = self._new_component_id()
+            sizes[target] = 0
+        elif base in neighbor_ids:
+            target = base
+        else:
+            # 改标较小的分量
+            target = max(neighbor_ids, key=lambda c: sizes[c])
+
+        component[i] = target
+        sizes[target] += 1
+        joined = [i]
+        for other in neighbor_ids - {target}:
+            start = next(j for j in self._neighbors(i) if component[j] == other)
+            cells = self._flood(start, other, target)
+            sizes[target] += len(cells)
+            del sizes[other]
+            joined.extend(cells)
+
+        if base < 0 and self._get_base_component() >= 0:
+            # 主基地瓦块重新变为可通行
+            self._base_component = self._get_base_component()
+            self._rebuild_reachable_tiles()
+            game_map.set_reachability(self.reachable_tiles, sim_time())
+        elif target == base:
+            self._set_cells_reachable(game_map, joined, True)
+
+    def _on_tile_blocked(self, game_map: MapGrid, i: int):
+        """瓦块变为不可通行：局部重检相邻瓦块是否仍然连通，被切断时重新标记"""
+        component = self._component
+        sizes = self._component_sizes
+        old_id = component[i]
+        if old_id < 0:
+            return
+        component[i] = -1
+        sizes[old_id] -= 1
+        was_base = old_id == self._base_component
+        if was_base:
+            self._set_cells_reachable(game_map, [i], False)
+
+        neighbors = [j for j in self._neighbors(i) if component[j] == old_id]
+        if not neighbors:
+            del sizes[old_id]
+        elif len(neighbors) > 1 and not self._locally_connected(i, neighbors, old_id):
+            self._split_component(game_map, old_id, neighbors, was_base)
+
+        if was_base and self._get_base_component() != self._base_component:
+            # 主基地瓦块本身被阻挡
+            self._base_component = self._get_base_component()
+            self._rebuild_reachable_tiles()
+            game_map.set_reachability(self.reachable_tiles, sim_time())
+
+    def _locally_connected(self, i: int, neighbors: List[int], component_id: int) -> bool:
+        """在被阻挡瓦块周围的有限窗口内检查所有相邻瓦块是否仍然互相连通"""
+        self.stats['local_checks'] += 1
+        component = self._component
+        width = self._width
+        radius = self.local_check_radius
+        center_x, center_y = i % width, i // width
+
+        targets = set(neighbors[1:])
+        visited = {neighbors[0]}
+        queue = deque([neighbors[0]])
+        while queue and targets:
+            for j in self._neighbors(queue.popleft()):
+                if j in visited or component[j] != component_id:
+                    continue
+                x, y = j % width, j // width
+                if abs(x - center_x) > radius or abs(y - center_y) > radius:
+                    continue
+                visited.add(j)
+                targets.discard(j)
+                queue.append(j)
+        return not targets
+
+    def _split_component(self, game_map: MapGrid, old_id: int, neighbors: List[int], was_base: bool):
+        """局部重检失败：从每个相邻瓦块重新标记被切开的各个部分"""
+        self.stats['component_splits'] += 1
+        component = self._component
+        sizes = self._component_sizes
+        del sizes[old_id]
+
+        parts = []
+        for start in neighbors:
+            if component[start] == old_id:
+                part_id = self._new_component_id()
+                cells = self._flood(start, old_id, part_id)
+                sizes[part_id] = len(cells)
+                parts.append((part_id, cells))
+
+        if was_base:
+            self._base_component = self._get_base_component()
+            for part_id, cells in parts:
+                if part_id != self._base_component:
+                    self._set_cells_reachable(game_map, cells, False)
+
+    def is_reachable(self, x: int, y: int) -> bool:
+        """
+        检查指定瓦块是否与主基地连通（基于上次更新时的分量标记，O(1)）
+
+        结构数组地图使用连通分量id数组，其他地图回退到可达瓦块集合。
+        """
+        if self._component is None:
+            return (x, y) in self.reachable_tiles
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return False
+        base = self._base_component
+        return base >= 0 and self._component[y * self._width + x] == base
+
     def is_tile_reachable(self, x: int, y: int) -> bool:
         """检查指定瓦块是否可达"""
         return (x, y) in self.reachable_tiles
@@ -190,8 +498,24 @@ class ReachabilitySystem:
         """获取所有可达瓦块的集合"""
         return self.reachable_tiles.copy()
 
+    def is_vein_reachable(self, x: int, y: int) -> bool:
+        """检查金矿脉是否可达：自身可达或与可达瓦块接壤（未挖掘的金矿脉）"""
+        return (self.is_reachable(x, y) or self.is_reachable(x + 1, y) or
+                self.is_reachable(x - 1, y) or self.is_reachable(x, y + 1) or
+                self.is_reachable(x, y - 1))
+
     def get_reachable_gold_veins(self, game_map: List[List]) -> List[Tuple[int, int, int]]:
         """获取所有可达的金矿脉（有储量的金矿）"""
+        if isinstance(game_map, MapGrid) and self._labeled_map is game_map:
+            # 结构数组地图：遍历金矿注册表，而不是遍历所有可达瓦块及其邻居
+            from src.managers.gold_mine_manager import get_gold_mine_manager
+            gold_mine_manager = get_gold_mine_manager()
+            if not gold_mine_manager.is_tracking(game_map):
+                gold_mine_manager.attach_map(game_map)
+            return [(x, y, mine_info['gold_amount'])
+                    for (x, y), mine_info in gold_mine_manager.gold_mines.items()
+                    if mine_info['gold_amount'] > 0 and self.is_vein_reachable(x, y)]
+
         reachable_veins = []
 
         # 首先检查已挖掘区域的金矿脉
@@ -280,6 +604,8 @@ class ReachabilitySystem:
         """使可达性缓存失效"""
         self.reachable_tiles.clear()
         self.last_update_time = 0.0
+        self._labeled_map = None
+        self._component = None
 
     def enable_adjacent_vein_logging(self):
         """启用接壤金矿脉日志输出"""
@@ -295,7 +621,9 @@ class ReachabilitySystem:
             'reachable_tiles_count': len(self.reachable_tiles),
             'last_update_time': self.last_update_time,
             'base_position': self.base_position,
-            'needs_update': time.time() - self.last_update_time > self.update_interval
+            'needs_update': sim_time() - self.last_update_time > self.update_interval,
+            'components_count': len(self._component_sizes),
+            **self.stats
         }
 
 
@@ -309,3 +637,9 @@ def get_reachability_system() -> ReachabilitySystem:
     if _reachability_system is None:
         _reachability_system = ReachabilitySystem()
     return _reachability_system
+
+
+def reset_reachability_system():
+    """重置可达性系统（用于测试或重新开始游戏）"""
+    global _reachability_system
+    _reachability_system = None
@@ -5,7 +5,6 @@
 处理所有技能相关的逻辑，包括主动技能和被动技能
 """
 
-import time
 import math
 import random
 from typing import List, Dict, Optional, Any, Tuple
@@ -14,6 +13,8 @@ from enum import Enum
 
 from src.core.constants import GameConstants
 from src.utils.logger import game_logger
+from src.core.sim_clock import sim_time
+from src.systems.spatial_index import get_spatial_index, UNIT_LAYERS
 
 
 class SkillType(Enum):
@@ -74,7 +75,7 @@ class Skill(ABC):
 
         if self.skill_type == SkillType.ACTIVE:
             # 检查冷却时间
-            current_time = time.time()
+            current_time = sim_time()
             if current_time - self.last_used_time < self.cooldown:
                 # 获取像素坐标 - 直接使用世界坐标，不乘以20
                 pixel_x = caster.x if hasattr(caster, 'x') else 0
@@ -106,7 +107,7 @@ class Skill(ABC):
             caster.mana -= self.mana_cost
 
         # 记录使用时间
-        self.last_used_time = time.time()
+        self.last_used_time = sim_time()
 
         # 执行技能效果
         result = self.execute_skill(caster, target, **kwargs)
@@ -124,7 +125,7 @@ class Skill(ABC):
     def update_cooldown(self):
         """更新冷却状态"""
         if self.skill_type == SkillType.ACTIVE:
-            current_time = time.time()
+            current_time = sim_time()
             self.is_on_cooldown = current_time - self.last_used_time < self.cooldown
 
 
@@ -227,13 +228,19 @@ class WhirlwindSlash(ActiveSkill):
         enemies = []
 
         # 获取所有可能的敌人
-        all_units = []
-        if hasattr(game_instance, 'monsters'):
-            all_units.extend(game_instance.monsters)
-            game_logger.info(f"💨 找到 {len(game_instance.monsters)} 个怪物")
-        if hasattr(game_instance, 'heroes'):
-            all_units.extend(game_instance.heroes)
-            game_logger.info(f"💨 找到 {len(game_instance.heroes)} 个英雄")
+        spatial_index = get_spatial_index(game_instance)
+        if spatial_index:
+            # 空间索引只返回旋风斩范围内的单位
+            all_units = spatial_index.query_radius(
+                caster.x, caster.y, self.range, layers=UNIT_LAYERS)
+        else:
+            all_units = []
+            if hasattr(game_instance, 'monsters'):
+                all_units.extend(game_instance.monsters)
+                game_logger.info(f"💨 找到 {len(game_instance.monsters)} 个怪物")
+            if hasattr(game_instance, 'heroes'):
+                all_units.extend(game_instance.heroes)
+                game_logger.info(f"💨 找到 {len(game_instance.heroes)} 个英雄")
 
         game_logger.info(f"💨 总单位数: {len(all_units)}")
 
@@ -322,7 +329,7 @@ class MultiShot(ActiveSkill):
 
         # 开始多重射击序列
         self.current_shot = 0
-        self.last_shot_time = time.time()
+        self.last_shot_time = sim_time()
         self.is_charging = True
         self.original_target = target  # 保存初始目标
 
@@ -346,7 +353,7 @@ class MultiShot(ActiveSkill):
             self.is_charging = False
             return False
 
-        current_time = time.time()
+        current_time = sim_time()
 
         # 检查是否到了下一次射击时间
         if current_time - self.last_shot_time >= self.shot_interval:
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+世界空间索引 - 基于 physics_system.SpatialHash 的均匀网格
+由游戏/模拟器每帧增量同步一次，供战斗、防御塔、技能和范围伤害共享使用，
+替代各系统中对全部单位的线性扫描。
+
+- 增量更新：记录每个单位所在的格子，只有跨格移动的单位才会在格子间搬移
+- 分层存储：怪物、英雄、建筑分别存放在独立的网格中，查询时按层选择
+- 查询类型：圆形、扇形、长方形（支持旋转）、K近邻
+
+查询结果只保证在同步时刻的格子划分下完整；单位在两次同步之间的小幅移动
+由 query_margin 覆盖，距离判断始终使用单位的当前坐标。
+"""
+
+import heapq
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.systems.physics_system import SpatialHash, PhysicsConstants
+
+
+# 标准图层名称 - 与游戏实例上的属性名保持一致
+LAYER_MONSTERS = 'monsters'
+LAYER_HEROES = 'heroes'
+LAYER_BUILDINGS = 'buildings'
+ALL_LAYERS = (LAYER_MONSTERS, LAYER_HEROES, LAYER_BUILDINGS)
+UNIT_LAYERS = (LAYER_MONSTERS, LAYER_HEROES)
+
+
+class SpatialGrid(SpatialHash):
+    """支持增量更新的均匀网格"""
+
+    def __init__(self, cell_size: int = PhysicsConstants.SPATIAL_HASH_CELL_SIZE):
+        super().__init__(cell_size)
+        # id(unit) -> (格子键值, 单位)
+        self._unit_cells: Dict[int, Tuple[Tuple[int, int], Any]] = {}
+        self.moves_last_sync = 0
+
+    def clear(self):
+        """清空网格"""
+        super().clear()
+        self._unit_cells.clear()
+
+    def __len__(self) -> int:
+        return len(self._unit_cells)
+
+    def __contains__(self, unit: Any) -> bool:
+        return id(unit) in self._unit_cells
+
+    def add_unit(self, unit: Any):
+        """添加单位（已存在时等同于 update_unit）"""
+        self.update_unit(unit)
+
+    def update_unit(self, unit: Any) -> bool:
+        """
+        更新单个单位的位置
+
+        Returns:
+            bool: 单位是否被放入了新的格子
+        """
+        uid = id(unit)
+        key = (int(unit.x // self.cell_size), int(unit.y // self.cell_size))
+        entry = self._unit_cells.get(uid)
+        if entry is not None:
+            if entry[0] == key:
+                return False
+            self._remove_from_cell(entry[0], unit)
+
+        cell = self.grid.get(key)
+        if cell is None:
+            self.grid[key] = [unit]
+        else:
+            cell.append(unit)
+        self._unit_cells[uid] = (key, unit)
+        return True
+
+    def remove_unit(self, unit: Any) -> bool:
+        """移除单位"""
+        entry = self._unit_cells.pop(id(unit), None)
+        if entry is None:
+            return False
+        self._remove_from_cell(entry[0], unit)
+        return True
+
+    def sync(self, units: Sequence[Any]):
+        """
+        与单位列表增量同步：移动跨格单位、加入新单位、移除已不在列表中的单位
+
+        Args:
+            units: 当前帧的完整单位列表
+        """
+        moves = 0
+        count = 0
+        update_unit = self.update_unit
+        for unit in units:
+            if update_unit(unit):
+                moves += 1
+            count += 1
+
+        # 网格中的单位比列表多，说明有单位被移除（死亡、拆除等）
+        if len(self._unit_cells) > count:
+            alive = {id(unit) for unit in units}
+            for uid in [uid for uid in self._unit_cells if uid not in alive]:
+                key, unit = self._unit_cells.pop(uid)
+                self._remove_from_cell(key, unit)
+
+        self.moves_last_sync = moves
+
+    def _remove_from_cell(self, key: Tuple[int, int], unit: Any):
+        cell = self.grid.get(key)
+        if not cell:
+            return
+        for i, other in enumerate(cell):
+            if other is unit:
+                cell[i] = cell[-1]
+                cell.pop()
+                break
+        if not cell:
+            del self.grid[key]
+
+    def iter_cells_in_rect(self, min_x: float, min_y: float,
+                           max_x: float, max_y: float) -> Iterable[List[Any]]:
+        """遍历与轴对齐矩形相交的所有非空格子"""
+        cell_size = self.cell_size
+        grid = self.grid
+        x0, x1 = int(min_x // cell_size), int(max_x // cell_size)
+        y0, y1 = int(min_y // cell_size), int(max_y // cell_size)
+
+        # 查询范围远大于已占用格子数时，直接遍历已占用格子
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(grid):
+            for (cx, cy), cell in grid.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    yield cell
+            return
+
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = grid.get((cx, cy))
+                if cell:
+                    yield cell
+
+
+class WorldSpatialIndex:
+    """世界空间索引 - 按图层组织的增量网格，每帧同步一次"""
+
+    def __init__(self, cell_size: int = PhysicsConstants.SPATIAL_HASH_CELL_SIZE,
+                 query_margin: float = None):
+        """
+        初始化世界空间索引
+
+        Args:
+            cell_size: 格子大小（像素）
+            query_margin: 选择候选格子时额外扩展的距离（像素），覆盖两次同步之间的移动
+        """
+        self.cell_size = cell_size
+        self.query_margin = cell_size * 0.25 if query_margin is None else query_margin
+        self.layers: Dict[str, SpatialGrid] = {}
+        self.sync_count = 0
+
+    def get_layer(self, layer: str) -> SpatialGrid:
+        """获取（必要时创建）图层网格"""
+        grid = self.layers.get(layer)
+        if grid is None:
+            grid = SpatialGrid(self.cell_size)
+            self.layers[layer] = grid
+        return grid
+
+    def sync(self, layer: str, units: Iterable[Any]):
+        """增量同步一个图层"""
+        self.get_layer(layer).sync(units)
+
+    def sync_game(self, game_instance):
+        """
+        从游戏实例同步全部标准图层 - 游戏/模拟器每帧在单位移动之后调用一次
+
+        Args:
+            game_instance: 拥有 monsters、heroes、building_manager 的游戏实例
+        """
+        self.sync(LAYER_MONSTERS, getattr(game_instance, 'monsters', None) or [])
+        self.sync(LAYER_HEROES, getattr(game_instance, 'heroes', None) or [])
+
+        building_manager = getattr(game_instance, 'building_manager', None)
+        buildings = building_manager.buildings if building_manager and building_manager.buildings else []
+        self.sync(LAYER_BUILDINGS, buildings)
+        self.sync_count += 1
+
+    def clear(self):
+        """清空所有图层"""
+        for grid in self.layers.values():
+            grid.clear()
+
+    def _iter_candidates(self, layers: Sequence[str], min_x: float, min_y: float,
+                         max_x: float, max_y: float) -> Iterable[Any]:
+        margin = self.query_margin
+        for layer in layers:
+            grid = self.layers.get(layer)
+            if not grid:
+                continue
+            for cell in grid.iter_cells_in_rect(min_x - margin, min_y - margin,
+                                                max_x + margin, max_y + margin):
+                yield from cell
+
+    def query_radius(self, x: float, y: float, radius: float,
+                     layers: Sequence[str] = UNIT_LAYERS,
+                     predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        圆形查询
+
+        Args:
+            x, y: 圆心（像素）
+            radius: 半径（像素），距离等于半径的单位包含在内
+            layers: 查询的图层
+            predicate: 可选过滤函数
+
+        Returns:
+            List: 圆内的单位
+        """
+        radius_sq = radius * radius
+        result = []
+        for unit in self._iter_candidates(layers, x - radius, y - radius, x + radius, y + radius):
+            dx = unit.x - x
+            dy = unit.y - y
+            if dx * dx + dy * dy <= radius_sq and (predicate is None or predicate(unit)):
+                result.append(unit)
+        return result
+
+    def query_sector(self, x: float, y: float, radius: float, angle: float, direction: float,
+                     layers: Sequence[str] = UNIT_LAYERS,
+                     predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        扇形查询
+
+        Args:
+            x, y: 扇形顶点（像素）
+            radius: 半径（像素）
+            angle: 扇形角度（度）
+            direction: 扇形方向（度，0度为右方向）
+        """
+        direction_rad = math.radians(direction)
+        half_angle_rad = math.radians(angle / 2)
+        result = []
+        for unit in self.query_radius(x, y, radius, layers, predicate):
+            unit_angle = math.atan2(unit.y - y, unit.x - x)
+            angle_diff = abs(unit_angle - direction_rad)
+            if angle_diff > math.pi:
+                angle_diff = 2 * math.pi - angle_diff
+            if angle_diff <= half_angle_rad:
+                result.append(unit)
+        return result
+
+    def query_rect(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                   layers: Sequence[str] = UNIT_LAYERS,
+                   predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """轴对齐矩形查询（边界包含在内）"""
+        result = []
+        for unit in self._iter_candidates(layers, min_x, min_y, max_x, max_y):
+            if min_x <= unit.x <= max_x and min_y <= unit.y <= max_y and \
+                    (predicate is None or predicate(unit)):
+                result.append(unit)
+        return result
+
+    def query_polygon_bounds(self, corners: Sequence[Tuple[float, float]],
+                             layers: Sequence[str] = UNIT_LAYERS,
+                             predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        旋转矩形（任意多边形）的候选查询 - 返回多边形包围盒内的单位，
+        精确的点在多边形内判断由调用方完成
+        """
+        xs = [corner[0] for corner in corners]
+        ys = [corner[1] for corner in corners]
+        return self.query_rect(min(xs), min(ys), max(xs), max(ys), layers, predicate)
+
+    def k_nearest(self, x: float, y: float, k: int = 1, max_radius: float = None,
+                  layers: Sequence[str] = UNIT_LAYERS,
+                  predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        K近邻查询 - 由近到远逐圈扩展格子，找到足够的单位后提前结束
+
+        Args:
+            x, y: 查询点（像素）
+            k: 返回的单位数量上限
+            max_radius: 可选的最大搜索半径（像素）
+            layers: 查询的图层
+            predicate: 可选过滤函数（如敌人判断）
+
+        Returns:
+            List: 按距离由近到远排序的单位
+        """
+        grids = [self.layers[layer] for layer in layers if self.layers.get(layer)]
+        if k <= 0 or not grids:
+            return []
+
+        cell_size = self.cell_size
+        cx, cy = int(x // cell_size), int(y // cell_size)
+
+        # 最大搜索圈数：不超过半径限制，也不超过已占用格子的范围
+        occupied = [key for grid in grids for key in grid.grid]
+        if not occupied:
+            return []
+        max_ring = max(max(abs(kx - cx), abs(ky - cy)) for kx, ky in occupied)
+        if max_radius is not None:
+            max_ring = min(max_ring, int(max_radius // cell_size) + 1)
+        max_radius_sq = None if max_radius is None else max_radius * max_radius
+
+        # 最大堆保存当前最近的k个单位: (-距离平方, 序号, 单位)
+        best: List[Tuple[float, int, Any]] = []
+        order = 0
+        for ring in range(max_ring + 1):
+            # 第ring圈及以外的单位距离至少为 (ring - 1) * cell_size（查询点可能位于格子任意位置）
+            if len(best) >= k:
+                min_outside = max(0.0, (ring - 1) * cell_size - self.query_margin)
+                if min_outside * min_outside > -best[0][0]:
+                    break
+
+            for key in self._ring_keys(cx, cy, ring):
+                for grid in grids:
+                    cell = grid.grid.get(key)
+                    if not cell:
+                        continue
+                    for unit in cell:
+                        dx = unit.x - x
+                        dy = unit.y - y
+                        dist_sq = dx * dx + dy * dy
+                        if max_radius_sq is not None and dist_sq > max_radius_sq:
+                            continue
+                        if len(best) >= k and dist_sq >= -best[0][0]:
+                            continue
+                        if predicate is not None and not predicate(unit):
+                            continue
+                        order += 1
+                        if len(best) < k:
+                            heapq.heappush(best, (-dist_sq, order, unit))
+                        else:
+                            heapq.heapreplace(best, (-dist_sq, order, unit))
+
+        best.sort(key=lambda item: (-item[0], item[1]))
+        return [item[2] for item in best]
+
+    def nearest(self, x: float, y: float, max_radius: float = None,
+                layers: Sequence[str] = UNIT_LAYERS,
+                predicate: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """最近单位查询，没有时返回 None"""
+        result = self.k_nearest(x, y, 1, max_radius, layers, predicate)
+        return result[0] if result else None
+
+    @staticmethod
+    def _ring_keys(cx: int, cy: int, ring: int) -> Iterable[Tuple[int, int]]:
+        """第ring圈的格子键值（切比雪夫距离等于ring）"""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取索引统计信息"""
+        stats = {'sync_count': self.sync_count}
+        for layer, grid in self.layers.items():
+            stats[f'{layer}_units'] = len(grid)
+            stats[f'{layer}_cells'] = len(grid.grid)
+            stats[f'{layer}_moves'] = grid.moves_last_sync
+        return stats
+
+
+def get_spatial_index(game_instance) -> Optional[WorldSpatialIndex]:
+    """获取游戏实例上的世界空间索引，没有时返回 None（调用方回退到线性扫描）"""
+    return getattr(game_instance, 'spatial_index', None) if game_instance else None
@@ -8,7 +8,7 @@
 2. 智能算法选择 - 根据场景自动选择最佳算法
 3. 性能优化 - 缓存、预计算、增量更新
 4. 动态调整 - 实时适应环境变化
-5. 多策略支持 - B*、A*、DFS、NavMesh等
+5. 多策略支持 - B*、A*、DFS、NavMesh、HPA*等
 """
 
 import math
@@ -21,6 +21,8 @@ from abc import ABC, abstractmethod
 
 from ..core.constants import GameConstants
 from ..core.enums import TileType
+from ..core.sim_clock import sim_time
+from .hpa_pathfinding import HierarchicalPathfinder
 
 
 class PathfindingStrategy(Enum):
@@ -29,10 +31,42 @@ class PathfindingStrategy(Enum):
     A_STAR = "a_star"           # A*算法 - 经典寻路
     DFS = "dfs"                 # 深度优先搜索 - 简单场景
     NAVMESH = "navmesh"         # 导航网格 - 复杂地形
+    HPA_STAR = "hpa_star"       # 分层A* - 长距离寻路
     HYBRID = "hybrid"           # 混合策略 - 自动选择
     RECTANGULAR = "rectangular"  # 矩形路径 - 简单移动
 
 
+# 可通行的瓦片类型（已挖掘的瓦片一律可通行）
+WALKABLE_TILE_TYPES = (TileType.GROUND, TileType.ROOM, TileType.GOLD_VEIN)
+
+_completed_building_status = None
+
+
+def is_tile_walkable(tile: Any) -> bool:
+    """
+    检查瓦片是否可通行（A*、DFS、HPA*共用）
+
+    只有已完成的建筑才阻挡寻路，建造中的建筑不阻挡。tile.building 可能是建筑对象本身，
+    也可能是 GameTile 的 TileBuilding 信息对象（建筑对象在其 building 字段中）
+    """
+    global _completed_building_status
+
+    if tile.type not in WALKABLE_TILE_TYPES and not tile.is_dug:
+        return False
+
+    building = getattr(tile, 'building', None)
+    if building is not None and not hasattr(building, 'status'):
+        building = getattr(building, 'building', None)
+    if building is not None:
+        if _completed_building_status is None:
+            from ..entities.building import BuildingStatus
+            _completed_building_status = BuildingStatus.COMPLETED
+        if building.status == _completed_building_status:
+            return False
+
+    return True
+
+
 class PathfindingResult:
     """寻路结果"""
 
@@ -43,7 +77,7 @@ class PathfindingResult:
         self.algorithm = algorithm
         self.cost = cost
         self.time_ms = time_ms
-        self.timestamp = time.time()
+        self.timestamp = sim_time()
 
 
 @dataclass
@@ -109,7 +143,7 @@ class BStarAlgorithm(PathfindingAlgorithm):
         cache_key = (start, goal, int(kwargs.get('dynamic_adjustments', True)))
         if self.config.enable_caching and cache_key in self.cache:
             result, cache_time = self.cache[cache_key]
-            if time.time() - cache_time < self.config.cache_timeout:
+            if sim_time() - cache_time < self.config.cache_timeout:
                 self.stats['cache_hits'] += 1
                 return result
 
@@ -148,7 +182,7 @@ class BStarAlgorithm(PathfindingAlgorithm):
 
         # 缓存结果
         if self.config.enable_caching:
-            self.cache[cache_key] = (result, time.time())
+            self.cache[cache_key] = (result, sim_time())
 
         return result
 
@@ -185,7 +219,7 @@ class AStarAlgorithm(PathfindingAlgorithm):
         cache_key = (start, goal)
         if self.config.enable_caching and cache_key in self.cache:
             result, cache_time = self.cache[cache_key]
-            if time.time() - cache_time < self.config.cache_timeout:
+            if sim_time() - cache_time < self.config.cache_timeout:
                 self.stats['cache_hits'] += 1
                 return result
 
@@ -224,7 +258,7 @@ class AStarAlgorithm(PathfindingAlgorithm):
 
         # 缓存结果
         if self.config.enable_caching:
-            self.cache[cache_key] = (result, time.time())
+            self.cache[cache_key] = (result, sim_time())
 
         return result
 
@@ -291,21 +325,7 @@ class AStarAlgorithm(PathfindingAlgorithm):
         if (x < 0 or x >= len(game_map[0]) or y < 0 or y >= len(game_map)):
             return False
 
-        tile = game_map[y][x]
-
-        # 检查瓦片类型是否可通行
-        if tile.type not in [TileType.GROUND, TileType.ROOM, TileType.GOLD_VEIN] and not tile.is_dug:
-            return False
-
-        # 检查是否有建筑阻挡（建造中的建筑不阻挡）
-        if hasattr(tile, 'building') and tile.building:
-            building = tile.building
-            # 只有已完成的建筑才阻挡寻路，建造中的建筑不阻挡
-            from src.entities.building import BuildingStatus
-            if building.status == BuildingStatus.COMPLETED:
-                return False
-
-        return True
+        return is_tile_walkable(game_map[y][x])
 
     def _reconstruct_path(self, came_from: Dict, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
         """重构路径"""
@@ -412,21 +432,7 @@ class DFSAlgorithm(PathfindingAlgorithm):
         if (x < 0 or x >= len(game_map[0]) or y < 0 or y >= len(game_map)):
             return False
 
-        tile = game_map[y][x]
-
-        # 检查瓦片类型是否可通行
-        if tile.type not in [TileType.GROUND, TileType.ROOM, TileType.GOLD_VEIN] and not tile.is_dug:
-            return False
-
-        # 检查是否有建筑阻挡（建造中的建筑不阻挡）
-        if hasattr(tile, 'building') and tile.building:
-            building = tile.building
-            # 只有已完成的建筑才阻挡寻路，建造中的建筑不阻挡
-            from src.entities.building import BuildingStatus
-            if building.status == BuildingStatus.COMPLETED:
-                return False
-
-        return True
+        return is_tile_walkable(game_map[y][x])
 
 
 class NavMeshAlgorithm(PathfindingAlgorithm):
@@ -467,6 +473,92 @@ class NavMeshAlgorithm(PathfindingAlgorithm):
         return result
 
 
+class HPAStarAlgorithm(PathfindingAlgorithm):
+    """HPA*算法实现"""
+
+    def __init__(self, config: PathfindingConfig):
+        super().__init__(config)
+        self.cache: Dict[Tuple, Tuple[PathfindingResult, float]] = {}
+        self.pathfinder = HierarchicalPathfinder(is_tile_walkable)
+        self._cache_version = self.pathfinder.version
+
+    def reset(self):
+        """丢弃路径缓存和抽象图（旧地图的变化监听随旧的分层寻路器一起释放）"""
+        self.cache.clear()
+        self.pathfinder = HierarchicalPathfinder(is_tile_walkable)
+        self._cache_version = self.pathfinder.version
+
+    def find_path(self, start: Tuple[float, float], goal: Tuple[float, float],
+                  game_map: List[List], **kwargs) -> PathfindingResult:
+        """HPA*算法寻路"""
+        start_time = time.time()
+        self.stats['calls'] += 1
+
+        # 同步地图变化，抽象图被重建过时缓存的路径全部作废
+        self.pathfinder.prepare(game_map)
+        if self.pathfinder.version != self._cache_version:
+            self.cache.clear()
+            self._cache_version = self.pathfinder.version
+
+        # 检查缓存
+        cache_key = (start, goal)
+        if self.config.enable_caching and cache_key in self.cache:
+            result, cache_time = self.cache[cache_key]
+            if sim_time() - cache_time < self.config.cache_timeout:
+                self.stats['cache_hits'] += 1
+                return result
+
+        # 转换为瓦片坐标
+        start_tile = (int(start[0] // GameConstants.TILE_SIZE),
+                      int(start[1] // GameConstants.TILE_SIZE))
+        goal_tile = (int(goal[0] // GameConstants.TILE_SIZE),
+                     int(goal[1] // GameConstants.TILE_SIZE))
+
+        # 执行分层搜索
+        path = self.pathfinder.find_path(start_tile, goal_tile, game_map)
+
+        # 转换为像素坐标
+        pixel_path = None
+        if path:
+            pixel_path = []
+            for tile in path:
+                pixel_x = tile[0] * GameConstants.TILE_SIZE + \
+                    GameConstants.TILE_SIZE // 2
+                pixel_y = tile[1] * GameConstants.TILE_SIZE + \
+                    GameConstants.TILE_SIZE // 2
+                pixel_path.append((pixel_x, pixel_y))
+
+        # 创建结果
+        result = PathfindingResult(
+            success=path is not None,
+            path=pixel_path,
+            algorithm="HPA*",
+            time_ms=(time.time() - start_time) * 1000
+        )
+
+        if result.success:
+            self.stats['successes'] += 1
+
+        self.stats['total_time'] += result.time_ms
+
+        # 缓存结果
+        if self.config.enable_caching:
+            self.cache[cache_key] = (result, sim_time())
+
+        return result
+
+    def invalidate_tiles(self, changed_tiles: List[Tuple[int, int]], game_map: List[List] = None):
+        """标记瓦片变化，下次寻路时只重建被触及的簇"""
+        self.pathfinder.invalidate_tiles(changed_tiles, game_map)
+
+    def get_performance_stats(self) -> Dict[str, Any]:
+        """获取性能统计"""
+        return {
+            **super().get_performance_stats(),
+            'hierarchy': self.pathfinder.get_stats()
+        }
+
+
 class UnifiedPathfindingSystem:
     """统一寻路系统"""
 
@@ -476,7 +568,8 @@ class UnifiedPathfindingSystem:
             PathfindingStrategy.B_STAR: BStarAlgorithm(self.config),
             PathfindingStrategy.A_STAR: AStarAlgorithm(self.config),
             PathfindingStrategy.DFS: DFSAlgorithm(self.config),
-            PathfindingStrategy.NAVMESH: NavMeshAlgorithm(self.config)
+            PathfindingStrategy.NAVMESH: NavMeshAlgorithm(self.config),
+            PathfindingStrategy.HPA_STAR: HPAStarAlgorithm(self.config)
         }
         self.global_stats = {
             'total_calls': 0,
@@ -535,7 +628,7 @@ class UnifiedPathfindingSystem:
         elif distance < 500:  # 中等距离
             return PathfindingStrategy.B_STAR
         else:  # 长距离
-            return PathfindingStrategy.NAVMESH
+            return PathfindingStrategy.HPA_STAR
 
     def get_performance_stats(self) -> Dict[str, Any]:
         """获取性能统计"""
@@ -558,6 +651,26 @@ class UnifiedPathfindingSystem:
             if hasattr(algorithm, 'cache'):
                 algorithm.cache.clear()
 
+    def reset(self):
+        """清空路径缓存并丢弃HPA*抽象图，下一次寻路时按当前地图重建"""
+        for algorithm in self.algorithms.values():
+            if isinstance(algorithm, HPAStarAlgorithm):
+                algorithm.reset()
+            elif hasattr(algorithm, 'cache'):
+                algorithm.cache.clear()
+
+    def update_map(self, changed_tiles: List[Tuple[int, int]], game_map: List[List] = None):
+        """
+        地图发生变化时调用
+
+        HPA*只重建被触及的簇，其余算法没有增量结构，直接清空路径缓存
+        """
+        for algorithm in self.algorithms.values():
+            if isinstance(algorithm, HPAStarAlgorithm):
+                algorithm.invalidate_tiles(changed_tiles, game_map)
+            elif hasattr(algorithm, 'cache'):
+                algorithm.cache.clear()
+
     def update_config(self, new_config: PathfindingConfig):
         """更新配置"""
         self.config = new_config
@@ -0,0 +1,310 @@
+"""
+渲染合成器
+把一帧画面拆成按层级排列的命名图层，每层缓存自己的画面，只有失效时才重绘，
+最后只把变化的矩形区域合成到屏幕并通过 pygame.display.update(rects) 提交。
+
+图层分为两类：
+- 世界图层（地形、建筑、单位、特效）：依次绘制到不透明的世界表面上。
+  cached=True 的世界图层（地形）拥有独立缓存，只在相机/缩放变化或被显式失效时重绘，
+  其余世界图层每次世界重建时直接绘制在缓存之上。任一世界图层失效都会重建整个世界表面。
+- 覆盖图层（HUD、模态界面）：各自缓存在透明表面中，重绘后用遮罩求出非透明区域，
+  合成时只贴这些区域，世界没有变化时只有覆盖图层新旧区域需要提交到屏幕。
+
+图层通过签名回调发现变化：签名与上次绘制时不同即视为失效，也可以调用 invalidate 显式失效。
+没有任何图层失效时 compose 不做任何绘制，也不提交屏幕更新，暂停或静止的画面几乎不占用CPU。
+"""
+
+import pygame
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# 图层绘制回调: draw(surface)
+DrawLayerCallback = Callable[[pygame.Surface], None]
+# 图层签名回调: 返回可比较的值，与上次绘制时不同则重绘
+SignatureCallback = Callable[[], Any]
+
+# 覆盖图层的区域数量超过该值时合并为一个包围矩形
+MAX_OVERLAY_REGIONS = 24
+# 脏矩形覆盖面积超过屏幕的该比例时直接整屏提交
+FULL_UPDATE_RATIO = 0.6
+
+
+class RenderLayer:
+    """渲染图层"""
+
+    def __init__(self, name: str, draw: DrawLayerCallback,
+                 signature: Optional[SignatureCallback] = None,
+                 world: bool = True, cached: bool = False):
+        """
+        初始化渲染图层
+
+        Args:
+            name: 图层名称
+            draw: 绘制回调
+            signature: 签名回调，None 时只能通过 invalidate 失效
+            world: 是否为世界图层（否则为覆盖图层）
+            cached: 世界图层是否拥有独立缓存（覆盖图层总是缓存）
+        """
+        self.name = name
+        self.draw = draw
+        self.signature = signature
+        self.world = world
+        self.cached = cached or not world
+        self.visible = True
+
+        self.surface: Optional[pygame.Surface] = None
+        self.regions: List[pygame.Rect] = []
+        self.dirty = True
+        self._last_signature = None
+        self.redraw_count = 0
+
+    def check_dirty(self) -> bool:
+        """比较签名并返回图层是否需要重绘"""
+        if self.signature is not None:
+            current = self.signature()
+            if current != self._last_signature:
+                self._last_signature = current
+                self.dirty = True
+        return self.dirty
+
+
+class RenderCompositor:
+    """渲染合成器 - 分层缓存 + 脏矩形提交"""
+
+    def __init__(self, width: int, height: int,
+                 background_color: Tuple[int, int, int] = (0, 0, 0)):
+        """
+        初始化渲染合成器
+
+        Args:
+            width, height: 画面尺寸
+            background_color: 世界表面的背景色
+        """
+        self.width = width
+        self.height = height
+        self.background_color = background_color
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+
+        self.layers: List[RenderLayer] = []
+        self._layers_by_name: Dict[str, RenderLayer] = {}
+        self._world_surface: Optional[pygame.Surface] = None
+        self._full_redraw = True
+
+        # 统计信息
+        self.stats = {
+            'frames': 0,
+            'idle_frames': 0,
+            'world_rebuilds': 0,
+            'overlay_redraws': 0,
+            'partial_updates': 0,
+            'full_updates': 0,
+        }
+
+    # ==================== 图层管理 ====================
+
+    def add_world_layer(self, name: str, draw: DrawLayerCallback,
+                        signature: Optional[SignatureCallback] = None,
+                        cached: bool = False) -> RenderLayer:
+        """添加世界图层（必须在所有覆盖图层之前添加）"""
+        if any(not layer.world for layer in self.layers):
+            raise ValueError(f"世界图层 {name} 必须添加在覆盖图层之前")
+        return self._add_layer(RenderLayer(name, draw, signature, world=True, cached=cached))
+
+    def add_overlay_layer(self, name: str, draw: DrawLayerCallback,
+                          signature: Optional[SignatureCallback] = None) -> RenderLayer:
+        """添加覆盖图层（缓存在透明表面中）"""
+        return self._add_layer(RenderLayer(name, draw, signature, world=False))
+
+    def _add_layer(self, layer: RenderLayer) -> RenderLayer:
+        if layer.name in self._layers_by_name:
+            raise ValueError(f"图层 {layer.name} 已存在")
+        self.layers.append(layer)
+        self._layers_by_name[layer.name] = layer
+        return layer
+
+    def get_layer(self, name: str) -> Optional[RenderLayer]:
+        """按名称获取图层"""
+        return self._layers_by_name.get(name)
+
+    def invalidate(self, *names: str):
+        """使指定图层失效，不指定名称时使所有图层失效并整屏提交"""
+        if not names:
+            for layer in self.layers:
+                layer.dirty = True
+            self._full_redraw = True
+            return
+        for name in names:
+            layer = self._layers_by_name.get(name)
+            if layer is not None:
+                layer.dirty = True
+
+    def set_visible(self, name: str, visible: bool):
+        """显示/隐藏图层"""
+        layer = self._layers_by_name.get(name)
+        if layer is not None and layer.visible != visible:
+            layer.visible = visible
+            layer.dirty = True
+
+    def resize(self, width: int, height: int):
+        """画面尺寸变化时丢弃所有缓存表面"""
+        self.width, self.height = width, height
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self._world_surface = None
+        for layer in self.layers:
+            layer.surface = None
+            layer.regions = []
+        self.invalidate()
+
+    # ==================== 合成 ====================
+
+    def compose(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """
+        重绘失效的图层，把变化区域合成到屏幕
+
+        Args:
+            screen: 显示表面
+
+        Returns:
+            List[pygame.Rect]: 本帧变化的屏幕区域（空列表表示画面没有变化）
+        """
+        self.stats['frames'] += 1
+        world_layers = [layer for layer in self.layers if layer.world]
+        overlay_layers = [layer for layer in self.layers if not layer.world]
+
+        # 每个图层都要比较签名，保证签名状态与本帧一致
+        world_dirty = False
+        for layer in world_layers:
+            world_dirty = layer.check_dirty() or world_dirty
+        world_dirty = world_dirty or self._world_surface is None
+
+        dirty_rects: List[pygame.Rect] = []
+        if world_dirty or self._full_redraw:
+            self._rebuild_world(world_layers)
+            dirty_rects.append(self.screen_rect.copy())
+
+        for layer in overlay_layers:
+            if layer.check_dirty() or layer.surface is None:
+                dirty_rects.extend(layer.regions)
+                self._redraw_overlay(layer)
+                dirty_rects.extend(layer.regions)
+
+        if not dirty_rects:
+            self.stats['idle_frames'] += 1
+            return []
+
+        dirty_rects = self._merge_rects(dirty_rects)
+        full = self._full_redraw or self._covers_screen(dirty_rects)
+        if full:
+            dirty_rects = [self.screen_rect.copy()]
+
+        world_surface = self._world_surface
+        for rect in dirty_rects:
+            screen.blit(world_surface, rect.topleft, rect)
+            for layer in overlay_layers:
+                if not layer.visible:
+                    continue
+                for region in layer.regions:
+                    clipped = region.clip(rect)
+                    if clipped.width > 0 and clipped.height > 0:
+                        screen.blit(layer.surface, clipped.topleft, clipped)
+
+        self._full_redraw = False
+        self.stats['full_updates' if full else 'partial_updates'] += 1
+        return dirty_rects
+
+    def present(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """合成并把变化区域提交到显示器"""
+        rects = self.compose(screen)
+        if not rects:
+            return rects
+        if len(rects) == 1 and rects[0] == self.screen_rect:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        return rects
+
+    def _rebuild_world(self, world_layers: List[RenderLayer]):
+        """重建世界表面：缓存图层按需重绘后贴上，直接图层依次绘制"""
+        if self._world_surface is None:
+            self._world_surface = self._new_surface(alpha=False)
+        world_surface = self._world_surface
+        world_surface.fill(self.background_color)
+
+        base_done = False
+        for layer in world_layers:
+            if not layer.visible:
+                layer.dirty = False
+                continue
+            if layer.cached:
+                if layer.dirty or layer.surface is None:
+                    # 最底层的缓存图层不透明，其余缓存图层透明
+                    if layer.surface is None:
+                        layer.surface = self._new_surface(alpha=base_done)
+                    layer.surface.fill((0, 0, 0, 0) if base_done else self.background_color)
+                    layer.draw(layer.surface)
+                    layer.redraw_count += 1
+                world_surface.blit(layer.surface, (0, 0))
+            else:
+                layer.draw(world_surface)
+                layer.redraw_count += 1
+            layer.dirty = False
+            base_done = True
+        self.stats['world_rebuilds'] += 1
+
+    def _redraw_overlay(self, layer: RenderLayer):
+        """重绘覆盖图层并求出非透明区域"""
+        if layer.surface is None:
+            layer.surface = self._new_surface(alpha=True)
+        surface = layer.surface
+        surface.fill((0, 0, 0, 0))
+        layer.dirty = False
+        if not layer.visible:
+            layer.regions = []
+            return
+
+        layer.draw(surface)
+        layer.redraw_count += 1
+        self.stats['overlay_redraws'] += 1
+
+        regions = pygame.mask.from_surface(surface).get_bounding_rects()
+        if len(regions) > MAX_OVERLAY_REGIONS:
+            regions = [regions[0].unionall(regions[1:])]
+        layer.regions = regions
+
+    # ==================== 工具 ====================
+
+    def _new_surface(self, alpha: bool) -> pygame.Surface:
+        size = (self.width, self.height)
+        if alpha:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        return surface
+
+    def _merge_rects(self, rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """裁剪到屏幕内并合并相互重叠的矩形"""
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            # 与已有矩形重叠时合并，合并后可能与更多矩形重叠，继续检查
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def _covers_screen(self, rects: List[pygame.Rect]) -> bool:
+        area = sum(rect.width * rect.height for rect in rects)
+        return area >= self.width * self.height * FULL_UPDATE_RATIO
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            **self.stats,
+            'redraws': {layer.name: layer.redraw_count for layer in self.layers},
+        }
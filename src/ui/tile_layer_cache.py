@@ -0,0 +1,226 @@
+"""
+瓦片图层缓存
+把地图的静态部分预渲染到分块 Surface 中，每帧只重绘被标记为脏的瓦片，
+然后按相机位置把可见分块贴到屏幕上，替代逐瓦片的 pygame.draw 调用。
+
+地图按 chunk_tiles × chunk_tiles 瓦片分块并按需创建，超过 max_chunks 时淘汰最久未使用的分块，
+因此大地图在高缩放倍数下也不会一次性分配整张地图大小的 Surface。
+"""
+
+import pygame
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+
+# 绘制回调: draw_tile(surface, tile_x, tile_y, surface_x, surface_y, scaled_tile_size)
+# 返回值为瓦片的渲染签名 - 非 None 时该瓦片会被记录为"动态瓦片"，
+# 调用方每帧比较签名来发现无需显式标记的变化（如金矿储量减少、建筑被摧毁）
+DrawTileCallback = Callable[[pygame.Surface, int, int, int, int, int], Optional[Any]]
+
+
+class TileLayerCache:
+    """瓦片图层缓存 - 分块预渲染 + 脏瓦片重绘"""
+
+    def __init__(self, map_width: int, map_height: int, tile_size: int,
+                 background_color: Tuple[int, int, int] = (0, 0, 0),
+                 chunk_tiles: int = 16, max_chunks: int = 128):
+        """
+        初始化瓦片图层缓存
+
+        Args:
+            map_width, map_height: 地图尺寸（瓦片）
+            tile_size: 瓦片大小（像素，未缩放）
+            background_color: 重绘瓦片前填充的背景色
+            chunk_tiles: 每个分块的边长（瓦片）
+            max_chunks: 最多保留的分块数量
+        """
+        self.map_width = map_width
+        self.map_height = map_height
+        self.tile_size = tile_size
+        self.background_color = background_color
+        self.chunk_tiles = chunk_tiles
+        self.max_chunks = max_chunks
+
+        self.ui_scale: Optional[float] = None
+        self.scaled_tile_size = tile_size
+        self._chunks: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+        self._dirty_tiles: Set[Tuple[int, int]] = set()
+        # 内容版本号 - 每次标记失效时递增，外层图层缓存据此判断是否需要重新贴图
+        self.revision = 0
+
+        # 动态瓦片按分块分桶: 分块 -> {(x, y) -> 渲染签名}，分块被淘汰时整桶丢弃
+        self._dynamic_by_chunk: Dict[Tuple[int, int], Dict[Tuple[int, int], Any]] = {}
+
+        # 统计信息
+        self.chunks_built = 0
+        self.tiles_redrawn = 0
+
+    # ==================== 失效管理 ====================
+
+    def mark_dirty(self, x: int, y: int):
+        """标记单个瓦片需要重绘"""
+        if 0 <= x < self.map_width and 0 <= y < self.map_height:
+            self._dirty_tiles.add((x, y))
+            self.revision += 1
+
+    def mark_all_dirty(self):
+        """使整个缓存失效（地图被整体替换时调用）"""
+        self._chunks.clear()
+        self._dirty_tiles.clear()
+        self._dynamic_by_chunk.clear()
+        self.revision += 1
+
+    def set_ui_scale(self, ui_scale: float):
+        """设置缩放倍数，变化时丢弃所有分块"""
+        if ui_scale != self.ui_scale:
+            self.ui_scale = ui_scale
+            self.scaled_tile_size = int(self.tile_size * ui_scale)
+            self.mark_all_dirty()
+
+    # ==================== 坐标换算 ====================
+
+    def tile_pixel(self, index: int) -> int:
+        """瓦片索引 -> 缩放后的世界像素坐标（与逐瓦片渲染的取整方式一致）"""
+        return int(index * self.tile_size * self.ui_scale)
+
+    def get_visible_tile_range(self, camera_x: float, camera_y: float,
+                               view_width: int, view_height: int) -> Tuple[int, int, int, int]:
+        """获取可见瓦片范围 (x0, y0, x1, y1)，x1/y1 不包含"""
+        world_tile = self.tile_size * self.ui_scale
+        x0 = max(0, int(camera_x / self.tile_size) - 1)
+        y0 = max(0, int(camera_y / self.tile_size) - 1)
+        x1 = min(self.map_width, int((camera_x * self.ui_scale + view_width) / world_tile) + 2)
+        y1 = min(self.map_height, int((camera_y * self.ui_scale + view_height) / world_tile) + 2)
+        return x0, y0, x1, y1
+
+    def iter_visible_dynamic_tiles(self, visible_range: Tuple[int, int, int, int]) -> Iterator[Tuple[int, int, Any]]:
+        """遍历可见范围内的动态瓦片 (x, y, 签名) - 只查看可见分块的桶"""
+        x0, y0, x1, y1 = visible_range
+        if x0 >= x1 or y0 >= y1:
+            return
+        chunk_tiles = self.chunk_tiles
+        for cy in range(y0 // chunk_tiles, (y1 - 1) // chunk_tiles + 1):
+            for cx in range(x0 // chunk_tiles, (x1 - 1) // chunk_tiles + 1):
+                bucket = self._dynamic_by_chunk.get((cx, cy))
+                if not bucket:
+                    continue
+                # 调用方可能在遍历中重绘瓦片，先取快照
+                for (x, y), signature in list(bucket.items()):
+                    if x0 <= x < x1 and y0 <= y < y1:
+                        yield x, y, signature
+
+    # ==================== 渲染 ====================
+
+    def render(self, screen: pygame.Surface, camera_x: float, camera_y: float,
+               draw_tile: DrawTileCallback,
+               visible_range: Tuple[int, int, int, int] = None) -> Tuple[int, int, int, int]:
+        """
+        把可见区域的缓存贴到屏幕上
+
+        Args:
+            screen: 目标屏幕
+            camera_x, camera_y: 相机位置（世界像素，未缩放）
+            draw_tile: 瓦片绘制回调
+            visible_range: 可见瓦片范围，None 时按屏幕尺寸计算
+
+        Returns:
+            Tuple: 本帧的可见瓦片范围
+        """
+        if visible_range is None:
+            visible_range = self.get_visible_tile_range(
+                camera_x, camera_y, screen.get_width(), screen.get_height())
+
+        self._flush_dirty_tiles(draw_tile)
+
+        x0, y0, x1, y1 = visible_range
+        if x0 >= x1 or y0 >= y1:
+            return visible_range
+
+        chunk_tiles = self.chunk_tiles
+        offset_x = int(camera_x * self.ui_scale)
+        offset_y = int(camera_y * self.ui_scale)
+        blits = []
+        for cy in range(y0 // chunk_tiles, (y1 - 1) // chunk_tiles + 1):
+            for cx in range(x0 // chunk_tiles, (x1 - 1) // chunk_tiles + 1):
+                chunk = self._get_chunk(cx, cy, draw_tile)
+                blits.append((chunk, (self.tile_pixel(cx * chunk_tiles) - offset_x,
+                                      self.tile_pixel(cy * chunk_tiles) - offset_y)))
+        screen.blits(blits, doreturn=False)
+        return visible_range
+
+    def redraw_tile(self, x: int, y: int, draw_tile: DrawTileCallback):
+        """立即重绘单个瓦片（所在分块不存在时等分块创建时再绘制）"""
+        key = (x // self.chunk_tiles, y // self.chunk_tiles)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._draw_tile_into_chunk(chunk, key, x, y, draw_tile)
+
+    def _flush_dirty_tiles(self, draw_tile: DrawTileCallback):
+        if not self._dirty_tiles:
+            return
+        for x, y in self._dirty_tiles:
+            self.redraw_tile(x, y, draw_tile)
+        self._dirty_tiles.clear()
+
+    def _get_chunk(self, cx: int, cy: int, draw_tile: DrawTileCallback) -> pygame.Surface:
+        key = (cx, cy)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        chunk_tiles = self.chunk_tiles
+        start_x, start_y = cx * chunk_tiles, cy * chunk_tiles
+        end_x = min(self.map_width, start_x + chunk_tiles)
+        end_y = min(self.map_height, start_y + chunk_tiles)
+
+        # 分块尺寸按相邻分块起点计算，保证分块之间没有缝隙也不重叠
+        width = self.tile_pixel(end_x) - self.tile_pixel(start_x)
+        height = self.tile_pixel(end_y) - self.tile_pixel(start_y)
+        chunk = pygame.Surface((max(1, width), max(1, height)))
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        chunk.fill(self.background_color)
+
+        for y in range(start_y, end_y):
+            for x in range(start_x, end_x):
+                self._draw_tile_into_chunk(chunk, key, x, y, draw_tile)
+
+        self._chunks[key] = chunk
+        self.chunks_built += 1
+        while len(self._chunks) > self.max_chunks:
+            evicted_key, _ = self._chunks.popitem(last=False)
+            self._dynamic_by_chunk.pop(evicted_key, None)
+        return chunk
+
+    def _draw_tile_into_chunk(self, chunk: pygame.Surface, key: Tuple[int, int],
+                              x: int, y: int, draw_tile: DrawTileCallback):
+        size = self.scaled_tile_size
+        local_x = self.tile_pixel(x) - self.tile_pixel(key[0] * self.chunk_tiles)
+        local_y = self.tile_pixel(y) - self.tile_pixel(key[1] * self.chunk_tiles)
+
+        # 先清除旧内容，瓦片绘制只能影响自己的区域
+        chunk.set_clip(pygame.Rect(local_x, local_y, size, size))
+        chunk.fill(self.background_color, (local_x, local_y, size, size))
+        signature = draw_tile(chunk, x, y, local_x, local_y, size)
+        chunk.set_clip(None)
+        self.tiles_redrawn += 1
+
+        if signature is None:
+            bucket = self._dynamic_by_chunk.get(key)
+            if bucket is not None:
+                bucket.pop((x, y), None)
+                if not bucket:
+                    del self._dynamic_by_chunk[key]
+        else:
+            self._dynamic_by_chunk.setdefault(key, {})[(x, y)] = signature
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计信息"""
+        return {
+            'chunks': len(self._chunks),
+            'chunks_built': self.chunks_built,
+            'tiles_redrawn': self.tiles_redrawn,
+            'dynamic_tiles': sum(len(bucket) for bucket in self._dynamic_by_chunk.values()),
+            'pending_dirty': len(self._dirty_tiles),
+        }
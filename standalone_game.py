@@ -23,17 +23,23 @@ try:
     from src.systems.placement_system import PlacementSystem
     from src.effects.effect_manager import EffectManager
     from src.systems.physics_system import PhysicsSystem
+    from src.systems.spatial_index import WorldSpatialIndex
     from src.systems.knockback_animation import KnockbackAnimation
     from src.systems.unified_pathfinding import PathfindingConfig
     from src.systems.reachability_system import get_reachability_system
     from src.managers.resource_manager import get_resource_manager
+    from src.managers.economy_ledger import RESOURCE_GOLD
+    from src.managers.hero_wave_spawner import HeroWaveSpawner
     from src.effects.glow_effect import get_glow_manager
     from src.ui.character_bestiary import CharacterBestiary
     from src.ui.status_indicator import StatusIndicator
+    from src.ui.tile_layer_cache import TileLayerCache
+    from src.ui.render_compositor import RenderCompositor
     from src.ui.building_ui import BuildingUI
     from src.core.constants import GameConstants, GameBalance
     from src.core.enums import TileType, BuildMode
     from src.core.game_state import Tile, GameState
+    from src.core.map_grid import MapGrid
     from src.core import emoji_constants
     from src.entities.configs import CreatureConfig, HeroConfig
     from src.entities.character_data import character_db
@@ -50,6 +56,7 @@ try:
     from src.ui.logistics_selection import LogisticsSelectionUI
     from src.entities.monster.goblin_engineer import EngineerRegistry
     from src.utils.logger import game_logger
+    from src.core.sim_clock import SimClock, set_sim_clock, sim_time
 except ImportError as e:
     from src.utils.logger import game_logger
     game_logger.error(f"❌ 系统导入失败: {e}")
@@ -80,7 +87,7 @@ class IdleStateManager:
     def register_idle_unit(self, unit):
         """注册进入空闲状态的单位"""
         unit_id = id(unit)
-        current_time = time.time()
+        current_time = sim_time()
 
         # 如果单位已经在空闲列表中，更新开始时间
         if unit_id in self.idle_units:
@@ -104,7 +111,7 @@ class IdleStateManager:
 
     def update_idle_units(self, delta_seconds: float):
         """更新所有空闲状态的单位"""
-        current_time = time.time()
+        current_time = sim_time()
         units_to_remove = []
 
         for unit_id, unit_data in self.idle_units.items():
@@ -197,6 +204,10 @@ class WarForTheOverworldGame:
             f"{emoji_manager.ROCKET} War for the Overworld - Python独立版本")
         game_logger.info("=" * 60)
 
+        # 模拟时钟 - 必须在创建任何游戏对象之前安装，所有系统的计时都读取它
+        self.sim_clock = SimClock()
+        set_sim_clock(self.sim_clock)
+
         # 初始化pygame
         self.screen = pygame.display.set_mode(
             (GameConstants.WINDOW_WIDTH, GameConstants.WINDOW_HEIGHT))
@@ -233,6 +244,10 @@ class WarForTheOverworldGame:
         self.physics_system = PhysicsSystem(
             world_bounds, GameConstants.TILE_SIZE)
 
+        # 世界空间索引 - 战斗、防御塔、技能和范围伤害共享的增量网格
+        self.spatial_index = WorldSpatialIndex()
+        self.effect_manager.set_spatial_index(self.spatial_index)
+
         # 初始化击退动画系统
         self.knockback_animation = KnockbackAnimation()
 
@@ -248,6 +263,14 @@ class WarForTheOverworldGame:
         self.tile_size = GameConstants.TILE_SIZE
         self.game_map = self._initialize_map()
 
+        # 英雄波次刷新器 - 按模拟时间调度入侵，与帧率无关；基地附近的刷新格子随挖掘失效
+        self.hero_wave_spawner = HeroWaveSpawner(list(character_db.get_all_heroes().keys()))
+        self.hero_wave_spawner.set_bases(self.hero_bases, self.game_map)
+
+        # 瓦片图层缓存 - 静态地图预渲染，只重绘脏瓦片
+        self.map_layer_cache = TileLayerCache(
+            self.map_width, self.map_height, self.tile_size, GameConstants.COLORS['background'])
+
         # 初始化统一寻路系统
         # 初始化统一寻路系统
         unified_success = MovementSystem.initialize_unified_pathfinding(
@@ -262,6 +285,9 @@ class WarForTheOverworldGame:
         if unified_success:
             game_logger.info("🚀 统一寻路系统初始化成功")
 
+        # 分时寻路 - A*请求排队，每帧在预算内推进
+        MovementSystem.enable_async_pathfinding(True)
+
         # 初始化高级寻路系统（NavMesh）作为备用
         navmesh_success = MovementSystem.initialize_advanced_pathfinding(
             self.game_map, self.map_width, self.map_height)
@@ -294,6 +320,7 @@ class WarForTheOverworldGame:
         # 时间系统
         self.last_time = time.time()
         self.running = True
+        self.paused = False
 
         # 调试模式
         self.debug_mode = False
@@ -343,7 +370,7 @@ class WarForTheOverworldGame:
         # 添加待处理的地牢之心到建筑管理器
         if hasattr(self, '_pending_dungeon_heart') and self._pending_dungeon_heart:
             self.dungeon_heart = self._pending_dungeon_heart  # 设置地牢之心引用
-            self.building_manager.buildings.append(
+            self.building_manager.add_building(
                 self._pending_dungeon_heart)
             game_logger.info(f"✅ 地牢之心已添加到建筑管理器")
 
@@ -368,6 +395,11 @@ class WarForTheOverworldGame:
         self.placement_system = PlacementSystem(self)
         game_logger.info("🎯 统一放置系统已初始化")
 
+        # 渲染合成器 - 按图层缓存画面，只提交变化区域
+        self.render_compositor = RenderCompositor(
+            GameConstants.WINDOW_WIDTH, GameConstants.WINDOW_HEIGHT, GameConstants.COLORS['background'])
+        self._setup_render_layers()
+
         game_logger.info(f"{emoji_manager.CHECK} 游戏初始化完成")
 
         # 游戏初始化完成后，启用接壤金矿脉日志输出
@@ -431,6 +463,9 @@ class WarForTheOverworldGame:
                     )
                     if result.success:
                         game_logger.info(f"✅ {result.message}")
+                        # 建筑瓦片已放置，重绘缓存中的该瓦片
+                        self.map_layer_cache.mark_dirty(
+                            self.mouse_world_x, self.mouse_world_y)
                         # 清空选择
                         self.selected_building_type = None
                         self.build_mode = BuildMode.NONE
@@ -454,6 +489,9 @@ class WarForTheOverworldGame:
             tile, x, y, cost=10, game_state=self.game_state)
 
         if result['success']:
+            # 瓦片外观已改变，重绘缓存中的该瓦片
+            self.map_layer_cache.mark_dirty(x, y)
+
             if result['gold_discovered'] > 0:
                 # 发现金矿脉
                 game_logger.info(f"{emoji_manager.MONEY} {result['message']}")
@@ -635,20 +673,13 @@ class WarForTheOverworldGame:
 
     def _initialize_map(self) -> List[List[Tile]]:
         """初始化地图"""
-        game_map = []
-        for y in range(self.map_height):
-            row = []
-            for x in range(self.map_width):
-                # 随机生成金矿 - 根据文档要求8%概率，每个矿脉500单位原始黄金
-                is_gold = random.random() < 0.08
-                gold_amount = 500 if is_gold else 0
-                tile = Tile(
-                    TileType.ROCK,
-                    is_gold_vein=is_gold,
-                    gold_amount=gold_amount
-                )
-                row.append(tile)
-            game_map.append(row)
+        # 结构数组地图：瓦块属性存放在数组中，game_map[y][x] 返回轻量视图
+        game_map = MapGrid(self.map_width, self.map_height, TileType.ROCK)
+        for i in range(game_map.size):
+            # 随机生成金矿 - 根据文档要求8%概率，每个矿脉500单位原始黄金
+            if random.random() < 0.08:
+                game_map.is_gold_vein[i] = True
+                game_map.gold_amount[i] = 500
 
         # 创建起始区域 - 在地图中央挖掘一个8x8的区域
         center_x = self.map_width // 2
@@ -1037,6 +1068,8 @@ class WarForTheOverworldGame:
             if hasattr(creature, 'bound_lair') and creature.bound_lair:
                 creature.bound_lair.on_bound_monster_died()
                 game_logger.info(f"🔓 通知巢穴：{creature.type} 已死亡，解除绑定")
+            # 清理移动状态和排队中的寻路任务
+            MovementSystem.clear_unit_state(creature)
             self.monsters.remove(creature)
             game_logger.info(f"💀 {creature.type} 死亡并被移除")
 
@@ -1048,50 +1081,23 @@ class WarForTheOverworldGame:
                 if hero.melee_target.melee_target == hero:
                     hero.melee_target.melee_target = None
                 hero.melee_target = None
+            MovementSystem.clear_unit_state(hero)
             self.heroes.remove(hero)
             game_logger.info(f"💀 {hero.type} 死亡并被移除")
 
-    def _spawn_hero(self):
-        """生成英雄 - 在英雄基地附近刷新"""
-        if random.random() < GameBalance.hero_spawn_rate:
-            if not self.hero_bases:
-                game_logger.info("❌ 没有英雄基地，无法生成英雄")
-                return
-
-            # 随机选择一个英雄基地
-            base_x, base_y, direction = random.choice(self.hero_bases)
-
-            # 在基地附近的已挖掘区域生成英雄
-            spawn_positions = []
-            for dy in range(-2, 3):
-                for dx in range(-2, 3):
-                    x = base_x + dx
-                    y = base_y + dy
-                    if (0 <= x < self.map_width and 0 <= y < self.map_height):
-                        tile = self.game_map[y][x]
-                        if tile.type == TileType.GROUND or tile.is_dug:
-                            spawn_positions.append((x, y))
-
-            if spawn_positions:
-                # 随机选择一个生成位置
-                spawn_x, spawn_y = random.choice(spawn_positions)
-
-                # 随机选择英雄类型
-                available_heroes = list(
-                    character_db.get_all_heroes().keys())
-                hero_type = random.choice(available_heroes)
-                hero_data = character_db.get_character(hero_type)
-                hero_name = hero_data.name if hero_data else hero_type
-
-                hero = Hero(spawn_x * self.tile_size + self.tile_size // 2,
-                            spawn_y * self.tile_size + self.tile_size // 2, hero_type)
-                # 设置游戏实例引用，用于触发攻击响应
-                hero.game_instance = self
-                self.heroes.append(hero)
-                game_logger.info(
-                    f"{emoji_manager.COMBAT} {hero_name}从基地 ({base_x}, {base_y}) 入侵！")
-            else:
-                game_logger.info("❌ 英雄基地附近没有可用的生成位置")
+    def _spawn_hero(self, delta_seconds: float):
+        """生成英雄 - 刷新器按模拟时间调度波次，在英雄基地附近批量刷新"""
+        for spawn in self.hero_wave_spawner.update(delta_seconds, self.game_map):
+            hero_data = character_db.get_character(spawn.hero_type)
+            hero_name = hero_data.name if hero_data else spawn.hero_type
+
+            hero = Hero(spawn.tile_x * self.tile_size + self.tile_size // 2,
+                        spawn.tile_y * self.tile_size + self.tile_size // 2, spawn.hero_type)
+            # 设置游戏实例引用，用于触发攻击响应
+            hero.game_instance = self
+            self.heroes.append(hero)
+            game_logger.info(
+                f"{emoji_manager.COMBAT} {hero_name}从基地 ({spawn.base[0]}, {spawn.base[1]}) 入侵！")
 
     def update(self, delta_time: float):
         """
@@ -1103,6 +1109,9 @@ class WarForTheOverworldGame:
         # 将毫秒转换为秒，供需要秒为单位的子系统使用
         delta_seconds = delta_time / 1000.0
 
+        # 推进模拟时钟，本帧内所有系统读取同一时间
+        self.sim_clock.advance(delta_seconds)
+
         # 更新生物（期望秒）
         for creature in self.monsters[:]:
             creature.update(delta_seconds, self.game_map,
@@ -1113,10 +1122,19 @@ class WarForTheOverworldGame:
             hero.update(delta_seconds, self.monsters,
                         self.game_map, self.effect_manager)
 
-        # 更新特效系统（期望毫秒）
+        # 推进分时寻路队列（本帧提交的寻路请求在预算内继续搜索）
+        MovementSystem.process_pathfinding_queue()
+
+        # 同步世界空间索引 - 单位移动完成后每帧增量同步一次，供特效、战斗、防御塔查询
+        if self.spatial_index:
+            self.spatial_index.sync_game(self)
+
+        # 更新特效系统（期望毫秒）- 接入空间索引后碰撞只查询附近格子，无需拼接全部单位
         if self.effect_manager:
-            all_targets = self.monsters + self.heroes
-            self.effect_manager.update(delta_time, all_targets)
+            if self.spatial_index:
+                self.effect_manager.update(delta_time)
+            else:
+                self.effect_manager.update(delta_time, self.monsters + self.heroes)
 
         # 更新物理系统
         if self.physics_system:
@@ -1167,36 +1185,194 @@ class WarForTheOverworldGame:
         self._cleanup_dead_units()
 
         # 生成英雄
-        self._spawn_hero()
+        self._spawn_hero(delta_seconds)
 
         # 资源生成 - 使用累积器确保整数
-        treasury_count = sum(1 for row in self.game_map for tile in row
-                             if tile.room == 'treasury')
+        # 金库数量直接读取经济账本（建成时注册、摧毁时注销），不再每帧扫描地图
+        resource_manager = get_resource_manager(self)
+        treasury_count = resource_manager.ledger.count_sources(
+            RESOURCE_GOLD, BuildingType.TREASURY)
 
         # 黄金累积 - 使用ResourceManager
         self.gold_accumulator += treasury_count * \
             GameBalance.gold_per_second_per_treasury * delta_time * 0.001
         if self.gold_accumulator >= 1.0:
             gold_to_add = int(self.gold_accumulator)
-            resource_manager = get_resource_manager(self)
             resource_manager.add_gold(gold_to_add, self.dungeon_heart)
             self.gold_accumulator -= gold_to_add
 
         # 法力增长现在由地牢之心处理，不再在主循环中处理
 
     def render(self):
-        """渲染游戏"""
-        # 清空屏幕
-        self.screen.fill(GameConstants.COLORS['background'])
-
+        """渲染游戏 - 渲染合成器只重绘失效的图层，只向显示器提交变化的区域"""
         # 处理待重新渲染的建筑
         if self._pending_rerender:
             self._force_rerender_buildings()
             self._pending_rerender = False
 
-        # 渲染地图
-        self._render_map()
+        # 模拟推进或视角变化后检查动态瓦片，签名变化的瓦片标记为脏，地形图层随之失效
+        view = (self.sim_clock.tick_count, self._terrain_signature())
+        if view != self._last_dynamic_tile_view:
+            self._last_dynamic_tile_view = view
+            self._check_dynamic_tiles()
+
+        self.render_compositor.present(self.screen)
+
+    # ==================== 渲染图层 ====================
+
+    def _setup_render_layers(self):
+        """注册渲染图层（从下到上）"""
+        self._last_dynamic_tile_view = None
+        compositor = self.render_compositor
+
+        # 世界图层 - 地形有独立缓存，建筑（含血条、状态条）、单位和特效在模拟推进时重绘
+        compositor.add_world_layer(
+            'terrain', lambda surface: self._draw_layer(surface, self._render_terrain, world=True),
+            self._terrain_signature, cached=True)
+        compositor.add_world_layer(
+            'buildings', lambda surface: self._draw_layer(surface, self._render_building_tiles, world=True),
+            self._world_signature)
+        compositor.add_world_layer(
+            'units', lambda surface: self._draw_layer(surface, self._render_units, world=True),
+            self._world_signature)
+        compositor.add_world_layer(
+            'effects', lambda surface: self._draw_layer(surface, self._render_effects, world=True),
+            self._world_signature)
+
+        # 覆盖图层 - 不受屏幕震动影响，只在显示内容变化时重绘
+        compositor.add_overlay_layer(
+            'hud', lambda surface: self._draw_layer(surface, self._render_hud),
+            self._hud_signature)
+        compositor.add_overlay_layer(
+            'modal', lambda surface: self._draw_layer(surface, self._render_modal_ui),
+            self._modal_signature)
+
+    def _draw_layer(self, surface, render, world: bool = False):
+        """
+        把渲染目标临时切换到图层表面后执行渲染函数
+
+        Args:
+            surface: 图层表面
+            render: 渲染函数（绘制到 self.screen）
+            world: 是否为世界图层，世界图层渲染时相机加上屏幕震动偏移
+        """
+        screen = self.screen
+        shake_x, shake_y = self._get_shake_offset() if world else (0, 0)
+        self.screen = surface
+        self.game_ui.screen = surface
+        self.camera_x += shake_x
+        self.camera_y += shake_y
+        try:
+            render()
+        finally:
+            self.camera_x -= shake_x
+            self.camera_y -= shake_y
+            self.screen = screen
+            self.game_ui.screen = screen
+
+    def _get_shake_offset(self) -> Tuple[int, int]:
+        """获取屏幕震动的相机偏移"""
+        return self.effect_manager.get_shake_offset() if self.effect_manager else (0, 0)
+
+    def _terrain_signature(self):
+        """地形图层签名 - 世界相机位置、缩放倍数和瓦片缓存版本"""
+        shake_x, shake_y = self._get_shake_offset()
+        return (self.camera_x + shake_x, self.camera_y + shake_y, self.ui_scale,
+                self.map_layer_cache.revision)
+
+    def _world_signature(self):
+        """建筑/单位/特效图层签名 - 模拟推进或视角变化时重绘"""
+        return (self.sim_clock.tick_count, self._terrain_signature())
+
+    def _get_resource_signature(self):
+        """界面显示的资源数量"""
+        resource_manager = get_resource_manager(self)
+        return (int(resource_manager.get_total_gold().total),
+                int(resource_manager.get_total_mana().total))
+
+    def _hud_signature(self):
+        """HUD图层签名 - 资源、模式、鼠标位置、相机等界面显示的状态"""
+        signature = (self._get_resource_signature(), len(self.monsters), int(self.game_state.score),
+                     self.game_state.wave_number, self.build_mode, self.mouse_world_x, self.mouse_world_y,
+                     self.camera_x, self.camera_y, self.ui_scale, self.paused, self.debug_mode)
+        # 放置高亮依赖地图占用情况，调试面板显示实时数据，模拟推进时持续刷新
+        if self.build_mode != BuildMode.NONE or self.debug_mode:
+            signature += (self.sim_clock.tick_count,)
+        return signature
+
+    def _modal_signature(self):
+        """模态界面图层签名 - 界面开关，打开时还包括鼠标悬停位置和资源数量"""
+        visibility = (self.monster_selection_ui.is_visible,
+                      self.logistics_selection_ui.is_visible,
+                      bool(self.bestiary and self.bestiary.is_open),
+                      bool(self.building_ui and self.building_ui.show_building_panel),
+                      bool(self.building_ui and self.building_ui.show_statistics_panel))
+        if not any(visibility):
+            return visibility, self.ui_scale
+        signature = (visibility, self.ui_scale, pygame.mouse.get_pos(),
+                     self._get_resource_signature(), len(self.monsters))
+        # 统计面板显示实时的建筑数据
+        if visibility[4]:
+            signature += (self.sim_clock.tick_count,)
+        return signature
+
+    def _invalidate_render_layers(self, event):
+        """根据输入事件使渲染图层失效（界面的滚动、选中等内部状态不在签名中）"""
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.render_compositor.invalidate()
+        elif event.type in (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+                            pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL):
+            self.render_compositor.invalidate('hud', 'modal')
+
+    def _get_visible_tile_range(self):
+        """当前相机下的可见瓦片范围"""
+        cache = self.map_layer_cache
+        cache.set_ui_scale(self.ui_scale)
+        return cache.get_visible_tile_range(
+            self.camera_x, self.camera_y, GameConstants.WINDOW_WIDTH, GameConstants.WINDOW_HEIGHT)
+
+    def _check_dynamic_tiles(self):
+        """动态瓦片（金矿、建筑）的渲染签名变化时重绘，覆盖储量减少、矿脉枯竭、建筑被移除等情况"""
+        shake_x, shake_y = self._get_shake_offset()
+        cache = self.map_layer_cache
+        cache.set_ui_scale(self.ui_scale)
+        visible_range = cache.get_visible_tile_range(
+            self.camera_x + shake_x, self.camera_y + shake_y,
+            GameConstants.WINDOW_WIDTH, GameConstants.WINDOW_HEIGHT)
+        for x, y, signature in cache.iter_visible_dynamic_tiles(visible_range):
+            if self._get_tile_render_signature(self.game_map[y][x]) != signature:
+                cache.mark_dirty(x, y)
+
+    def _render_terrain(self):
+        """渲染地形 - 静态瓦片来自瓦片图层缓存"""
+        self.map_layer_cache.render(self.screen, self.camera_x, self.camera_y,
+                                    self._draw_cached_tile, self._get_visible_tile_range())
+
+    def _render_building_tiles(self):
+        """渲染建筑瓦片 - 建筑包含血条、状态条等每帧变化的内容，不进入瓦片缓存"""
+        if not self.building_ui:
+            return
+        cache = self.map_layer_cache
+        visible_range = self._get_visible_tile_range()
+        scaled_tile_size = int(self.tile_size * self.ui_scale)
+        for x, y, _ in cache.iter_visible_dynamic_tiles(visible_range):
+            tile = self.game_map[y][x]
+            if (tile.type != TileType.ROOM or not tile.room_type or
+                    tile.room_type.startswith('hero_base_')):
+                continue
+
+            screen_x = int((x * self.tile_size - self.camera_x) * self.ui_scale)
+            screen_y = int((y * self.tile_size - self.camera_y) * self.ui_scale)
+
+            # 只渲染屏幕内的瓦片
+            if (screen_x + scaled_tile_size < 0 or screen_x > GameConstants.WINDOW_WIDTH or
+                    screen_y + scaled_tile_size < 0 or screen_y > GameConstants.WINDOW_HEIGHT):
+                continue
+
+            self._render_building_tile(tile, screen_x, screen_y, x, y)
 
+    def _render_units(self):
+        """渲染目标连线、生物和英雄"""
         # 渲染目标连线（功能性怪物的目标可视化）
         MovementSystem.render_target_lines(
             self.screen, self.camera_x, self.camera_y, self.ui_scale)
@@ -1207,37 +1383,38 @@ class WarForTheOverworldGame:
         # 渲染英雄
         self._render_heroes()
 
-        # 工程师状态指示器现在由统一的生物状态指示器系统处理
-
-        # 渲染特效系统
+    def _render_effects(self):
+        """渲染特效系统和击退动画"""
         if self.effect_manager:
-            self.screen = self.effect_manager.render(
+            self.effect_manager.render(
                 self.screen, self.ui_scale, self.camera_x, self.camera_y)
 
-        # 渲染击退动画
         if self.knockback_animation:
             self.knockback_animation.render(
                 self.screen, self.camera_x, self.camera_y, self.ui_scale)
 
-        # 渲染鼠标高亮
+    def _render_hud(self):
+        """渲染鼠标高亮、资源/建造/状态面板、暂停提示和调试信息"""
         self._render_mouse_cursor()
-
-        # 渲染UI
         self._render_ui()
 
-        # 渲染怪物选择UI
+        if self.paused:
+            self._render_pause_indicator()
+
+        if self.debug_mode:
+            self._render_debug_info()
+
+    def _render_modal_ui(self):
+        """渲染怪物选择、后勤召唤、角色图鉴和建筑系统界面"""
         self.monster_selection_ui.render(
             self.screen, self.font, self.small_font)
 
-        # 渲染后勤召唤UI
         self.logistics_selection_ui.render(
             self.screen, self.font, self.small_font)
 
-        # 渲染角色图鉴
         if self.bestiary:
             self.bestiary.render(self.screen)
 
-        # 渲染建筑系统UI
         if self.building_ui:
             # 更新地精工程师计数 - 从生物列表中统计
             goblin_engineer_count = sum(1 for creature in self.monsters
@@ -1246,118 +1423,112 @@ class WarForTheOverworldGame:
             self.building_ui.render(
                 self.screen, self.building_manager, self.game_state, self.ui_scale)
 
-        # 渲染调试信息
-        if self.debug_mode:
-            self._render_debug_info()
+    def _render_pause_indicator(self):
+        """渲染暂停提示"""
+        text_surface = self._safe_render_text(
+            self.font, "已暂停 - 按空格键继续", (255, 215, 0))
+        rect = text_surface.get_rect(center=(GameConstants.WINDOW_WIDTH // 2, 30))
+        pygame.draw.rect(self.screen, (0, 0, 0), rect.inflate(24, 12))
+        pygame.draw.rect(self.screen, (255, 215, 0), rect.inflate(24, 12), 2)
+        self.screen.blit(text_surface, rect)
 
-        # 更新显示
-        pygame.display.flip()
+    def _get_tile_render_signature(self, tile):
+        """
+        获取瓦片的渲染签名 - 外观依赖运行时状态的瓦片（金矿、建筑）返回状态元组，
+        普通岩石/地面返回 None（只能通过 map_layer_cache.mark_dirty 显式重绘）
+        """
+        if tile.is_gold_vein or tile.type == TileType.ROOM:
+            return (tile.type, tile.room_type, tile.is_gold_vein, tile.gold_amount,
+                    tile.being_mined, tile.miners_count)
+        return None
 
-    def _render_map(self):
-        """渲染地图"""
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                tile = self.game_map[y][x]
-                # 应用UI缩放
-                scaled_tile_size = int(self.tile_size * self.ui_scale)
-                screen_x = int(
-                    (x * self.tile_size - self.camera_x) * self.ui_scale)
-                screen_y = int(
-                    (y * self.tile_size - self.camera_y) * self.ui_scale)
-
-                # 只渲染屏幕内的瓦片
-                if (screen_x + scaled_tile_size < 0 or screen_x > GameConstants.WINDOW_WIDTH or
-                        screen_y + scaled_tile_size < 0 or screen_y > GameConstants.WINDOW_HEIGHT):
-                    continue
-
-                # 绘制特殊标识和状态（优先处理特殊建筑）
-                elif tile.room_type and tile.room_type.startswith('hero_base_'):
-                    # 绘制英雄基地 - 正义风格的金蓝色设计
-                    # 背景：渐变蓝色
-                    base_bg_rect = pygame.Rect(screen_x + 1, screen_y + 1,
-                                               scaled_tile_size - 2, scaled_tile_size - 2)
-                    pygame.draw.rect(self.screen, (25, 25, 112),
-                                     base_bg_rect)  # 深蓝色背景
-
-                    # 边框：双层边框效果
-                    outer_border = pygame.Rect(
-                        screen_x, screen_y, scaled_tile_size, scaled_tile_size)
-                    inner_border = pygame.Rect(
-                        screen_x + 2, screen_y + 2, scaled_tile_size - 4, scaled_tile_size - 4)
-                    pygame.draw.rect(self.screen, (100, 149, 237),
-                                     outer_border, 2)  # 外边框：天蓝色
-                    pygame.draw.rect(self.screen, (255, 215, 0),
-                                     inner_border, 1)  # 内边框：金色
-
-                    # 中心装饰：城堡符号
-                    base_text = self._safe_render_text(
-                        self.font, emoji_manager.CASTLE, (255, 255, 255))  # 白色城堡
-                    base_rect = base_text.get_rect(center=(
-                        screen_x + scaled_tile_size // 2,
-                        screen_y + scaled_tile_size // 2))
-                    self.screen.blit(base_text, base_rect)
-
-                    # 正义光环：十字装饰
-                    center_x = screen_x + scaled_tile_size // 2
-                    center_y = screen_y + scaled_tile_size // 2
-                    # 垂直十字
-                    pygame.draw.rect(self.screen, (255, 215, 0),
-                                     (center_x - 1, center_y - 4, 2, 8))
-                    # 水平十字
-                    pygame.draw.rect(self.screen, (255, 215, 0),
-                                     (center_x - 4, center_y - 1, 8, 2))
-
-                    # 四个角的装饰：小星星
-                    corner_size = max(1, int(2 * self.ui_scale))
-                    corners = [
-                        (screen_x + 1, screen_y + 1),  # 左上
-                        (screen_x + scaled_tile_size - 3, screen_y + 1),  # 右上
-                        (screen_x + 1, screen_y + scaled_tile_size - 3),  # 左下
-                        (screen_x + scaled_tile_size - 3,
-                         screen_y + scaled_tile_size - 3)  # 右下
-                    ]
-                    for cx, cy in corners:
-                        pygame.draw.rect(self.screen, (255, 215, 0),
-                                         (cx, cy, corner_size, corner_size))
-
-                    # 英雄基地渲染完成，跳过后续处理
-                    continue
-                elif tile.type == TileType.ROOM:
-                    # 检查是否刚刚重新渲染过
-                    if hasattr(tile, 'just_rerendered') and tile.just_rerendered:
-                        # 清除重新渲染标记，跳过本次渲染
-                        tile.just_rerendered = False
-                        continue
-
-                    # 渲染建筑瓦片
-                    if tile.room_type and self.building_ui:
-                        self._render_building_tile(
-                            tile, screen_x, screen_y, x, y)
-                        continue  # 跳过后续的普通渲染
-                    else:
-                        # 没有BuildingUI或room_type，使用默认颜色
-                        color = self._get_building_color(
-                            tile.room_type or tile.room)
-                else:
-                    # 选择普通瓦片颜色
-                    color = self._get_tile_color(tile)
-
-                # 绘制瓦片
-                pygame.draw.rect(self.screen, color, (screen_x,
-                                 screen_y, scaled_tile_size, scaled_tile_size))
-
-                # 绘制边框
-                pygame.draw.rect(self.screen, (50, 50, 50), (screen_x,
-                                 screen_y, scaled_tile_size, scaled_tile_size), 1)
-
-                # 绘制金矿和其他特殊瓦片
-                if tile.is_gold_vein and tile.gold_amount > 0:
-                    self._render_gold_mine_ui(
-                        screen_x, screen_y, tile, scaled_tile_size)
-                elif tile.is_gold_vein and tile.gold_amount <= 0:
-                    # 枯竭金矿显示为灰色
-                    pygame.draw.rect(self.screen, (100, 100, 100),
-                                     (screen_x, screen_y, scaled_tile_size, scaled_tile_size))
+    def _draw_cached_tile(self, surface, x: int, y: int, surface_x: int, surface_y: int,
+                          scaled_tile_size: int):
+        """把单个瓦片的静态外观绘制到瓦片图层缓存中"""
+        tile = self.game_map[y][x]
+
+        # 绘制特殊标识和状态（优先处理特殊建筑）
+        if tile.room_type and tile.room_type.startswith('hero_base_'):
+            self._render_hero_base_tile(
+                surface, surface_x, surface_y, scaled_tile_size)
+            return self._get_tile_render_signature(tile)
+        elif tile.type == TileType.ROOM:
+            # 建筑瓦片每帧在缓存之上单独渲染
+            if tile.room_type and self.building_ui:
+                return self._get_tile_render_signature(tile)
+            # 没有BuildingUI或room_type，使用默认颜色
+            color = self._get_building_color(tile.room_type or tile.room)
+        else:
+            # 选择普通瓦片颜色
+            color = self._get_tile_color(tile)
+
+        # 绘制瓦片
+        pygame.draw.rect(surface, color, (surface_x,
+                         surface_y, scaled_tile_size, scaled_tile_size))
+
+        # 绘制边框
+        pygame.draw.rect(surface, (50, 50, 50), (surface_x,
+                         surface_y, scaled_tile_size, scaled_tile_size), 1)
+
+        # 绘制金矿和其他特殊瓦片
+        if tile.is_gold_vein and tile.gold_amount > 0:
+            self._render_gold_mine_ui(
+                surface_x, surface_y, tile, scaled_tile_size, surface)
+        elif tile.is_gold_vein and tile.gold_amount <= 0:
+            # 枯竭金矿显示为灰色
+            pygame.draw.rect(surface, (100, 100, 100),
+                             (surface_x, surface_y, scaled_tile_size, scaled_tile_size))
+
+        return self._get_tile_render_signature(tile)
+
+    def _render_hero_base_tile(self, surface, screen_x: int, screen_y: int, scaled_tile_size: int):
+        """绘制英雄基地 - 正义风格的金蓝色设计"""
+        # 背景：渐变蓝色
+        base_bg_rect = pygame.Rect(screen_x + 1, screen_y + 1,
+                                   scaled_tile_size - 2, scaled_tile_size - 2)
+        pygame.draw.rect(surface, (25, 25, 112),
+                         base_bg_rect)  # 深蓝色背景
+
+        # 边框：双层边框效果
+        outer_border = pygame.Rect(
+            screen_x, screen_y, scaled_tile_size, scaled_tile_size)
+        inner_border = pygame.Rect(
+            screen_x + 2, screen_y + 2, scaled_tile_size - 4, scaled_tile_size - 4)
+        pygame.draw.rect(surface, (100, 149, 237),
+                         outer_border, 2)  # 外边框：天蓝色
+        pygame.draw.rect(surface, (255, 215, 0),
+                         inner_border, 1)  # 内边框：金色
+
+        # 中心装饰：城堡符号
+        base_text = self._safe_render_text(
+            self.font, emoji_manager.CASTLE, (255, 255, 255))  # 白色城堡
+        base_rect = base_text.get_rect(center=(
+            screen_x + scaled_tile_size // 2,
+            screen_y + scaled_tile_size // 2))
+        surface.blit(base_text, base_rect)
+
+        # 正义光环：十字装饰
+        center_x = screen_x + scaled_tile_size // 2
+        center_y = screen_y + scaled_tile_size // 2
+        # 垂直十字
+        pygame.draw.rect(surface, (255, 215, 0),
+                         (center_x - 1, center_y - 4, 2, 8))
+        # 水平十字
+        pygame.draw.rect(surface, (255, 215, 0),
+                         (center_x - 4, center_y - 1, 8, 2))
+
+        # 四个角的装饰：小星星
+        corner_size = max(1, int(2 * self.ui_scale))
+        corners = [
+            (screen_x + 1, screen_y + 1),  # 左上
+            (screen_x + scaled_tile_size - 3, screen_y + 1),  # 右上
+            (screen_x + 1, screen_y + scaled_tile_size - 3),  # 左下
+            (screen_x + scaled_tile_size - 3,
+             screen_y + scaled_tile_size - 3)  # 右下
+        ]
+        for cx, cy in corners:
+            pygame.draw.rect(surface, (255, 215, 0),
+                             (cx, cy, corner_size, corner_size))
 
     def _render_building_tile(self, tile, screen_x: int, screen_y: int, x: int, y: int):
         """渲染建筑瓦片 - 统一处理完成和未完成建筑"""
@@ -1458,29 +1629,14 @@ class WarForTheOverworldGame:
             return GameConstants.COLORS['rock']
 
     def _force_rerender_buildings(self):
-        """强制重新渲染所有标记为需要重新渲染的建筑瓦片"""
+        """把标记为需要重新渲染的瓦片（建筑完成等）加入瓦片图层缓存的脏区域"""
         for y in range(self.map_height):
             for x in range(self.map_width):
                 tile = self.game_map[y][x]
                 if hasattr(tile, 'needs_rerender') and tile.needs_rerender:
                     # 清除重新渲染标记
                     tile.needs_rerender = False
-
-                    # 计算屏幕坐标
-                    screen_x = x * self.tile_size - self.camera_x
-                    screen_y = y * self.tile_size - self.camera_y
-
-                    # 只重新渲染屏幕内的瓦片
-                    if (screen_x + self.tile_size < 0 or screen_x > GameConstants.WINDOW_WIDTH or
-                            screen_y + self.tile_size < 0 or screen_y > GameConstants.WINDOW_HEIGHT):
-                        continue
-
-                    # 重新渲染建筑瓦片
-                    if tile.type == TileType.ROOM and tile.room_type and self.building_ui:
-                        self._render_building_tile(
-                            tile, screen_x, screen_y, x, y)
-                        # 标记为已重新渲染，避免被_render_map覆盖
-                        tile.just_rerendered = True
+                    self.map_layer_cache.mark_dirty(x, y)
 
     def _render_building_status_overlay(self, tile, screen_x: int, screen_y: int, x: int, y: int):
         """渲染建筑状态高亮覆盖层 - 在最后绘制，确保不被覆盖"""
@@ -1512,10 +1668,13 @@ class WarForTheOverworldGame:
         else:
             game_logger.error("❌ 建筑对象缺少get_status_for_indicator方法，无法渲染状态指示器")
 
-    def _render_gold_mine_ui(self, screen_x: int, screen_y: int, tile, scaled_tile_size: int = None):
+    def _render_gold_mine_ui(self, screen_x: int, screen_y: int, tile, scaled_tile_size: int = None,
+                             surface=None):
         """渲染金矿UI - 现代化设计"""
         if scaled_tile_size is None:
             scaled_tile_size = self.tile_size
+        if surface is None:
+            surface = self.screen
         # 计算储量百分比
         max_gold = 100  # 假设最大储量为100
         gold_percentage = min(tile.gold_amount / max_gold, 1.0)
@@ -1540,12 +1699,12 @@ class WarForTheOverworldGame:
         # 绘制主背景
         main_rect = pygame.Rect(
             screen_x + 1, screen_y + 1, scaled_tile_size - 2, scaled_tile_size - 2)
-        pygame.draw.rect(self.screen, base_color, main_rect)
+        pygame.draw.rect(surface, base_color, main_rect)
 
         # 绘制发光效果
         glow_manager = get_glow_manager()
         glow_manager.render_effect_glow(
-            self.screen, 'normal',
+            surface, 'normal',
             (screen_x + scaled_tile_size // 2,
              screen_y + scaled_tile_size // 2),
             glow_color,
@@ -1553,7 +1712,7 @@ class WarForTheOverworldGame:
         )
 
         # 绘制边框
-        pygame.draw.rect(self.screen, border_color, main_rect, 2)
+        pygame.draw.rect(surface, border_color, main_rect, 2)
 
         # 绘制金矿图标 - 使用更现代的符号
         center_x = screen_x + scaled_tile_size // 2
@@ -1566,8 +1725,8 @@ class WarForTheOverworldGame:
             (center_x, center_y + 6),      # 下
             (center_x - 6, center_y)       # 左
         ]
-        pygame.draw.polygon(self.screen, (255, 255, 255), diamond_points)
-        pygame.draw.polygon(self.screen, (200, 200, 200), diamond_points, 1)
+        pygame.draw.polygon(surface, (255, 255, 255), diamond_points)
+        pygame.draw.polygon(surface, (200, 200, 200), diamond_points, 1)
 
         # 绘制储量条
         bar_width = scaled_tile_size - 8
@@ -1577,20 +1736,20 @@ class WarForTheOverworldGame:
 
         # 背景条
         bar_bg_rect = pygame.Rect(bar_x, bar_y, bar_width, bar_height)
-        pygame.draw.rect(self.screen, (100, 100, 100), bar_bg_rect)
+        pygame.draw.rect(surface, (100, 100, 100), bar_bg_rect)
 
         # 储量条
         bar_fill_width = int(bar_width * gold_percentage)
         if bar_fill_width > 0:
             bar_fill_rect = pygame.Rect(
                 bar_x, bar_y, bar_fill_width, bar_height)
-            pygame.draw.rect(self.screen, (255, 255, 0), bar_fill_rect)
+            pygame.draw.rect(surface, (255, 255, 0), bar_fill_rect)
 
         # 挖掘状态指示
         if tile.being_mined or tile.miners_count > 0:
             if self.status_indicator:
                 self.status_indicator.render_mining_highlight(
-                    self.screen, screen_x, screen_y, self.tile_size, tile.miners_count, self.ui_scale)
+                    surface, screen_x, screen_y, self.tile_size, tile.miners_count, self.ui_scale)
             else:
                 game_logger.error("❌ StatusIndicator系统不可用，无法渲染挖掘状态")
 
@@ -1952,6 +2111,15 @@ class WarForTheOverworldGame:
                 f"屏幕震动: {'是' if effect_stats['screen_shake_active'] else '否'}"
             ])
 
+        if self.effect_manager:
+            lod_stats = self.effect_manager.get_lod_stats()
+            debug_info.extend([
+                f"",  # 空行
+                f"=== 特效LOD ===",
+                f"档位: {lod_stats['tier']} (质量 {lod_stats['quality']:.2f})",
+                f"平均帧耗时: {lod_stats['average_frame_ms']:.1f}ms / {lod_stats['target_frame_ms']:.1f}ms"
+            ])
+
         for i, info in enumerate(debug_info):
             text = self._safe_render_text(
                 self.small_font, info, (255, 255, 255))
@@ -1981,6 +2149,9 @@ class WarForTheOverworldGame:
     def handle_events(self):
         """处理事件"""
         for event in pygame.event.get():
+            # 输入可能改变界面内部状态，相关图层失效
+            self._invalidate_render_layers(event)
+
             # 让建筑UI先处理事件
             if self.building_ui and self.building_ui.handle_event(event, self.building_manager):
                 # 检查是否有选中的建筑类型
@@ -2059,6 +2230,11 @@ class WarForTheOverworldGame:
                     self.debug_mode = not self.debug_mode
                     game_logger.info(
                         f"🐛 调试模式: {'开启' if self.debug_mode else '关闭'}")
+                elif event.key == pygame.K_SPACE:
+                    # 暂停/继续 - 暂停时不推进模拟，画面没有变化时不重绘
+                    self.paused = not self.paused
+                    game_logger.info(
+                        f"⏸️ 游戏{'已暂停' if self.paused else '继续'}")
 
                 # 处理相机输入
                 elif self.handle_camera_input(event):
@@ -2082,6 +2258,7 @@ class WarForTheOverworldGame:
         game_logger.info("  - 0键: 重置UI放大倍数")
         game_logger.info("  - ESC: 取消建造模式")
         game_logger.info("  - B键: 打开/关闭角色图鉴")
+        game_logger.info("  - 空格键: 暂停/继续")
         game_logger.info("  - TAB键: 统计面板 (查看详细统计)")
         game_logger.info("  - 关闭窗口: 退出游戏")
         game_logger.info("")
@@ -2094,8 +2271,9 @@ class WarForTheOverworldGame:
             # 处理事件
             self.handle_events()
 
-            # 更新游戏逻辑
-            self.update(delta_time)
+            # 更新游戏逻辑（暂停时模拟时钟停止）
+            if not self.paused:
+                self.update(delta_time)
 
             # 渲染游戏
             self.render()
@@ -2103,6 +2281,10 @@ class WarForTheOverworldGame:
             # 控制帧率
             self.clock.tick(GameConstants.FPS_TARGET)
 
+            # 用本帧实际耗时（不含帧率限制的等待）驱动特效LOD
+            if self.effect_manager:
+                self.effect_manager.lod.record_frame(self.clock.get_rawtime())
+
         game_logger.info("🛑 游戏结束")
         pygame.quit()
 
@@ -2144,21 +2326,8 @@ class WarForTheOverworldGame:
         if not self.building_manager:
             return None
 
-        for building in self.building_manager.buildings:
-            # 处理2x2地牢之心
-            if (hasattr(building, 'building_type') and
-                building.building_type.value == 'dungeon_heart' and
-                    hasattr(building, 'size') and building.size == (2, 2)):
-                # 检查是否在2x2范围内（使用瓦片坐标）
-                if (building.tile_x <= x < building.tile_x + 2 and
-                        building.tile_y <= y < building.tile_y + 2):
-                    return building
-            else:
-                # 普通建筑：精确匹配坐标（使用瓦片坐标）
-                if building.tile_x == x and building.tile_y == y:
-                    return building
-
-        return None
+        # 建筑索引按锚点瓦片查找
+        return self.building_manager.get_building_at(x, y)
 
     # ==================== 统一API接口 ====================
 
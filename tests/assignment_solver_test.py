@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+最小代价匹配求解测试
+在随机代价矩阵（行列数不同、含 inf 不可行组合、含并列代价）上，
+把 solve_assignment 的 NumPy 实现和纯 Python 实现分别与穷举结果对比：
+匹配数必须最多、总代价必须最小，结果只包含可行组合且行列不重复
+
+运行方式: python -m pytest tests/assignment_solver_test.py
+"""
+
+import math
+import random
+import itertools
+
+import src.managers.task_matching as task_matching
+from src.managers.task_matching import solve_assignment
+
+INF = float('inf')
+
+
+def solve_with_backend(cost_matrix, use_numpy: bool):
+    """指定求解后端（NumPy 或纯 Python）求解"""
+    original = task_matching.NUMPY_AVAILABLE
+    task_matching.NUMPY_AVAILABLE = use_numpy
+    try:
+        return solve_assignment(cost_matrix)
+    finally:
+        task_matching.NUMPY_AVAILABLE = original
+
+
+def brute_force(cost_matrix):
+    """
+    穷举最优匹配
+
+    Returns:
+        (匹配数, 总代价)：先最大化可行组合的数量，再最小化总代价
+    """
+    rows = len(cost_matrix)
+    cols = len(cost_matrix[0]) if rows else 0
+    best = (0, 0.0)
+    if rows == 0 or cols == 0:
+        return best
+    if rows <= cols:
+        candidates = ([(row, col) for row, col in enumerate(perm)]
+                      for perm in itertools.permutations(range(cols), rows))
+    else:
+        candidates = ([(row, col) for col, row in enumerate(perm)]
+                      for perm in itertools.permutations(range(rows), cols))
+    for pairs in candidates:
+        costs = [cost_matrix[row][col] for row, col in pairs if cost_matrix[row][col] < INF]
+        key = (len(costs), sum(costs))
+        if key[0] > best[0] or (key[0] == best[0] and key[1] < best[1] - 1e-9):
+            best = key
+    return best
+
+
+def random_matrix(rng: random.Random, rows: int, cols: int, inf_ratio: float, integer: bool):
+    matrix = []
+    for _ in range(rows):
+        row = []
+        for _ in range(cols):
+            if rng.random() < inf_ratio:
+                row.append(INF)
+            elif integer:
+                # 小范围整数，制造大量并列代价
+                row.append(float(rng.randint(0, 5)))
+            else:
+                row.append(rng.uniform(-10.0, 100.0))
+        matrix.append(row)
+    return matrix
+
+
+def check_result(pairs, cost_matrix, expected, label: str):
+    rows = [row for row, _ in pairs]
+    cols = [col for _, col in pairs]
+    assert rows == sorted(rows), f"{label}: 结果没有按行排序 {pairs}"
+    assert len(set(rows)) == len(rows) and len(set(cols)) == len(cols), f"{label}: 行或列重复 {pairs}"
+    assert all(cost_matrix[row][col] < INF for row, col in pairs), f"{label}: 包含不可行组合 {pairs}"
+    total = sum(cost_matrix[row][col] for row, col in pairs)
+    assert len(pairs) == expected[0], f"{label}: 匹配数 {len(pairs)} != 最优 {expected[0]}"
+    assert math.isclose(total, expected[1], rel_tol=1e-9, abs_tol=1e-6), \
+        f"{label}: 总代价 {total} != 最优 {expected[1]}"
+
+
+def compare_backends(rng: random.Random, cases: int, max_size: int, inf_ratio: float, integer: bool):
+    backends = [False]
+    if task_matching.NUMPY_AVAILABLE:
+        backends.append(True)
+    for _ in range(cases):
+        rows, cols = rng.randint(1, max_size), rng.randint(1, max_size)
+        matrix = random_matrix(rng, rows, cols, inf_ratio, integer)
+        expected = brute_force(matrix)
+        for use_numpy in backends:
+            label = f"{'NumPy' if use_numpy else 'Python'} {rows}x{cols} {matrix}"
+            check_result(solve_with_backend(matrix, use_numpy), matrix, expected, label)
+
+
+def test_dense_matrices_match_brute_force():
+    """没有不可行组合时与穷举一致（含负代价、行多于列和列多于行）"""
+    compare_backends(random.Random(1), 200, 6, 0.0, integer=False)
+
+
+def test_infinite_entries_match_brute_force():
+    """含 inf 不可行组合时优先匹配最多的可行组合，再最小化总代价"""
+    rng = random.Random(2)
+    for inf_ratio in (0.2, 0.5, 0.8):
+        compare_backends(rng, 150, 6, inf_ratio, integer=False)
+
+
+def test_tied_costs_match_brute_force():
+    """大量并列代价时总代价仍然最优"""
+    compare_backends(random.Random(3), 200, 6, 0.3, integer=True)
+
+
+def test_degenerate_matrices():
+    """空矩阵、全部不可行和单个元素"""
+    for use_numpy in ([False, True] if task_matching.NUMPY_AVAILABLE else [False]):
+        assert solve_with_backend([], use_numpy) == []
+        assert solve_with_backend([[]], use_numpy) == []
+        assert solve_with_backend([[INF, INF], [INF, INF]], use_numpy) == []
+        assert solve_with_backend([[3.0]], use_numpy) == [(0, 0)]
+        assert solve_with_backend([[INF], [2.0], [1.0]], use_numpy) == [(2, 0)]
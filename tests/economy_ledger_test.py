@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+经济账本测试
+对存储建筑随机执行注册、注销、存入、取出、直接赋值和修改容量，
+每一步都把资源管理器的账本快照（总量、容量、来源列表）与逐个建筑全量扫描的结果对比
+
+运行方式: python -m pytest tests/economy_ledger_test.py
+"""
+
+import random
+
+from src.entities.building import BuildingRegistry, BuildingType
+from src.managers.economy_ledger import RESOURCE_GOLD, RESOURCE_MANA
+from src.managers.resource_manager import ResourceInfo, ResourceManager
+
+
+def full_scan(buildings, amount_attribute: str, capacity_attribute: str) -> ResourceInfo:
+    """逐个建筑汇总资源（账本引入之前 get_total_gold / get_total_mana 的做法）"""
+    sources = []
+    total = 0
+    total_capacity = 0
+    for building in buildings:
+        if hasattr(building, amount_attribute):
+            amount = getattr(building, amount_attribute)
+            capacity = getattr(building, capacity_attribute, 0)
+            position = f"({building.tile_x},{building.tile_y})"
+            sources.append({
+                'building': building.building_type.value,
+                'name': f"{building.name}{position}",
+                'amount': amount,
+                'capacity': capacity,
+                'available': amount,
+            })
+            total += amount
+            total_capacity += capacity
+    return ResourceInfo(total=total, available=total, capacity=total_capacity, sources=sources)
+
+
+def assert_matches_scan(manager: ResourceManager, step: str):
+    gold = full_scan(manager.gold_buildings, 'stored_gold', 'gold_storage_capacity')
+    mana = full_scan(manager.mana_buildings, 'stored_mana', 'mana_storage_capacity')
+    assert manager.get_total_gold() == gold, f"{step}: 金币快照与全量扫描不一致"
+    assert manager.get_total_mana() == mana, f"{step}: 魔力快照与全量扫描不一致"
+    assert manager.can_afford(gold.total, mana.total)
+    assert not manager.can_afford(gold.total + 1, 0)
+    treasuries = sum(1 for building in manager.gold_buildings
+                     if building.building_type == BuildingType.TREASURY)
+    assert manager.ledger.count_sources(RESOURCE_GOLD, BuildingType.TREASURY) == treasuries
+
+
+def create_building(rng: random.Random, building_type: BuildingType):
+    return BuildingRegistry.create_building(building_type, rng.randrange(50), rng.randrange(50))
+
+
+def register(manager: ResourceManager, building):
+    if building.building_type == BuildingType.DUNGEON_HEART:
+        manager.register_dungeon_heart(building)
+    elif building.building_type == BuildingType.TREASURY:
+        manager.register_treasury(building)
+    else:
+        manager.register_magic_altar(building)
+
+
+def unregister(manager: ResourceManager, building):
+    manager.remove_gold_building(building)
+    manager.remove_mana_building(building)
+
+
+def test_ledger_matches_full_scan_under_random_operations():
+    """随机经济操作序列中，每一步的账本快照都与全量扫描一致"""
+    rng = random.Random(2024)
+    manager = ResourceManager(None)
+    building_types = [BuildingType.DUNGEON_HEART, BuildingType.TREASURY, BuildingType.MAGIC_ALTAR]
+    registered = []
+    for building_type in building_types + [BuildingType.TREASURY]:
+        building = create_building(rng, building_type)
+        register(manager, building)
+        registered.append(building)
+    assert_matches_scan(manager, "初始注册")
+
+    for step in range(2000):
+        operation = rng.random()
+        if operation < 0.2:
+            manager.add_gold(rng.randint(1, 200), rng.choice(manager.gold_buildings or [None]))
+        elif operation < 0.35:
+            manager.consume_gold(rng.randint(1, 300))
+        elif operation < 0.45:
+            manager.add_mana(rng.randint(1, 50), rng.choice(manager.mana_buildings or [None]))
+        elif operation < 0.55:
+            manager.consume_mana(rng.randint(1, 80))
+        elif operation < 0.65 and registered:
+            # 绕过资源管理器直接修改存储量（建筑自身逻辑的做法）
+            building = rng.choice(registered)
+            if hasattr(building, 'stored_gold'):
+                building.stored_gold = rng.randint(0, 500)
+        elif operation < 0.72 and registered:
+            building = rng.choice(registered)
+            if hasattr(building, 'gold_storage_capacity'):
+                building.gold_storage_capacity = rng.randint(100, 2000)
+        elif operation < 0.86:
+            building = create_building(rng, rng.choice(building_types))
+            register(manager, building)
+            registered.append(building)
+        elif registered:
+            building = registered.pop(rng.randrange(len(registered)))
+            unregister(manager, building)
+            # 已注销的建筑继续变化不再影响账本
+            if hasattr(building, 'stored_gold'):
+                building.stored_gold += 10
+        assert_matches_scan(manager, f"第 {step} 步")
+
+
+def test_snapshot_is_cached_until_values_change():
+    """数值没有变化时返回同一个快照对象，变化后重新生成"""
+    rng = random.Random(7)
+    manager = ResourceManager(None)
+    heart = create_building(rng, BuildingType.DUNGEON_HEART)
+    manager.register_dungeon_heart(heart)
+
+    first = manager.get_total_gold()
+    assert manager.get_total_gold() is first
+    heart.stored_gold += 25
+    second = manager.get_total_gold()
+    assert second is not first and second.total == first.total + 25
+    # 魔力变化不使金币快照失效
+    heart.stored_mana += 5
+    assert manager.get_total_gold() is second
+
+
+def test_shared_building_stays_registered_for_other_resource():
+    """地牢之心同时存储金币和魔力，从一种资源注销后另一种资源仍然跟踪它的变化"""
+    rng = random.Random(11)
+    manager = ResourceManager(None)
+    heart = create_building(rng, BuildingType.DUNGEON_HEART)
+    manager.register_dungeon_heart(heart)
+    manager.remove_gold_building(heart)
+    heart.stored_mana += 40
+    assert manager.ledger.get_total(RESOURCE_MANA) == heart.stored_mana
+    assert manager.ledger.get_total(RESOURCE_GOLD) == 0
+    assert_matches_scan(manager, "注销金币来源后")
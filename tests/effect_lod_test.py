@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+特效LOD测试
+特效质量系数随实测帧耗时变化，不同质量下生成的粒子数量不同，
+但全局随机序列必须保持一致，否则相同种子的模拟会因为机器快慢得到不同的游戏结果
+
+运行方式: python -m pytest tests/effect_lod_test.py
+"""
+
+import random
+
+from src.effects.effect_lod import get_effect_lod, reset_effect_lod
+from src.effects.particle_arrays import NUMPY_AVAILABLE
+from src.effects.particle_system import ParticleSystem
+
+
+def spawn_effects(quality: float, vectorized: bool):
+    """在指定质量系数下生成各类粒子，返回 (粒子数量, 之后的全局随机序列)"""
+    reset_effect_lod()
+    get_effect_lod().quality = quality
+    particle_system = ParticleSystem(vectorized=vectorized)
+    random.seed(1)
+    try:
+        particle_system.create_particle_burst(100, 100, 20, (255, 0, 0), (2, 4), (50, 100), 300)
+        particle_system.create_fire_particles(100, 100, 10)
+        particle_system.create_smoke_particles(100, 100, 8)
+        particle_system.create_splash_particles(100, 100, (0, 0, 255), 8)
+        stream = [random.random() for _ in range(5)]
+    finally:
+        reset_effect_lod()
+    return particle_system.get_particle_count(), stream
+
+
+def test_quality_does_not_shift_global_random_stream():
+    """满质量、半质量和最低质量下粒子数量不同，全局随机序列相同"""
+    for vectorized in ([False, True] if NUMPY_AVAILABLE else [False]):
+        full_count, full_stream = spawn_effects(1.0, vectorized)
+        half_count, half_stream = spawn_effects(0.5, vectorized)
+        low_count, low_stream = spawn_effects(0.2, vectorized)
+        assert full_count == 46
+        assert low_count < half_count < full_count
+        assert half_stream == full_stream and low_stream == full_stream
+
+
+def test_full_quality_keeps_original_random_draws():
+    """满质量时每个粒子的参数与未缩放时逐个抽取的结果相同"""
+    reset_effect_lod()
+    particle_system = ParticleSystem(vectorized=False)
+    random.seed(3)
+    particle_system.create_splash_particles(0, 0, (255, 255, 255), 4)
+    random.seed(3)
+    expected = []
+    for _ in range(4):
+        random.uniform(0, 6.283185307179586)
+        random.uniform(60, 120)
+        expected.append((random.uniform(1, 3), random.uniform(300, 600)))
+    assert [(particle.size, particle.life) for particle in particle_system.particles] == expected
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流场寻路测试
+在随机地图上把流场与逐格 A* 对比：可达性必须一致，流场代价和沿流场取出的路径代价都等于 A* 的最优代价；
+并验证挖掘和建筑建成后，只失效受影响的流场也能得到与 A* 一致的结果
+
+运行方式: python -m pytest tests/flow_field_test.py
+"""
+
+import random
+
+from src.core.enums import TileType
+from src.core.map_grid import MapGrid
+from src.entities.building import BuildingRegistry, BuildingStatus, BuildingType
+from src.systems.flow_field import FlowFieldManager
+from src.systems.unified_pathfinding import is_tile_walkable
+
+from pathfinding_helpers import (
+    assert_valid_path, make_corridor_map, make_random_map, path_cost, reference_path, walkable_cells)
+
+
+def compare_with_astar(manager: FlowFieldManager, game_map: MapGrid,
+                       rng: random.Random, goals: int, starts: int) -> int:
+    """随机目标、起点与A*对比，返回可达的查询数"""
+    cells = walkable_cells(game_map)
+    reachable = 0
+    for goal in rng.sample(cells, goals):
+        field = manager.get_field(goal, game_map)
+        for start in rng.sample(cells, starts):
+            expected = reference_path(start, goal, game_map)
+            assert field.is_reachable(*start) == (expected is not None), \
+                f"{start} -> {goal} 可达性不一致: 流场={field.is_reachable(*start)}, A*={expected is not None}"
+            if expected is None:
+                continue
+            reachable += 1
+            optimal = path_cost(expected)
+            path = manager.find_path(start, goal, game_map)
+            assert_valid_path(path, start, goal, game_map)
+            assert abs(field.get_cost(*start) - optimal) < 1e-6, \
+                f"{start} -> {goal} 流场代价 {field.get_cost(*start):.3f} != A* {optimal:.3f}"
+            assert abs(path_cost(path) - optimal) < 1e-6, \
+                f"{start} -> {goal} 路径代价 {path_cost(path):.3f} != A* {optimal:.3f}"
+    return reachable
+
+
+def test_flow_field_matches_astar_on_random_maps():
+    """随机地图上流场与 A* 的可达性和代价一致（包括斜向穿过拐角）"""
+    reachable = 0
+    for seed in range(6):
+        game_map = make_random_map(40, 30, seed)
+        manager = FlowFieldManager(is_tile_walkable)
+        reachable += compare_with_astar(manager, game_map, random.Random(seed), 4, 15)
+    assert reachable > 0
+
+
+def test_diagonal_corner_matches_astar():
+    """只能斜向连通的两个格子：A* 可以穿过拐角，流场也必须可达"""
+    game_map = MapGrid(4, 4)
+    game_map.set_type(1, 1, TileType.GROUND)
+    game_map.set_type(2, 2, TileType.GROUND)
+    manager = FlowFieldManager(is_tile_walkable)
+    assert reference_path((1, 1), (2, 2), game_map) == [(1, 1), (2, 2)]
+    assert manager.find_path((1, 1), (2, 2), game_map) == [(1, 1), (2, 2)]
+
+
+def test_flow_field_follows_digging():
+    """挖掘后（瓦块变化事件）只失效受影响的流场，结果仍与 A* 一致"""
+    rng = random.Random(7)
+    game_map = make_random_map(40, 30, 7, open_ratio=0.5)
+    manager = FlowFieldManager(is_tile_walkable)
+    compare_with_astar(manager, game_map, rng, 3, 10)
+    for _ in range(5):
+        for _ in range(30):
+            game_map.set_type(rng.randrange(game_map.width), rng.randrange(game_map.height),
+                              TileType.GROUND)
+        compare_with_astar(manager, game_map, rng, 3, 10)
+
+
+def test_completed_building_blocks_cached_field():
+    """走廊上的建筑建成后，已缓存的流场不再穿过该格子"""
+    game_map = make_corridor_map()
+    building = BuildingRegistry.create_building(BuildingType.ARROW_TOWER, 13, 2)
+    game_map[2][13].building.building = building
+    manager = FlowFieldManager(is_tile_walkable)
+    assert (13, 2) in manager.find_path((0, 2), (29, 2), game_map), "建造中的建筑不应阻挡寻路"
+
+    building.status = BuildingStatus.COMPLETED
+    path = manager.find_path((0, 2), (29, 2), game_map)
+    assert path is not None and (13, 2) not in path, "建成的建筑仍被当作可通行"
+    assert path_cost(path) == path_cost(reference_path((0, 2), (29, 2), game_map))
+    assert manager.stats['fields_invalidated'] == 1
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+英雄波次刷新器测试
+同一种子下，分别以 30/60/144 FPS、10 倍速大步长和不规则步长推进刷新器，
+得到的英雄入侵序列（波次时间、英雄类型、位置、基地）必须完全相同；
+并验证脚本波次、MapGrid 挖掘后刷新格子缓存失效
+
+运行方式: python -m pytest tests/hero_wave_spawner_test.py
+"""
+
+import random
+
+from src.core.enums import TileType
+from src.core.map_grid import MapGrid
+from src.managers.hero_wave_spawner import HeroWave, HeroWaveSpawner
+
+HERO_TYPES = ['knight', 'archer', 'wizard', 'paladin']
+BASES = [(5, 5, 'north'), (34, 5, 'east'), (20, 24, 'south')]
+# 比较的模拟时长（秒）；末尾留出余量，避免不同步长的浮点累加误差影响最后一个波次是否到期
+DURATION = 600.0
+COMPARE_UNTIL = DURATION - 5.0
+
+
+def make_map() -> MapGrid:
+    """在英雄基地周围挖出部分地面"""
+    rng = random.Random(0)
+    game_map = MapGrid(40, 30)
+    for base_x, base_y, _ in BASES:
+        for dy in range(-2, 3):
+            for dx in range(-2, 3):
+                if rng.random() < 0.7:
+                    game_map.set_type(base_x + dx, base_y + dy, TileType.GROUND)
+    return game_map
+
+
+def make_spawner(seed: int, waves=None) -> HeroWaveSpawner:
+    return HeroWaveSpawner(HERO_TYPES, seed=seed, rate=0.05, wave_size=(1, 3), waves=waves)
+
+
+def run(seed: int, steps, waves=None):
+    """按给定的步长序列推进刷新器，返回入侵序列"""
+    game_map = make_map()
+    spawner = make_spawner(seed, waves)
+    spawner.set_bases(BASES, game_map)
+    spawns = []
+    for delta in steps:
+        spawns.extend(spawner.update(delta, game_map))
+    return [(spawn.wave_time, spawn.hero_type, spawn.tile_x, spawn.tile_y, spawn.base)
+            for spawn in spawns if spawn.wave_time < COMPARE_UNTIL]
+
+
+def fixed_steps(fps: float):
+    return [1.0 / fps] * int(DURATION * fps)
+
+
+def irregular_steps(seed: int):
+    """帧耗时抖动的步长（包括卡顿的长帧）"""
+    rng = random.Random(seed)
+    steps, elapsed = [], 0.0
+    while elapsed < DURATION:
+        delta = rng.choice([rng.uniform(0.005, 0.05), rng.uniform(0.2, 1.5)])
+        steps.append(delta)
+        elapsed += delta
+    return steps
+
+
+def test_same_sequence_at_any_frame_rate():
+    """30/60/144 FPS、10 倍速和不规则步长得到相同的入侵序列"""
+    for seed in (1, 2, 3):
+        reference = run(seed, fixed_steps(60))
+        assert len(reference) > 10, "测试时长内的波次太少"
+        for steps in (fixed_steps(30), fixed_steps(144), fixed_steps(6),
+                      [2.5] * int(DURATION / 2.5), irregular_steps(seed)):
+            assert run(seed, steps) == reference, f"种子 {seed} 的入侵序列随步长变化"
+
+
+def test_different_seeds_differ():
+    """不同种子得到不同的入侵序列"""
+    assert run(1, fixed_steps(60)) != run(2, fixed_steps(60))
+
+
+def test_scripted_waves_spawn_in_order():
+    """脚本波次按时间出现，英雄类型和基地按指定值使用，并与随机波次交错且不受步长影响"""
+    waves = [HeroWave(120.0, count=3, hero_types=['knight', 'archer'], base=1),
+             HeroWave(30.0, count=1, hero_types=['wizard'], base=0)]
+    reference = run(5, fixed_steps(60), waves)
+    assert run(5, [10.0] * int(DURATION / 10.0), waves) == reference
+
+    scripted = [spawn for spawn in reference if spawn[0] in (30.0, 120.0)]
+    assert [spawn[1] for spawn in scripted] == ['wizard', 'knight', 'archer', 'knight']
+    assert [spawn[4] for spawn in scripted] == [BASES[0]] + [BASES[1]] * 3
+    assert [spawn[0] for spawn in reference] == sorted(spawn[0] for spawn in reference)
+
+
+def test_spawn_cells_follow_digging():
+    """MapGrid 上挖掘基地附近的格子后刷新格子缓存失效，新格子可以刷出英雄"""
+    game_map = MapGrid(20, 20)
+    game_map.set_type(10, 10, TileType.GROUND)
+    spawner = make_spawner(9)
+    spawner.set_bases([(10, 10, 'north')], game_map)
+    assert spawner.get_spawn_cells(0, game_map) == [(10, 10)]
+    assert spawner.get_spawn_cells(0, game_map) == [(10, 10)]
+    assert spawner.stats['cell_rebuilds'] == 1
+
+    # 基地刷新区域外的挖掘不影响缓存
+    game_map.set_type(0, 0, TileType.GROUND)
+    spawner.get_spawn_cells(0, game_map)
+    assert spawner.stats['cell_rebuilds'] == 1
+
+    game_map.set_type(11, 11, TileType.GROUND)
+    assert spawner.get_spawn_cells(0, game_map) == [(10, 10), (11, 11)]
+    assert spawner.stats['cell_rebuilds'] == 2
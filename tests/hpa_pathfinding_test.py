@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HPA*分层寻路测试
+在随机地图上把 HPA* 的结果与逐格 A* 对比：可达性必须一致，路径必须合法，代价不低于最优；
+HPA* 经由簇边界入口绕行，单条路径允许有限的绕路，平均代价必须接近最优；
+并验证挖掘、放置建筑和建筑建成后，HPA* 只刷新受影响的簇也能得到与 A* 一致的结果
+
+运行方式: python -m pytest tests/hpa_pathfinding_test.py
+"""
+
+import random
+from typing import List
+
+from src.core.enums import TileType
+from src.core.map_grid import MapGrid
+from src.entities.building import BuildingRegistry, BuildingStatus, BuildingType
+from src.systems.hpa_pathfinding import HierarchicalPathfinder
+from src.systems.unified_pathfinding import is_tile_walkable
+
+from pathfinding_helpers import (
+    assert_valid_path, make_corridor_map, make_random_map, path_cost, reference_path, walkable_cells)
+
+# 单条路径相对最优代价允许的绕路（经由入口节点的绕路不超过一个簇的边长）
+MAX_DETOUR = 10.0
+# 平均路径代价相对最优代价的上限
+MAX_MEAN_COST_RATIO = 1.05
+
+
+def compare_with_astar(pathfinder: HierarchicalPathfinder, game_map: MapGrid,
+                       rng: random.Random, queries: int) -> List[float]:
+    """随机查询并与A*对比，返回可达查询的代价比（HPA* / A*）"""
+    cells = walkable_cells(game_map)
+    ratios = []
+    for _ in range(queries):
+        start, goal = rng.choice(cells), rng.choice(cells)
+        expected = reference_path(start, goal, game_map)
+        actual = pathfinder.find_path(start, goal, game_map)
+        assert (actual is None) == (expected is None), \
+            f"{start} -> {goal} 可达性不一致: HPA*={actual is not None}, A*={expected is not None}"
+        if expected is None:
+            continue
+        assert_valid_path(actual, start, goal, game_map)
+        optimal = path_cost(expected)
+        cost = path_cost(actual)
+        assert cost >= optimal - 1e-6, f"{start} -> {goal} 代价低于最优: {cost:.3f} < {optimal:.3f}"
+        assert cost <= optimal + MAX_DETOUR + 1e-6, \
+            f"{start} -> {goal} 绕路过多: {cost:.3f} > {optimal:.3f} + {MAX_DETOUR}"
+        if optimal > 0:
+            ratios.append(cost / optimal)
+    return ratios
+
+
+def test_hpa_matches_astar_on_random_maps():
+    """随机地图上 HPA* 与 A* 的可达性一致、平均代价接近最优"""
+    ratios = []
+    for seed in range(6):
+        game_map = make_random_map(45, 35, seed)
+        pathfinder = HierarchicalPathfinder(is_tile_walkable)
+        ratios.extend(compare_with_astar(pathfinder, game_map, random.Random(seed), 30))
+    assert ratios, "随机地图上没有可达的查询"
+    mean_ratio = sum(ratios) / len(ratios)
+    assert mean_ratio <= MAX_MEAN_COST_RATIO, f"平均代价比 {mean_ratio:.3f} > {MAX_MEAN_COST_RATIO}"
+
+
+def test_hpa_follows_digging():
+    """挖掘后（瓦块变化事件）HPA* 只刷新受影响的簇，结果仍与 A* 一致"""
+    rng = random.Random(42)
+    game_map = make_random_map(45, 35, 42, open_ratio=0.5)
+    pathfinder = HierarchicalPathfinder(is_tile_walkable)
+    compare_with_astar(pathfinder, game_map, rng, 10)
+    for _ in range(5):
+        for _ in range(40):
+            game_map.set_type(rng.randrange(game_map.width), rng.randrange(game_map.height),
+                              TileType.GROUND)
+        compare_with_astar(pathfinder, game_map, rng, 10)
+    assert pathfinder.stats['full_rebuilds'] == 1
+
+
+def test_completed_building_blocks_cached_path():
+    """走廊上的建筑建成后，已缓存的抽象图不再穿过该格子"""
+    game_map = make_corridor_map()
+    building = BuildingRegistry.create_building(BuildingType.ARROW_TOWER, 13, 2)
+    game_map[2][13].building.building = building
+    pathfinder = HierarchicalPathfinder(is_tile_walkable)
+    path = pathfinder.find_path((0, 2), (29, 2), game_map)
+    assert (13, 2) in path, "建造中的建筑不应阻挡寻路"
+
+    building.status = BuildingStatus.COMPLETED
+    assert not is_tile_walkable(game_map[2][13])
+    path = pathfinder.find_path((0, 2), (29, 2), game_map)
+    assert path is not None and (13, 2) not in path, "建成的建筑仍被当作可通行"
+    assert_valid_path(path, (0, 2), (29, 2), game_map)
+
+    # 建筑被摧毁（从格子上移除）后走廊重新打通
+    game_map[2][13].building.building = None
+    path = pathfinder.find_path((0, 2), (29, 2), game_map)
+    assert path_cost(path) == path_cost(reference_path((0, 2), (29, 2), game_map))
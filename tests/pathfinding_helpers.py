@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+寻路测试的公共工具
+随机地图生成、逐格 A* 参考路径、路径代价和路径合法性检查，
+供 HPA*、流场和分时寻路队列的测试共用
+"""
+
+import random
+
+from src.core.enums import TileType
+from src.core.map_grid import MapGrid
+from src.systems.hpa_pathfinding import DIAGONAL_COST
+from src.systems.unified_pathfinding import AStarAlgorithm, PathfindingConfig, is_tile_walkable
+
+
+def make_random_map(width: int, height: int, seed: int, open_ratio: float = 0.6) -> MapGrid:
+    """生成随机地图：按比例把岩石挖成地面"""
+    rng = random.Random(seed)
+    game_map = MapGrid(width, height)
+    for y in range(height):
+        for x in range(width):
+            if rng.random() < open_ratio:
+                game_map.set_type(x, y, TileType.GROUND)
+    return game_map
+
+
+def make_corridor_map() -> MapGrid:
+    """30x5 的走廊地图：第 2 行全部可通行，(12~14, 1) 提供绕过 (13, 2) 的旁路"""
+    game_map = MapGrid(30, 5)
+    for x in range(30):
+        game_map.set_type(x, 2, TileType.GROUND)
+    for x in range(12, 15):
+        game_map.set_type(x, 1, TileType.GROUND)
+    return game_map
+
+
+def reference_path(start, goal, game_map):
+    """逐格同步A*（不限制迭代次数）"""
+    astar = AStarAlgorithm(PathfindingConfig(max_iterations=10 ** 7, enable_caching=False))
+    return astar._astar_search(start, goal, game_map)
+
+
+def path_cost(path) -> float:
+    """路径代价（与A*相同的八方向代价）"""
+    cost = 0.0
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        cost += DIAGONAL_COST if x0 != x1 and y0 != y1 else 1.0
+    return cost
+
+
+def walkable_cells(game_map: MapGrid):
+    """地图上所有可通行的格子"""
+    return [(x, y) for y in range(game_map.height) for x in range(game_map.width)
+            if is_tile_walkable(game_map[y][x])]
+
+
+def make_is_walkable(game_map: MapGrid):
+    """按坐标判断可通行（自行处理越界），供 IncrementalAStar 使用"""
+    def is_walkable(x: int, y: int) -> bool:
+        return 0 <= x < game_map.width and 0 <= y < game_map.height and \
+            is_tile_walkable(game_map[y][x])
+    return is_walkable
+
+
+def assert_valid_path(path, start, goal, game_map):
+    """路径首尾正确、每一步为八方向相邻的可通行格子"""
+    assert path[0] == start and path[-1] == goal, f"路径首尾错误: {path[0]} -> {path[-1]}"
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert max(abs(x1 - x0), abs(y1 - y0)) == 1, f"路径不连续: ({x0},{y0}) -> ({x1},{y1})"
+        assert is_tile_walkable(game_map[y1][x1]), f"路径经过不可通行的格子 ({x1},{y1})"
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分时寻路队列测试
+验证可中断的 IncrementalAStar 无论时间片多大，结果都与同步 A* 一致（可达性和路径代价），
+队列按预算分帧推进后得到相同的结果，以及单位死亡、清空状态时任务会被丢弃
+
+运行方式: python -m pytest tests/pathfinding_queue_test.py
+"""
+
+import random
+
+from src.core.constants import GameConstants
+from src.core.map_grid import MapGrid
+from src.managers.movement_system import MovementSystem
+from src.systems.pathfinding_queue import (
+    IncrementalAStar, PathfindingQueue, get_pathfinding_queue, reset_pathfinding_queue)
+
+from pathfinding_helpers import (
+    make_is_walkable, make_random_map, path_cost, reference_path, walkable_cells)
+
+
+class DummyUnit:
+    """只有位置的测试单位"""
+
+    def __init__(self, x: float, y: float, name: str = "测试单位"):
+        self.x = x
+        self.y = y
+        self.name = name
+
+
+def random_queries(game_map: MapGrid, rng: random.Random, count: int):
+    cells = walkable_cells(game_map)
+    return [(rng.choice(cells), rng.choice(cells)) for _ in range(count)]
+
+
+def assert_same_result(path, expected, start, goal):
+    assert (path is None) == (expected is None), \
+        f"{start} -> {goal} 可达性不一致: 分时={path is not None}, 同步={expected is not None}"
+    if expected is not None:
+        assert path[0] == start and path[-1] == goal
+        assert abs(path_cost(path) - path_cost(expected)) < 1e-6, \
+            f"{start} -> {goal} 代价不一致: {path_cost(path):.3f} != {path_cost(expected):.3f}"
+
+
+def test_incremental_astar_matches_sync_astar():
+    """任意时间片大小下，IncrementalAStar 与同步 A* 的结果一致"""
+    for seed in range(4):
+        game_map = make_random_map(40, 30, seed)
+        is_walkable = make_is_walkable(game_map)
+        for start, goal in random_queries(game_map, random.Random(seed), 15):
+            expected = reference_path(start, goal, game_map)
+            for max_steps in (1, 7, 100000):
+                search = IncrementalAStar(start, goal, is_walkable, max_expansions=10 ** 7)
+                while not search.step(max_steps):
+                    pass
+                assert_same_result(search.path, expected, start, goal)
+
+
+def test_queue_matches_sync_astar():
+    """队列在很小的预算下分多帧完成，结果与同步 A* 一致"""
+    game_map = make_random_map(40, 30, 11)
+    is_walkable = make_is_walkable(game_map)
+    queries = random_queries(game_map, random.Random(11), 20)
+    queue = PathfindingQueue(frame_budget_ms=0.01, slice_expansions=5)
+    jobs = [queue.submit(owner, start, goal, is_walkable, max_expansions=10 ** 7)
+            for owner, (start, goal) in enumerate(queries)]
+    frames = 0
+    while queue.pending_count():
+        queue.process()
+        frames += 1
+        assert frames < 100000, "队列没有推进"
+    assert frames > 1, "预算很小时任务应该被摊到多帧"
+    for job, (start, goal) in zip(jobs, queries):
+        assert_same_result(job.path, reference_path(start, goal, game_map), start, goal)
+
+
+def test_dead_unit_jobs_are_dropped():
+    """单位死亡（clear_unit_state）和清空所有状态时丢弃任务，包括已完成未取走的结果"""
+    reset_pathfinding_queue()
+    game_map = make_random_map(20, 20, 3, open_ratio=1.0)
+    is_walkable = make_is_walkable(game_map)
+    queue = get_pathfinding_queue()
+
+    finished, pending, other = DummyUnit(0, 0), DummyUnit(0, 0), DummyUnit(0, 0)
+    queue.submit(finished, (0, 0), (1, 1), is_walkable)
+    queue.process(budget_ms=1000)
+    queue.submit(pending, (0, 0), (19, 19), is_walkable)
+    queue.submit(other, (0, 0), (19, 0), is_walkable)
+
+    MovementSystem.clear_unit_state(finished)
+    MovementSystem.clear_unit_state(pending)
+    assert queue.get_job(finished) is None and queue.get_job(pending) is None
+    assert queue.get_job(other) is not None
+
+    MovementSystem.clear_all_unit_states()
+    assert queue.get_job(other) is None and queue.pending_count() == 0
+    reset_pathfinding_queue()
+
+
+def test_bstar_requests_are_not_queued():
+    """开启分时寻路后只有 A* 请求进入队列，B* 请求同步执行"""
+    reset_pathfinding_queue()
+    MovementSystem.clear_all_unit_states()
+    game_map = make_random_map(20, 20, 5, open_ratio=1.0)
+    tile_size = GameConstants.TILE_SIZE
+    target = (15 * tile_size + tile_size // 2, 12 * tile_size + tile_size // 2)
+    try:
+        MovementSystem.enable_async_pathfinding(True)
+        bstar_unit = DummyUnit(tile_size // 2, tile_size // 2, "B*单位")
+        assert MovementSystem.generate_path(bstar_unit, target, game_map, "B_STAR")
+        assert get_pathfinding_queue().get_job(bstar_unit) is None
+
+        astar_unit = DummyUnit(tile_size // 2, tile_size // 2, "A*单位")
+        assert not MovementSystem.generate_path(astar_unit, target, game_map, "A_STAR")
+        assert get_pathfinding_queue().get_job(astar_unit) is not None
+    finally:
+        MovementSystem.enable_async_pathfinding(False)
+        MovementSystem.clear_all_unit_states()
+        reset_pathfinding_queue()